@@ -0,0 +1,631 @@
+"""
+Пакетная безголовая симуляция: тысячи игр одновременно на матрицах numpy.
+
+core.simulation проигрывает игры по одной через Game: на цикл уходят
+десятки вызовов Python на объектах одной партии, и скорость упирается
+в 150–200 игр в секунду. Здесь все игры пакета идут в ногу: состояние
+каждой подсистемы — массив по играм (баланс, караван в пути, города,
+события, насыщение рынка, флот), а цикл — несколько десятков векторных
+операций сразу для всего пакета. На одном ядре это тысячи игр по 91
+циклу в секунду.
+
+Правила те же, что у Game, и берутся из тех же мест: цены —
+core.finance.sale_unit_price в порядке PricingKernel, события — пулы
+сложности и сэмплеры курьера и повозки из core.events, насыщение —
+пороги и затухание конфигурации, прогрессия — config.progression,
+новые города — константы core.world. События в пути разыгрываются при
+отправке одним броском за рейс (как preroll_travel_event): распределение
+итогового события то же, что при броске раз в цикл.
+
+Отличия от core.simulation:
+    - случайные числа — один генератор numpy на пакет, а не потоки
+      core.rng.RngService отдельной игры, поэтому совпадают распределения
+      результатов, а не отдельные партии с тем же зерном;
+    - у игры не больше одного каравана в пути (так играют встроенные
+      стратегии: жадная ждёт возвращения каравана).
+
+Запуск:
+    python -m core.batch_simulation --games 100000 --seed 42 --difficulty normal
+"""
+import argparse
+import time
+from models.city import ROME_CITY_ID
+from models.courier import Courier
+from models.wagon import Wagon
+from core.caravan import BANDIT_LOSS_RANGE, ILLNESS_COST_RANGE, WAGON_REPAIR_COST_RANGE
+from core.config import DEFAULT_DURABILITY, RuntimeConfig
+from core.events import get_difficulty_sampler, get_travel_sampler, trip_event_distribution
+from core.finance import MIN_PRICE_MODIFIER, ROME_PRICE_RATIO, calculate_trip_expenses, saturation_modifier
+from core.goods import load_goods
+from core.market import MIN_SALES
+from core.pricing import NUMPY_AVAILABLE, PricingKernel, np
+from core.progression import UNLOCK_CITIES, UNLOCK_COURIER, UNLOCK_WAGON, unlock_kind, unlocked_city_count
+from core.rng import derive_seed
+from core.simulation import BALANCE_BUCKET, BatchSummary, print_summary
+from core.world import (
+    CITY_DURATIONS,
+    DEFAULT_CITY_COUNT,
+    DEMAND_SHIFTED_GOODS,
+    HIGH_DEMAND,
+    LOW_DEMAND,
+    load_balance_config
+)
+
+# Игр в одном пакете: больше — меньше накладных расходов Python на цикл, но больше памяти
+BATCH_SIZE = 4096
+
+
+class BatchRules:
+    """
+    Правила игры, переведённые в массивы (общие для всех пакетов одной конфигурации).
+
+    Атрибуты:
+        base_prices (np.ndarray): Базовые цены товаров, форма (G,).
+        event_mods (np.ndarray): Модификаторы событий минус 1, форма (K + 1, G).
+        city_event_ids (np.ndarray): ID городских событий пула сложности.
+        city_event_cdf (np.ndarray): Накопленные вероятности городских событий.
+        saturation_table (np.ndarray): Множитель цены по целой части счётчика продаж.
+        trip_expenses (np.ndarray): Расходы на поездку по числу дней.
+        trip_risk (np.ndarray): Риск рейса (как Game.trip_risk) по длительности.
+        courier_keys (List[float]): Типы курьеров (illness_resistance) по возрастанию.
+        wagon_types (List[Tuple[int, float]]): Типы повозок (вместимость, durability) по возрастанию.
+        travel_ids (np.ndarray): События в пути, кроме «ничего не произошло».
+        travel_quiet (np.ndarray): Вероятность «ничего не произошло» за бросок, форма (Kc, Kw).
+        travel_cdf (np.ndarray): Накопленное условное распределение остальных событий, форма (Kc, Kw, E).
+        levels (List[Tuple[int, List[int], List[int], int]]): Пороги прогрессии:
+            (порог, открываемые типы курьеров, типы повозок, число городов).
+        city_slots (int): Наибольшее число городов в игре (мир и все открытия).
+    """
+
+    def __init__(self, config: RuntimeConfig, difficulty: str = "normal"):
+        """
+        Args:
+            config (RuntimeConfig): Конфигурация (уже с применённой сложностью).
+            difficulty (str): Уровень сложности (пулы событий).
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Для пакетной симуляции требуется numpy: pip install numpy")
+
+        registry = config.registry
+        self.config = config
+        self.registry = registry
+        kernel = PricingKernel(load_goods(config), [], config, registry)
+        self.base_prices = kernel.base_prices
+        self.base_prices_int = kernel.base_prices_int
+        self.event_mods = kernel.event_mods
+        self.good_count = len(self.base_prices)
+        self.no_event = kernel.event_id(None)
+
+        sampler = get_difficulty_sampler(config, "city_events", difficulty, registry)
+        self.city_event_ids = np.array(sampler.ids, dtype=np.intp)
+        self.city_event_cdf = np.cumsum(sampler.probabilities)
+
+        top = max((int(threshold) for threshold, _ in config.saturation_levels), default=0)
+        self.saturation_table = np.array([saturation_modifier(sales, config) for sales in range(top + 1)])
+        self.saturation_top = top
+
+        longest = max(CITY_DURATIONS)
+        self.trip_expenses = np.array(
+            [calculate_trip_expenses(days, config) for days in range(longest * 2 + 2)], dtype=np.int64
+        )
+        self.trip_risk = np.zeros(longest + 1)
+        harmful = (registry.bandits, registry.wagon_breakdown, registry.courier_illness, registry.courier_death)
+        for duration in range(longest + 1):
+            distribution = trip_event_distribution(config, registry, duration, difficulty)
+            self.trip_risk[duration] = sum(distribution.get(event_id, 0.0) for event_id in harmful)
+
+        # Флот: все типы курьеров и повозок, которые могут появиться за игру
+        multiplier = config.illness_resistance_multiplier
+        couriers = {float(data.get("illness_resistance", 1.0)): data for data in config.starting_couriers}
+        wagons = {
+            (int(data["capacity"]), float(data.get("durability", DEFAULT_DURABILITY))): data
+            for data in config.starting_wagons
+        }
+        self.levels = []
+        extra_cities = 0
+        for threshold, unlocks in config.progression:
+            level_couriers, level_wagons, level_cities = [], [], 0
+            for name in unlocks:
+                kind = unlock_kind(name, config)
+                if kind == UNLOCK_COURIER:
+                    data = config.couriers[name]
+                    key = float(data.get("illness_resistance", 1.0)) / multiplier
+                    couriers.setdefault(key, data)
+                    level_couriers.append(key)
+                elif kind == UNLOCK_WAGON:
+                    data = config.wagons[name]
+                    key = (int(data["capacity"]), float(data.get("durability", DEFAULT_DURABILITY)))
+                    wagons.setdefault(key, data)
+                    level_wagons.append(key)
+                elif kind == UNLOCK_CITIES:
+                    level_cities += unlocked_city_count(name)
+            extra_cities += level_cities
+            self.levels.append((threshold, level_couriers, level_wagons, level_cities))
+
+        self.courier_keys = sorted(couriers)
+        self.wagon_types = sorted(wagons)
+        self.levels = [
+            (
+                threshold,
+                [self.courier_keys.index(key) for key in level_couriers],
+                [self.wagon_types.index(key) for key in level_wagons],
+                level_cities
+            )
+            for threshold, level_couriers, level_wagons, level_cities in self.levels
+        ]
+        self.starting_couriers = [
+            self.courier_keys.index(float(data.get("illness_resistance", 1.0)))
+            for data in config.starting_couriers
+        ]
+        self.starting_wagons = [
+            self.wagon_types.index((int(data["capacity"]), float(data.get("durability", DEFAULT_DURABILITY))))
+            for data in config.starting_wagons
+        ]
+        self.wagon_capacity = np.array([capacity for capacity, _ in self.wagon_types], dtype=np.int64)
+        self.city_slots = DEFAULT_CITY_COUNT + extra_cities
+
+        # События в пути для каждой пары типов курьера и повозки
+        travel_ids = [
+            event_id for event_id in get_difficulty_sampler(config, "travel_events", difficulty, registry).ids
+            if event_id != registry.nothing
+        ]
+        self.travel_ids = np.array(travel_ids, dtype=np.intp)
+        self.travel_quiet = np.ones((len(self.courier_keys), len(self.wagon_types)))
+        self.travel_cdf = np.ones((len(self.courier_keys), len(self.wagon_types), max(len(travel_ids), 1)))
+        for c, key in enumerate(self.courier_keys):
+            courier = Courier(name="", endurance=0, illness_resistance=key)
+            for w, (capacity, durability) in enumerate(self.wagon_types):
+                wagon = Wagon(name="", capacity=capacity, durability=durability)
+                sampler = get_travel_sampler(config, registry, difficulty, courier, wagon)
+                weights = dict(zip(sampler.ids, sampler.probabilities))
+                self.travel_quiet[c, w] = weights.get(registry.nothing, 0.0)
+                rest = np.array([weights.get(event_id, 0.0) for event_id in travel_ids])
+                if rest.sum() > 0:
+                    self.travel_cdf[c, w, :len(travel_ids)] = np.cumsum(rest / rest.sum())
+                self.travel_cdf[c, w, -1] = 1.0
+
+
+class GameBatch:
+    """
+    Состояние пакета игр, идущих в ногу.
+
+    Атрибуты:
+        size (int): Число игр в пакете.
+        cycle (int): Текущий цикл (общий для пакета).
+        alive (np.ndarray): Игра ещё идёт.
+        balance (np.ndarray): Баланс игрока.
+        final_cycle (np.ndarray): Цикл окончания игры (как GameResult.cycles).
+        caravans (np.ndarray): Число завершённых караванов.
+        city_count (np.ndarray): Число городов в мире игры.
+        duration (np.ndarray): Длительность экспедиции, форма (N, C); Рим — 0.
+        trip_cost (np.ndarray): Расходы на поездку туда и обратно, форма (N, C).
+        trip_rate (np.ndarray): Делитель «за рейс → за цикл» (длительность, для Рима 1), форма (N, C).
+        sellable (np.ndarray): Город есть в мире и в него можно отправить караван, форма (N, C).
+        demand_factors (np.ndarray): 1 + (модификатор спроса - 1), как в PricingKernel, форма (N, C, G).
+        events (np.ndarray): Текущее событие города (строка event_mods), форма (N, C).
+        sales (np.ndarray): Счётчики продаж, делённые на sales_scale, форма (N, C, G).
+        sales_scale (float): decay ** cycle: счётчик в текущем цикле — sales × sales_scale,
+            поэтому затухание не проходит по массиву каждый цикл.
+        couriers, wagons (np.ndarray): Есть ли у игрока тип курьера и повозки, формы (N, Kc), (N, Kw).
+        travelling (np.ndarray): Караван в пути; его поля — в массивах trip_*.
+    """
+
+    def __init__(self, rules: BatchRules, size: int, rng: "np.random.Generator"):
+        """
+        Args:
+            rules (BatchRules): Правила игры.
+            size (int): Число игр.
+            rng (np.random.Generator): Генератор пакета.
+        """
+        self.rules = rules
+        self.rng = rng
+        self.size = size
+        self.cycle = 1
+        config = rules.config
+        goods = rules.good_count
+
+        self.alive = np.ones(size, dtype=bool)
+        self.balance = np.full(size, config.starting_balance, dtype=np.int64)
+        self.final_cycle = np.zeros(size, dtype=np.int64)
+        self.caravans = np.zeros(size, dtype=np.int64)
+
+        slots = rules.city_slots
+        self.city_count = np.zeros(size, dtype=np.int64)
+        self.duration = np.zeros((size, slots), dtype=np.int64)
+        self.trip_cost = np.full((size, slots), rules.trip_expenses[1], dtype=np.int64)
+        self.trip_rate = np.ones((size, slots))
+        self.sellable = np.zeros((size, slots), dtype=bool)
+        self.demand_factors = np.ones((size, slots, goods))
+        self.events = np.full((size, slots), rules.no_event, dtype=np.intp)
+        self.sales = np.zeros((size, slots, goods))
+        self.sales_scale = 1.0
+        # Рим — первый город мира (ROME_CITY_ID), остальные генерируются
+        self.city_count[:] = ROME_CITY_ID + 1
+        self.add_cities(np.arange(size), DEFAULT_CITY_COUNT - 1)
+
+        self.couriers = np.zeros((size, len(rules.courier_keys)), dtype=bool)
+        self.couriers[:, rules.starting_couriers] = True
+        self.wagons = np.zeros((size, len(rules.wagon_types)), dtype=bool)
+        self.wagons[:, rules.starting_wagons] = True
+        # Курьер и повозка, которые у игрока первые в списке (GreedyStrategy берёт wagons[0])
+        self.first_courier = np.full(size, rules.starting_couriers[0] if rules.starting_couriers else -1)
+        self.first_wagon = np.full(size, rules.starting_wagons[0] if rules.starting_wagons else -1)
+        self.reached = np.zeros(size, dtype=np.int64)
+
+        self.travelling = np.zeros(size, dtype=bool)
+        self.trip_city = np.zeros(size, dtype=np.intp)
+        self.trip_good = np.zeros(size, dtype=np.intp)
+        self.trip_quantity = np.zeros(size, dtype=np.int64)
+        self.trip_return = np.zeros(size, dtype=np.int64)
+        self.trip_event = np.zeros(size, dtype=np.intp)
+        self.trip_loss = np.zeros(size)
+        self.trip_extra = np.zeros(size, dtype=np.int64)
+
+        self.check_progression(np.arange(size))
+        self.finish(np.arange(size))
+
+    # Мир
+
+    def add_cities(self, rows: "np.ndarray", count: int) -> None:
+        """
+        Добавляет count новых городов в миры игр rows (как core.world.generate_cities).
+        События им назначаются со следующего цикла.
+        """
+        if not count or not rows.size:
+            return
+        rules = self.rules
+        goods = rules.good_count
+        cells = (rows[:, None], self.city_count[rows][:, None] + np.arange(count))
+        duration = self.rng.choice(CITY_DURATIONS, size=(rows.size, count))
+        self.duration[cells] = duration
+        self.trip_cost[cells] = rules.trip_expenses[duration * 2 + 1]
+        self.trip_rate[cells] = np.maximum(duration, 1)
+        self.sellable[cells] = duration > 0
+        # Случайная перестановка товаров: первые — повышенный спрос, следующие — пониженный
+        order = np.argsort(self.rng.random((rows.size, count, goods)), axis=2)
+        demand = np.ones((rows.size, count, goods))
+        high, low = 1.0 + (HIGH_DEMAND - 1.0), 1.0 + (LOW_DEMAND - 1.0)
+        np.put_along_axis(demand, order[:, :, :DEMAND_SHIFTED_GOODS], high, axis=2)
+        np.put_along_axis(demand, order[:, :, DEMAND_SHIFTED_GOODS:2 * DEMAND_SHIFTED_GOODS], low, axis=2)
+        self.demand_factors[cells] = demand
+        self.events[cells] = rules.no_event
+        self.city_count[rows] += count
+
+    def update_city_events(self) -> None:
+        """Новые события во всех городах (как Game.update_city_events)."""
+        rules = self.rules
+        draws = self.rng.random(self.events.shape)
+        picked = np.searchsorted(rules.city_event_cdf, draws, side="right")
+        np.minimum(picked, len(rules.city_event_ids) - 1, out=picked)
+        self.events = rules.city_event_ids[picked]
+
+    def update_market(self) -> None:
+        """Затухание счётчиков продаж за цикл (как MarketSaturation.advance)."""
+        decay = self.rules.config.saturation_decay
+        if decay > 0:
+            self.sales_scale = decay ** self.cycle
+        else:
+            self.sales[:] = 0.0
+
+    def saturation(self, sales: "np.ndarray") -> "np.ndarray":
+        """Множители цены для хранимых счётчиков продаж (см. sales)."""
+        rules = self.rules
+        current = (sales * self.sales_scale).astype(np.int64)
+        return rules.saturation_table[np.minimum(current, rules.saturation_top)]
+
+    def record_sales(self, rows: "np.ndarray", city: "np.ndarray", good: "np.ndarray") -> None:
+        """+1 к счётчику продаж товара good в городе city (как MarketSaturation.record_sale)."""
+        cells = (rows, city, good)
+        value = self.sales[cells] * self.sales_scale
+        value[value < MIN_SALES] = 0.0
+        self.sales[cells] = (value + 1.0) / self.sales_scale
+
+    def prices(self, rows: "np.ndarray") -> "np.ndarray":
+        """
+        Цены за единицу во всех городах игр rows при текущих событиях, форма (M, C, G).
+        Порядок вычислений как в PricingKernel.price_matrix; цены целые, но в float64.
+        """
+        rules = self.rules
+        modifier = self.demand_factors[rows]
+        modifier += rules.event_mods[self.events[rows]]
+        np.maximum(modifier, MIN_PRICE_MODIFIER, out=modifier)
+        modifier *= rules.base_prices
+        # Продажи были в немногих ячейках: насыщение только для них
+        sales = self.sales[rows]
+        hot = np.nonzero(sales)
+        if hot[0].size:
+            modifier[hot] *= self.saturation(sales[hot])
+        np.floor(modifier, out=modifier)
+        modifier[:, ROME_CITY_ID] = np.floor(rules.base_prices * ROME_PRICE_RATIO)
+        return modifier
+
+    # Флот и караваны
+
+    def _pick(self, owned: "np.ndarray", risk: "np.ndarray") -> "np.ndarray":
+        """
+        Тип актива по риску маршрута среди owned (типы по возрастанию ключа),
+        как core.fleet._pick_by_risk; -1, если подходящих нет.
+        """
+        count = owned.sum(axis=1)
+        target = np.round((1.0 - risk) * np.maximum(count - 1, 0))
+        rank = np.cumsum(owned, axis=1) - 1
+        chosen = np.argmax(owned & (rank == target[:, None]), axis=1)
+        return np.where(count > 0, chosen, -1)
+
+    def dispatch(self, rows: "np.ndarray", city: "np.ndarray", good: "np.ndarray", quantity: "np.ndarray") -> None:
+        """
+        Отправляет караваны: закупка груза, подбор курьера и повозки по риску
+        маршрута (как Game.assign_fleet) и розыгрыш события в пути на весь рейс.
+
+        Args:
+            rows: Игры, форма (M,).
+            city: Город назначения (слот), форма (M,).
+            good: Товар (ID в реестре), форма (M,).
+            quantity: Количество, форма (M,).
+        """
+        if not rows.size:
+            return
+        rules = self.rules
+        rng = self.rng
+        duration = self.duration[rows, city]
+
+        # Риск относительно самого опасного города мира (Game.route_risk)
+        risks = rules.trip_risk[self.duration[rows]]
+        highest = risks.max(axis=1)
+        risk = np.divide(rules.trip_risk[duration], highest, out=np.zeros(rows.size), where=highest > 0)
+
+        courier = self._pick(self.couriers[rows], risk)
+        fits = self.wagons[rows] & (rules.wagon_capacity >= quantity[:, None])
+        smallest = np.where(fits, rules.wagon_capacity, np.iinfo(np.int64).max).min(axis=1)
+        wagon = self._pick(fits & (rules.wagon_capacity == smallest[:, None]), risk)
+        # Диспетчер никого не нашёл: как GreedyStrategy — первые курьер и повозка игрока
+        missing = (courier < 0) | (wagon < 0)
+        courier = np.where(missing, self.first_courier[rows], courier)
+        wagon = np.where(missing, self.first_wagon[rows], wagon)
+
+        # Событие за весь рейс: хоть одно за duration бросков, затем какое (preroll_travel_event)
+        happened = rng.random(rows.size) < 1.0 - rules.travel_quiet[courier, wagon] ** duration
+        cdf = rules.travel_cdf[courier, wagon]
+        picked = np.minimum((cdf <= rng.random(rows.size)[:, None]).sum(axis=1), len(rules.travel_ids) - 1)
+        event = np.where(happened & (duration > 0), rules.travel_ids[picked], rules.registry.nothing)
+
+        self.trip_loss[rows] = rng.uniform(*BANDIT_LOSS_RANGE, size=rows.size)
+        repair = rng.integers(WAGON_REPAIR_COST_RANGE[0], WAGON_REPAIR_COST_RANGE[1] + 1, size=rows.size)
+        illness = rng.integers(ILLNESS_COST_RANGE[0], ILLNESS_COST_RANGE[1] + 1, size=rows.size)
+        registry = rules.registry
+        self.trip_extra[rows] = np.where(
+            event == registry.wagon_breakdown, repair, np.where(event == registry.courier_illness, illness, 0)
+        )
+
+        self.balance[rows] -= rules.base_prices_int[good] * quantity
+        self.travelling[rows] = True
+        self.trip_city[rows] = city
+        self.trip_good[rows] = good
+        self.trip_quantity[rows] = quantity
+        self.trip_return[rows] = self.cycle + duration
+        self.trip_event[rows] = event
+
+    def update_caravans(self) -> None:
+        """Завершает караваны, вернувшиеся к текущему циклу (как process_completed_caravan)."""
+        rules = self.rules
+        registry = rules.registry
+        rows = np.flatnonzero(self.alive & self.travelling & (self.trip_return <= self.cycle))
+        if not rows.size:
+            return
+        city = self.trip_city[rows]
+        good = self.trip_good[rows]
+        event = self.trip_event[rows]
+        duration = self.duration[rows, city]
+        rome = duration == 0
+        dead = event == registry.courier_death
+
+        quantity = self.trip_quantity[rows]
+        bandits = event == registry.bandits
+        quantity = np.where(bandits, np.floor(quantity * (1 - self.trip_loss[rows])).astype(np.int64), quantity)
+
+        base = rules.base_prices[good]
+        modifier = np.maximum(
+            MIN_PRICE_MODIFIER,
+            self.demand_factors[rows, city, good] + rules.event_mods[self.events[rows, city], good]
+        )
+        price = np.floor(base * modifier * self.saturation(self.sales[rows, city, good]))
+        price = np.where(rome, np.floor(base * ROME_PRICE_RATIO), price).astype(np.int64)
+
+        sold = ~dead & ~rome & (quantity > 0)
+        self.record_sales(rows[sold], city[sold], good[sold])
+
+        expenses = self.trip_cost[rows, city] + self.trip_extra[rows]
+        self.balance[rows] += np.where(dead, 0, price * quantity - expenses)
+        self.caravans[rows] += 1
+        self.travelling[rows] = False
+        self.check_progression(rows)
+
+    def check_progression(self, rows: "np.ndarray") -> None:
+        """Применяет открытия порогов, достигнутых играми rows (как Game.check_progression)."""
+        # Уровни по порядку: игра за один раз может пройти несколько порогов
+        for level, (threshold, couriers, wagons, cities) in enumerate(self.rules.levels):
+            opened = rows[(self.reached[rows] == level) & (self.balance[rows] >= threshold)]
+            if not opened.size:
+                continue
+            for courier in couriers:
+                self.first_courier[opened] = np.where(self.couriers[opened].any(axis=1), self.first_courier[opened], courier)
+                self.couriers[opened, courier] = True
+            for wagon in wagons:
+                self.first_wagon[opened] = np.where(self.wagons[opened].any(axis=1), self.first_wagon[opened], wagon)
+                self.wagons[opened, wagon] = True
+            self.add_cities(opened, cities)
+            self.reached[opened] = level + 1
+
+    def finish(self, rows: "np.ndarray") -> None:
+        """Отмечает окончание игр rows, для которых выполнено Game.is_game_over."""
+        config = self.rules.config
+        over = rows[self.alive[rows] & (
+            (self.cycle > config.cycles_to_win) | (self.balance[rows] >= config.victory_goal)
+        )]
+        self.alive[over] = False
+        self.final_cycle[over] = self.cycle
+
+    def next_cycle(self) -> None:
+        """Переход к следующему циклу (как Game.next_cycle)."""
+        self.cycle += 1
+        self.update_city_events()
+        self.update_market()
+
+
+class BatchStrategy:
+    """
+    Стратегия для пакета игр: решает за все идущие игры сразу.
+    Наследники переопределяют play_cycle.
+    """
+
+    def play_cycle(self, batch: GameBatch) -> None:
+        """
+        Выполняет действия игроков перед переходом к следующему циклу.
+
+        Args:
+            batch (GameBatch): Пакет игр.
+        """
+        pass
+
+
+class BatchIdleStrategy(BatchStrategy):
+    """Ничего не делает (пакетный аналог IdleStrategy)."""
+
+
+class BatchGreedyStrategy(BatchStrategy):
+    """
+    Пакетный аналог GreedyStrategy: игры без каравана в пути закупают
+    товар с лучшей прибылью за цикл по текущим ценам и везут его в лучший город.
+    """
+
+    def play_cycle(self, batch: GameBatch) -> None:
+        rules = batch.rules
+        ready = (batch.first_wagon >= 0) & batch.couriers.any(axis=1)
+        rows = np.flatnonzero(batch.alive & ~batch.travelling & ready)
+        if not rows.size:
+            return
+
+        base = rules.base_prices_int
+        capacity = rules.wagon_capacity[batch.first_wagon[rows]]
+        quantity = np.minimum(capacity[:, None], np.maximum(batch.balance[rows][:, None] // base, 0))
+        affordable = quantity.any(axis=1)
+        rows, quantity = rows[affordable], quantity[affordable]
+        if not rows.size:
+            return
+
+        # Прибыль за цикл, на месте в матрице цен: (цена - база) × количество - расходы, / длительность
+        rate = batch.prices(rows)
+        rate -= base
+        rate *= quantity[:, None, :]
+        rate -= batch.trip_cost[rows][:, :, None]
+        rate /= batch.trip_rate[rows][:, :, None]
+        rate[~batch.sellable[rows]] = -np.inf
+
+        flat = rate.reshape(rows.size, -1)
+        best = np.argmax(flat, axis=1)
+        chosen = flat[np.arange(rows.size), best] > 0
+        rows, best, quantity = rows[chosen], best[chosen], quantity[chosen]
+        city, good = np.divmod(best, rules.good_count)
+        batch.dispatch(rows, city, good, quantity[np.arange(rows.size), good])
+
+
+BATCH_STRATEGIES = {
+    "idle": BatchIdleStrategy,
+    "greedy": BatchGreedyStrategy,
+}
+
+
+def play_batch(rules: BatchRules, strategy: BatchStrategy, size: int, rng: "np.random.Generator") -> GameBatch:
+    """
+    Проигрывает пакет игр до конца.
+
+    Args:
+        rules (BatchRules): Правила игры.
+        strategy (BatchStrategy): Стратегия.
+        size (int): Число игр.
+        rng (np.random.Generator): Генератор пакета.
+
+    Returns:
+        GameBatch: Итоговое состояние (баланс, цикл окончания, число караванов).
+    """
+    batch = GameBatch(rules, size, rng)
+    while batch.alive.any():
+        strategy.play_cycle(batch)
+        batch.next_cycle()
+        batch.update_caravans()
+        batch.finish(np.flatnonzero(batch.alive))
+    return batch
+
+
+def summarize(batch: GameBatch, summary: BatchSummary) -> None:
+    """Добавляет итоги пакета в сводку (как BatchSummary.add для каждой игры)."""
+    goal = batch.rules.config.victory_goal
+    balance = batch.balance
+    won = balance >= goal
+    summary.games += batch.size
+    summary.wins += int(won.sum())
+    summary.balance_sum += int(balance.sum())
+    buckets, counts = np.unique(balance // BALANCE_BUCKET * BALANCE_BUCKET, return_counts=True)
+    for bucket, count in zip(buckets.tolist(), counts.tolist()):
+        summary.balance_histogram[bucket] = summary.balance_histogram.get(bucket, 0) + count
+    cycles, counts = np.unique(batch.final_cycle[won], return_counts=True)
+    for cycle, count in zip(cycles.tolist(), counts.tolist()):
+        summary.cycles_to_win[cycle] = summary.cycles_to_win.get(cycle, 0) + count
+    low, high = int(balance.min()), int(balance.max())
+    if summary.min_balance is None or low < summary.min_balance:
+        summary.min_balance = low
+    if summary.max_balance is None or high > summary.max_balance:
+        summary.max_balance = high
+
+
+def run_batch_fast(
+        config: RuntimeConfig,
+        strategy: BatchStrategy,
+        games: int,
+        seed: int = 0,
+        difficulty: str = "normal",
+        batch_size: int = BATCH_SIZE
+) -> BatchSummary:
+    """
+    Проигрывает серию игр пакетами по batch_size.
+
+    Args:
+        config (RuntimeConfig): Конфигурация (уже с применённой сложностью).
+        strategy (BatchStrategy): Стратегия (см. BATCH_STRATEGIES).
+        games (int): Количество игр.
+        seed (int): Зерно серии; одно зерно и размер пакета воспроизводят серию целиком.
+        difficulty (str): Уровень сложности.
+        batch_size (int): Игр в одном пакете.
+
+    Returns:
+        BatchSummary: Агрегированные результаты.
+    """
+    summary = BatchSummary()
+    started = time.perf_counter()
+    rules = BatchRules(config, difficulty)
+    rng = np.random.default_rng(derive_seed(seed, "batch"))
+    for start in range(0, games, batch_size):
+        summarize(play_batch(rules, strategy, min(batch_size, games - start), rng), summary)
+    summary.elapsed = time.perf_counter() - started
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Пакетная симуляция Торгового Дома на numpy")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", choices=["easy", "normal", "hard"], default="normal")
+    parser.add_argument("--strategy", choices=sorted(BATCH_STRATEGIES), default="greedy")
+    parser.add_argument("--config", default="data/balance_config.json")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    config = load_balance_config(path=args.config, difficulty=args.difficulty)
+    summary = run_batch_fast(
+        config, BATCH_STRATEGIES[args.strategy](), args.games, args.seed, args.difficulty, args.batch_size
+    )
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
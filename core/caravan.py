@@ -3,58 +3,139 @@ from typing import Tuple, Dict, Optional
 from models.caravan import Caravan
 from models.player import Player
 from models.goods_item import GoodsItem
-from core.events import choose_travel_event
+from core.config import RuntimeConfig
+from core.events import choose_travel_event_id, preroll_travel_event
 from core.finance import calculate_trip_expenses, calculate_sale_profit, generate_report
+from core.market import MarketSaturation
+from core.pricing import PricingKernel
+from core.registry import Registry, get_registry
+
+# Доля груза, теряемая при набеге разбойников (равномерно в диапазоне)
+BANDIT_LOSS_RANGE = (0.3, 0.5)
+# Доплаты (целые, включительно) при поломке повозки и болезни курьера
+WAGON_REPAIR_COST_RANGE = (10, 20)
+ILLNESS_COST_RANGE = (5, 10)
+
+
 def update_caravan_event_once(
     caravan: Caravan,
     current_cycle: int,
-    config: dict,
-    difficulty: str
+    config: RuntimeConfig,
+    difficulty: str,
+    registry: Optional[Registry] = None,
+    rng: random.Random = random
 ) -> Optional[str]:
-    """Генерирует событие для каравана."""
+    """Генерирует событие для каравана с учётом его курьера и повозки."""
     if caravan.event_occurred or caravan.is_rome_expedition():
         return None  # Пропускаем для Рима
 
     if caravan.departure_cycle <= current_cycle <= caravan.return_cycle:
-        event = choose_travel_event(config, difficulty)
-        if event != "Ничего не произошло":
-            caravan.event_occurred = event
-            return event
+        registry = registry or get_registry(config)
+        event_id = choose_travel_event_id(
+            config, registry, difficulty, rng, caravan.courier, caravan.wagon
+        )
+        if event_id != registry.nothing:
+            caravan.event_id = event_id
+            caravan.event_occurred = registry.events[event_id]
+            return caravan.event_occurred
     return None
 
 
+def preroll_caravan_event(
+    caravan: Caravan,
+    config: RuntimeConfig,
+    difficulty: str,
+    registry: Optional[Registry] = None,
+    rng: random.Random = random
+) -> Optional[int]:
+    """
+    Разыгрывает событие в пути сразу при отправке каравана.
+    Караван бросает событие раз в цикл с цикла после отправки до цикла возвращения.
+
+    Returns:
+        Optional[int]: Цикл, в котором наступит событие, или None.
+    """
+    if caravan.event_occurred or caravan.is_rome_expedition():
+        return None
+
+    registry = registry or get_registry(config)
+    rolls = caravan.return_cycle - caravan.departure_cycle
+    outcome = preroll_travel_event(
+        config, registry, rolls, difficulty, rng, caravan.courier, caravan.wagon
+    )
+    if outcome is None:
+        return None
+
+    roll, event_id = outcome
+    caravan.scheduled_event_id = event_id
+    caravan.scheduled_event_cycle = caravan.departure_cycle + roll
+    return caravan.scheduled_event_cycle
+
+
+def apply_scheduled_event(caravan: Caravan, current_cycle: int, registry: Registry) -> Optional[str]:
+    """Применяет заранее разыгранное событие, если его цикл наступил."""
+    if caravan.event_occurred or caravan.scheduled_event_id is None:
+        return None
+    if current_cycle < caravan.scheduled_event_cycle:
+        return None
+    caravan.event_id = caravan.scheduled_event_id
+    caravan.event_occurred = registry.events[caravan.event_id]
+    return caravan.event_occurred
+
+
 
 def process_completed_caravan(
     caravan: Caravan,
     player: Player,
     current_cycle: int,
     goods_dict: Dict[str, GoodsItem],
-    config: dict
+    config: RuntimeConfig,
+    registry: Optional[Registry] = None,
+    rng: random.Random = random,
+    market: Optional[MarketSaturation] = None,
+    kernel: Optional[PricingKernel] = None
 ) -> Tuple[Dict, bool]:
-    """Обрабатывает завершённый караван."""
+    """
+    Обрабатывает завершённый караван.
+
+    Args:
+        market (Optional[MarketSaturation]): Насыщение рынка: снижает цены продажи
+            и учитывает проданный груз (кроме Рима).
+        kernel (Optional[PricingKernel]): Ядро цен: выручка считается по его матрицам.
+    """
     if current_cycle < caravan.return_cycle:
         return {}, False
 
+    registry = registry or get_registry(config)
+
     # Специальная обработка для Рима
     if caravan.is_rome_expedition():
         total_days = 0
-        event = "Продажа в Риме"
+        event_id = registry.rome_sale
+    elif caravan.event_id is not None:
+        total_days = caravan.days_to_travel
+        event_id = caravan.event_id
+    elif caravan.event_occurred:
+        # Событие задано по названию (например, караван создан вне ядра)
+        total_days = caravan.days_to_travel
+        event_id = registry.intern_event(caravan.event_occurred)
     else:
         total_days = caravan.days_to_travel
-        event = caravan.event_occurred or "Ничего не произошло"
+        event_id = registry.nothing
+    event = registry.events[event_id]
     loss_ratio = 0.0
     extra_cost = 0
 
 
 
     # === Обработка события ===
-    if event == "Набег разбойников":
-        loss_ratio = random.uniform(0.3, 0.5)
-    elif event == "Поломка повозки":
-        extra_cost += random.randint(10, 20)
-    elif event == "Болезнь курьера":
-        extra_cost += random.randint(5, 10)
-    elif event == "Смерть курьера":
+    if event_id == registry.bandits:
+        loss_ratio = rng.uniform(*BANDIT_LOSS_RANGE)
+    elif event_id == registry.wagon_breakdown:
+        extra_cost += rng.randint(*WAGON_REPAIR_COST_RANGE)
+    elif event_id == registry.courier_illness:
+        extra_cost += rng.randint(*ILLNESS_COST_RANGE)
+    elif event_id == registry.courier_death:
         caravan.goods = {}
         report = generate_report(
             profit=0,
@@ -77,8 +158,12 @@ def process_completed_caravan(
     profit, sale_breakdown = calculate_sale_profit(
         caravan=caravan,
         goods=goods_dict,
-        config=config
+        config=config,
+        market=market,
+        kernel=kernel
     )
+    if market is not None and not caravan.is_rome_expedition():
+        market.record_sale(caravan.destination.city_id, caravan.goods)
 
     # === Расходы ===
     total_days = caravan.days_to_travel * 2 + 1
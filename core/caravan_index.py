@@ -0,0 +1,181 @@
+"""
+Индексы активных караванов: по городу назначения, по фазе рейса и по циклу отправки.
+
+Интерфейсу для каждой строки города нужно знать, какие караваны идут
+туда, в какой они фазе и не отправлен ли караван в этом цикле. Кроме
+трёх основных индексов хранятся составные (город, фаза) и (город, цикл
+отправки), поэтому эти вопросы решаются за O(1) на город, а обзор
+городов — за O(городов), без перебора всех караванов.
+
+Фаза каравана меняется со временем, поэтому переходы (прибытие в город,
+наступление цикла возвращения) стоят в TimingWheel, и при смене цикла
+пересчитываются только караваны, у которых переход наступил.
+"""
+from typing import Dict, Hashable, Iterable, List, Optional
+from models.caravan import Caravan
+from core.timing_wheel import TimingWheel
+
+# Фазы рейса
+PHASE_OUTBOUND = "outbound"  # В пути к городу: цикл < arrival_cycle
+PHASE_IN_CITY = "in_city"  # В городе: arrival_cycle <= цикл < return_cycle
+PHASE_RETURNING = "returning"  # Цикл возвращения наступил, караван ещё не завершён
+PHASES = (PHASE_OUTBOUND, PHASE_IN_CITY, PHASE_RETURNING)
+
+
+def caravan_phase(caravan: Caravan, cycle: int) -> str:
+    """
+    Фаза рейса каравана в цикле cycle.
+
+    Args:
+        caravan (Caravan): Караван.
+        cycle (int): Цикл.
+
+    Returns:
+        str: PHASE_OUTBOUND, PHASE_IN_CITY или PHASE_RETURNING.
+    """
+    if cycle < caravan.arrival_cycle:
+        return PHASE_OUTBOUND
+    if cycle < caravan.return_cycle:
+        return PHASE_IN_CITY
+    return PHASE_RETURNING
+
+
+def _put(index: Dict, value: Hashable, caravan: Caravan) -> None:
+    index.setdefault(value, {})[id(caravan)] = caravan
+
+
+def _discard(index: Dict, value: Hashable, caravan: Caravan) -> None:
+    bucket = index[value]
+    del bucket[id(caravan)]
+    if not bucket:
+        del index[value]
+
+
+class CaravanIndex:
+    """
+    Индексы активных караванов. Внутри каждого ключа караваны лежат
+    в порядке добавления (словарь id → караван: удаление за O(1)).
+
+    Атрибуты:
+        by_destination (Dict[int, Dict[int, Caravan]]): ID города назначения → караваны.
+        by_phase (Dict[str, Dict[int, Caravan]]): Фаза рейса → караваны.
+        by_departure (Dict[int, Dict[int, Caravan]]): Цикл отправки → караваны.
+        cycle (int): Цикл, для которого рассчитаны фазы.
+    """
+
+    def __init__(self):
+        self.by_destination: Dict[int, Dict[int, Caravan]] = {}
+        self.by_phase: Dict[str, Dict[int, Caravan]] = {phase: {} for phase in PHASES}
+        self.by_departure: Dict[int, Dict[int, Caravan]] = {}
+        self.cycle = 0
+        self._phase_of: Dict[int, str] = {}
+        # Составные индексы: (город, фаза) и (город, цикл отправки)
+        self._city_phase: Dict[tuple, Dict[int, Caravan]] = {}
+        self._city_departure: Dict[tuple, Dict[int, Caravan]] = {}
+        self._transitions: TimingWheel[Caravan] = TimingWheel()
+
+    def __len__(self) -> int:
+        return len(self._phase_of)
+
+    def __contains__(self, caravan: Caravan) -> bool:
+        return id(caravan) in self._phase_of
+
+    def add(self, caravan: Caravan, cycle: int) -> None:
+        """
+        Добавляет караван в индексы.
+
+        Args:
+            caravan (Caravan): Отправленный караван.
+            cycle (int): Текущий цикл.
+        """
+        if id(caravan) in self._phase_of:
+            return
+        self.cycle = cycle
+        city_id = caravan.destination.city_id
+        _put(self.by_destination, city_id, caravan)
+        _put(self.by_departure, caravan.departure_cycle, caravan)
+        _put(self._city_departure, (city_id, caravan.departure_cycle), caravan)
+        self._set_phase(caravan, caravan_phase(caravan, cycle))
+
+    def remove(self, caravan: Caravan) -> None:
+        """Убирает караван из индексов (например, после завершения рейса)."""
+        phase = self._phase_of.pop(id(caravan), None)
+        if phase is None:
+            return
+        city_id = caravan.destination.city_id
+        del self.by_phase[phase][id(caravan)]
+        _discard(self._city_phase, (city_id, phase), caravan)
+        _discard(self.by_destination, city_id, caravan)
+        _discard(self.by_departure, caravan.departure_cycle, caravan)
+        _discard(self._city_departure, (city_id, caravan.departure_cycle), caravan)
+        # Запланированный переход останется в расписании и будет пропущен в advance
+
+    def advance(self, cycle: int) -> None:
+        """
+        Пересчитывает фазы караванов, у которых к циклу cycle наступил переход.
+
+        Args:
+            cycle (int): Новый текущий цикл.
+        """
+        self.cycle = cycle
+        for caravan in self._transitions.pop_due(cycle):
+            if id(caravan) in self._phase_of:
+                self._set_phase(caravan, caravan_phase(caravan, cycle))
+
+    def rebuild(self, caravans: Iterable[Caravan], cycle: int) -> None:
+        """
+        Пересобирает индексы по активным караванам (например, после загрузки).
+
+        Args:
+            caravans (Iterable[Caravan]): Активные караваны.
+            cycle (int): Текущий цикл.
+        """
+        self.__init__()
+        for caravan in caravans:
+            if not caravan.resolved:
+                self.add(caravan, cycle)
+
+    def _set_phase(self, caravan: Caravan, phase: str) -> None:
+        key = id(caravan)
+        city_id = caravan.destination.city_id
+        old = self._phase_of.get(key)
+        if old is not None:
+            del self.by_phase[old][key]
+            _discard(self._city_phase, (city_id, old), caravan)
+        self._phase_of[key] = phase
+        self.by_phase[phase][key] = caravan
+        _put(self._city_phase, (city_id, phase), caravan)
+        if phase == PHASE_OUTBOUND:
+            self._transitions.schedule(caravan.arrival_cycle, caravan)
+        elif phase == PHASE_IN_CITY:
+            self._transitions.schedule(caravan.return_cycle, caravan)
+
+    def phase_of(self, caravan: Caravan) -> str:
+        """Фаза рейса каравана из индекса."""
+        return self._phase_of[id(caravan)]
+
+    def to_city(self, city_id: int) -> List[Caravan]:
+        """Активные караваны в город в порядке отправки."""
+        return list(self.by_destination.get(city_id, {}).values())
+
+    def departed_in(self, cycle: int) -> List[Caravan]:
+        """Караваны, отправленные в цикле cycle и ещё не завершённые."""
+        return list(self.by_departure.get(cycle, {}).values())
+
+    def in_phase(self, phase: str) -> List[Caravan]:
+        """Караваны в фазе рейса phase."""
+        return list(self.by_phase[phase].values())
+
+    def has_city(self, city_id: int) -> bool:
+        """Есть ли активные караваны в город (O(1))."""
+        return city_id in self.by_destination
+
+    def first_to_city(self, city_id: int, phase: str) -> Optional[Caravan]:
+        """Первый караван в город в фазе phase или None (O(1))."""
+        bucket = self._city_phase.get((city_id, phase))
+        return next(iter(bucket.values())) if bucket else None
+
+    def departed_to_city(self, city_id: int, cycle: int) -> Optional[Caravan]:
+        """Первый караван в город, отправленный в цикле cycle, или None (O(1))."""
+        bucket = self._city_departure.get((city_id, cycle))
+        return next(iter(bucket.values())) if bucket else None
@@ -0,0 +1,174 @@
+"""
+Колоночное хранилище активных караванов.
+
+Поля караванов, которые нужны ядру при завершении рейса и интерфейсу
+для фильтрации, хранятся в типизированных массивах (struct-of-arrays):
+город назначения, цикл возвращения и груз построчно по ID товара.
+Поэтому закупочная стоимость груза и проверка «караван ещё в пути»
+не трогают объекты Caravan и словари груза.
+
+Завершённые караваны не удаляются из массивов сразу: строка помечается
+пустой, а массивы уплотняются одним проходом, когда пустых строк
+становится больше, чем занятых. Поэтому завершение каравана стоит
+амортизированно O(1), а порядок отправки остальных сохраняется.
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from models.caravan import Caravan
+from core.registry import Registry
+
+# Меньше пустых строк не уплотняются: проход не окупится
+MIN_COMPACT_ROWS = 32
+
+
+class CaravanStore:
+    """
+    Активные караваны игры.
+
+    Поддерживает итерацию, len и проверку «in», поэтому интерфейсы
+    работают с ним как со списком караванов.
+
+    Атрибуты:
+        caravans (List[Optional[Caravan]]): Объекты караванов по строкам
+            (None — строка завершённого каравана до уплотнения).
+        return_cycle (array): Цикл возвращения.
+        destination (array): ID города назначения.
+        cargo (array): Груз построчно, по goods_count ячеек на караван (индекс — ID товара).
+        goods_count (int): Количество товаров в реестре.
+    """
+
+    def __init__(self, registry: Registry):
+        """
+        Args:
+            registry (Registry): Реестр ID товаров.
+        """
+        self.registry = registry
+        self.goods_count = len(registry.goods)
+        self.caravans: List[Optional[Caravan]] = []
+        self.return_cycle = array("q")
+        self.destination = array("q")
+        self.cargo = array("q")
+        self._rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __bool__(self) -> bool:
+        return bool(self._rows)
+
+    def __iter__(self) -> Iterator[Caravan]:
+        return (caravan for caravan in self.caravans if caravan is not None)
+
+    def __contains__(self, caravan: Caravan) -> bool:
+        return id(caravan) in self._rows
+
+    def append(self, caravan: Caravan) -> int:
+        """
+        Добавляет караван.
+
+        Args:
+            caravan (Caravan): Караван.
+
+        Returns:
+            int: Номер строки каравана (действителен до следующего retire).
+        """
+        row = len(self.caravans)
+        self.caravans.append(caravan)
+        self.return_cycle.append(caravan.return_cycle)
+        self.destination.append(caravan.destination.city_id)
+        self.cargo.extend(self._cargo_vector(caravan.goods))
+        self._rows[id(caravan)] = row
+        return row
+
+    def extend(self, caravans: Iterable[Caravan]) -> None:
+        """
+        Добавляет сразу несколько караванов.
+
+        Args:
+            caravans (Iterable[Caravan]): Караваны.
+        """
+        for caravan in caravans:
+            self.append(caravan)
+
+    def row_of(self, caravan: Caravan) -> Optional[int]:
+        """Номер строки каравана или None, если его нет в хранилище."""
+        return self._rows.get(id(caravan))
+
+    def cargo_cost(self, row: int, prices: Sequence[int]) -> int:
+        """
+        Стоимость груза строки.
+
+        Args:
+            row (int): Номер строки.
+            prices (Sequence[int]): Цены по ID товара (например, config.base_prices).
+
+        Returns:
+            int: Стоимость груза.
+        """
+        start = row * self.goods_count
+        cargo = self.cargo
+        return sum(cargo[start + good_id] * price for good_id, price in enumerate(prices[:self.goods_count]))
+
+    def travelling(self, cycle: int) -> List[Caravan]:
+        """
+        Караваны, которые к циклу cycle ещё не вернулись, в порядке отправки.
+
+        Args:
+            cycle (int): Текущий цикл.
+        """
+        caravans = self.caravans
+        return [
+            caravans[row] for row, returns in enumerate(self.return_cycle)
+            if cycle < returns and caravans[row] is not None
+        ]
+
+    def retire(self, rows: Iterable[int]) -> List[Caravan]:
+        """
+        Убирает несколько караванов с сохранением порядка остальных.
+
+        Args:
+            rows (Iterable[int]): Номера строк.
+
+        Returns:
+            List[Caravan]: Убранные караваны.
+        """
+        retired = []
+        for row in rows:
+            caravan = self.caravans[row]
+            if caravan is not None:
+                self.caravans[row] = None
+                del self._rows[id(caravan)]
+                retired.append(caravan)
+
+        empty = len(self.caravans) - len(self._rows)
+        if empty >= MIN_COMPACT_ROWS and empty > len(self._rows):
+            self._compact()
+        return retired
+
+    def remove(self, caravan: Caravan) -> None:
+        """Убирает один караван (совместимость со списком)."""
+        row = self._rows.get(id(caravan))
+        if row is None:
+            raise ValueError("Караван отсутствует в хранилище")
+        self.retire([row])
+
+    def _compact(self) -> None:
+        """Удаляет пустые строки одним проходом."""
+        keep = [row for row, caravan in enumerate(self.caravans) if caravan is not None]
+        width = self.goods_count
+        self.caravans = [self.caravans[row] for row in keep]
+        self.return_cycle = array("q", (self.return_cycle[row] for row in keep))
+        self.destination = array("q", (self.destination[row] for row in keep))
+        cargo = array("q")
+        for row in keep:
+            cargo.extend(self.cargo[row * width:(row + 1) * width])
+        self.cargo = cargo
+        self._rows = {id(caravan): row for row, caravan in enumerate(self.caravans)}
+
+    def _cargo_vector(self, goods: Dict[str, int]) -> array:
+        vector = array("q", bytes(8 * self.goods_count))
+        for name, quantity in goods.items():
+            good_id = self.registry.good_ids.get(name)
+            if good_id is not None and good_id < self.goods_count:
+                vector[good_id] += quantity
+        return vector
@@ -0,0 +1,186 @@
+"""
+Подбор груза для каравана (автозагрузка повозки).
+
+Каждая единица товара занимает одно место в повозке, а её ожидаемая
+выручка в выбранном городе не зависит от количества: цена определяется
+спросом города, распределением событий в цикле продажи и насыщением рынка.
+Поэтому задача ограниченного рюкзака решается жадно — единицы с наибольшей
+ожидаемой ценой загружаются первыми, и такое решение оптимально.
+Итог плана оценивается точно (core.expectation).
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from models.city import City
+from models.courier import Courier
+from models.goods_item import GoodsItem
+from models.wagon import Wagon
+from core.caravan import BANDIT_LOSS_RANGE, ILLNESS_COST_RANGE, WAGON_REPAIR_COST_RANGE
+from core.config import RuntimeConfig
+from core.events import trip_event_distribution
+from core.expectation import estimate_outcome, expected_unit_prices
+from core.finance import calculate_trip_expenses, saturation_modifier
+from core.registry import Registry, get_registry
+
+# Средняя доля груза, теряемая при набеге разбойников
+BANDIT_MEAN_LOSS = sum(BANDIT_LOSS_RANGE) / 2
+# Средние доплаты при поломке повозки и болезни курьера
+WAGON_REPAIR_MEAN = sum(WAGON_REPAIR_COST_RANGE) / 2
+ILLNESS_COST_MEAN = sum(ILLNESS_COST_RANGE) / 2
+
+
+@dataclass
+class CargoPlan:
+    """
+    План загрузки каравана.
+
+    Атрибуты:
+        goods (Dict[str, int]): Товар → количество.
+        revenue (float): Ожидаемая выручка, если в пути ничего не случится.
+        expenses (int): Расходы на поездку.
+        expected_net (float): Ожидаемый чистый доход с учётом событий в пути.
+        net_std (float): Стандартное отклонение чистого дохода.
+    """
+    goods: Dict[str, int] = field(default_factory=dict)
+    revenue: float = 0.0
+    expenses: int = 0
+    expected_net: float = 0.0
+    net_std: float = 0.0
+
+    @property
+    def units(self) -> int:
+        """Занятое место в повозке."""
+        return sum(self.goods.values())
+
+
+def unit_values(
+        inventory: Dict[str, int],
+        city: City,
+        goods: Dict[str, GoodsItem],
+        config: RuntimeConfig,
+        difficulty: str = "normal",
+        sales: Optional[Dict[str, float]] = None
+) -> Dict[str, float]:
+    """
+    Ожидаемая цена за единицу каждого товара со склада в городе.
+
+    Args:
+        inventory (Dict[str, int]): Склад игрока.
+        city (City): Город назначения.
+        goods (Dict[str, GoodsItem]): Товары по названию.
+        config (RuntimeConfig): Конфигурация игры.
+        difficulty (str): Уровень сложности.
+        sales (Optional[Dict[str, float]]): Счётчики недавних продаж товаров в городе (для насыщения рынка).
+
+    Returns:
+        Dict[str, float]: Товар → ожидаемая цена за единицу.
+    """
+    stocked = [goods[name] for name, quantity in inventory.items() if name in goods and quantity > 0]
+    return expected_unit_prices(city, stocked, config, difficulty, saturation_modifiers(sales, config))
+
+
+def saturation_modifiers(sales: Optional[Dict[str, float]], config: RuntimeConfig) -> Dict[str, float]:
+    """
+    Множители насыщения рынка по счётчикам продаж.
+
+    Args:
+        sales (Optional[Dict[str, float]]): Счётчики недавних продаж товаров в городе.
+        config (RuntimeConfig): Конфигурация игры.
+
+    Returns:
+        Dict[str, float]: Товар → множитель цены.
+    """
+    return {name: saturation_modifier(count, config) for name, count in (sales or {}).items()}
+
+
+def plan_cargo(
+        inventory: Dict[str, int],
+        capacity: int,
+        city: City,
+        goods: Dict[str, GoodsItem],
+        config: RuntimeConfig,
+        difficulty: str = "normal",
+        registry: Optional[Registry] = None,
+        sales: Optional[Dict[str, float]] = None,
+        courier: Optional[Courier] = None,
+        wagon: Optional[Wagon] = None
+) -> CargoPlan:
+    """
+    Подбирает груз, максимизирующий ожидаемый чистый доход каравана.
+
+    Args:
+        inventory (Dict[str, int]): Склад игрока.
+        capacity (int): Вместимость повозки.
+        city (City): Город назначения.
+        goods (Dict[str, GoodsItem]): Товары по названию.
+        config (RuntimeConfig): Конфигурация игры.
+        difficulty (str): Уровень сложности.
+        registry (Optional[Registry]): Реестр ID событий.
+        sales (Optional[Dict[str, float]]): Счётчики продаж товаров в городе к моменту продажи.
+        courier (Optional[Courier]): Курьер рейса (шанс болезни в оценке итога).
+        wagon (Optional[Wagon]): Повозка рейса (шанс поломки в оценке итога).
+
+    Returns:
+        CargoPlan: План загрузки.
+    """
+    values = unit_values(inventory, city, goods, config, difficulty, sales)
+
+    plan = CargoPlan()
+    free = capacity
+    for name in sorted(values, key=lambda n: (-values[n], n)):
+        if free <= 0 or values[name] <= 0:
+            break
+        quantity = min(inventory[name], free)
+        plan.goods[name] = quantity
+        plan.revenue += values[name] * quantity
+        free -= quantity
+
+    plan.expenses = calculate_trip_expenses(city.duration * 2 + 1, config)
+    estimate = estimate_outcome(
+        plan.goods, city, goods, config, difficulty, registry,
+        saturation=saturation_modifiers(sales, config),
+        courier=courier,
+        wagon=wagon
+    )
+    plan.expected_net = estimate.mean
+    plan.net_std = estimate.std
+    return plan
+
+
+def trip_outcome_factors(
+        city: City,
+        expenses: int,
+        config: RuntimeConfig,
+        difficulty: str = "normal",
+        registry: Optional[Registry] = None
+) -> Tuple[float, float]:
+    """
+    Линейная модель ожидаемого чистого дохода поездки:
+    E[чистый доход] = выручка × revenue_factor − fixed_cost.
+
+    Учитывает гибель курьера (груз и расходы теряются), набег разбойников
+    (средняя потеря доли груза), доплаты за поломку повозки и болезнь курьера.
+
+    Args:
+        city (City): Город назначения.
+        expenses (int): Расходы на поездку.
+        config (RuntimeConfig): Конфигурация игры.
+        difficulty (str): Уровень сложности.
+        registry (Optional[Registry]): Реестр ID событий.
+
+    Returns:
+        Tuple[float, float]: (revenue_factor, fixed_cost).
+    """
+    if city.duration == 0:
+        return 1.0, float(expenses)
+
+    registry = registry or get_registry(config)
+    distribution = trip_event_distribution(config, registry, city.duration, difficulty)
+    death = distribution.get(registry.courier_death, 0.0)
+    bandits = distribution.get(registry.bandits, 0.0)
+    breakdown = distribution.get(registry.wagon_breakdown, 0.0)
+    illness = distribution.get(registry.courier_illness, 0.0)
+
+    revenue_factor = 1.0 - death - bandits * BANDIT_MEAN_LOSS
+    fixed_cost = (1.0 - death) * expenses + breakdown * WAGON_REPAIR_MEAN + illness * ILLNESS_COST_MEAN
+    return revenue_factor, fixed_cost
+
@@ -0,0 +1,233 @@
+"""
+Лента изменений состояния игры для интерфейса.
+
+Game и Player сообщают ленте о каждом изменении (баланс, склад, отправка
+и возвращение караванов, события в пути и в городах, новый цикл,
+открытия), а лента копит их до вызова flush. Изменения сворачиваются:
+несколько изменений баланса дают одно BalanceChanged (старое и новое
+значение), изменения склада суммируются по товару, города с новыми
+событиями собираются во множество. flush раздаёт подписчикам только те
+виды событий, на которые они подписаны, и экраны обновляют лишь
+затронутые виджеты, не перечитывая всё состояние.
+
+Пока подписчиков нет, лента ничего не копит (кроме последнего баланса),
+поэтому безголовая симуляция за неё почти не платит.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Set, Tuple
+from models.caravan import Caravan
+
+
+@dataclass(frozen=True)
+class BalanceChanged:
+    """
+    Изменился баланс игрока.
+
+    Атрибуты:
+        old (int): Баланс на момент прошлой раздачи.
+        new (int): Текущий баланс.
+    """
+    old: int
+    new: int
+
+
+@dataclass(frozen=True)
+class InventoryChanged:
+    """
+    Изменился склад игрока.
+
+    Атрибуты:
+        deltas (Dict[str, int]): Товар → суммарное изменение количества (без нулевых).
+    """
+    deltas: Dict[str, int]
+
+
+@dataclass(frozen=True)
+class CaravanDeparted:
+    """
+    Караван отправлен.
+
+    Атрибуты:
+        caravan (Caravan): Отправленный караван.
+    """
+    caravan: Caravan
+
+
+@dataclass(frozen=True)
+class CaravanReturned:
+    """
+    Караван завершил рейс.
+
+    Атрибуты:
+        caravan (Caravan): Завершённый караван.
+        report_id (int): Номер отчёта о рейсе в Game.reports.
+    """
+    caravan: Caravan
+    report_id: int
+
+
+@dataclass(frozen=True)
+class TravelEventOccurred:
+    """
+    С караваном в пути произошло событие.
+
+    Атрибуты:
+        caravan (Caravan): Караван (событие — caravan.event_occurred).
+    """
+    caravan: Caravan
+
+
+@dataclass(frozen=True)
+class CityEventsChanged:
+    """
+    Сменились события в городах.
+
+    Атрибуты:
+        city_ids (Tuple[int, ...]): Позиции городов в списке мира по возрастанию.
+    """
+    city_ids: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class CycleAdvanced:
+    """
+    Начался новый цикл.
+
+    Атрибуты:
+        cycle (int): Номер текущего цикла.
+    """
+    cycle: int
+
+
+@dataclass(frozen=True)
+class Unlocked:
+    """
+    Достигнуты пороги прогрессии.
+
+    Атрибуты:
+        events (Tuple): События открытия (core.progression.UnlockEvent) в порядке порогов.
+    """
+    events: Tuple
+
+
+Handler = Callable[[List[object]], None]
+
+
+class ChangeFeed:
+    """
+    Накопитель изменений состояния и подписчики на них.
+
+    Атрибуты:
+        balance (int): Баланс на момент прошлой раздачи.
+    """
+
+    def __init__(self, balance: int):
+        """
+        Args:
+            balance (int): Текущий баланс игрока.
+        """
+        self.balance = balance
+        self._handlers: List[Tuple[Handler, Tuple[type, ...]]] = []
+        self._clear()
+        self._new_balance = balance
+
+    def _clear(self) -> None:
+        self._cycle = 0
+        self._inventory: Dict[str, int] = {}
+        self._departed: List[Caravan] = []
+        self._travel: Dict[int, Caravan] = {}
+        self._returned: List[CaravanReturned] = []
+        self._cities: Set[int] = set()
+        self._unlocks: List = []
+
+    def reset(self, balance: int) -> None:
+        """Отбрасывает накопленные изменения (например, после загрузки игры)."""
+        self.balance = self._new_balance = balance
+        self._clear()
+
+    def subscribe(self, handler: Handler, *types: type) -> None:
+        """
+        Подписывает обработчик на виды событий.
+
+        Args:
+            handler (Handler): Получает список событий одной раздачи.
+            *types (type): Виды событий; без них — все.
+        """
+        self.unsubscribe(handler)
+        self._handlers.append((handler, types))
+
+    def unsubscribe(self, handler: Handler) -> None:
+        """Отписывает обработчик (если он подписан)."""
+        self._handlers = [entry for entry in self._handlers if entry[0] != handler]
+
+    # Сообщения от Game и Player
+
+    def balance_changed(self, balance: int) -> None:
+        """Новый баланс игрока (Player.on_balance_change)."""
+        self._new_balance = balance
+
+    def inventory_changed(self, name: str, delta: int) -> None:
+        """Изменение количества товара на складе (Player.on_inventory_change)."""
+        if self._handlers:
+            self._inventory[name] = self._inventory.get(name, 0) + delta
+
+    def caravan_departed(self, caravan: Caravan) -> None:
+        """Караван отправлен."""
+        if self._handlers:
+            self._departed.append(caravan)
+
+    def travel_event(self, caravan: Caravan) -> None:
+        """С караваном в пути произошло событие."""
+        if self._handlers:
+            self._travel[id(caravan)] = caravan
+
+    def caravan_returned(self, caravan: Caravan, report_id: int) -> None:
+        """Караван завершил рейс."""
+        if self._handlers:
+            self._returned.append(CaravanReturned(caravan, report_id))
+
+    def city_events_changed(self, city_ids: List[int]) -> None:
+        """Сменились события в городах."""
+        if self._handlers:
+            self._cities.update(city_ids)
+
+    def cycle_advanced(self, cycle: int) -> None:
+        """Начался новый цикл."""
+        if self._handlers:
+            self._cycle = cycle
+
+    def unlocked(self, event) -> None:
+        """Применено открытие прогрессии."""
+        if self._handlers:
+            self._unlocks.append(event)
+
+    def flush(self) -> List[object]:
+        """
+        Раздаёт накопленные изменения подписчикам и начинает новую пачку.
+
+        Returns:
+            List[object]: Свёрнутые события пачки.
+        """
+        events: List[object] = []
+        if self._cycle:
+            events.append(CycleAdvanced(self._cycle))
+        if self._new_balance != self.balance:
+            events.append(BalanceChanged(self.balance, self._new_balance))
+        deltas = {name: delta for name, delta in self._inventory.items() if delta}
+        if deltas:
+            events.append(InventoryChanged(deltas))
+        events.extend(CaravanDeparted(caravan) for caravan in self._departed)
+        events.extend(TravelEventOccurred(caravan) for caravan in self._travel.values())
+        events.extend(self._returned)
+        if self._cities:
+            events.append(CityEventsChanged(tuple(sorted(self._cities))))
+        if self._unlocks:
+            events.append(Unlocked(tuple(self._unlocks)))
+
+        self.balance = self._new_balance
+        self._clear()
+        for handler, types in list(self._handlers):
+            batch = [event for event in events if isinstance(event, types)] if types else events
+            if batch:
+                handler(batch)
+        return events
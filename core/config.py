@@ -0,0 +1,337 @@
+"""
+Скомпилированная конфигурация игры.
+
+balance_config.json загружается как вложенный словарь, но ядро с ним
+напрямую не работает: compile_config один раз проверяет схему, применяет
+настройки сложности и строит неизменяемый объект RuntimeConfig с заранее
+проиндексированными данными — товарами, модификаторами событий (и их
+матрицей), порогами насыщения рынка, скомпилированными таблицами событий
+и стартовыми активами игрока. Для горячих путей заранее посчитаны
+таблицы по позиции товара (базовые цены, строки множителей событий)
+и расходы на поездку по числу дней: расчёт цены и расходов — это
+обращение к кортежу по индексу, без обхода вложенных отображений.
+
+Для чтения интерфейсом RuntimeConfig остаётся отображением:
+config["player"] возвращает неизменяемый вид исходного раздела.
+"""
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterator, Tuple
+from core.events import DIFFICULTIES, compile_event_tables
+from core.registry import Registry
+
+# Пустые модификаторы событий (событие без записи в event_modifiers)
+NO_MODIFIERS: Mapping = MappingProxyType({})
+# Доля счётчика продаж, остающаяся через цикл, если в конфигурации не задана
+DEFAULT_SATURATION_DECAY = 0.9
+# Прочность повозки по умолчанию
+DEFAULT_DURABILITY = 0.75
+# Для скольких дней пути расходы считаются заранее (длиннее — по формуле)
+EXPENSE_TABLE_DAYS = 256
+
+
+class ConfigError(ValueError):
+    """Конфигурация не соответствует схеме."""
+
+
+@dataclass(frozen=True, slots=True)
+class GoodSpec:
+    """
+    Товар из конфигурации.
+
+    Атрибуты:
+        name (str): Название.
+        base_price (int): Базовая цена.
+        category (str): Категория.
+    """
+    name: str
+    base_price: int
+    category: str
+
+
+@dataclass(frozen=True, slots=True)
+class TravelCosts:
+    """
+    Расходы в пути.
+
+    Атрибуты:
+        food_per_day (int): Еда за день.
+        lodging_per_2_days (int): Ночлег за каждые два дня.
+        guard_cost_per_trip (int): Охрана за поездку.
+    """
+    food_per_day: int
+    lodging_per_2_days: int
+    guard_cost_per_trip: int
+
+    def for_days(self, days: int) -> int:
+        """Расходы на еду, ночлег и охрану за поездку длиной days дней."""
+        return self.food_per_day * days + self.lodging_per_2_days * (days // 2) + self.guard_cost_per_trip
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class RuntimeConfig(Mapping):
+    """
+    Проверенная неизменяемая конфигурация для одного уровня сложности.
+
+    Атрибуты:
+        difficulty (str): Уровень сложности, для которого применены настройки.
+        raw (Mapping[str, Any]): Неизменяемый вид исходного balance_config.json.
+        settings (Mapping[str, float]): Настройки уровня сложности.
+        goods (Tuple[GoodSpec, ...]): Товары в порядке конфигурации.
+        good_names (Tuple[str, ...]): Названия товаров (позиция — ID товара в реестре).
+        good_index (Mapping[str, int]): Название товара → позиция.
+        base_prices (Tuple[int, ...]): Базовые цены по позиции товара.
+        travel_costs (TravelCosts): Расходы в пути.
+        trip_expenses (Tuple[int, ...]): Расходы за поездку по числу дней
+            (первые EXPENSE_TABLE_DAYS значений).
+        event_modifiers (Mapping[str, Mapping[str, float]]): Событие → товар → множитель цены
+            (для каждого события заданы все товары).
+        modifier_events (Tuple[str, ...]): События с модификаторами (строки матрицы).
+        event_modifier_matrix (Tuple[Tuple[float, ...], ...]): Множители цены,
+            форма события × товары (порядок good_names).
+        event_price_rows (Mapping[str, Tuple[float, ...]]): Событие → строка
+            event_modifier_matrix (множители по позиции товара).
+        neutral_price_row (Tuple[float, ...]): Строка множителей 1.0 для событий
+            без модификаторов.
+        saturation_levels (Tuple[Tuple[float, float], ...]): Пороги насыщения рынка
+            (порог, множитель цены) по возрастанию порога.
+        saturation_decay (float): Доля счётчика продаж, остающаяся через цикл.
+        city_events (Tuple[Mapping, ...]): Исходный пул городских событий.
+        travel_events (Tuple[Mapping, ...]): Исходный пул событий в пути.
+        event_tables (Mapping[str, Mapping[str, Tuple[Mapping, ...]]]): Пулы событий,
+            скомпилированные для каждого уровня сложности (см. core.events.compile_event_pool).
+        starting_balance (int): Стартовый баланс с учётом сложности.
+        illness_resistance_multiplier (float): Множитель сопротивляемости болезням
+            курьеров для уровня сложности (больше 1 — курьеры болеют реже;
+            illness_resistance курьеров делится на него).
+        starting_couriers (Tuple[Mapping, ...]): Стартовые курьеры (сопротивляемость с учётом сложности).
+        starting_wagons (Tuple[Mapping, ...]): Стартовые повозки.
+        cycles_to_win (int): Число циклов партии.
+        victory_goal (int): Баланс для победы.
+        couriers (Mapping[str, Mapping]): Курьеры, открываемые прогрессией, по названию.
+        wagons (Mapping[str, Mapping]): Повозки, открываемые прогрессией, по названию.
+        progression (Tuple[Tuple[int, Tuple[str, ...]], ...]): Пороги баланса и их открытия
+            по возрастанию порога.
+        registry (Registry): Реестр ID товаров и событий этой конфигурации.
+    """
+    difficulty: str
+    raw: Mapping
+    settings: Mapping
+    goods: Tuple[GoodSpec, ...]
+    good_names: Tuple[str, ...]
+    good_index: Mapping
+    base_prices: Tuple[int, ...]
+    travel_costs: TravelCosts
+    trip_expenses: Tuple[int, ...]
+    event_modifiers: Mapping
+    modifier_events: Tuple[str, ...]
+    event_modifier_matrix: Tuple[Tuple[float, ...], ...]
+    event_price_rows: Mapping
+    neutral_price_row: Tuple[float, ...]
+    saturation_levels: Tuple[Tuple[float, float], ...]
+    saturation_decay: float
+    city_events: Tuple[Mapping, ...]
+    travel_events: Tuple[Mapping, ...]
+    event_tables: Mapping
+    starting_balance: int
+    illness_resistance_multiplier: float
+    starting_couriers: Tuple[Mapping, ...]
+    starting_wagons: Tuple[Mapping, ...]
+    cycles_to_win: int
+    victory_goal: int
+    couriers: Mapping
+    wagons: Mapping
+    progression: Tuple[Tuple[int, Tuple[str, ...]], ...]
+    registry: Registry
+
+    def __getitem__(self, key: str) -> Any:
+        return self.raw[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def event_modifier(self, event_name: str, good_name: str) -> float:
+        """Множитель цены товара при событии (1.0, если не задан)."""
+        index = self.good_index.get(good_name)
+        if index is None:
+            return 1.0
+        return self.event_price_rows.get(event_name, self.neutral_price_row)[index]
+
+
+def freeze(value: Any) -> Any:
+    """Рекурсивно заменяет словари на неизменяемые виды, а списки — на кортежи."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _require(section: Mapping, key: str, path: str) -> Any:
+    if not isinstance(section, Mapping) or key not in section:
+        raise ConfigError(f"В конфигурации отсутствует ключ '{path}'")
+    return section[key]
+
+
+def _number(section: Mapping, key: str, path: str, minimum: float = 0.0) -> float:
+    value = _require(section, key, path)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < minimum:
+        raise ConfigError(f"Ключ '{path}' должен быть числом не меньше {minimum}: {value!r}")
+    return value
+
+
+def _named_list(section: Mapping, key: str) -> list:
+    entries = _require(section, key, key)
+    valid = isinstance(entries, (list, tuple)) and all(
+        isinstance(entry, Mapping) and "name" in entry for entry in entries
+    )
+    if not valid:
+        raise ConfigError(f"'{key}' должен быть списком записей с ключом 'name'")
+    return entries
+
+
+def _event_pool(raw: Mapping, key: str) -> list:
+    pool = _named_list(raw, key)
+    if not pool:
+        raise ConfigError(f"Пустой пул событий '{key}'")
+    for event in pool:
+        _number(event, "probability", f"{key}.{event['name']}.probability")
+    if sum(event["probability"] for event in pool) <= 0:
+        raise ConfigError(f"Сумма вероятностей событий '{key}' должна быть положительной")
+    return pool
+
+
+def compile_config(raw: Mapping, difficulty: str = "normal") -> RuntimeConfig:
+    """
+    Проверяет конфигурацию и компилирует её для уровня сложности.
+    Исходный словарь не изменяется.
+
+    Args:
+        raw (Mapping): Конфигурация из balance_config.json.
+        difficulty (str): Уровень сложности.
+
+    Returns:
+        RuntimeConfig: Скомпилированная конфигурация.
+
+    Raises:
+        ConfigError: Если не хватает разделов или значения некорректны.
+    """
+    all_settings = raw.get("difficulty_settings", {})
+    if difficulty not in DIFFICULTIES and difficulty not in all_settings:
+        raise ConfigError(f"Недопустимый уровень сложности: {difficulty}")
+    settings = all_settings.get(difficulty, {})
+
+    # Товары
+    goods = []
+    for item in _named_list(raw, "goods"):
+        path = f"goods.{item['name']}"
+        goods.append(GoodSpec(
+            name=item["name"],
+            base_price=int(_number(item, "base_price", f"{path}.base_price")),
+            category=item.get("category", "")
+        ))
+    good_names = tuple(good.name for good in goods)
+    if len(set(good_names)) != len(good_names):
+        raise ConfigError("Названия товаров должны быть уникальными")
+
+    # Расходы в пути
+    costs = _require(raw, "travel_costs", "travel_costs")
+    travel_costs = TravelCosts(**{
+        key: _number(costs, key, f"travel_costs.{key}")
+        for key in ("food_per_day", "lodging_per_2_days", "guard_cost_per_trip")
+    })
+
+    # Модификаторы событий: для каждого события заданы все товары
+    event_modifiers = {}
+    for event_name, modifiers in raw.get("event_modifiers", {}).items():
+        row = {}
+        for good_name in good_names:
+            row[good_name] = float(_number(modifiers, good_name, f"event_modifiers.{event_name}.{good_name}")
+                                   if good_name in modifiers else 1.0)
+        event_modifiers[event_name] = row
+    modifier_events = tuple(event_modifiers)
+    event_modifier_matrix = tuple(
+        tuple(event_modifiers[event_name][good_name] for good_name in good_names)
+        for event_name in modifier_events
+    )
+
+    # Пороги насыщения рынка
+    saturation_levels = tuple(sorted(
+        (
+            _number(level, "threshold", "market_saturation.threshold"),
+            _number(level, "price_modifier", "market_saturation.price_modifier")
+        )
+        for level in raw.get("market_saturation", [])
+    ))
+
+    # События
+    city_events = _event_pool(raw, "city_events")
+    travel_events = _event_pool(raw, "travel_events")
+
+    # Игрок: настройки сложности применяются к копии
+    player = _require(raw, "player", "player")
+    starting_balance = int(
+        _number(player, "starting_balance", "player.starting_balance")
+        * settings.get("starting_balance_multiplier", 1.0)
+    )
+    illness_multiplier = float(settings.get("illness_resistance_multiplier", 1.0))
+    if illness_multiplier <= 0:
+        raise ConfigError(f"'illness_resistance_multiplier' должен быть больше 0: {illness_multiplier!r}")
+    # Сопротивляемость выше — болезнь реже: illness_resistance курьера умножает
+    # вероятность болезни, поэтому множитель сложности входит в неё делителем
+    starting_couriers = [
+        dict(courier, illness_resistance=courier.get("illness_resistance", 1.0) / illness_multiplier)
+        for courier in player.get("starting_couriers", [])
+    ]
+    starting_wagons = [
+        dict(wagon, durability=wagon.get("durability", DEFAULT_DURABILITY))
+        for wagon in player.get("starting_wagons", [])
+    ]
+    for wagon in starting_wagons + list(raw.get("wagons", [])):
+        _number(wagon, "capacity", f"wagons.{wagon.get('name')}.capacity")
+
+    # Сначала проверка каждого уровня, затем сортировка по уже проверенному порогу
+    levels = [
+        (int(_number(level, "threshold", "progression.threshold")), tuple(level.get("unlocks", [])))
+        for level in raw.get("progression", [])
+    ]
+    progression = tuple(sorted(levels, key=lambda level: level[0]))
+
+    return RuntimeConfig(
+        difficulty=difficulty,
+        raw=freeze(raw),
+        settings=freeze(settings),
+        goods=tuple(goods),
+        good_names=good_names,
+        good_index=MappingProxyType({name: index for index, name in enumerate(good_names)}),
+        base_prices=tuple(good.base_price for good in goods),
+        travel_costs=travel_costs,
+        trip_expenses=tuple(travel_costs.for_days(days) for days in range(EXPENSE_TABLE_DAYS)),
+        event_modifiers=freeze(event_modifiers),
+        modifier_events=modifier_events,
+        event_modifier_matrix=event_modifier_matrix,
+        event_price_rows=MappingProxyType(dict(zip(modifier_events, event_modifier_matrix))),
+        neutral_price_row=(1.0,) * len(good_names),
+        saturation_levels=saturation_levels,
+        saturation_decay=float(raw.get("market_saturation_decay", DEFAULT_SATURATION_DECAY)),
+        city_events=freeze(city_events),
+        travel_events=freeze(travel_events),
+        event_tables=freeze(compile_event_tables(raw)),
+        starting_balance=starting_balance,
+        illness_resistance_multiplier=illness_multiplier,
+        starting_couriers=freeze(starting_couriers),
+        starting_wagons=freeze(starting_wagons),
+        cycles_to_win=int(_number(player, "cycles_to_win", "player.cycles_to_win", 1)),
+        victory_goal=int(_number(player, "victory_goal", "player.victory_goal")),
+        couriers=freeze({courier["name"]: courier for courier in raw.get("couriers", [])}),
+        wagons=freeze({wagon["name"]: wagon for wagon in raw.get("wagons", [])}),
+        progression=progression,
+        registry=Registry(
+            list(good_names),
+            [event["name"] for event in list(city_events) + list(travel_events)] + list(modifier_events)
+        )
+    )
@@ -1,16 +1,356 @@
+import math
 import random
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict, Mapping, Optional, Sequence, Tuple
+from models.courier import Courier
+from models.wagon import Wagon
+from core.registry import HARMFUL_EVENTS, NO_EVENT, NOTHING_HAPPENED, Registry
 
+if TYPE_CHECKING:
+    from core.config import RuntimeConfig
 
-def choose_event(event_pool: List[Dict], difficulty: str = "normal") -> str:
+# Уровни сложности, для которых всегда компилируются таблицы событий
+DIFFICULTIES = ('easy', 'normal', 'hard')
+# Пулы событий и нейтральное событие каждого из них (забирает/отдаёт массу негативных)
+EVENT_POOLS = (('city_events', NO_EVENT), ('travel_events', NOTHING_HAPPENED))
+
+
+class EventSampler:
+    """
+    Скомпилированный пул событий для выбора за O(1) (алиас-метод Уолкера/Воуза).
+
+    Таблицы строятся один раз для пула (сложность уже учтена в его весах,
+    см. compile_event_pool), после чего каждый выбор стоит одно обращение
+    к генератору случайных чисел.
+
+    Атрибуты:
+        names (List[str]): Названия событий.
+        ids (Optional[List[int]]): ID событий в реестре (если реестр передан).
+        probabilities (List[float]): Нормализованные вероятности событий.
+    """
+
+    def __init__(self, event_pool: List[Dict], registry: Optional[Registry] = None):
+        """
+        Строит алиас-таблицы для пула событий.
+
+        Args:
+            event_pool: Список словарей событий с ключами 'name' и 'probability'
+            registry: Реестр ID событий; нужен для выбора сразу в виде ID
+        """
+        # Проверка входных данных
+        if not event_pool:
+            raise ValueError("Пустой пул событий")
+
+        self.names = [event["name"] for event in event_pool]
+        self.ids = [registry.intern_event(name) for name in self.names] if registry is not None else None
+        self._registry = registry
+        self._excluded: Dict[str, Tuple[float, Optional["EventSampler"]]] = {}
+        weights = [event["probability"] for event in event_pool]
+
+        # Нормализуем веса, чтобы сумма была равна 1.0
+        total_weight = sum(weights)
+        if total_weight <= 0:
+            raise ValueError("Сумма вероятностей событий должна быть положительной")
+
+        self.probabilities = [w / total_weight for w in weights]
+        self._build_alias_tables()
+
+    def _build_alias_tables(self) -> None:
+        """Строит таблицы порогов и алиасов (метод Воуза)."""
+        n = len(self.probabilities)
+        scaled = [p * n for p in self.probabilities]
+        self._threshold = [1.0] * n
+        self._alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self._threshold[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Остатки из-за погрешности округления получают порог 1.0
+        for i in small + large:
+            self._threshold[i] = 1.0
+
+        # Готовые пары (основной исход, алиас) без лишней индексации
+        self._outcomes = [
+            (self.names[i], self.names[self._alias[i]]) for i in range(n)
+        ]
+        self._id_outcomes = [
+            (self.ids[i], self.ids[self._alias[i]]) for i in range(n)
+        ] if self.ids is not None else None
+        self._size = n
+
+    def _draw(self, outcomes: list, rng: random.Random):
+        u = rng.random() * self._size
+        index = int(u)
+        value, alias = outcomes[index]
+        return value if u - index < self._threshold[index] else alias
+
+    def _draw_many(self, outcomes: list, count: int, rng: random.Random) -> list:
+        size = self._size
+        threshold = self._threshold
+        draw = rng.random
+        result = []
+        for _ in range(count):
+            u = draw() * size
+            index = int(u)
+            value, alias = outcomes[index]
+            result.append(value if u - index < threshold[index] else alias)
+        return result
+
+    def sample(self, rng: random.Random = random) -> str:
+        """
+        Выбирает одно событие.
+
+        Args:
+            rng: Генератор случайных чисел (по умолчанию глобальный модуль random)
+
+        Returns:
+            Название выбранного события
+        """
+        return self._draw(self._outcomes, rng)
+
+    def sample_id(self, rng: random.Random = random) -> int:
+        """Выбирает одно событие и возвращает его ID в реестре."""
+        return self._draw(self._id_outcomes, rng)
+
+    def sample_many_ids(self, count: int, rng: random.Random = random) -> List[int]:
+        """Выбирает несколько событий и возвращает их ID в реестре."""
+        return self._draw_many(self._id_outcomes, count, rng)
+
+    def excluding(self, name: str) -> Tuple[float, Optional["EventSampler"]]:
+        """
+        Разделяет пул на событие name и все остальные.
+
+        Args:
+            name: Название исключаемого события (например, «ничего не произошло»)
+
+        Returns:
+            Вероятность события name и сэмплер условного распределения остальных
+            событий (None, если других событий нет)
+        """
+        cached = self._excluded.get(name)
+        if cached is not None:
+            return cached
+
+        excluded_probability = sum(p for n, p in zip(self.names, self.probabilities) if n == name)
+        rest = [
+            {"name": n, "probability": p}
+            for n, p in zip(self.names, self.probabilities)
+            if n != name and p > 0
+        ]
+        result = (excluded_probability, EventSampler(rest, self._registry) if rest else None)
+        self._excluded[name] = result
+        return result
+
+
+def is_negative_event(event: Dict) -> bool:
+    """
+    Неблагоприятно ли событие: флаг "negative" в конфигурации,
+    а без него — набег, поломка, болезнь и гибель курьера.
+    """
+    return event.get("negative", event["name"] in HARMFUL_EVENTS)
+
+
+def compile_event_pool(event_pool: List[Dict], multiplier: float = 1.0, neutral: Optional[str] = None) -> List[Dict]:
+    """
+    Применяет множитель сложности к пулу событий.
+
+    Вероятности неблагоприятных событий умножаются на multiplier, а разница
+    забирается у нейтрального события (или отдаётся ему), поэтому остальные
+    события сохраняют свои вероятности. Если нейтрального события нет или его
+    массы не хватает, пул просто нормализуется.
+
+    Args:
+        event_pool: Список словарей событий с ключами 'name' и 'probability'
+        multiplier: Множитель вероятности неблагоприятных событий
+        neutral: Название нейтрального события («ничего не произошло»)
+
+    Returns:
+        Новый пул с нормализованными вероятностями
+    """
+    if not event_pool:
+        raise ValueError("Пустой пул событий")
+    total = sum(event["probability"] for event in event_pool)
+    if total <= 0:
+        raise ValueError("Сумма вероятностей событий должна быть положительной")
+
+    weights = [event["probability"] / total for event in event_pool]
+    shift = 0.0
+    for index, event in enumerate(event_pool):
+        if is_negative_event(event):
+            scaled = weights[index] * multiplier
+            shift += scaled - weights[index]
+            weights[index] = scaled
+    for index, event in enumerate(event_pool):
+        if event["name"] == neutral:
+            weights[index] = max(weights[index] - shift, 0.0)
+            break
+
+    total = sum(weights)
+    return [dict(event, probability=weight / total) for event, weight in zip(event_pool, weights)]
+
+
+def compile_event_tables(config: Mapping) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Компилирует пулы событий исходной конфигурации для всех уровней сложности
+    (вызывается из core.config.compile_config).
+
+    Args:
+        config: Исходная конфигурация (ключи 'city_events', 'travel_events',
+            'difficulty_settings' с event_probability_multiplier)
+
+    Returns:
+        Таблицы: сложность → ключ пула → скомпилированный пул
+    """
+    settings = config.get("difficulty_settings", {})
+    tables = {}
+    for difficulty in dict.fromkeys(DIFFICULTIES + tuple(settings)):
+        multiplier = settings.get(difficulty, {}).get("event_probability_multiplier", 1.0)
+        tables[difficulty] = {
+            key: compile_event_pool(config[key], multiplier, neutral)
+            for key, neutral in EVENT_POOLS
+            if config.get(key)
+        }
+    return tables
+
+
+def difficulty_event_pool(config: "RuntimeConfig", key: str, difficulty: str = "normal") -> Sequence[Mapping]:
+    """
+    Пул событий config[key] для уровня сложности.
+
+    Args:
+        config: Конфигурация игры
+        key: 'city_events' или 'travel_events'
+        difficulty: Уровень сложности
+
+    Returns:
+        Скомпилированный пул (тот же объект при каждом вызове)
+    """
+    pools = config.event_tables.get(difficulty)
+    if pools is None:
+        raise ValueError(f"Недопустимый уровень сложности: {difficulty}")
+    pool = pools.get(key)
+    if pool is None:
+        raise KeyError(f"В конфигурации отсутствует ключ '{key}'")
+    return pool
+
+
+def get_difficulty_sampler(
+        config: "RuntimeConfig",
+        key: str,
+        difficulty: str = "normal",
+        registry: Optional[Registry] = None
+) -> EventSampler:
+    """
+    Сэмплер пула событий config[key] с учётом уровня сложности.
+    Строится при первом обращении и хранится в реестре (registry.samplers).
+
+    Args:
+        config: Конфигурация игры
+        key: 'city_events' или 'travel_events'
+        difficulty: Уровень сложности
+        registry: Реестр ID событий (по умолчанию реестр конфигурации)
+
+    Returns:
+        EventSampler скомпилированного пула
+    """
+    registry = registry or config.registry
+    event_pool = difficulty_event_pool(config, key, difficulty)
+    cached = registry.samplers.get((key, difficulty))
+    # Реестр может обслуживать и другую конфигурацию: сэмплер привязан к пулу
+    if cached is not None and cached[0] is event_pool:
+        return cached[1]
+    sampler = EventSampler(event_pool, registry)
+    registry.samplers[(key, difficulty)] = (event_pool, sampler)
+    return sampler
+
+
+def get_travel_sampler(
+        config: "RuntimeConfig",
+        registry: Registry,
+        difficulty: str = "normal",
+        courier: Optional[Courier] = None,
+        wagon: Optional[Wagon] = None
+) -> EventSampler:
+    """
+    Сэмплер событий в пути для каравана с данными курьером и повозкой.
+
+    Вероятность болезни курьера умножается на его illness_resistance,
+    вероятность поломки повозки — на её durability; разница переходит
+    в «ничего не произошло», остальные события не меняются. Сэмплер
+    строится один раз на тип курьера и повозки (и сложность) и хранится
+    в реестре (registry.samplers), поэтому
+    бросок стоит столько же, сколько бросок по общему пулу.
+
+    Args:
+        config: Конфигурация игры (должна содержать ключ 'travel_events')
+        registry: Реестр ID событий
+        difficulty: Уровень сложности ('easy', 'normal' или 'hard')
+        courier: Курьер каравана (None — без модификатора)
+        wagon: Повозка каравана (None — без модификатора)
+
+    Returns:
+        EventSampler событий в пути для этой пары активов
+    """
+    event_pool = difficulty_event_pool(config, 'travel_events', difficulty)
+    illness_resistance = courier.illness_resistance if courier is not None else 1.0
+    durability = wagon.durability if wagon is not None else 1.0
+    key = ('travel_events', difficulty, illness_resistance, durability)
+    cached = registry.samplers.get(key)
+    if cached is not None and cached[0] is event_pool:
+        return cached[1]
+
+    base = get_difficulty_sampler(config, 'travel_events', difficulty, registry)
+    if illness_resistance == 1.0 and durability == 1.0:
+        registry.samplers[key] = (event_pool, base)
+        return base
+
+    weights = list(base.probabilities)
+    freed = 0.0
+    for index, event_id in enumerate(base.ids):
+        if courier is not None and event_id == registry.courier_illness:
+            adjusted = courier.get_actual_illness_chance(weights[index])
+        elif wagon is not None and event_id == registry.wagon_breakdown:
+            adjusted = wagon.get_actual_break_chance(weights[index])
+        else:
+            continue
+        freed += weights[index] - adjusted
+        weights[index] = adjusted
+
+    # Освободившаяся (или недостающая) масса — за счёт «ничего не произошло»
+    nothing = [index for index, event_id in enumerate(base.ids) if event_id == registry.nothing]
+    if nothing:
+        weights[nothing[0]] = max(weights[nothing[0]] + freed, 0.0)
+
+    pool = [
+        {"name": name, "probability": weight}
+        for name, weight in zip(base.names, weights)
+        if weight > 0
+    ]
+    sampler = EventSampler(pool, registry)
+    registry.samplers[key] = (event_pool, sampler)
+    return sampler
+
+
+def choose_event(event_pool: List[Dict], rng: random.Random = random) -> str:
     """
-    Выбирает случайное событие из пула с учетом уровня сложности.
+    Выбирает случайное событие из пула; вероятности берутся как есть
+    (сложность учитывается при компиляции пула, см. compile_event_pool).
 
     Args:
         event_pool: Список словарей событий, каждый должен содержать ключи:
                    'name' (str) - название события,
                    'probability' (float) - исходная вероятность
-        difficulty: Уровень сложности ('easy', 'normal' или 'hard')
+        rng: Генератор случайных чисел
 
     Returns:
         Название выбранного события
@@ -18,69 +358,156 @@ def choose_event(event_pool: List[Dict], difficulty: str = "normal") -> str:
     Пример события:
         {"name": "Болезнь курьера", "probability": 0.1}
     """
-    # Проверка входных данных
-    if not event_pool:
-        raise ValueError("Пустой пул событий")
+    return EventSampler(event_pool).sample(rng)
 
-    if difficulty not in ('easy', 'normal', 'hard'):
-        raise ValueError(f"Недопустимый уровень сложности: {difficulty}")
 
-    # Извлекаем названия событий
-    event_names = [event["name"] for event in event_pool]
-
-    # Применяем модификаторы сложности
-    if difficulty == 'easy':
-        # Уменьшаем вероятность негативных событий
-        weights = [event["probability"] * 0.7 for event in event_pool]
-    elif difficulty == 'hard':
-        # Увеличиваем вероятность негативных событий
-        weights = [event["probability"] * 1.3 for event in event_pool]
-    else:  # normal
-        weights = [event["probability"] for event in event_pool]
+def choose_city_event(config: "RuntimeConfig", difficulty: str = "normal", rng: random.Random = random) -> str:
+    """
+    Выбирает городское событие с учетом уровня сложности.
 
-    # Нормализуем веса, чтобы сумма была равна 1.0
-    total_weight = sum(weights)
-    if total_weight <= 0:
-        raise ValueError("Сумма вероятностей событий должна быть положительной")
+    Args:
+        config: Конфигурация игры (должна содержать ключ 'city_events')
+        difficulty: Уровень сложности ('easy', 'normal' или 'hard')
+        rng: Генератор случайных чисел
+
+    Returns:
+        Название выбранного городского события
+    """
+    return get_difficulty_sampler(config, 'city_events', difficulty).sample(rng)
 
-    normalized_weights = [w / total_weight for w in weights]
 
-    # Выбираем случайное событие
-    return random.choices(event_names, weights=normalized_weights, k=1)[0]
+def choose_city_event_ids(
+        config: "RuntimeConfig",
+        count: int,
+        registry: Registry,
+        difficulty: str = "normal",
+        rng: random.Random = random
+) -> List[int]:
+    """
+    Выбирает городские события сразу для нескольких городов.
 
+    Args:
+        config: Конфигурация игры (должна содержать ключ 'city_events')
+        count: Количество городов
+        registry: Реестр ID событий
+        difficulty: Уровень сложности ('easy', 'normal' или 'hard')
+        rng: Генератор случайных чисел (поток городских событий)
 
+    Returns:
+        Список ID городских событий в реестре
+    """
+    return get_difficulty_sampler(config, 'city_events', difficulty, registry).sample_many_ids(count, rng)
 
 
-def choose_city_event(config: dict, difficulty: str = "normal") -> str:
+def preroll_travel_event(
+        config: "RuntimeConfig",
+        registry: Registry,
+        rolls: int,
+        difficulty: str = "normal",
+        rng: random.Random = random,
+        courier: Optional[Courier] = None,
+        wagon: Optional[Wagon] = None
+) -> Optional[Tuple[int, int]]:
     """
-    Выбирает городское событие с учетом уровня сложности.
+    Заранее разыгрывает события в пути для каравана за один раз.
+
+    Эквивалентно броскам choose_travel_event_id раз в цикл до первого
+    события, отличного от «ничего не произошло»: номер броска с первым
+    событием распределён геометрически, а само событие выбирается
+    из условного распределения остальных событий.
 
     Args:
-        config: Конфигурация игры (должна содержать ключ 'city_events')
+        config: Конфигурация игры (должна содержать ключ 'travel_events')
+        registry: Реестр ID событий
+        rolls: Сколько бросков сделал бы караван (по одному за цикл в пути)
         difficulty: Уровень сложности ('easy', 'normal' или 'hard')
+        rng: Генератор случайных чисел
+        courier: Курьер каравана (модификатор болезни)
+        wagon: Повозка каравана (модификатор поломки)
 
     Returns:
-        Название выбранного городского события
+        (номер броска начиная с 1, ID события) или None, если событий не будет
     """
-    if 'city_events' not in config:
-        raise KeyError("В конфигурации отсутствует ключ 'city_events'")
+    if rolls <= 0:
+        return None
 
-    return choose_event(config['city_events'], difficulty)
+    sampler = get_travel_sampler(config, registry, difficulty, courier, wagon)
+    nothing_probability, events = sampler.excluding(registry.events[registry.nothing])
+    if events is None:
+        return None
 
+    event_probability = 1.0 - nothing_probability
+    if event_probability >= 1.0:
+        roll = 1
+    else:
+        # Геометрическое распределение: номер первого «успеха»
+        roll = int(math.log(1.0 - rng.random()) / math.log(nothing_probability)) + 1
+    if roll > rolls:
+        return None
+    return roll, events.sample_id(rng)
 
 
-def choose_travel_event(config: dict, difficulty: str = "normal") -> str:
+def choose_travel_event_id(
+        config: "RuntimeConfig",
+        registry: Registry,
+        difficulty: str = "normal",
+        rng: random.Random = random,
+        courier: Optional[Courier] = None,
+        wagon: Optional[Wagon] = None
+) -> int:
     """
-    Выбирает событие в пути с учетом уровня сложности.
+    Выбирает событие в пути и возвращает его ID в реестре.
 
     Args:
         config: Конфигурация игры (должна содержать ключ 'travel_events')
+        registry: Реестр ID событий
         difficulty: Уровень сложности ('easy', 'normal' или 'hard')
+        rng: Генератор случайных чисел (поток событий в пути)
+        courier: Курьер каравана (модификатор болезни)
+        wagon: Повозка каравана (модификатор поломки)
 
     Returns:
-        Название выбранного события путешествия
+        ID выбранного события путешествия
+    """
+    return get_travel_sampler(config, registry, difficulty, courier, wagon).sample_id(rng)
+
+
+def trip_event_distribution(
+        config: "RuntimeConfig",
+        registry: Registry,
+        rolls: int,
+        difficulty: str = "normal",
+        courier: Optional[Courier] = None,
+        wagon: Optional[Wagon] = None
+) -> Dict[int, float]:
     """
-    if 'travel_events' not in config:
-        raise KeyError("В конфигурации отсутствует ключ 'travel_events'")
+    Точное распределение итогового события в пути за всю поездку.
+
+    Караван бросает событие раз в цикл, пока не выпадет что-то кроме
+    «ничего не произошло»: событие случится с вероятностью 1 - q^rolls
+    и распределено как условное распределение остальных событий.
+
+    Args:
+        config: Конфигурация игры (должна содержать ключ 'travel_events')
+        registry: Реестр ID событий
+        rolls: Количество бросков (циклов в пути)
+        difficulty: Уровень сложности ('easy', 'normal' или 'hard')
+        courier: Курьер каравана (модификатор болезни)
+        wagon: Повозка каравана (модификатор поломки)
+
+    Returns:
+        ID события → вероятность; «ничего не произошло» включено
+    """
+    if rolls <= 0:
+        return {registry.nothing: 1.0}
+
+    sampler = get_travel_sampler(config, registry, difficulty, courier, wagon)
+    nothing_probability, events = sampler.excluding(registry.events[registry.nothing])
+    if events is None:
+        return {registry.nothing: 1.0}
 
-    return choose_event(config['travel_events'], difficulty)
+    happened = 1.0 - nothing_probability ** rolls
+    distribution = {registry.nothing: 1.0 - happened}
+    for event_id, probability in zip(events.ids, events.probabilities):
+        distribution[event_id] = distribution.get(event_id, 0.0) + happened * probability
+    return distribution
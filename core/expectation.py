@@ -0,0 +1,311 @@
+"""
+Аналитические ожидание и дисперсия итога каравана.
+
+Итог рейса зависит от трёх независимых случайных величин:
+    событие в пути (распределение за все броски, см. events.trip_event_distribution);
+    событие в городе в цикле продажи (городские события разыгрываются заново
+    каждый цикл, поэтому продажа идёт по их распределению, а не по текущему событию);
+    размер потерь и доплат (доля груза при набеге, стоимость ремонта и лечения).
+
+Все моменты считаются точно, без сэмплирования. Единственная нелинейность —
+округление груза вниз после набега, int(qty × (1 − loss)); на отрезке долей
+потерь оно кусочно-постоянно, поэтому выручка интегрируется по точкам разрыва.
+"""
+from dataclasses import dataclass
+from math import floor, sqrt
+from typing import Dict, List, Optional, Tuple
+from models.caravan import Caravan
+from models.city import City
+from models.courier import Courier
+from models.goods_item import GoodsItem
+from models.wagon import Wagon
+from core.caravan import BANDIT_LOSS_RANGE, ILLNESS_COST_RANGE, WAGON_REPAIR_COST_RANGE
+from core.config import RuntimeConfig
+from core.events import get_difficulty_sampler, trip_event_distribution
+from core.finance import calculate_trip_expenses, expected_unit_price
+from core.registry import Registry, get_registry
+
+
+@dataclass
+class OutcomeEstimate:
+    """
+    Моменты чистого дохода рейса.
+
+    Атрибуты:
+        mean (float): Ожидаемый чистый доход.
+        variance (float): Дисперсия чистого дохода.
+        mean_revenue (float): Ожидаемая выручка.
+        mean_expenses (float): Ожидаемые расходы (с доплатами за происшествия).
+    """
+    mean: float
+    variance: float
+    mean_revenue: float
+    mean_expenses: float
+
+    @property
+    def std(self) -> float:
+        """Стандартное отклонение чистого дохода."""
+        return sqrt(max(self.variance, 0.0))
+
+
+def _uniform_int_moments(bounds: Tuple[int, int]) -> Tuple[float, float]:
+    low, high = bounds
+    count = high - low + 1
+    return (low + high) / 2, (count * count - 1) / 12
+
+
+def city_event_distribution(config: RuntimeConfig, difficulty: str = "normal") -> List[Tuple[str, float]]:
+    """
+    Распределение события в городе в цикле продажи.
+
+    Args:
+        config (RuntimeConfig): Конфигурация игры.
+        difficulty (str): Уровень сложности.
+
+    Returns:
+        List[Tuple[str, float]]: Пары (событие, вероятность).
+    """
+    sampler = get_difficulty_sampler(config, "city_events", difficulty)
+    merged: Dict[str, float] = {}
+    for name, probability in zip(sampler.names, sampler.probabilities):
+        merged[name] = merged.get(name, 0.0) + probability
+    return list(merged.items())
+
+
+def sale_price_table(
+        cargo: Dict[str, int],
+        city: City,
+        goods: Dict[str, GoodsItem],
+        config: RuntimeConfig,
+        difficulty: str = "normal",
+        saturation: Optional[Dict[str, float]] = None
+) -> Tuple[List[int], List[float], List[List[int]]]:
+    """
+    Цены продажи груза по событиям в городе.
+
+    Args:
+        saturation (Optional[Dict[str, float]]): Множители насыщения рынка по товарам.
+
+    Returns:
+        Tuple: (количества товаров, вероятности событий,
+                цены [событие][товар]); товары вне справочника пропускаются.
+    """
+    items = [(goods[name], quantity) for name, quantity in cargo.items() if name in goods and quantity > 0]
+    quantities = [quantity for _, quantity in items]
+    if city.duration == 0:
+        # В Риме фиксированная цена, событие города не влияет
+        return quantities, [1.0], [[expected_unit_price(item, city, config) for item, _ in items]]
+
+    saturation = saturation or {}
+    events = city_event_distribution(config, difficulty)
+    prices = [
+        [expected_unit_price(item, city, config, event_name, saturation.get(item.name, 1.0)) for item, _ in items]
+        for event_name, _ in events
+    ]
+    return quantities, [probability for _, probability in events], prices
+
+
+def expected_unit_prices(
+        city: City,
+        goods: List[GoodsItem],
+        config: RuntimeConfig,
+        difficulty: str = "normal",
+        saturation: Optional[Dict[str, float]] = None
+) -> Dict[str, float]:
+    """
+    Ожидаемая цена продажи единицы каждого товара в городе
+    (с учётом распределения событий в цикле продажи).
+
+    Args:
+        city (City): Город продажи.
+        goods (List[GoodsItem]): Товары.
+        config (RuntimeConfig): Конфигурация игры.
+        difficulty (str): Уровень сложности.
+        saturation (Optional[Dict[str, float]]): Множители насыщения рынка по товарам.
+
+    Returns:
+        Dict[str, float]: Товар → ожидаемая цена за единицу.
+    """
+    if city.duration == 0:
+        return {item.name: float(expected_unit_price(item, city, config)) for item in goods}
+    saturation = saturation or {}
+    events = city_event_distribution(config, difficulty)
+    return {
+        item.name: sum(
+            p * expected_unit_price(item, city, config, name, saturation.get(item.name, 1.0))
+            for name, p in events
+        )
+        for item in goods
+    }
+
+
+def _bandit_revenue_moments(
+        quantities: List[int],
+        probabilities: List[float],
+        prices: List[List[int]]
+) -> Tuple[float, float]:
+    """
+    E[B] и E[B²] для выручки после набега: B = Σ цена × int(qty × Y),
+    Y = 1 − loss равномерно распределена, событие в городе независимо от Y.
+    """
+    low, high = 1.0 - BANDIT_LOSS_RANGE[1], 1.0 - BANDIT_LOSS_RANGE[0]
+    width = high - low
+
+    # Точки, где int(qty × y) увеличивается на единицу
+    breaks = []
+    for index, quantity in enumerate(quantities):
+        for k in range(floor(quantity * low) + 1, floor(quantity * high) + 1):
+            y = k / quantity
+            if low < y < high:
+                breaks.append((y, index))
+    breaks.sort()
+
+    revenue = [
+        sum(price * floor(quantity * low) for price, quantity in zip(row, quantities))
+        for row in prices
+    ]
+    first = [0.0] * len(prices)
+    second = [0.0] * len(prices)
+    previous = low
+    for y, index in breaks + [(high, None)]:
+        weight = (y - previous) / width if width > 0 else 0.0
+        if weight > 0:
+            for c, value in enumerate(revenue):
+                first[c] += weight * value
+                second[c] += weight * value * value
+        if index is not None:
+            for c, row in enumerate(prices):
+                revenue[c] += row[index]
+        previous = y
+
+    if width <= 0:
+        first, second = revenue, [value * value for value in revenue]
+    return (
+        sum(p * m for p, m in zip(probabilities, first)),
+        sum(p * m for p, m in zip(probabilities, second))
+    )
+
+
+def estimate_outcome(
+        cargo: Dict[str, int],
+        city: City,
+        goods: Dict[str, GoodsItem],
+        config: RuntimeConfig,
+        difficulty: str = "normal",
+        registry: Optional[Registry] = None,
+        travel_distribution: Optional[Dict[int, float]] = None,
+        saturation: Optional[Dict[str, float]] = None,
+        courier: Optional[Courier] = None,
+        wagon: Optional[Wagon] = None
+) -> OutcomeEstimate:
+    """
+    Точные ожидание и дисперсия чистого дохода рейса.
+
+    Args:
+        cargo (Dict[str, int]): Груз.
+        city (City): Город назначения.
+        goods (Dict[str, GoodsItem]): Товары по названию.
+        config (RuntimeConfig): Конфигурация игры.
+        difficulty (str): Уровень сложности.
+        registry (Optional[Registry]): Реестр ID событий.
+        travel_distribution (Optional[Dict[int, float]]): Распределение события в пути;
+            по умолчанию — за весь рейс с момента отправки.
+        saturation (Optional[Dict[str, float]]): Множители насыщения рынка по товарам
+            на момент продажи.
+        courier (Optional[Courier]): Курьер (модификатор болезни в распределении по умолчанию).
+        wagon (Optional[Wagon]): Повозка (модификатор поломки в распределении по умолчанию).
+
+    Returns:
+        OutcomeEstimate: Моменты чистого дохода.
+    """
+    registry = registry or get_registry(config)
+    expenses = calculate_trip_expenses(city.duration * 2 + 1, config)
+    quantities, probabilities, prices = sale_price_table(cargo, city, goods, config, difficulty, saturation)
+
+    totals = [sum(price * quantity for price, quantity in zip(row, quantities)) for row in prices]
+    revenue_mean = sum(p * total for p, total in zip(probabilities, totals))
+    revenue_second = sum(p * total * total for p, total in zip(probabilities, totals))
+
+    if city.duration == 0:
+        return OutcomeEstimate(revenue_mean - expenses, revenue_second - revenue_mean ** 2, revenue_mean, expenses)
+
+    if travel_distribution is None:
+        travel_distribution = trip_event_distribution(
+            config, registry, city.duration, difficulty, courier, wagon
+        )
+
+    repair_mean, repair_variance = _uniform_int_moments(WAGON_REPAIR_COST_RANGE)
+    illness_mean, illness_variance = _uniform_int_moments(ILLNESS_COST_RANGE)
+    revenue_variance = revenue_second - revenue_mean ** 2
+
+    mean = second = 0.0
+    mean_revenue = mean_expenses = 0.0
+    for event_id, probability in travel_distribution.items():
+        if probability <= 0:
+            continue
+        if event_id == registry.courier_death:
+            # Груз и расходы не учитываются: чистый доход 0
+            continue
+        if event_id == registry.bandits:
+            bandit_mean, bandit_second = _bandit_revenue_moments(quantities, probabilities, prices)
+            event_mean = bandit_mean - expenses
+            event_second = bandit_second - 2 * expenses * bandit_mean + expenses ** 2
+            event_revenue, event_expenses = bandit_mean, expenses
+        else:
+            if event_id == registry.wagon_breakdown:
+                extra_mean, extra_variance = repair_mean, repair_variance
+            elif event_id == registry.courier_illness:
+                extra_mean, extra_variance = illness_mean, illness_variance
+            else:
+                extra_mean, extra_variance = 0.0, 0.0
+            event_mean = revenue_mean - expenses - extra_mean
+            event_second = revenue_variance + extra_variance + event_mean ** 2
+            event_revenue, event_expenses = revenue_mean, expenses + extra_mean
+        mean += probability * event_mean
+        second += probability * event_second
+        mean_revenue += probability * event_revenue
+        mean_expenses += probability * event_expenses
+
+    return OutcomeEstimate(mean, second - mean * mean, mean_revenue, mean_expenses)
+
+
+def estimate_caravan(
+        caravan: Caravan,
+        current_cycle: int,
+        goods: Dict[str, GoodsItem],
+        config: RuntimeConfig,
+        difficulty: str = "normal",
+        registry: Optional[Registry] = None,
+        saturation: Optional[Dict[str, float]] = None
+) -> OutcomeEstimate:
+    """
+    Моменты чистого дохода каравана в пути с учётом уже известного:
+    случившегося события или оставшихся бросков (с модификаторами его курьера и повозки).
+
+    Args:
+        caravan (Caravan): Караван.
+        current_cycle (int): Текущий цикл.
+        goods (Dict[str, GoodsItem]): Товары по названию.
+        config (RuntimeConfig): Конфигурация игры.
+        difficulty (str): Уровень сложности.
+        registry (Optional[Registry]): Реестр ID событий.
+        saturation (Optional[Dict[str, float]]): Множители насыщения рынка по товарам
+            на момент продажи.
+
+    Returns:
+        OutcomeEstimate: Моменты чистого дохода.
+    """
+    registry = registry or get_registry(config)
+    city = caravan.destination
+    if caravan.is_rome_expedition():
+        return estimate_outcome(caravan.goods, city, goods, config, difficulty, registry)
+
+    if caravan.event_occurred:
+        event_id = caravan.event_id if caravan.event_id is not None else registry.intern_event(caravan.event_occurred)
+        distribution = {event_id: 1.0}
+    else:
+        rolls = max(caravan.return_cycle - current_cycle, 0)
+        distribution = trip_event_distribution(
+            config, registry, rolls, difficulty, caravan.courier, caravan.wagon
+        )
+    return estimate_outcome(caravan.goods, city, goods, config, difficulty, registry, distribution, saturation)
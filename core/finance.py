@@ -1,84 +1,321 @@
-from typing import Dict, Tuple, Any
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple
 from models.caravan import Caravan
+from models.city import City
 from models.goods_item import GoodsItem
+from core.config import RuntimeConfig
 
+if TYPE_CHECKING:
+    from core.market import MarketSaturation
+    from core.pricing import PricingKernel
 
-def calculate_trip_expenses(days: int, config: dict) -> int:
+# Цена продажи в Риме относительно базовой
+ROME_PRICE_RATIO = 0.9
+# Нижняя граница итогового модификатора цены
+MIN_PRICE_MODIFIER = 0.5
+
+
+def calculate_trip_expenses(days: int, config: RuntimeConfig) -> int:
     """
     Считает расходы на еду, ночлег и охрану за поездку.
 
     Args:
         days (int): Общее количество дней в пути.
-        config (dict): Конфигурация игры.
+        config (RuntimeConfig): Конфигурация игры.
 
     Returns:
         int: Общая сумма расходов.
     """
-    food = config["travel_costs"]["food_per_day"] * days
-    lodging = config["travel_costs"]["lodging_per_2_days"] * (days // 2)
-    guard = config["travel_costs"]["guard_cost_per_trip"]
-    return food + lodging + guard
+    table = config.trip_expenses
+    if 0 <= days < len(table):
+        return table[days]
+    return config.travel_costs.for_days(days)
 
 
-def calculate_sale_profit(
+class SaleBreakdown(Mapping):
+    """
+    Детализация продаж по товарам, вычисляемая лениво.
+    Словарь строится только при первом обращении (например, при показе отчёта).
+    """
+
+    def __init__(self, build: Callable[[], Dict[str, Dict[str, float | int]]]):
+        self._build = build
+        self._data: Optional[Dict[str, Dict[str, float | int]]] = None
+
+    def _materialize(self) -> Dict[str, Dict[str, float | int]]:
+        if self._data is None:
+            self._data = self._build()
+            self._build = None
+        return self._data
+
+    def __getitem__(self, name: str) -> Dict[str, float | int]:
+        return self._materialize()[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._materialize())
+
+    def __len__(self) -> int:
+        return len(self._materialize())
+
+    def __repr__(self) -> str:
+        return f"SaleBreakdown({self._materialize()!r})"
+
+
+def expected_unit_price(
+        item: GoodsItem,
+        city: City,
+        config: RuntimeConfig,
+        event_name: Optional[str] = None,
+        saturation: float = 1.0
+) -> int:
+    """
+    Цена продажи единицы товара в городе при событии (по умолчанию — текущем).
+
+    Args:
+        item (GoodsItem): Товар.
+        city (City): Город продажи.
+        config (RuntimeConfig): Конфигурация игры.
+        event_name (Optional[str]): Событие в городе на момент продажи.
+        saturation (float): Множитель насыщения рынка (в Риме не применяется).
+
+    Returns:
+        int: Цена за единицу.
+    """
+    if city.duration == 0:
+        return rome_unit_price(item.base_price)
+    event_name = event_name or city.current_event or "Нет события"
+    city_mod = city.demand_modifiers.get(item.name, 1.0) - 1.0
+    event_mod = config.event_modifier(event_name, item.name) - 1.0
+    return sale_unit_price(item.base_price, price_modifier(city_mod, event_mod), saturation)
+
+
+def price_modifier(city_mod: float, event_mod: float) -> float:
+    """
+    Итоговый модификатор цены от спроса города и события (без насыщения рынка).
+
+    Args:
+        city_mod (float): Модификатор спроса города минус 1.
+        event_mod (float): Модификатор события минус 1.
+
+    Returns:
+        float: Модификатор не ниже MIN_PRICE_MODIFIER.
+    """
+    return max(MIN_PRICE_MODIFIER, 1.0 + city_mod + event_mod)
+
+
+def sale_unit_price(base_price: float, modifier: float, saturation: float = 1.0) -> int:
+    """
+    Цена продажи единицы товара вне Рима.
+
+    Единая формула для продажи, ожиданий и планировщиков: от порядка
+    умножения зависит округление, поэтому PricingKernel считает
+    матрицы в том же порядке — (база × модификатор) × насыщение.
+
+    Args:
+        base_price (float): Базовая цена товара.
+        modifier (float): Модификатор price_modifier.
+        saturation (float): Множитель насыщения рынка.
+
+    Returns:
+        int: Цена за единицу.
+    """
+    return int(base_price * modifier * saturation)
+
+
+def rome_unit_price(base_price: float) -> int:
+    """Цена продажи единицы товара в Риме (фиксированная доля базовой)."""
+    return int(base_price * ROME_PRICE_RATIO)
+
+
+def saturation_modifier(sales: int, config: RuntimeConfig) -> float:
+    """
+    Множитель цены от насыщения рынка (пороги config.saturation_levels).
+
+    Args:
+        sales (int): Сколько раз товар недавно продавали в этом городе.
+        config (RuntimeConfig): Конфигурация игры.
+
+    Returns:
+        float: Множитель цены последнего достигнутого порога (1.0, если порогов не достигнуто).
+    """
+    modifier = 1.0
+    for threshold, price_modifier in config.saturation_levels:
+        if sales < threshold:
+            break
+        modifier = price_modifier
+    return modifier
+
+
+def _rome_breakdown(cargo: Dict[str, int], goods: Dict[str, GoodsItem]) -> Dict[str, Dict[str, float | int]]:
+    """Детализация продажи в Риме по фиксированной цене."""
+    sale_breakdown = {}
+    for name, quantity in cargo.items():
+        item = goods.get(name)
+        if item is None:
+            continue
+        price = rome_unit_price(item.base_price)
+        sale_breakdown[name] = {
+            "base_price": item.base_price,
+            "qty": quantity,
+            "city_mod": 0,
+            "event_mod": 0,
+            "dist_mod": 0,
+            "market_mod": 0,
+            "final_mod": 1.2,
+            "unit_price": price,
+            "total": price * quantity
+        }
+    return sale_breakdown
+
+
+def _kernel_sale_profit(
         caravan: Caravan,
         goods: Dict[str, GoodsItem],
-        config: dict
-) -> Tuple[int, Dict[str, Dict[str, float | int]]]:
-    profit = 0
+        market: Optional["MarketSaturation"],
+        kernel: "PricingKernel"
+) -> Tuple[int, SaleBreakdown]:
+    """Выручка по матрицам ядра цен: груз переводится в ID товаров один раз."""
     destination = caravan.destination
-    event_name = destination.current_event or "Нет события"
-    sale_breakdown = {}
+    cargo = caravan.goods
+    city_id = destination.city_id
+    event_id = kernel.city_event_id(destination)
+    good_index = kernel.good_index
+    # Груз по ID товара; неизвестные товары пропускаются
+    lots = [(name, good_index[name], quantity) for name, quantity in cargo.items() if name in good_index]
 
-    if destination.duration == 0:
-        for name, quantity in caravan.goods.items():
+    # Множители фиксируются до продажи: продажа сразу изменит насыщение, а детализация строится позже
+    rome = destination.duration == 0
+    prices = {}
+    modifiers = {}
+    for name, good_id, quantity in lots:
+        base_price = float(kernel.base_prices[good_id])
+        if rome:
+            prices[good_id] = rome_unit_price(base_price)
+            continue
+        city_mod = float(kernel.demand[city_id, good_id])
+        event_mod = float(kernel.event_mods[event_id, good_id])
+        market_modifier = float(market.factors[city_id, good_id]) if market is not None else 1.0
+        modifier = price_modifier(city_mod, event_mod)
+        prices[good_id] = sale_unit_price(base_price, modifier, market_modifier)
+        modifiers[good_id] = (city_mod, event_mod, market_modifier, modifier)
+    profit = sum(prices[good_id] * quantity for _, good_id, quantity in lots)
+
+    if rome:
+        return profit, SaleBreakdown(lambda: _rome_breakdown(cargo, goods))
+
+    def build() -> Dict[str, Dict[str, float | int]]:
+        sale_breakdown = {}
+        for name, good_id, quantity in lots:
             item = goods.get(name)
             if item is None:
                 continue
-
-            price = int(item.base_price * 0.9)
-            total_price = price * quantity
-            profit += total_price
-
+            city_mod, event_mod, market_modifier, final_modifier = modifiers[good_id]
+            price = prices[good_id]
             sale_breakdown[name] = {
                 "base_price": item.base_price,
                 "qty": quantity,
-                "city_mod": 0,
-                "event_mod": 0,
+                "city_mod": round(city_mod, 2),
+                "event_mod": round(event_mod, 2),
                 "dist_mod": 0,
-                "final_mod": 1.2,
+                "market_mod": round(market_modifier - 1.0, 2),
+                "final_mod": round(final_modifier * market_modifier, 2),
                 "unit_price": price,
-                "total": total_price
+                "total": price * quantity
             }
-        return profit, sale_breakdown
+        return sale_breakdown
+
+    return profit, SaleBreakdown(build)
 
-    for name, quantity in caravan.goods.items():
+
+def calculate_sale_profit(
+        caravan: Caravan,
+        goods: Dict[str, GoodsItem],
+        config: RuntimeConfig,
+        market: Optional["MarketSaturation"] = None,
+        kernel: Optional["PricingKernel"] = None
+) -> Tuple[int, SaleBreakdown]:
+    """
+    Считает выручку от продажи груза каравана.
+
+    С ядром цен груз один раз переводится в вектор по ID товара, а цены
+    берутся из его матриц (строка города, строка события, строка
+    MarketSaturation.factors). Без numpy цены считаются по словарям
+    города и конфигурации с той же формулой.
+
+    Args:
+        caravan (Caravan): Караван с грузом.
+        goods (Dict[str, GoodsItem]): Товары по названию.
+        config (RuntimeConfig): Конфигурация игры.
+        market (Optional[MarketSaturation]): Насыщение рынка; без него цены не снижаются.
+        kernel (Optional[PricingKernel]): Ядро цен игры (города в том же порядке, что в мире).
+
+    Returns:
+        Tuple[int, SaleBreakdown]: Выручка и ленивая детализация по товарам.
+    """
+    if kernel is not None:
+        return _kernel_sale_profit(caravan, goods, market, kernel)
+
+    profit = 0
+    destination = caravan.destination
+    event_name = destination.current_event or "Нет события"
+    cargo = caravan.goods
+
+    if destination.duration == 0:
+        for name, quantity in cargo.items():
+            item = goods.get(name)
+            if item is not None:
+                profit += rome_unit_price(item.base_price) * quantity
+
+        return profit, SaleBreakdown(lambda: _rome_breakdown(cargo, goods))
+
+    demand = destination.demand_modifiers
+    good_index = config.good_index
+    event_row = config.event_price_rows.get(event_name, config.neutral_price_row)
+    # Множители насыщения фиксируются до продажи: детализация строится позже
+    saturation = {}
+    if market is not None:
+        for name in cargo:
+            modifier = market.modifier(destination.city_id, name)
+            if modifier != 1.0:
+                saturation[name] = modifier
+
+    for name, quantity in cargo.items():
         item = goods.get(name)
         if item is None:
             continue
+        index = good_index.get(name)
+        event_modifier = event_row[index] if index is not None else 1.0
+        final_modifier = price_modifier(demand.get(name, 1.0) - 1.0, event_modifier - 1.0)
+        profit += sale_unit_price(item.base_price, final_modifier, saturation.get(name, 1.0)) * quantity
 
-        city_mod = destination.demand_modifiers.get(name, 1.0) - 1.0
-        event_mod = config["event_modifiers"].get(event_name, {}).get(name, 1.0) - 1.0
-
-        # Защита от экстремальных значений
-        final_modifier = max(0.5, 1.0 + city_mod + event_mod)
+    def build() -> Dict[str, Dict[str, float | int]]:
+        sale_breakdown = {}
+        for name, quantity in cargo.items():
+            item = goods.get(name)
+            if item is None:
+                continue
 
-        price = int(item.base_price * final_modifier)
-        total_price = price * quantity
-        profit += total_price
+            city_mod = demand.get(name, 1.0) - 1.0
+            index = good_index.get(name)
+            event_mod = (event_row[index] if index is not None else 1.0) - 1.0
+            market_modifier = saturation.get(name, 1.0)
+            final_modifier = price_modifier(city_mod, event_mod)
+            price = sale_unit_price(item.base_price, final_modifier, market_modifier)
 
-        sale_breakdown[name] = {
-            "base_price": item.base_price,
-            "qty": quantity,
-            "city_mod": round(city_mod, 2),
-            "event_mod": round(event_mod, 2),
-            "dist_mod": 0,
-            "final_mod": round(final_modifier, 2),
-            "unit_price": price,
-            "total": total_price
-        }
+            sale_breakdown[name] = {
+                "base_price": item.base_price,
+                "qty": quantity,
+                "city_mod": round(city_mod, 2),
+                "event_mod": round(event_mod, 2),
+                "dist_mod": 0,
+                "market_mod": round(market_modifier - 1.0, 2),
+                "final_mod": round(final_modifier * market_modifier, 2),
+                "unit_price": price,
+                "total": price * quantity
+            }
+        return sale_breakdown
 
-    return profit, sale_breakdown
+    return profit, SaleBreakdown(build)
 
 
 def generate_report(
@@ -86,7 +323,7 @@ def generate_report(
         expenses: int,
         event_path: str,
         event_city: str,
-        sale_breakdown: Dict[str, Dict[str, float | int]]
+        sale_breakdown: Mapping
 ) -> Dict[str, Any]:
     """
     Генерирует финансовый отчёт по завершению миссии каравана.
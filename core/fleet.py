@@ -0,0 +1,225 @@
+"""
+Диспетчер флота: какие курьеры и повозки свободны и кого отправить в рейс.
+
+Свободные активы лежат в корзинах по типу (одинаковые характеристики
+взаимозаменяемы), а непустые типы — в отсортированном списке. Поэтому
+проверка «свободен ли актив» и выдача актива стоят O(1) по числу активов
+и зависят только от числа различных типов, которых в игре единицы,
+даже когда у игрока сотни курьеров и повозок.
+
+Подбор: повозка — самая маленькая из вмещающих груз; самые надёжные
+курьеры и повозки (меньше illness_resistance и durability — меньше
+шанс болезни и поломки) уходят на самые рискованные маршруты, а на
+безопасные — наименее надёжные из свободных.
+"""
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+from models.caravan import Caravan
+from models.courier import Courier
+from models.player import Player
+from models.wagon import Wagon
+
+T = TypeVar("T")
+
+
+class AssetPool(Generic[T]):
+    """
+    Свободные и занятые активы одного вида.
+
+    Активы различаются по id(): одинаковые курьеры и повозки — разные объекты.
+
+    Атрибуты:
+        busy (Dict[int, int]): id занятого актива → цикл его возвращения.
+    """
+
+    def __init__(self, key: Callable[[T], tuple]):
+        """
+        Args:
+            key (Callable[[T], tuple]): Тип актива; меньший ключ — более надёжный актив.
+        """
+        self.key = key
+        self.busy: Dict[int, int] = {}
+        self._assets: Dict[int, T] = {}
+        self._buckets: Dict[tuple, Dict[int, T]] = {}
+        self._keys: List[tuple] = []  # Непустые типы по возрастанию ключа
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    @property
+    def idle_count(self) -> int:
+        """Число свободных активов."""
+        return len(self._assets) - len(self.busy)
+
+    @property
+    def types(self) -> List[tuple]:
+        """Типы, у которых есть свободные активы, по возрастанию ключа."""
+        return self._keys
+
+    def _push(self, asset: T) -> None:
+        key = self.key(asset)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = {}
+        if not bucket:
+            insort(self._keys, key)
+        bucket[id(asset)] = asset
+
+    def _pop(self, asset: T) -> None:
+        key = self.key(asset)
+        bucket = self._buckets[key]
+        del bucket[id(asset)]
+        if not bucket:
+            del self._keys[bisect_left(self._keys, key)]
+
+    def add(self, asset: T) -> None:
+        """Добавляет новый свободный актив."""
+        if id(asset) not in self._assets:
+            self._assets[id(asset)] = asset
+            self._push(asset)
+
+    def remove(self, asset: T) -> None:
+        """Убирает актив из флота насовсем."""
+        if self._assets.pop(id(asset), None) is not None:
+            if self.busy.pop(id(asset), None) is None:
+                self._pop(asset)
+
+    def is_idle(self, asset: T) -> bool:
+        """Свободен ли актив (O(1))."""
+        return id(asset) in self._assets and id(asset) not in self.busy
+
+    def take(self, asset: T, return_cycle: int) -> None:
+        """
+        Отмечает актив занятым до цикла return_cycle.
+
+        Raises:
+            ValueError: Если актив не во флоте или уже занят.
+        """
+        if not self.is_idle(asset):
+            raise ValueError(f"{getattr(asset, 'name', asset)} сейчас недоступен")
+        self._pop(asset)
+        self.busy[id(asset)] = return_cycle
+
+    def release(self, asset: T) -> None:
+        """Возвращает актив в число свободных."""
+        if self.busy.pop(id(asset), None) is not None:
+            self._push(asset)
+
+    def first(self, key: tuple) -> T:
+        """Любой свободный актив заданного типа."""
+        return next(iter(self._buckets[key].values()))
+
+    def idle(self) -> List[T]:
+        """Свободные активы, от самых надёжных к наименее надёжным."""
+        return [asset for key in self._keys for asset in self._buckets[key].values()]
+
+
+def _pick_by_risk(keys: List[tuple], risk: float) -> tuple:
+    """Тип по риску маршрута: 1.0 — самый надёжный (первый), 0.0 — наименее надёжный (последний)."""
+    risk = min(max(risk, 0.0), 1.0)
+    return keys[int(round((1.0 - risk) * (len(keys) - 1)))]
+
+
+class FleetManager:
+    """
+    Учёт занятости курьеров и повозок игрока и автоматическое назначение на рейсы.
+
+    Атрибуты:
+        couriers (AssetPool[Courier]): Курьеры; тип — illness_resistance.
+        wagons (AssetPool[Wagon]): Повозки; тип — (capacity, durability).
+    """
+
+    def __init__(self):
+        self.couriers: AssetPool[Courier] = AssetPool(lambda courier: (courier.illness_resistance,))
+        self.wagons: AssetPool[Wagon] = AssetPool(lambda wagon: (wagon.capacity, wagon.durability))
+
+    def rebuild(self, player: Player, caravans: Iterable[Caravan]) -> None:
+        """
+        Пересобирает учёт по активам игрока и караванам в пути (например, после загрузки).
+
+        Args:
+            player (Player): Игрок.
+            caravans (Iterable[Caravan]): Активные караваны.
+        """
+        self.__init__()
+        for courier in player.couriers:
+            self.couriers.add(courier)
+        for wagon in player.wagons:
+            self.wagons.add(wagon)
+        for caravan in caravans:
+            if caravan.resolved:
+                continue
+            # Активы вне списков игрока (или уже учтённые) пропускаются
+            for pool, asset in ((self.couriers, caravan.courier), (self.wagons, caravan.wagon)):
+                if pool.is_idle(asset):
+                    pool.take(asset, caravan.return_cycle)
+
+    def dispatch(self, caravan: Caravan) -> None:
+        """
+        Отмечает курьера и повозку каравана занятыми до его возвращения.
+
+        Raises:
+            ValueError: Если курьер или повозка уже в пути.
+        """
+        if not self.wagons.is_idle(caravan.wagon):
+            raise ValueError(f"Повозка «{caravan.wagon.name}» сейчас недоступна")
+        self.couriers.take(caravan.courier, caravan.return_cycle)
+        self.wagons.take(caravan.wagon, caravan.return_cycle)
+
+    def release(self, caravan: Caravan) -> None:
+        """Возвращает курьера и повозку каравана в число свободных."""
+        self.couriers.release(caravan.courier)
+        self.wagons.release(caravan.wagon)
+
+    def largest_idle_capacity(self) -> int:
+        """Вместимость самой большой свободной повозки (0, если свободных нет)."""
+        types = self.wagons.types
+        return types[-1][0] if types else 0
+
+    def pick_courier(self, risk: float) -> Optional[Courier]:
+        """
+        Свободный курьер для маршрута с относительным риском risk.
+
+        Args:
+            risk (float): Риск маршрута от 0 (безопасный) до 1 (самый опасный).
+
+        Returns:
+            Optional[Courier]: Курьер или None, если свободных нет.
+        """
+        types = self.couriers.types
+        if not types:
+            return None
+        return self.couriers.first(_pick_by_risk(types, risk))
+
+    def pick_wagon(self, units: int, risk: float) -> Optional[Wagon]:
+        """
+        Самая маленькая свободная повозка, вмещающая груз; среди повозок
+        этой вместимости надёжность подбирается по риску маршрута.
+
+        Args:
+            units (int): Размер груза.
+            risk (float): Риск маршрута от 0 до 1.
+
+        Returns:
+            Optional[Wagon]: Повозка или None, если груз не помещается ни в одну свободную.
+        """
+        types = self.wagons.types
+        start = bisect_left(types, (units,))
+        if start == len(types):
+            return None
+        capacity = types[start][0]
+        end = bisect_left(types, (capacity, float("inf")), start)
+        return self.wagons.first(_pick_by_risk(types[start:end], risk))
+
+    def assign(self, units: int, risk: float) -> Optional[Tuple[Courier, Wagon]]:
+        """
+        Подбирает курьера и повозку для груза размером units.
+
+        Returns:
+            Optional[Tuple[Courier, Wagon]]: Пара или None, если подходящих свободных нет.
+        """
+        courier = self.pick_courier(risk)
+        wagon = self.pick_wagon(units, risk)
+        if courier is None or wagon is None:
+            return None
+        return courier, wagon
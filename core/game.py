@@ -1,45 +1,223 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from models.city import City
 from models.goods_item import GoodsItem
 from models.player import Player
 from models.caravan import Caravan
 from models.courier import Courier
 from models.wagon import Wagon
-from core.events import choose_city_event
+from core.events import choose_city_event_ids, trip_event_distribution
+from core.caravan import (
+    update_caravan_event_once,
+    preroll_caravan_event,
+    apply_scheduled_event,
+    process_completed_caravan
+)
+from core.pricing import NUMPY_AVAILABLE, PricingKernel
+from core.registry import get_registry
+from core.caravan_store import CaravanStore
+from core.caravan_index import CaravanIndex
+from core.changes import ChangeFeed
+from core.config import DEFAULT_DURABILITY, RuntimeConfig
+from core.timing_wheel import TimingWheel
+from core.rng import RngService
+from core.cargo import CargoPlan, plan_cargo
+from core.routes import RouteRecommender, RouteScore
+from core.expectation import OutcomeEstimate, estimate_caravan, estimate_outcome
+from core.market import MarketSaturation
+from core.fleet import FleetManager
+from core.reports import ReportStore
+from core.progression import (
+    UNLOCK_CITIES,
+    UNLOCK_COURIER,
+    UNLOCK_WAGON,
+    ProgressionEngine,
+    UnlockEvent,
+    unlock_kind,
+    unlocked_city_count
+)
+from core.world import generate_cities
 
 
 class Game:
     """
     Класс для управления основным игровым процессом.
     """    
-    def __init__(self, player: Player, cities: List[City], goods: List[GoodsItem], config: dict, difficulty: str = "normal"):
+    def __init__(
+            self,
+            player: Player,
+            cities: List[City],
+            goods: List[GoodsItem],
+            config: RuntimeConfig,
+            difficulty: str = "normal",
+            verbose: bool = True,
+            preroll_events: bool = False,
+            rng: Optional[RngService] = None
+    ):
         """
         Инициализация игры.
+
+        Args:
+            verbose (bool): Печатать ли отчёты о завершённых караванах в консоль.
+                Безголовая симуляция отключает вывод.
+            preroll_events (bool): Разыгрывать события в пути один раз при отправке
+                каравана вместо броска в каждом цикле.
+            rng (Optional[RngService]): Потоки случайных чисел партии; без него
+                создаются потоки со случайным зерном.
         """
         self.player = player
         self.cities = cities
         self.goods = goods
+        self.goods_dict = {g.name: g for g in goods}
         self.config = config
-        self.difficulty = difficulty        
+        self.difficulty = difficulty
+        self.verbose = verbose
+        self.preroll_events = preroll_events
+        self.rng = rng if rng is not None else RngService()
         self.current_cycle = 1
-        self.max_cycles = config["player"]["cycles_to_win"]
-        self.victory_goal = config["player"]["victory_goal"]
-        self.active_caravans: List[Caravan] = []
-        self.caravan_reports: List[dict] = []  # Отчеты о завершенных караванах
+        self.max_cycles = config.cycles_to_win
+        self.victory_goal = config.victory_goal
+        # ID товаров и событий; названия нужны только интерфейсу
+        self.registry = get_registry(config)
+        # Векторизованная модель цен (если установлен numpy)
+        self.pricing = PricingKernel(goods, cities, config) if NUMPY_AVAILABLE else None
+        self.active_caravans = CaravanStore(self.registry)
+        # Закупочные цены по ID товара (столбцы груза в CaravanStore)
+        self.purchase_prices = [
+            self.goods_dict[name].base_price if name in self.goods_dict else 0
+            for name in self.registry.goods
+        ]
+        # Индексы активных караванов по городу, фазе рейса и циклу отправки
+        self.caravan_index = CaravanIndex()
+        # Затухающие счётчики продаж по городам и товарам
+        self.market = MarketSaturation(len(cities), self.registry, config)
+        # Рейтинг маршрутов; оценки городов сбрасываются после продаж и по прогнозу рынка
+        self.routes = RouteRecommender(cities, goods, config, difficulty, self.registry, self.market)
+        # Расписания: возвращение караванов по циклу и караваны, ждущие события в пути
+        self.return_wheel: TimingWheel[Caravan] = TimingWheel()
+        self.event_wheel: TimingWheel[Caravan] = TimingWheel()
+        # Отчёты о завершённых караванах (последние) и итоги рейсов за всю игру
+        self.reports = ReportStore()
+        # Занятость курьеров и повозок
+        self.fleet = FleetManager()
+        self.fleet.rebuild(player, [])
+        self._trip_risk: Dict[int, float] = {}
+        # Прогрессия: пороги баланса проверяются при каждом его изменении
+        self.progression = ProgressionEngine(config)
+        self.unlock_events: List[UnlockEvent] = []  # История открытий
+        self.pending_unlocks: List[UnlockEvent] = []  # Ещё не показанные интерфейсу
+        # Лента изменений для интерфейса (раздаётся подписчикам по flush)
+        self.changes = ChangeFeed(player.balance)
+        self.player.on_balance_change = self.on_balance_change
+        self.player.on_inventory_change = self.changes.inventory_changed
+        self.check_progression(self.player.balance)
 
     def next_cycle(self) -> None:
         """
         Переход к следующему игровому циклу.
         """
         self.current_cycle += 1
+        self.caravan_index.advance(self.current_cycle)
+        self.changes.cycle_advanced(self.current_cycle)
         self.update_city_events()
+        self.update_market()
     
     def update_city_events(self) -> None:
         """
         Обновляет события для всех городов.
         """
-        for city in self.cities:
-            city.current_event = choose_city_event(self.config, self.difficulty)
+        event_ids = choose_city_event_ids(
+            self.config, len(self.cities), self.registry, self.difficulty, self.rng.city_events
+        )
+        event_names = self.registry.events
+        changed = []
+        for index, (city, event_id) in enumerate(zip(self.cities, event_ids)):
+            if city.current_event_id != event_id:
+                changed.append(index)
+            city.current_event_id = event_id
+            city.current_event = event_names[event_id]
+        # Рейтинг маршрутов зависит от распределения событий, а не от текущих
+        if changed:
+            self.changes.city_events_changed(changed)
+
+    def update_market(self) -> None:
+        """
+        Затухание насыщения рынков за цикл (оценки маршрутов устаревают по прогнозу рынка).
+        """
+        self.market.advance()
+
+    def on_balance_change(self, balance: int) -> None:
+        """
+        Обработчик изменения баланса игрока: лента изменений и пороги прогрессии.
+        """
+        self.changes.balance_changed(balance)
+        self.check_progression(balance)
+
+    def check_progression(self, balance: int) -> None:
+        """
+        Применяет открытия порогов, достигнутых при балансе balance.
+        """
+        for threshold, name in self.progression.advance(balance):
+            self.apply_unlock(threshold, name)
+
+    def apply_unlock(self, threshold: int, name: str) -> UnlockEvent:
+        """
+        Применяет открытие: добавляет курьера, повозку или новые города.
+
+        Args:
+            threshold (int): Достигнутый порог баланса.
+            name (str): Название открытия из config.progression.
+
+        Returns:
+            UnlockEvent: Событие открытия.
+        """
+        kind = unlock_kind(name, self.config)
+        event = UnlockEvent(threshold=threshold, name=name, kind=kind, cycle=self.current_cycle)
+
+        if kind == UNLOCK_COURIER:
+            data = self.config.couriers[name]
+            self.player.couriers.append(Courier(
+                name=data["name"],
+                endurance=data.get("endurance", 0),
+                illness_resistance=data.get("illness_resistance", 1.0)
+                / self.config.illness_resistance_multiplier
+            ))
+            self.fleet.couriers.add(self.player.couriers[-1])
+            event.added.append(name)
+        elif kind == UNLOCK_WAGON:
+            data = self.config.wagons[name]
+            self.player.wagons.append(Wagon(
+                name=data["name"],
+                capacity=data["capacity"],
+                durability=data.get("durability", DEFAULT_DURABILITY)
+            ))
+            self.fleet.wagons.add(self.player.wagons[-1])
+            event.added.append(name)
+        elif kind == UNLOCK_CITIES:
+            cities = generate_cities(self.config, unlocked_city_count(name), self.cities, self.rng.world)
+            self.add_cities(cities)
+            event.added.extend(city.name for city in cities)
+
+        self.unlock_events.append(event)
+        self.pending_unlocks.append(event)
+        self.changes.unlocked(event)
+        return event
+
+    def add_cities(self, cities: List[City]) -> None:
+        """
+        Добавляет города в конец списка мира (события им назначаются со следующего цикла).
+        """
+        self.cities.extend(cities)
+        if self.pricing is not None:
+            self.pricing.set_cities(self.cities)
+        self.market.add_cities(len(cities))
+
+    def pop_unlocks(self) -> List[UnlockEvent]:
+        """
+        Забирает открытия, о которых интерфейс ещё не сообщил игроку.
+        """
+        events = self.pending_unlocks
+        self.pending_unlocks = []
+        return events
 
     def is_game_over(self) -> bool:
         """
@@ -84,63 +262,218 @@ class Game:
             return_cycle=return_cycle
         )
 
+        # Проверка занятости до того, как караван попадёт в расписания
+        self.fleet.dispatch(caravan)
+        if self.preroll_events:
+            preroll_caravan_event(caravan, self.config, self.difficulty, self.registry, self.rng.travel_events)
         self.active_caravans.append(caravan)
+        self.caravan_index.add(caravan, self.current_cycle)
+        self.schedule_caravan(caravan)
+        self.changes.caravan_departed(caravan)
         return caravan
 
+    def trip_risk(self, duration: int) -> float:
+        """
+        Вероятность неблагоприятного события (набег, поломка, болезнь, гибель)
+        за рейс длительностью duration циклов.
+        """
+        risk = self._trip_risk.get(duration)
+        if risk is None:
+            distribution = trip_event_distribution(self.config, self.registry, duration, self.difficulty)
+            harmful = (
+                self.registry.bandits,
+                self.registry.wagon_breakdown,
+                self.registry.courier_illness,
+                self.registry.courier_death
+            )
+            risk = self._trip_risk[duration] = sum(distribution.get(event_id, 0.0) for event_id in harmful)
+        return risk
+
+    def route_risk(self, city: City) -> float:
+        """
+        Риск маршрута относительно самого опасного города мира (от 0 до 1).
+        """
+        highest = max(self.trip_risk(c.duration) for c in self.cities)
+        return self.trip_risk(city.duration) / highest if highest > 0 else 0.0
+
+    def assign_fleet(self, units: int, city: City) -> Optional[Tuple[Courier, Wagon]]:
+        """
+        Подбирает свободных курьера и повозку для груза размером units в город city.
+
+        Returns:
+            Optional[Tuple[Courier, Wagon]]: Пара или None, если подходящих свободных нет.
+        """
+        return self.fleet.assign(units, self.route_risk(city))
+
+    def rebuild_fleet(self) -> None:
+        """
+        Пересобирает учёт занятости по активам игрока и караванам в пути (например, после загрузки).
+        """
+        self.fleet.rebuild(self.player, self.active_caravans)
+
+    def rebuild_caravan_index(self) -> None:
+        """
+        Пересобирает индексы активных караванов (например, после загрузки).
+        """
+        self.caravan_index.rebuild(self.active_caravans, self.current_cycle)
+
+    def plan_cargo(self, wagon: Wagon, city: City, courier: Optional[Courier] = None) -> CargoPlan:
+        """
+        Подбирает груз со склада для повозки и города назначения (автозагрузка).
+        Оценка итога учитывает надёжность повозки и курьера (если он выбран).
+        """
+        return plan_cargo(
+            self.player.inventory,
+            wagon.capacity,
+            city,
+            self.goods_dict,
+            self.config,
+            self.difficulty,
+            self.registry,
+            self.market.city_sales(city.city_id, city.duration),
+            courier=courier,
+            wagon=wagon
+        )
+
+    def estimate_outcome(
+            self,
+            cargo: Dict[str, int],
+            city: City,
+            courier: Optional[Courier] = None,
+            wagon: Optional[Wagon] = None
+    ) -> OutcomeEstimate:
+        """
+        Ожидание и разброс чистого дохода рейса с грузом cargo в город city
+        (с учётом надёжности курьера и повозки, если они известны).
+        """
+        return estimate_outcome(
+            cargo, city, self.goods_dict, self.config, self.difficulty, self.registry,
+            saturation=self.market.modifiers(city.city_id, city.duration),
+            courier=courier,
+            wagon=wagon
+        )
+
+    def estimate_caravan(self, caravan: Caravan) -> OutcomeEstimate:
+        """
+        Ожидание и разброс чистого дохода каравана в пути с учётом текущего цикла.
+        """
+        cycles_left = caravan.return_cycle - self.current_cycle
+        return estimate_caravan(
+            caravan, self.current_cycle, self.goods_dict, self.config, self.difficulty, self.registry,
+            saturation=self.market.modifiers(caravan.destination.city_id, cycles_left)
+        )
+
+    def recommend_routes(self, capacity: Optional[int] = None) -> List[RouteScore]:
+        """
+        Рейтинг городов по ожидаемой прибыли за цикл (кэшируется до смены событий).
+
+        Args:
+            capacity (Optional[int]): Вместимость повозки; по умолчанию — самая большая у игрока.
+        """
+        if capacity is None:
+            capacity = max((wagon.capacity for wagon in self.player.wagons), default=0)
+        return self.routes.ranking(capacity)
+
+    def schedule_caravan(self, caravan: Caravan) -> None:
+        """
+        Ставит караван в расписания возвращения и бросков событий в пути.
+        """
+        self.return_wheel.schedule(caravan.return_cycle, caravan)
+        if caravan.scheduled_event_id is not None:
+            # Событие уже разыграно: караван нужен только в цикле события
+            self.event_wheel.schedule(caravan.scheduled_event_cycle, caravan)
+        elif self.preroll_events:
+            return
+        elif not caravan.is_rome_expedition() and not caravan.event_occurred:
+            # Первый бросок — в следующем обрабатываемом цикле, но не раньше отправки
+            self.event_wheel.schedule(max(caravan.departure_cycle, self.current_cycle), caravan)
+
+    def rebuild_schedules(self) -> None:
+        """
+        Пересобирает расписания по активным караванам (например, после загрузки).
+        """
+        self.return_wheel.clear()
+        self.event_wheel.clear()
+        for caravan in self.active_caravans:
+            if not caravan.resolved:
+                self.schedule_caravan(caravan)
+
     def update_caravans(self) -> None:
         """
         Обновляет все активные караваны.
         """
-        from core.caravan import update_caravan_event_once, process_completed_caravan
-        goods_dict = {g.name: g for g in self.goods}
-        finished = []
+        store = self.active_caravans
+        cycle = self.current_cycle
 
-        for caravan in self.active_caravans:
-            if caravan.resolved:
+        # Броски событий только для караванов в пути без события
+        for caravan in self.event_wheel.pop_due(cycle):
+            if caravan.resolved or caravan.event_occurred:
                 continue
+            if caravan.scheduled_event_id is not None:
+                apply_scheduled_event(caravan, cycle, self.registry)
+            elif caravan.departure_cycle <= cycle <= caravan.return_cycle:
+                update_caravan_event_once(
+                    caravan, cycle, self.config, self.difficulty, self.registry, self.rng.travel_events
+                )
+            if caravan.event_id is not None:
+                self.changes.travel_event(caravan)
+            if not caravan.event_occurred and caravan.scheduled_event_id is None and cycle < caravan.return_cycle:
+                self.event_wheel.schedule(cycle + 1, caravan)
 
-            update_caravan_event_once(caravan, self.current_cycle, self.config, self.difficulty)
+        # Завершение только тех караванов, чей цикл возвращения наступил
+        finished_rows = []
+        for caravan in self.return_wheel.pop_due(cycle):
+            if caravan.resolved:
+                continue
 
+            # Закупочная стоимость груза до потерь в пути — для окупаемости маршрута
+            row = store.row_of(caravan)
+            cargo_cost = store.cargo_cost(row, self.purchase_prices)
             report, done = process_completed_caravan(
                 caravan=caravan,
                 player=self.player,
                 current_cycle=self.current_cycle,
-                goods_dict=goods_dict,
-                config=self.config
+                goods_dict=self.goods_dict,
+                config=self.config,
+                registry=self.registry,
+                rng=self.rng.losses,
+                market=self.market,
+                kernel=self.pricing
             )
 
             if done:
-                # Сохраняем отчет с информацией о караване
-                report_with_caravan = {
-                    **report,
-                    "caravan_id": id(caravan),  # Уникальный идентификатор каравана
-                    "destination": caravan.destination.name,
-                    "departure_cycle": caravan.departure_cycle,
-                    "return_cycle": caravan.return_cycle,
-                    "goods": caravan.goods.copy(),
-                    "courier_name": caravan.courier.name,
-                    "wagon_name": caravan.wagon.name,
-                    "completion_cycle": self.current_cycle
-                }
-                self.caravan_reports.append(report_with_caravan)
+                self.fleet.release(caravan)
+                self.caravan_index.remove(caravan)
+                if caravan.goods and not caravan.is_rome_expedition():
+                    self.routes.invalidate([store.destination[row]])
+                report_id = self.reports.record(caravan, report, self.current_cycle, cargo_cost)
+                self.changes.caravan_returned(caravan, report_id)
                 
-                print("Караван завершён:")
-                print("  Событие в пути:", report["event_path"])
-                print("  Событие в городе:", report["event_city"])
-                for name, data in report["sale_breakdown"].items():
-                    print(f"  - {name}:")
-                    print(f"     {data['qty']} ед. × {data['unit_price']} (баз. {data['base_price']})")
-                    print(
-                        f"     Модификаторы: город {data['city_mod']:+.2f}, ивент {data['event_mod']:+.2f}, дальность {data['dist_mod']:+.2f}")
-                    print(f"     Итоговый множитель: {data['final_mod']:.2f}")
-                print(f"  Прибыль: {report['profit']}")
-                print(f"  Расходы: {report['expenses']}")
-                print(f"  Чистый доход: {report['net']}")
+                if self.verbose:
+                    self.print_report(report)
                 caravan.resolved = True
-                finished.append(caravan)
+                finished_rows.append(row)
+
+        store.retire(finished_rows)
 
-        for c in finished:
-            self.active_caravans.remove(c)
+    @staticmethod
+    def print_report(report: dict) -> None:
+        """
+        Печатает отчёт о завершённом караване в консоль.
+        """
+        print("Караван завершён:")
+        print("  Событие в пути:", report["event_path"])
+        print("  Событие в городе:", report["event_city"])
+        for name, data in report["sale_breakdown"].items():
+            print(f"  - {name}:")
+            print(f"     {data['qty']} ед. × {data['unit_price']} (баз. {data['base_price']})")
+            print(
+                f"     Модификаторы: город {data['city_mod']:+.2f}, ивент {data['event_mod']:+.2f}, "
+                f"дальность {data['dist_mod']:+.2f}, рынок {data.get('market_mod', 0):+.2f}")
+            print(f"     Итоговый множитель: {data['final_mod']:.2f}")
+        print(f"  Прибыль: {report['profit']}")
+        print(f"  Расходы: {report['expenses']}")
+        print(f"  Чистый доход: {report['net']}")
 
     def reset_for_new_cycle(self) -> None:
         """
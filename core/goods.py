@@ -1,23 +1,24 @@
 from typing import List, Optional
 from models.goods_item import GoodsItem
+from core.config import RuntimeConfig
 
 
-def load_goods(config: dict) -> List[GoodsItem]:
+def load_goods(config: RuntimeConfig) -> List[GoodsItem]:
     """
     Загружает список товаров из конфигурации.
 
     Args:
-        config (dict): Конфигурация из balance_config.json.
+        config (RuntimeConfig): Скомпилированная конфигурация.
 
     Returns:
         List[GoodsItem]: Список объектов товаров.
     """
     goods = []
-    for item in config["goods"]:
+    for item in config.goods:
         goods.append(GoodsItem(
-            name=item["name"],
-            base_price=item["base_price"],
-            category=item["category"]
+            name=item.name,
+            base_price=item.base_price,
+            category=item.category
         ))
     return goods
 
@@ -0,0 +1,286 @@
+"""
+Насыщение рынка: недавние продажи товаров по городам.
+
+Счётчик продаж каждой пары (город, товар) хранится в плоском массиве
+array('d') размера «города × товары». Каждая продажа товара караваном
+добавляет к счётчику единицу, а каждый цикл счётчики затухают
+(умножаются на config.saturation_decay).
+
+Затухание ленивое: счётчик хранится вместе с циклом последнего изменения,
+а текущее значение — это счётчик × decay ** (прошло циклов). Смена цикла
+стоит O(1) плюс число ячеек, у которых в этом цикле меняется множитель
+цены: множитель зависит только от целой части счётчика (пороги
+config.saturation_levels целые), поэтому цикл следующей смены множителя
+каждой ячейки вычисляется заранее и ставится в TimingWheel.
+
+Множители цен всех пар лежат в матрице factors (np.ndarray «города ×
+товары», без numpy — плоский array('d')), которую PricingKernel
+использует напрямую. В сохранение пишутся счётчики, приведённые
+к текущему циклу, одним блоком.
+"""
+from array import array
+from math import floor, log
+from typing import Dict, List
+from core.config import RuntimeConfig
+from core.finance import saturation_modifier
+from core.pricing import NUMPY_AVAILABLE, np
+from core.registry import Registry
+from core.timing_wheel import TimingWheel
+
+# Счётчики меньше этого значения обнуляются: город снова «тихий»
+MIN_SALES = 0.01
+# Нет запланированной смены множителя
+NO_STEP = -1
+
+
+class MarketSaturation:
+    """
+    Затухающие счётчики продаж по городам и товарам.
+
+    Атрибуты:
+        city_count (int): Число городов (строки массива, позиция города в списке мира).
+        good_count (int): Число товаров (столбцы массива, ID товара в реестре).
+        decay (float): Доля счётчика, остающаяся через цикл.
+        cycle (int): Число прошедших циклов (отсчёт затухания).
+        factors: Множители цен, форма (city_count, good_count) — np.ndarray,
+            если установлен numpy, иначе плоский array('d').
+    """
+
+    def __init__(self, city_count: int, registry: Registry, config: RuntimeConfig):
+        """
+        Args:
+            city_count (int): Число городов мира.
+            registry (Registry): Реестр ID товаров.
+            config (RuntimeConfig): Конфигурация игры (пороги и затухание насыщения).
+        """
+        self.city_count = city_count
+        self.good_count = len(registry.goods)
+        self.good_ids = registry.good_ids
+        self.decay = config.saturation_decay
+        self.cycle = 0
+
+        # Пороги целые, поэтому множитель зависит только от целой части счётчика
+        top = max((int(threshold) for threshold, _ in config.saturation_levels), default=0)
+        self._table = [saturation_modifier(sales, config) for sales in range(top + 1)]
+        self._top = top
+        # Для каждой целой части: значение счётчика, ниже которого множитель станет другим
+        # (0 — множитель больше не меняется)
+        self._drops = []
+        for level in range(top + 1):
+            lower = level
+            while lower > 0 and self._table[lower - 1] == self._table[level]:
+                lower -= 1
+            self._drops.append(lower)
+        self._log_decay = log(self.decay) if 0 < self.decay < 1 else 0.0
+
+        self._steps: TimingWheel[int] = TimingWheel()
+        self._allocate(city_count)
+
+    def _allocate(self, city_count: int) -> None:
+        size = city_count * self.good_count
+        self.city_count = city_count
+        self.sales = array("d", bytes(8 * size))
+        self._touched = array("q", bytes(8 * size))
+        self._next_step = array("q", [NO_STEP]) * size
+        if NUMPY_AVAILABLE:
+            self.factors = np.full((city_count, self.good_count), self._table[0], dtype=np.float64)
+            # Плоское представление той же памяти для поячеечного доступа
+            self._flat = self.factors.reshape(-1)
+        else:
+            self.factors = self._flat = array("d", [self._table[0]]) * size
+        self._steps.clear()
+
+    def _slot(self, city_id: int, name: str) -> int:
+        """Позиция счётчика в массиве или -1 для неизвестного города или товара."""
+        good_id = self.good_ids.get(name)
+        if good_id is None or good_id >= self.good_count or not 0 <= city_id < self.city_count:
+            return -1
+        return city_id * self.good_count + good_id
+
+    def _lookup(self, sales: float) -> float:
+        return self._table[min(int(sales), self._top)]
+
+    def _value(self, slot: int, cycle: int) -> float:
+        """Счётчик ячейки в цикле cycle (не раньше последнего изменения)."""
+        value = self.sales[slot]
+        if value:
+            value *= self.decay ** (cycle - self._touched[slot])
+            if value < MIN_SALES:
+                return 0.0
+        return value
+
+    def _step_after(self, slot: int, cycle: int) -> int:
+        """Первый цикл после cycle, в котором множитель ячейки станет другим, или NO_STEP."""
+        value = self._value(slot, cycle)
+        threshold = self._drops[min(int(value), self._top)]
+        if threshold <= 0 or self.decay >= 1:
+            return NO_STEP
+        if self.decay <= 0:
+            return cycle + 1
+        # Наименьшее k ≥ 1 с value * decay ** k < threshold; проверка тем же выражением, что и _value
+        k = max(1, floor(log(threshold / value) / self._log_decay) + 1)
+        while k > 1 and self._value(slot, cycle + k - 1) < threshold:
+            k -= 1
+        while self._value(slot, cycle + k) >= threshold:
+            k += 1
+        return cycle + k
+
+    def _schedule(self, slot: int) -> None:
+        step = self._step_after(slot, self.cycle)
+        self._next_step[slot] = step
+        if step != NO_STEP:
+            self._steps.schedule(step, slot)
+
+    def count(self, city_id: int, name: str) -> float:
+        """Текущий счётчик продаж товара в городе."""
+        slot = self._slot(city_id, name)
+        return self._value(slot, self.cycle) if slot >= 0 else 0.0
+
+    def modifier(self, city_id: int, name: str) -> float:
+        """
+        Множитель цены товара в городе от насыщения рынка.
+
+        Args:
+            city_id (int): Позиция города в списке мира.
+            name (str): Название товара.
+
+        Returns:
+            float: Множитель цены (1.0 — рынок не насыщен).
+        """
+        slot = self._slot(city_id, name)
+        return float(self._flat[slot]) if slot >= 0 else 1.0
+
+    def record_sale(self, city_id: int, cargo: Dict[str, int]) -> None:
+        """
+        Учитывает продажу груза каравана: +1 к счётчику каждого проданного товара.
+
+        Args:
+            city_id (int): Позиция города в списке мира.
+            cargo (Dict[str, int]): Проданный груз.
+        """
+        for name, quantity in cargo.items():
+            if quantity > 0:
+                slot = self._slot(city_id, name)
+                if slot >= 0:
+                    value = self._value(slot, self.cycle) + 1.0
+                    self.sales[slot] = value
+                    self._touched[slot] = self.cycle
+                    self._flat[slot] = self._lookup(value)
+                    self._schedule(slot)
+
+    def advance(self) -> List[int]:
+        """
+        Затухание счётчиков за один цикл: пересчитываются только ячейки,
+        у которых в этом цикле меняется множитель цены.
+
+        Returns:
+            List[int]: Города, у которых изменились множители цен.
+        """
+        self.cycle += 1
+        cycle = self.cycle
+        changed = set()
+        for slot in self._steps.pop_due(cycle):
+            step = self._next_step[slot]
+            # Устаревшая запись: после новой продажи смена перенесена
+            if step == NO_STEP or step > cycle:
+                continue
+            modifier = self._lookup(self._value(slot, cycle))
+            if modifier != self._flat[slot]:
+                self._flat[slot] = modifier
+                changed.add(slot // self.good_count)
+            self._schedule(slot)
+        return sorted(changed)
+
+    def next_change(self, city_id: int, after: int) -> int:
+        """
+        Первый цикл после after, в котором без новых продаж меняется множитель
+        хотя бы одного товара в городе.
+
+        Args:
+            city_id (int): Позиция города в списке мира.
+            after (int): Цикл (в отсчёте cycle), не раньше текущего.
+
+        Returns:
+            int: Цикл смены или NO_STEP, если множители больше не меняются.
+        """
+        first = NO_STEP
+        start = city_id * self.good_count
+        for slot in range(start, start + self.good_count):
+            if self.sales[slot]:
+                step = self._step_after(slot, after)
+                if step != NO_STEP and (first == NO_STEP or step < first):
+                    first = step
+        return first
+
+    def city_sales(self, city_id: int, cycles_ahead: int = 0) -> Dict[str, float]:
+        """
+        Счётчики продаж товаров в городе через cycles_ahead циклов (без новых продаж).
+
+        Args:
+            city_id (int): Позиция города в списке мира.
+            cycles_ahead (int): Через сколько циклов (например, к продаже в конце рейса).
+
+        Returns:
+            Dict[str, float]: Ненулевые счётчики по названию товара.
+        """
+        if not 0 <= city_id < self.city_count:
+            return {}
+        cycle = self.cycle + max(cycles_ahead, 0)
+        start = city_id * self.good_count
+        result = {}
+        for name, good_id in self.good_ids.items():
+            if good_id < self.good_count:
+                value = self._value(start + good_id, cycle)
+                if value:
+                    result[name] = value
+        return result
+
+    def modifiers(self, city_id: int, cycles_ahead: int = 0) -> Dict[str, float]:
+        """
+        Множители цен товаров в городе через cycles_ahead циклов.
+
+        Returns:
+            Dict[str, float]: Множители меньше 1.0 по названию товара (остальные не насыщены).
+        """
+        result = {}
+        for name, sales in self.city_sales(city_id, cycles_ahead).items():
+            modifier = self._lookup(sales)
+            if modifier != 1.0:
+                result[name] = modifier
+        return result
+
+    def add_cities(self, count: int) -> None:
+        """Добавляет строки счётчиков для новых городов (в конец списка мира)."""
+        sales = self.getstate()
+        self._allocate(self.city_count + count)
+        self.setstate(sales + array("d", bytes(8 * count * self.good_count)))
+
+    def getstate(self) -> array:
+        """Счётчики, приведённые к текущему циклу (для сохранения игры)."""
+        return array("d", (self._value(slot, self.cycle) for slot in range(len(self.sales))))
+
+    def setstate(self, sales: array) -> None:
+        """Восстанавливает счётчики; массив другого размера отбрасывается."""
+        if len(sales) != len(self.sales):
+            return
+        self._allocate(self.city_count)
+        for slot, value in enumerate(sales):
+            if value:
+                self._restore(slot, value)
+
+    def city_state(self, city_id: int) -> array:
+        """Счётчики города, приведённые к текущему циклу (для журнала сохранений)."""
+        start = city_id * self.good_count
+        return array("d", (self._value(slot, self.cycle) for slot in range(start, start + self.good_count)))
+
+    def set_city_state(self, city_id: int, sales: array) -> None:
+        """Восстанавливает счётчики города из city_state."""
+        start = city_id * self.good_count
+        for offset, value in enumerate(sales[:self.good_count]):
+            self._restore(start + offset, value)
+
+    def _restore(self, slot: int, value: float) -> None:
+        self.sales[slot] = value
+        self._touched[slot] = self.cycle
+        self._flat[slot] = self._lookup(value)
+        self._schedule(slot)
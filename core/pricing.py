@@ -0,0 +1,203 @@
+"""
+Векторизованный расчёт цен продажи на NumPy.
+
+Хранит матрицы модификаторов (города × товары, события × товары)
+и считает цены сразу для всех городов или для целой партии караванов.
+Формула и порядок умножения совпадают с core.finance.sale_unit_price
+(множители насыщения рынка передаются отдельной матрицей).
+"""
+from typing import Dict, List, Optional, Sequence
+from models.city import City
+from models.goods_item import GoodsItem
+from core.config import RuntimeConfig
+from core.finance import MIN_PRICE_MODIFIER, ROME_PRICE_RATIO, calculate_trip_expenses
+from core.registry import Registry, get_registry
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+class PricingKernel:
+    """
+    Матричная модель цен.
+
+    Атрибуты:
+        good_index (Dict[str, int]): Название товара → столбец матриц (ID товара в реестре).
+        event_index (Dict[str, int]): Название события → строка матрицы событий (ID события в реестре).
+        base_prices (np.ndarray): Базовые цены товаров, форма (G,).
+        demand (np.ndarray): Модификаторы спроса городов минус 1, форма (C, G).
+        event_mods (np.ndarray): Модификаторы событий минус 1, форма (K + 1, G);
+            последняя строка нулевая — для событий без модификаторов.
+        rome_mask (np.ndarray): Города с мгновенной продажей по фиксированной цене, форма (C,).
+        durations (np.ndarray): Длительность экспедиции в каждый город, форма (C,).
+        trip_expenses (np.ndarray): Расходы на поездку туда и обратно в каждый город, форма (C,).
+        trip_rates (np.ndarray): Делители «прибыль за рейс → прибыль за цикл», форма (C, 1)
+            (длительность экспедиции; для Рима 1, его строки исключаются отдельно).
+    """
+
+    def __init__(
+            self,
+            goods: List[GoodsItem],
+            cities: List[City],
+            config: RuntimeConfig,
+            registry: Optional[Registry] = None
+    ):
+        """
+        Строит матрицы по списку товаров, городам и конфигурации.
+
+        Args:
+            goods (List[GoodsItem]): Товары.
+            cities (List[City]): Города.
+            config (RuntimeConfig): Конфигурация игры (матрица модификаторов событий).
+            registry (Optional[Registry]): Реестр ID (по умолчанию — реестр конфигурации).
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Для векторизованного расчёта цен требуется numpy: pip install numpy")
+
+        registry = registry or get_registry(config)
+        self.config = config
+        for item in goods:
+            registry.intern_good(item.name)
+        self.good_index = dict(registry.good_ids)
+        self.base_prices = np.zeros(len(self.good_index), dtype=np.float64)
+        for item in goods:
+            self.base_prices[self.good_index[item.name]] = item.base_price
+        self.base_prices_int = self.base_prices.astype(np.int64)
+
+        self.event_index = dict(registry.event_ids)
+        self._no_event = registry.no_event
+        self._unknown_event = len(self.event_index)
+        self.event_mods = np.zeros((len(self.event_index) + 1, len(self.good_index)), dtype=np.float64)
+        columns = [self.good_index[name] for name in config.good_names]
+        for name, modifiers in zip(config.modifier_events, config.event_modifier_matrix):
+            self.event_mods[self.event_index[name], columns] = np.asarray(modifiers) - 1.0
+
+        self.set_cities(cities)
+
+    def set_cities(self, cities: List[City]) -> None:
+        """
+        Перестраивает матрицу спроса (например, после открытия новых городов).
+
+        Args:
+            cities (List[City]): Города.
+        """
+        self.cities = list(cities)
+        self.city_index = {city.name: j for j, city in enumerate(self.cities)}
+        self.demand = np.zeros((len(self.cities), len(self.good_index)), dtype=np.float64)
+        for j, city in enumerate(self.cities):
+            for good_name, modifier in city.demand_modifiers.items():
+                column = self.good_index.get(good_name)
+                if column is not None:
+                    self.demand[j, column] = modifier - 1.0
+        self.rome_mask = np.array([city.duration == 0 for city in self.cities], dtype=bool)
+        self.durations = np.array([city.duration for city in self.cities], dtype=np.int64)
+        self.trip_expenses = np.array(
+            [calculate_trip_expenses(city.duration * 2 + 1, self.config) for city in self.cities],
+            dtype=np.int64
+        )
+        self.trip_rates = np.maximum(self.durations, 1).astype(np.float64)[:, None]
+        self._rome_prices = np.floor(self.base_prices * ROME_PRICE_RATIO)
+        self._rome_rows = np.flatnonzero(self.rome_mask)
+        self._demand_factors = 1.0 + self.demand
+
+    def event_id(self, event_name: Optional[str]) -> int:
+        """Строка матрицы событий для названия события (None — нет события)."""
+        if event_name is None:
+            return self._no_event
+        return self.event_index.get(event_name, self._unknown_event)
+
+    def city_event_id(self, city: City) -> int:
+        """Текущее событие города как индекс строки матрицы событий."""
+        if 0 <= city.current_event_id < self._unknown_event:
+            return city.current_event_id
+        return self.event_id(city.current_event)
+
+    def current_event_ids(self) -> "np.ndarray":
+        """Текущие события всех городов как индексы строк матрицы событий."""
+        return np.array([self.city_event_id(city) for city in self.cities], dtype=np.intp)
+
+    def quantities(self, cargo: Dict[str, int]) -> "np.ndarray":
+        """
+        Переводит груз (название → количество) в вектор формы (G,).
+        Неизвестные товары пропускаются, как в calculate_sale_profit.
+        """
+        vector = np.zeros(len(self.good_index), dtype=np.int64)
+        for name, quantity in cargo.items():
+            column = self.good_index.get(name)
+            if column is not None:
+                vector[column] += quantity
+        return vector
+
+    def unit_prices(
+            self,
+            city_ids: "np.ndarray | Sequence[int]",
+            event_ids: "np.ndarray | Sequence[int]",
+            saturation: "Optional[np.ndarray]" = None
+    ) -> "np.ndarray":
+        """
+        Цены за единицу для пар (город, событие).
+
+        Args:
+            city_ids: Индексы городов, форма (N,).
+            event_ids: Индексы событий, форма (N,).
+            saturation: Множители насыщения рынка, форма (N, G); в Риме не применяются.
+
+        Returns:
+            np.ndarray: Целые цены, форма (N, G).
+        """
+        city_ids = np.asarray(city_ids, dtype=np.intp)
+        event_ids = np.asarray(event_ids, dtype=np.intp)
+        modifier = np.maximum(MIN_PRICE_MODIFIER, (1.0 + self.demand[city_ids]) + self.event_mods[event_ids])
+        # Порядок умножения как в core.finance.sale_unit_price: (база × модификатор) × насыщение
+        prices = self.base_prices * modifier
+        if saturation is not None:
+            prices *= np.asarray(saturation, dtype=np.float64)
+        np.floor(prices, out=prices)
+        rome = self.rome_mask[city_ids]
+        if rome.any():
+            prices[rome] = self._rome_prices
+        return prices.astype(np.int64)
+
+    def price_matrix(self, saturation: "Optional[np.ndarray]" = None) -> "np.ndarray":
+        """
+        Цены за единицу во всех городах при текущих событиях, форма (C, G).
+
+        Args:
+            saturation: Множители насыщения рынка, форма (C, G)
+                (например, MarketSaturation.factors).
+        """
+        # Та же формула, что в unit_prices, но без индексации по городам и на месте:
+        # матрица небольшая, и время уходит на промежуточные массивы, а не на арифметику
+        modifier = self._demand_factors + self.event_mods[self.current_event_ids()]
+        np.maximum(modifier, MIN_PRICE_MODIFIER, out=modifier)
+        modifier *= self.base_prices
+        if saturation is not None:
+            modifier *= saturation
+        np.floor(modifier, out=modifier)
+        modifier[self._rome_rows] = self._rome_prices
+        return modifier.astype(np.int64)
+
+    def price_batch(
+            self,
+            city_ids: "np.ndarray | Sequence[int]",
+            event_ids: "np.ndarray | Sequence[int]",
+            quantities: "np.ndarray",
+            saturation: "Optional[np.ndarray]" = None
+    ) -> "np.ndarray":
+        """
+        Выручка для партии караванов одним векторным вызовом.
+
+        Args:
+            city_ids: Города назначения, форма (N,).
+            event_ids: События в городах на момент продажи, форма (N,).
+            quantities: Груз, форма (N, G).
+            saturation: Множители насыщения рынка, форма (N, G).
+
+        Returns:
+            np.ndarray: Выручка каждого каравана, форма (N,).
+        """
+        return (self.unit_prices(city_ids, event_ids, saturation) * np.asarray(quantities, dtype=np.int64)).sum(axis=1)
@@ -0,0 +1,116 @@
+"""
+Прогрессия: открытие повозок, курьеров и городов по порогам баланса.
+
+Пороги config.progression хранятся отсортированными. При каждом
+изменении баланса сначала сравнивается ближайший неоткрытый порог
+(O(1) в обычном случае), а при его достижении число пройденных порогов
+находится двоичным поиском — список не перебирается целиком.
+Открытия необратимы: падение баланса их не отменяет.
+"""
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from core.config import RuntimeConfig
+
+# Виды открытий
+UNLOCK_COURIER = "courier"
+UNLOCK_WAGON = "wagon"
+UNLOCK_CITIES = "cities"
+UNLOCK_OTHER = "other"
+
+# Открытие новых городов: "+3 города"
+_CITIES_PATTERN = re.compile(r"^\+(\d+)\s+город")
+
+
+@dataclass
+class UnlockEvent:
+    """
+    Событие открытия.
+
+    Атрибуты:
+        threshold (int): Порог баланса, на котором произошло открытие.
+        name (str): Название открытия из конфигурации.
+        kind (str): Вид открытия (UNLOCK_COURIER, UNLOCK_WAGON, UNLOCK_CITIES, UNLOCK_OTHER).
+        cycle (int): Цикл, в котором произошло открытие.
+        added (List[str]): Что добавлено игроку или миру (имена курьеров, повозок, городов).
+    """
+    threshold: int
+    name: str
+    kind: str
+    cycle: int = 0
+    added: List[str] = field(default_factory=list)
+
+
+def unlock_kind(name: str, config: RuntimeConfig) -> str:
+    """
+    Определяет вид открытия по его названию.
+
+    Args:
+        name (str): Название открытия.
+        config (RuntimeConfig): Конфигурация игры (курьеры и повозки по названию).
+
+    Returns:
+        str: Вид открытия.
+    """
+    if name in config.couriers:
+        return UNLOCK_COURIER
+    if name in config.wagons:
+        return UNLOCK_WAGON
+    if _CITIES_PATTERN.match(name):
+        return UNLOCK_CITIES
+    return UNLOCK_OTHER
+
+
+def unlocked_city_count(name: str) -> int:
+    """Сколько городов открывает открытие вида "+N города"."""
+    match = _CITIES_PATTERN.match(name)
+    return int(match.group(1)) if match else 0
+
+
+class ProgressionEngine:
+    """
+    Отсортированные пороги прогрессии и число уже пройденных.
+
+    Атрибуты:
+        thresholds (List[int]): Пороги баланса по возрастанию.
+        unlocks (List[List[str]]): Открытия каждого порога.
+        reached (int): Сколько порогов уже пройдено.
+    """
+
+    def __init__(self, config: RuntimeConfig):
+        """
+        Args:
+            config (RuntimeConfig): Конфигурация игры (пороги прогрессии).
+        """
+        self.thresholds: List[int] = [threshold for threshold, _ in config.progression]
+        self.unlocks: List[List[str]] = [list(unlocks) for _, unlocks in config.progression]
+        self.reached = 0
+
+    @property
+    def next_threshold(self) -> float:
+        """Ближайший непройденный порог (inf, если пройдены все)."""
+        if self.reached < len(self.thresholds):
+            return self.thresholds[self.reached]
+        return float("inf")
+
+    def advance(self, balance: int) -> List[Tuple[int, str]]:
+        """
+        Отмечает пороги, достигнутые при балансе balance.
+
+        Args:
+            balance (int): Текущий баланс.
+
+        Returns:
+            List[Tuple[int, str]]: Новые открытия (порог, название) в порядке порогов.
+        """
+        if balance < self.next_threshold:
+            return []
+        reached = bisect_right(self.thresholds, balance)
+        opened = [
+            (self.thresholds[level], name)
+            for level in range(self.reached, reached)
+            for name in self.unlocks[level]
+        ]
+        self.reached = reached
+        return opened
@@ -0,0 +1,116 @@
+"""
+Реестр целочисленных идентификаторов товаров и событий.
+
+События в пути, матрицы цен, насыщение рынка, хранилища караванов
+и отчётов индексируют товары и события по плотным целым ID. Модели
+(склад игрока, груз каравана, спрос города) по-прежнему хранят названия:
+они переводятся в ID один раз на входе в расчёт.
+Города нумеруются позицией в списке мира (см. core.world.generate_world).
+"""
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from core.config import RuntimeConfig
+
+# Названия событий, на которые ссылается логика ядра
+NO_EVENT = "Нет события"
+NOTHING_HAPPENED = "Ничего не произошло"
+ROME_SALE = "Продажа в Риме"
+BANDIT_RAID = "Набег разбойников"
+WAGON_BREAKDOWN = "Поломка повозки"
+COURIER_ILLNESS = "Болезнь курьера"
+COURIER_DEATH = "Смерть курьера"
+
+# События в пути, считающиеся неблагоприятными, если в конфигурации нет флага "negative"
+HARMFUL_EVENTS = (BANDIT_RAID, WAGON_BREAKDOWN, COURIER_ILLNESS, COURIER_DEATH)
+
+ENGINE_EVENTS = (
+    NO_EVENT,
+    NOTHING_HAPPENED,
+    ROME_SALE,
+    BANDIT_RAID,
+    WAGON_BREAKDOWN,
+    COURIER_ILLNESS,
+    COURIER_DEATH,
+)
+
+
+class Registry:
+    """
+    Таблицы «название ↔ ID» для товаров и событий одной конфигурации.
+    Порядок товаров совпадает с core.goods.load_goods.
+
+    Атрибуты:
+        goods (List[str]): Названия товаров по ID.
+        good_ids (Dict[str, int]): Название товара → ID.
+        events (List[str]): Названия событий по ID.
+        event_ids (Dict[str, int]): Название события → ID.
+        no_event, nothing, rome_sale, bandits, wagon_breakdown,
+        courier_illness, courier_death (int): ID событий, используемых ядром.
+        samplers (Dict[tuple, Any]): Скомпилированные сэмплеры событий
+            (заполняет core.events; живут столько же, сколько реестр).
+    """
+
+    def __init__(self, goods: List[str], events: List[str]):
+        """
+        Args:
+            goods (List[str]): Названия товаров в порядке конфигурации.
+            events (List[str]): Названия событий в порядке конфигурации.
+        """
+        self.goods: List[str] = []
+        self.good_ids: Dict[str, int] = {}
+        for name in goods:
+            self.intern_good(name)
+
+        self.events: List[str] = []
+        self.event_ids: Dict[str, int] = {}
+        for name in list(events) + list(ENGINE_EVENTS):
+            self.intern_event(name)
+
+        self.no_event = self.event_ids[NO_EVENT]
+        self.nothing = self.event_ids[NOTHING_HAPPENED]
+        self.rome_sale = self.event_ids[ROME_SALE]
+        self.bandits = self.event_ids[BANDIT_RAID]
+        self.wagon_breakdown = self.event_ids[WAGON_BREAKDOWN]
+        self.courier_illness = self.event_ids[COURIER_ILLNESS]
+        self.courier_death = self.event_ids[COURIER_DEATH]
+        self.samplers: Dict[tuple, Any] = {}
+
+    def intern_good(self, name: str) -> int:
+        """Возвращает ID товара, регистрируя его при первом обращении."""
+        good_id = self.good_ids.get(name)
+        if good_id is None:
+            good_id = len(self.goods)
+            self.goods.append(name)
+            self.good_ids[name] = good_id
+        return good_id
+
+    def intern_event(self, name: str) -> int:
+        """Возвращает ID события, регистрируя его при первом обращении."""
+        event_id = self.event_ids.get(name)
+        if event_id is None:
+            event_id = len(self.events)
+            self.events.append(name)
+            self.event_ids[name] = event_id
+        return event_id
+
+    def good_name(self, good_id: int) -> str:
+        """Название товара по ID."""
+        return self.goods[good_id]
+
+    def event_name(self, event_id: int) -> str:
+        """Название события по ID."""
+        return self.events[event_id]
+
+
+def get_registry(config: "RuntimeConfig") -> Registry:
+    """
+    Возвращает реестр конфигурации (строится в core.config.compile_config).
+
+    Args:
+        config (RuntimeConfig): Конфигурация игры.
+
+    Returns:
+        Registry: Реестр ID.
+    """
+    return config.registry
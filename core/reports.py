@@ -0,0 +1,437 @@
+"""
+Хранилище отчётов о завершённых караванах: история по столбцам и агрегаты.
+
+Отчёт не хранится словарём: его поля лежат в типизированных массивах
+(array), строки (город, события, курьер, повозка, товары) — номерами
+в общей таблице строк, груз и детализация продаж — плоскими столбцами
+со смещениями строк. Словарь отчёта собирается только при обращении
+(store[i]) — например, для видимых строк списка отчётов.
+
+История ограничена: хранятся последние HISTORY_LIMIT отчётов, старые
+отбрасываются пачками по TRIM_CHUNK. Итоги за всю игру (доход, расходы,
+окупаемость по городам, выручка по товарам) ведутся отдельными
+накопителями и от обрезки истории не зависят.
+
+Каждый отчёт получает постоянный номер report_id (по порядку
+завершения); он не меняется при обрезке, сохранении и загрузке.
+"""
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+from models.caravan import Caravan
+from core.finance import SaleBreakdown
+
+# Сколько последних отчётов хранится и сколько старых отбрасывается за раз
+HISTORY_LIMIT = 1000
+TRIM_CHUNK = 250
+
+# Столбцы отчёта
+INT_FIELDS = ("profit", "expenses", "net", "departure_cycle", "return_cycle", "completion_cycle", "cargo_cost")
+STR_FIELDS = ("event_path", "event_city", "destination", "courier_name", "wagon_name")
+BREAKDOWN_INT_FIELDS = ("base_price", "qty", "unit_price", "total")
+BREAKDOWN_FLOAT_FIELDS = ("city_mod", "event_mod", "dist_mod", "market_mod", "final_mod")
+
+
+@dataclass
+class CityTotals:
+    """
+    Итоги рейсов в один город за всю игру.
+
+    Атрибуты:
+        trips (int): Завершённые рейсы.
+        profit (int): Выручка от продаж.
+        expenses (int): Расходы на рейсы.
+        cargo_cost (int): Закупочная стоимость отправленного груза.
+    """
+    trips: int = 0
+    profit: int = 0
+    expenses: int = 0
+    cargo_cost: int = 0
+
+    @property
+    def net(self) -> int:
+        """Прибыль с учётом расходов и стоимости груза."""
+        return self.profit - self.expenses - self.cargo_cost
+
+    @property
+    def roi(self) -> float:
+        """Окупаемость вложений: прибыль на денарий расходов и груза."""
+        invested = self.expenses + self.cargo_cost
+        return self.net / invested if invested else 0.0
+
+
+@dataclass
+class GoodTotals:
+    """
+    Итоги продаж одного товара за всю игру.
+
+    Атрибуты:
+        sold (int): Продано единиц.
+        revenue (int): Выручка.
+    """
+    sold: int = 0
+    revenue: int = 0
+
+
+class ReportStore(Sequence):
+    """
+    Последние отчёты о караванах по столбцам и итоги за всю игру.
+
+    Последовательность: len(store) — число хранимых отчётов, store[i] —
+    словарь отчёта (i = 0 — самый старый из хранимых; допустимы
+    отрицательные индексы).
+
+    Атрибуты:
+        limit (int): Сколько последних отчётов хранить.
+        first_id (int): report_id самого старого хранимого отчёта.
+        total (int): Отчётов за всю игру (следующий report_id).
+        total_profit (int): Выручка за всю игру.
+        total_expenses (int): Расходы на рейсы за всю игру.
+        successes (int): Рейсов, где выручка превысила расходы.
+        cities (Dict[str, CityTotals]): Город назначения → итоги рейсов.
+        goods (Dict[str, GoodTotals]): Товар → итоги продаж.
+    """
+
+    def __init__(self, limit: int = HISTORY_LIMIT):
+        """
+        Args:
+            limit (int): Сколько последних отчётов хранить.
+        """
+        self.limit = limit
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.first_id = 0
+        self.total = 0
+        self.total_profit = 0
+        self.total_expenses = 0
+        self.successes = 0
+        self.cities: Dict[str, CityTotals] = {}
+        self.goods: Dict[str, GoodTotals] = {}
+        self._clear_rows()
+
+    def _clear_rows(self) -> None:
+        self.ints: Dict[str, array] = {field: array("q") for field in INT_FIELDS}
+        self.strs: Dict[str, array] = {field: array("I") for field in STR_FIELDS}
+        self.success = array("b")
+        # Груз: конец позиций отчёта в плоских столбцах (товар, количество)
+        self.goods_end = array("Q")
+        self.goods_names = array("I")
+        self.goods_qty = array("q")
+        # Детализация продаж в том же плоском виде
+        self.sale_end = array("Q")
+        self.sale_names = array("I")
+        self.sale_ints: Dict[str, array] = {field: array("q") for field in BREAKDOWN_INT_FIELDS}
+        self.sale_floats: Dict[str, array] = {field: array("d") for field in BREAKDOWN_FLOAT_FIELDS}
+
+    def intern(self, text: str) -> int:
+        """Номер строки в таблице строк (добавляет новую)."""
+        index = self._string_ids.get(text)
+        if index is None:
+            index = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    # Запись
+
+    def record(self, caravan: Caravan, report: Mapping[str, Any], cycle: int, cargo_cost: int = 0) -> int:
+        """
+        Добавляет отчёт о завершённом караване и обновляет итоги.
+
+        Args:
+            caravan (Caravan): Завершённый караван (груз — после потерь в пути).
+            report (Mapping): Отчёт core.finance.generate_report.
+            cycle (int): Цикл завершения.
+            cargo_cost (int): Закупочная стоимость груза при отправке.
+
+        Returns:
+            int: report_id нового отчёта.
+        """
+        breakdown = report.get("sale_breakdown") or {}
+        self.append({
+            "profit": report.get("profit", 0),
+            "expenses": report.get("expenses", 0),
+            "net": report.get("net", 0),
+            "departure_cycle": caravan.departure_cycle,
+            "return_cycle": caravan.return_cycle,
+            "completion_cycle": cycle,
+            "cargo_cost": cargo_cost,
+            "event_path": report.get("event_path", ""),
+            "event_city": report.get("event_city", ""),
+            "destination": caravan.destination.name,
+            "courier_name": caravan.courier.name,
+            "wagon_name": caravan.wagon.name,
+            "success": report.get("success", False),
+            "goods": caravan.goods,
+            "sale_breakdown": breakdown
+        })
+        return self.total - 1
+
+    def append(self, report: Mapping[str, Any]) -> None:
+        """
+        Добавляет отчёт в виде словаря (ключи как у store[i]) и обновляет итоги.
+
+        Args:
+            report (Mapping): Отчёт.
+        """
+        for field in INT_FIELDS:
+            self.ints[field].append(report.get(field, 0))
+        for field in STR_FIELDS:
+            self.strs[field].append(self.intern(report.get(field, "")))
+        self.success.append(1 if report.get("success") else 0)
+
+        for name, qty in report.get("goods", {}).items():
+            self.goods_names.append(self.intern(name))
+            self.goods_qty.append(qty)
+        self.goods_end.append(len(self.goods_names))
+
+        for name, data in (report.get("sale_breakdown") or {}).items():
+            self.sale_names.append(self.intern(name))
+            for field in BREAKDOWN_INT_FIELDS:
+                self.sale_ints[field].append(data.get(field, 0))
+            for field in BREAKDOWN_FLOAT_FIELDS:
+                self.sale_floats[field].append(data.get(field, 0.0))
+        self.sale_end.append(len(self.sale_names))
+
+        self.total += 1
+        self._count(len(self) - 1)
+        self._trim()
+
+    def _count(self, row: int) -> None:
+        """Учитывает отчёт в итогах за всю игру."""
+        profit = self.ints["profit"][row]
+        expenses = self.ints["expenses"][row]
+        self.total_profit += profit
+        self.total_expenses += expenses
+        self.successes += self.success[row]
+
+        destination = self.strings[self.strs["destination"][row]]
+        city = self.cities.get(destination)
+        if city is None:
+            city = self.cities[destination] = CityTotals()
+        city.trips += 1
+        city.profit += profit
+        city.expenses += expenses
+        city.cargo_cost += self.ints["cargo_cost"][row]
+
+        qty = self.sale_ints["qty"]
+        totals = self.sale_ints["total"]
+        for j in range(self._sale_start(row), self.sale_end[row]):
+            name = self.strings[self.sale_names[j]]
+            good = self.goods.get(name)
+            if good is None:
+                good = self.goods[name] = GoodTotals()
+            good.sold += qty[j]
+            good.revenue += totals[j]
+
+    def _trim(self) -> None:
+        """Отбрасывает самые старые отчёты, если история превысила предел."""
+        count = len(self)
+        if count <= self.limit + TRIM_CHUNK:
+            return
+        cut = count - self.limit
+        goods_cut = self.goods_end[cut - 1]
+        sale_cut = self.sale_end[cut - 1]
+        for column in (*self.ints.values(), *self.strs.values(), self.success):
+            del column[:cut]
+        del self.goods_names[:goods_cut]
+        del self.goods_qty[:goods_cut]
+        self.goods_end = array("Q", (end - goods_cut for end in self.goods_end[cut:]))
+        del self.sale_names[:sale_cut]
+        for column in (*self.sale_ints.values(), *self.sale_floats.values()):
+            del column[:sale_cut]
+        self.sale_end = array("Q", (end - sale_cut for end in self.sale_end[cut:]))
+        self.first_id += cut
+
+    # Чтение
+
+    def __len__(self) -> int:
+        return len(self.success)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("report index out of range")
+        return self._report(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self._report(row) for row in range(len(self)))
+
+    def __reversed__(self) -> Iterator[Dict[str, Any]]:
+        return (self._report(row) for row in range(len(self) - 1, -1, -1))
+
+    def _goods_start(self, row: int) -> int:
+        return self.goods_end[row - 1] if row else 0
+
+    def _sale_start(self, row: int) -> int:
+        return self.sale_end[row - 1] if row else 0
+
+    def goods_count(self, row: int) -> int:
+        """Число позиций груза в отчёте (без сборки словаря)."""
+        return self.goods_end[row] - self._goods_start(row)
+
+    def _report(self, row: int) -> Dict[str, Any]:
+        strings = self.strings
+        start, end = self._goods_start(row), self.goods_end[row]
+        report = {field: self.ints[field][row] for field in INT_FIELDS}
+        report.update({field: strings[self.strs[field][row]] for field in STR_FIELDS})
+        report["success"] = bool(self.success[row])
+        report["report_id"] = self.first_id + row
+        report["goods"] = {strings[self.goods_names[j]]: self.goods_qty[j] for j in range(start, end)}
+        report["sale_breakdown"] = self._lazy_breakdown(report["report_id"])
+        return report
+
+    def _lazy_breakdown(self, report_id: int) -> SaleBreakdown:
+        def build() -> Dict[str, Dict[str, float | int]]:
+            # Если отчёт отброшен до первого обращения, детализация пуста
+            row = self.row_of(report_id)
+            if row is None:
+                return {}
+            breakdown = {}
+            for j in range(self._sale_start(row), self.sale_end[row]):
+                entry = {field: self.sale_ints[field][j] for field in BREAKDOWN_INT_FIELDS}
+                entry.update({field: self.sale_floats[field][j] for field in BREAKDOWN_FLOAT_FIELDS})
+                breakdown[self.strings[self.sale_names[j]]] = entry
+            return breakdown
+        return SaleBreakdown(build)
+
+    def row_of(self, report_id: int) -> Optional[int]:
+        """Позиция отчёта в хранимой истории или None, если он уже отброшен."""
+        row = report_id - self.first_id
+        return row if 0 <= row < len(self) else None
+
+    def find(self, caravan: Caravan) -> Optional[Dict[str, Any]]:
+        """
+        Последний хранимый отчёт о рейсе каравана: совпадают город, цикл отправки,
+        курьер и повозка.
+
+        Args:
+            caravan (Caravan): Караван.
+
+        Returns:
+            Optional[Dict]: Отчёт или None.
+        """
+        keys = {field: self._string_ids.get(value) for field, value in (
+            ("destination", caravan.destination.name),
+            ("courier_name", caravan.courier.name),
+            ("wagon_name", caravan.wagon.name)
+        )}
+        if None in keys.values():
+            return None
+        departures = self.ints["departure_cycle"]
+        for row in range(len(self) - 1, -1, -1):
+            if departures[row] == caravan.departure_cycle and all(
+                    self.strs[field][row] == key for field, key in keys.items()):
+                return self._report(row)
+        return None
+
+    # Итоги
+
+    @property
+    def total_net(self) -> int:
+        """Чистый доход рейсов за всю игру (выручка минус расходы)."""
+        return self.total_profit - self.total_expenses
+
+    def best_city(self) -> Optional[str]:
+        """Город с наибольшей окупаемостью или None, если рейсов не было."""
+        if not self.cities:
+            return None
+        return max(self.cities, key=lambda name: self.cities[name].roi)
+
+    def top_goods(self, count: int = 3) -> List[str]:
+        """Товары с наибольшей выручкой, по убыванию."""
+        ranked = sorted(self.goods, key=lambda name: self.goods[name].revenue, reverse=True)
+        return ranked[:count]
+
+    # Сохранение
+
+    def columns(self, since_id: int = 0) -> Dict[str, Any]:
+        """
+        Столбцы отчётов начиная с report_id since_id (строки — текстом).
+
+        Args:
+            since_id (int): Первый report_id (более ранние отброшенные пропускаются).
+
+        Returns:
+            Dict[str, Any]: Столбцы в формате extend.
+        """
+        row = max(since_id - self.first_id, 0)
+        goods_start, sale_start = self._goods_start(row), self._sale_start(row)
+        strings = self.strings
+        return {
+            "ints": {field: self.ints[field][row:] for field in INT_FIELDS},
+            "strs": {field: [strings[i] for i in self.strs[field][row:]] for field in STR_FIELDS},
+            "success": self.success[row:],
+            "goods_counts": array("I", (end - start for start, end in zip(
+                [goods_start, *self.goods_end[row:-1]], self.goods_end[row:]))),
+            "goods_names": [strings[i] for i in self.goods_names[goods_start:]],
+            "goods_qty": self.goods_qty[goods_start:],
+            "sale_counts": array("I", (end - start for start, end in zip(
+                [sale_start, *self.sale_end[row:-1]], self.sale_end[row:]))),
+            "sale_names": [strings[i] for i in self.sale_names[sale_start:]],
+            "sale_ints": {field: self.sale_ints[field][sale_start:] for field in BREAKDOWN_INT_FIELDS},
+            "sale_floats": {field: self.sale_floats[field][sale_start:] for field in BREAKDOWN_FLOAT_FIELDS}
+        }
+
+    def extend(self, columns: Dict[str, Any], count_totals: bool = True) -> None:
+        """
+        Дописывает отчёты из столбцов (см. columns).
+
+        Args:
+            columns (Dict[str, Any]): Столбцы отчётов.
+            count_totals (bool): Учитывать ли отчёты в итогах (при загрузке снимка
+                итоги восстанавливаются отдельно).
+        """
+        start = len(self)
+        added = len(columns["success"])
+        for field in INT_FIELDS:
+            self.ints[field].extend(columns["ints"][field])
+        for field in STR_FIELDS:
+            self.strs[field].extend(self.intern(text) for text in columns["strs"][field])
+        self.success.extend(columns["success"])
+
+        end = len(self.goods_names)
+        for count in columns["goods_counts"]:
+            end += count
+            self.goods_end.append(end)
+        self.goods_names.extend(self.intern(name) for name in columns["goods_names"])
+        self.goods_qty.extend(columns["goods_qty"])
+
+        end = len(self.sale_names)
+        for count in columns["sale_counts"]:
+            end += count
+            self.sale_end.append(end)
+        self.sale_names.extend(self.intern(name) for name in columns["sale_names"])
+        for field in BREAKDOWN_INT_FIELDS:
+            self.sale_ints[field].extend(columns["sale_ints"][field])
+        for field in BREAKDOWN_FLOAT_FIELDS:
+            self.sale_floats[field].extend(columns["sale_floats"][field])
+
+        self.total += added
+        if count_totals:
+            for row in range(start, start + added):
+                self._count(row)
+        self._trim()
+
+    def totals_state(self) -> list:
+        """Итоги за всю игру в виде простых значений (для сохранения)."""
+        return [
+            self.total, self.total_profit, self.total_expenses, self.successes,
+            {name: [c.trips, c.profit, c.expenses, c.cargo_cost] for name, c in self.cities.items()},
+            {name: [g.sold, g.revenue] for name, g in self.goods.items()}
+        ]
+
+    def restore_totals(self, state: list) -> None:
+        """
+        Восстанавливает итоги из totals_state; хранимые отчёты считаются
+        последними из state-общего числа.
+
+        Args:
+            state (list): Результат totals_state.
+        """
+        total, self.total_profit, self.total_expenses, self.successes, cities, goods = state
+        self.cities = {name: CityTotals(*values) for name, values in cities.items()}
+        self.goods = {name: GoodTotals(*values) for name, values in goods.items()}
+        self.total = total
+        self.first_id = total - len(self)
@@ -0,0 +1,89 @@
+"""
+Независимые генераторы случайных чисел для подсистем игры.
+
+Каждая подсистема (генерация мира, городские события, события в пути,
+потери при происшествиях) получает собственный поток random.Random,
+зерно которого выводится из общего зерна партии. Поэтому одно зерно
+воспроизводит партию целиком, а лишний бросок в одной подсистеме
+не сдвигает последовательности остальных.
+"""
+import hashlib
+import random
+from typing import Dict, Optional
+
+# Потоки, которые получает игра
+WORLD = "world"
+CITY_EVENTS = "city_events"
+TRAVEL_EVENTS = "travel_events"
+LOSSES = "losses"
+
+STREAMS = (WORLD, CITY_EVENTS, TRAVEL_EVENTS, LOSSES)
+
+
+def derive_seed(seed: int, *path) -> int:
+    """
+    Выводит 64-битное зерно из родительского зерна и имени потока.
+    В отличие от hash(), результат одинаков во всех процессах.
+
+    Args:
+        seed (int): Родительское зерно.
+        *path: Имя потока или номер дочернего набора.
+
+    Returns:
+        int: Новое зерно.
+    """
+    key = ":".join(str(part) for part in (seed,) + path).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class RngService:
+    """
+    Набор независимых потоков случайных чисел одной партии.
+
+    Атрибуты:
+        seed (int): Зерно партии.
+        world, city_events, travel_events, losses (random.Random): Потоки подсистем.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Args:
+            seed (Optional[int]): Зерно партии; без него выбирается случайное.
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.streams: Dict[str, random.Random] = {
+            name: random.Random(derive_seed(seed, name)) for name in STREAMS
+        }
+        self.world = self.streams[WORLD]
+        self.city_events = self.streams[CITY_EVENTS]
+        self.travel_events = self.streams[TRAVEL_EVENTS]
+        self.losses = self.streams[LOSSES]
+
+    def stream(self, name: str) -> random.Random:
+        """Поток по имени."""
+        return self.streams[name]
+
+    def spawn(self, index: int) -> "RngService":
+        """
+        Дочерний набор потоков, например для игры номер index в пакете
+        или для рабочего процесса. Достаточно передать в процесс одно число.
+
+        Args:
+            index (int): Номер дочернего набора.
+
+        Returns:
+            RngService: Независимый набор потоков.
+        """
+        return RngService(derive_seed(self.seed, "spawn", index))
+
+    def getstate(self) -> Dict[str, tuple]:
+        """Состояние всех потоков (для сохранения игры)."""
+        return {name: rng.getstate() for name, rng in self.streams.items()}
+
+    def setstate(self, state: Dict[str, tuple]) -> None:
+        """Восстанавливает состояние потоков; неизвестные имена пропускаются."""
+        for name, stream_state in state.items():
+            if name in self.streams:
+                self.streams[name].setstate(stream_state)
@@ -0,0 +1,185 @@
+"""
+Рекомендации маршрутов: рейтинг городов по ожидаемой прибыли за цикл.
+
+Для города оценивается рейс с полной повозкой самого выгодного товара,
+купленного по базовой цене: ожидаемая выручка с учётом спроса, распределения
+событий в цикле продажи и потерь в пути минус стоимость закупки и расходы
+на поездку, делённые на время, которое караван занят. Насыщение рынка
+учитывается на момент продажи. Ожидаемый доход линеен
+по вместимости повозки, поэтому для каждого города кэшируются только
+маржа на единицу и постоянные издержки.
+
+Оценка зависит от спроса и длительности города, распределения событий
+(а не от текущего события в городе) и прогноза насыщения рынка к концу
+рейса. Поэтому она пересчитывается только после продажи в городе
+(invalidate) или когда прогноз насыщения меняется со временем: цикл
+такой смены известен заранее (MarketSaturation.next_change).
+"""
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+from models.city import City
+from models.goods_item import GoodsItem
+from core.cargo import trip_outcome_factors
+from core.config import RuntimeConfig
+from core.expectation import expected_unit_prices
+from core.finance import calculate_trip_expenses
+from core.market import NO_STEP, MarketSaturation
+from core.registry import Registry, get_registry
+
+
+@dataclass
+class RouteScore:
+    """
+    Оценка маршрута в город.
+
+    Атрибуты:
+        city (City): Город назначения.
+        cycles (int): Сколько циклов караван занят (не меньше 1).
+        best_good (Optional[str]): Самый выгодный товар для закупки.
+        unit_margin (float): Ожидаемая прибыль на единицу груза с учётом потерь в пути.
+        fixed_cost (float): Ожидаемые расходы на поездку и происшествия.
+        expected_net (float): Ожидаемая прибыль рейса для заданной вместимости
+            (заполняется в рейтинге).
+        per_cycle (float): Ожидаемая прибыль за цикл (заполняется в рейтинге).
+    """
+    city: City
+    cycles: int
+    best_good: Optional[str]
+    unit_margin: float
+    fixed_cost: float
+    expected_net: float = 0.0
+    per_cycle: float = 0.0
+
+
+class RouteRecommender:
+    """
+    Кэш оценок маршрутов. Оценка города пересчитывается после invalidate
+    или когда меняется прогноз насыщения его рынка.
+
+    Атрибуты:
+        cities (List[City]): Города мира (общий список с игрой).
+        market (Optional[MarketSaturation]): Насыщение рынка (по умолчанию не учитывается).
+        scores (Dict[int, RouteScore]): Кэш оценок по позиции города в списке.
+    """
+
+    def __init__(
+            self,
+            cities: List[City],
+            goods: List[GoodsItem],
+            config: RuntimeConfig,
+            difficulty: str = "normal",
+            registry: Optional[Registry] = None,
+            market: Optional[MarketSaturation] = None
+    ):
+        self.cities = cities
+        self.goods = goods
+        self.config = config
+        self.difficulty = difficulty
+        self.registry = registry or get_registry(config)
+        self.market = market
+        self.scores: Dict[int, RouteScore] = {}
+        # Цикл рынка, с которого оценка города устаревает
+        self._expiry: Dict[int, int] = {}
+        self._next_expiry: Optional[int] = None
+        # Рейтинги по вместимости повозки
+        self._rankings: Dict[int, List[RouteScore]] = {}
+
+    def invalidate(self, indexes: Optional[List[int]] = None) -> None:
+        """
+        Сбрасывает оценки городов (например, после смены событий).
+
+        Args:
+            indexes (Optional[List[int]]): Позиции городов; None — все города.
+        """
+        if indexes is None:
+            self.scores.clear()
+            self._expiry.clear()
+        else:
+            for index in indexes:
+                self.scores.pop(index, None)
+                self._expiry.pop(index, None)
+        self._rankings.clear()
+
+    def _expire(self) -> None:
+        """Сбрасывает оценки, прогноз насыщения для которых сменился."""
+        if self._next_expiry is None or self.market.cycle < self._next_expiry:
+            return
+        cycle = self.market.cycle
+        self.invalidate([index for index, expiry in self._expiry.items() if expiry <= cycle])
+        self._next_expiry = min(self._expiry.values(), default=None)
+
+    def score(self, index: int) -> RouteScore:
+        """
+        Оценка города по позиции в списке (из кэша или свежая).
+
+        Args:
+            index (int): Позиция города в списке.
+
+        Returns:
+            RouteScore: Оценка без учёта вместимости (expected_net и per_cycle не заполнены).
+        """
+        self._expire()
+        cached = self.scores.get(index)
+        if cached is not None:
+            return cached
+
+        city = self.cities[index]
+        expenses = calculate_trip_expenses(city.duration * 2 + 1, self.config)
+        revenue_factor, fixed_cost = trip_outcome_factors(
+            city, expenses, self.config, self.difficulty, self.registry
+        )
+
+        saturation = self.market.modifiers(city.city_id, city.duration) if self.market is not None else None
+        prices = expected_unit_prices(city, self.goods, self.config, self.difficulty, saturation)
+        best_good = None
+        unit_margin = 0.0
+        for item in self.goods:
+            margin = prices[item.name] * revenue_factor - item.base_price
+            if best_good is None or margin > unit_margin:
+                best_good = item.name
+                unit_margin = margin
+
+        score = RouteScore(
+            city=city,
+            cycles=max(city.duration, 1),
+            best_good=best_good,
+            unit_margin=unit_margin,
+            fixed_cost=fixed_cost
+        )
+        self.scores[index] = score
+        if self.market is not None and city.duration > 0:
+            # Прогноз насыщения к продаже сменится, когда до смены останется длительность рейса
+            change = self.market.next_change(city.city_id, self.market.cycle + city.duration)
+            if change != NO_STEP:
+                expiry = change - city.duration
+                self._expiry[index] = expiry
+                if self._next_expiry is None or expiry < self._next_expiry:
+                    self._next_expiry = expiry
+        return score
+
+    def ranking(self, capacity: int) -> List[RouteScore]:
+        """
+        Города по убыванию ожидаемой прибыли за цикл.
+
+        Args:
+            capacity (int): Вместимость повозки.
+
+        Returns:
+            List[RouteScore]: Рейтинг маршрутов.
+        """
+        self._expire()
+        cached = self._rankings.get(capacity)
+        if cached is not None and len(cached) == len(self.cities):
+            return cached
+
+        ranking = []
+        for index in range(len(self.cities)):
+            score = self.score(index)
+            # Невыгодный товар не закупают: тогда рейс везёт пустую повозку
+            expected_net = capacity * max(score.unit_margin, 0.0) - score.fixed_cost
+            # Копия: кэшированная оценка общая для всех вместимостей
+            ranking.append(replace(score, expected_net=expected_net, per_cycle=expected_net / score.cycles))
+        ranking.sort(key=lambda s: s.per_cycle, reverse=True)
+
+        self._rankings[capacity] = ranking
+        return ranking
@@ -0,0 +1,893 @@
+"""
+Система сохранений: компактный версионированный бинарный формат.
+
+Структура файла:
+    заголовок  — сигнатура, версия формата, CRC32 тела;
+    тело       — таблица строк, затем секции состояния игры.
+
+Каждая строка (названия товаров, событий, городов) хранится в таблице
+один раз, а в секциях — её номер. Отчёты о караванах записываются теми же
+столбцами, что и в хранилище core.reports.ReportStore, поэтому даже тысячи
+отчётов читаются несколькими вызовами array.frombytes; вместе с ними
+пишутся итоги за всю игру (история отчётов ограничена, итоги — нет).
+
+Автосохранение (SaveJournal) не переписывает снимок каждый цикл,
+а дописывает в журнал рядом с ним изменения за цикл (отправленные
+и вернувшиеся караваны, события, склад, баланс) и периодически
+уплотняет журнал в новый снимок.
+"""
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+from models.caravan import Caravan
+from models.city import City
+from models.courier import Courier
+from models.player import Player
+from models.wagon import Wagon
+from core.caravan_store import CaravanStore
+from core.changes import (
+    CaravanDeparted,
+    CaravanReturned,
+    CityEventsChanged,
+    InventoryChanged,
+    TravelEventOccurred,
+    Unlocked
+)
+from core.config import compile_config
+from core.game import Game
+from core.goods import load_goods
+from core.progression import UnlockEvent
+from core.reports import (
+    BREAKDOWN_FLOAT_FIELDS,
+    BREAKDOWN_INT_FIELDS,
+    INT_FIELDS as REPORT_INT_FIELDS,
+    STR_FIELDS as REPORT_STR_FIELDS,
+    ReportStore
+)
+from core.rng import STREAMS, RngService
+
+MAGIC = b"THSAVE"
+JOURNAL_MAGIC = b"THJRNL"
+FORMAT_VERSION = 7
+DEFAULT_SAVE_PATH = "savegame.ths"
+AUTOSAVE_PATH = "autosave.ths"
+JOURNAL_SUFFIX = ".journal"
+# Число записей журнала, после которого он уплотняется в снимок
+COMPACT_EVERY = 20
+
+_HEADER = struct.Struct("<6sHI")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_FRAME = struct.Struct("<II")
+
+# Теги универсального кодировщика значений
+_TAG_NONE, _TAG_FALSE, _TAG_TRUE, _TAG_INT, _TAG_FLOAT, _TAG_STR, _TAG_LIST, _TAG_DICT, _TAG_TUPLE, _TAG_BIGINT = range(10)
+
+_SWAP_BYTES = sys.byteorder != "little"
+
+
+class SaveFormatError(ValueError):
+    """Файл сохранения повреждён или записан несовместимой версией."""
+
+
+class _Writer:
+    """Буфер тела сохранения с таблицей строк."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.strings: Dict[str, int] = {}
+
+    def u32(self, value: int) -> None:
+        self.parts.append(_U32.pack(value))
+
+    def i64(self, value: int) -> None:
+        self.parts.append(_I64.pack(value))
+
+    def f64(self, value: float) -> None:
+        self.parts.append(_F64.pack(value))
+
+    def string_id(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+        return index
+
+    def str(self, value: str) -> None:
+        self.u32(self.string_id(value))
+
+    def opt_str(self, value: Optional[str]) -> None:
+        # 0 — None, иначе номер строки + 1
+        self.u32(0 if value is None else self.string_id(value) + 1)
+
+    def array(self, typecode: str, values) -> None:
+        data = array(typecode, values)
+        if _SWAP_BYTES:
+            data.byteswap()
+        self.u32(len(data))
+        self.parts.append(data.tobytes())
+
+    def str_array(self, values) -> None:
+        string_id = self.string_id
+        self.array("I", [string_id(v) for v in values])
+
+    def value(self, value: Any) -> None:
+        """Универсальная запись значений JSON-подобной структуры."""
+        if value is None:
+            self.parts.append(bytes((_TAG_NONE,)))
+        elif value is True:
+            self.parts.append(bytes((_TAG_TRUE,)))
+        elif value is False:
+            self.parts.append(bytes((_TAG_FALSE,)))
+        elif isinstance(value, int):
+            if -(1 << 63) <= value < (1 << 63):
+                self.parts.append(bytes((_TAG_INT,)))
+                self.i64(value)
+            else:
+                self.parts.append(bytes((_TAG_BIGINT,)))
+                self.str(str(value))
+        elif isinstance(value, float):
+            self.parts.append(bytes((_TAG_FLOAT,)))
+            self.f64(value)
+        elif isinstance(value, str):
+            self.parts.append(bytes((_TAG_STR,)))
+            self.str(value)
+        elif isinstance(value, (list, tuple)):
+            self.parts.append(bytes((_TAG_TUPLE if isinstance(value, tuple) else _TAG_LIST,)))
+            self.u32(len(value))
+            for item in value:
+                self.value(item)
+        elif isinstance(value, dict) or hasattr(value, "items"):
+            items = list(value.items())
+            self.parts.append(bytes((_TAG_DICT,)))
+            self.u32(len(items))
+            for key, item in items:
+                self.value(key)
+                self.value(item)
+        else:
+            raise TypeError(f"Невозможно сохранить значение типа {type(value).__name__}")
+
+    def getvalue(self) -> bytes:
+        table = [_U32.pack(len(self.strings))]
+        for text in self.strings:
+            encoded = text.encode("utf-8")
+            table.append(_U32.pack(len(encoded)))
+            table.append(encoded)
+        return b"".join(table + self.parts)
+
+
+class _Reader:
+    """Чтение тела сохранения."""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.pos = 0
+        count = self.u32()
+        strings = []
+        for _ in range(count):
+            length = self.u32()
+            strings.append(str(self.data[self.pos:self.pos + length], "utf-8"))
+            self.pos += length
+        self.strings = strings
+
+    def u32(self) -> int:
+        value = _U32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
+
+    def i64(self) -> int:
+        value = _I64.unpack_from(self.data, self.pos)[0]
+        self.pos += 8
+        return value
+
+    def f64(self) -> float:
+        value = _F64.unpack_from(self.data, self.pos)[0]
+        self.pos += 8
+        return value
+
+    def str(self) -> str:
+        return self.strings[self.u32()]
+
+    def opt_str(self) -> Optional[str]:
+        index = self.u32()
+        return None if index == 0 else self.strings[index - 1]
+
+    def array(self, typecode: str) -> array:
+        count = self.u32()
+        data = array(typecode)
+        size = count * data.itemsize
+        data.frombytes(self.data[self.pos:self.pos + size])
+        if _SWAP_BYTES:
+            data.byteswap()
+        self.pos += size
+        return data
+
+    def str_array(self) -> List[str]:
+        strings = self.strings
+        return [strings[i] for i in self.array("I")]
+
+    def value(self) -> Any:
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _TAG_NONE:
+            return None
+        if tag == _TAG_TRUE:
+            return True
+        if tag == _TAG_FALSE:
+            return False
+        if tag == _TAG_INT:
+            return self.i64()
+        if tag == _TAG_BIGINT:
+            return int(self.str())
+        if tag == _TAG_FLOAT:
+            return self.f64()
+        if tag == _TAG_STR:
+            return self.str()
+        if tag in (_TAG_LIST, _TAG_TUPLE):
+            items = [self.value() for _ in range(self.u32())]
+            return tuple(items) if tag == _TAG_TUPLE else items
+        if tag == _TAG_DICT:
+            result = {}
+            for _ in range(self.u32()):
+                key = self.value()
+                result[key] = self.value()
+            return result
+        raise SaveFormatError(f"Неизвестный тег значения: {tag}")
+
+
+def _write_caravan(writer: _Writer, caravan: Caravan, game: Game) -> None:
+    player, cities = game.player, game.cities
+    # Курьер и повозка — ссылкой на список игрока, если это его объекты
+    courier_ref = next((i for i, c in enumerate(player.couriers) if c is caravan.courier), -1)
+    writer.i64(courier_ref)
+    if courier_ref < 0:
+        writer.value([caravan.courier.name, caravan.courier.endurance, caravan.courier.illness_resistance])
+    wagon_ref = next((i for i, w in enumerate(player.wagons) if w is caravan.wagon), -1)
+    writer.i64(wagon_ref)
+    if wagon_ref < 0:
+        writer.value([caravan.wagon.name, caravan.wagon.capacity, caravan.wagon.durability])
+
+    city_ref = next((i for i, c in enumerate(cities) if c is caravan.destination), -1)
+    writer.i64(city_ref)
+    if city_ref < 0:
+        writer.value(_city_state(caravan.destination))
+
+    writer.value(caravan.goods)
+    writer.i64(caravan.days_to_travel)
+    writer.i64(caravan.departure_cycle)
+    writer.i64(caravan.arrival_cycle)
+    writer.i64(caravan.return_cycle)
+    writer.opt_str(caravan.event_occurred)
+    writer.value(caravan.resolved)
+    writer.value(caravan.scheduled_event_cycle)
+    # Запланированное событие хранится по названию: ID зависят от реестра
+    scheduled = caravan.scheduled_event_id
+    writer.opt_str(None if scheduled is None else game.registry.event_name(scheduled))
+
+
+def _read_caravan(reader: _Reader, player: Player, game: Game) -> Caravan:
+    courier_ref = reader.i64()
+    if courier_ref >= 0:
+        courier = player.couriers[courier_ref]
+    else:
+        name, endurance, illness_resistance = reader.value()
+        courier = Courier(name=name, endurance=endurance, illness_resistance=illness_resistance)
+    wagon_ref = reader.i64()
+    if wagon_ref >= 0:
+        wagon = player.wagons[wagon_ref]
+    else:
+        name, capacity, durability = reader.value()
+        wagon = Wagon(name=name, capacity=capacity, durability=durability)
+    city_ref = reader.i64()
+    destination = game.cities[city_ref] if city_ref >= 0 else _city_from_state(reader.value())
+
+    caravan = Caravan(
+        courier=courier,
+        wagon=wagon,
+        goods=reader.value(),
+        destination=destination,
+        days_to_travel=reader.i64(),
+        departure_cycle=reader.i64(),
+        arrival_cycle=reader.i64(),
+        return_cycle=reader.i64(),
+        event_occurred=reader.opt_str(),
+        resolved=reader.value()
+    )
+    caravan.scheduled_event_cycle = reader.value()
+    scheduled_event = reader.opt_str()
+    # ID событий — по реестру этой игры
+    if caravan.event_occurred:
+        caravan.event_id = game.registry.intern_event(caravan.event_occurred)
+    if scheduled_event is not None:
+        caravan.scheduled_event_id = game.registry.intern_event(scheduled_event)
+    return caravan
+
+
+def _city_state(city: City) -> list:
+    return [city.name, city.duration, city.demand_modifiers, city.current_event, city.city_id]
+
+
+def _city_from_state(state: list) -> City:
+    name, duration, demand_modifiers, current_event, city_id = state
+    return City(
+        name=name,
+        duration=duration,
+        demand_modifiers=demand_modifiers,
+        current_event=current_event,
+        city_id=city_id
+    )
+
+
+def _write_reports(writer: _Writer, store: ReportStore, since_id: int = 0) -> None:
+    """Отчёты начиная с report_id since_id и итоги за всю игру."""
+    columns = store.columns(since_id)
+    for field in REPORT_INT_FIELDS:
+        writer.array("q", columns["ints"][field])
+    for field in REPORT_STR_FIELDS:
+        writer.str_array(columns["strs"][field])
+    writer.array("b", columns["success"])
+
+    # Груз: число позиций в каждом отчёте и плоские столбцы (товар, количество)
+    writer.array("I", columns["goods_counts"])
+    writer.str_array(columns["goods_names"])
+    writer.array("q", columns["goods_qty"])
+
+    # Детализация продаж в том же плоском виде
+    writer.array("I", columns["sale_counts"])
+    writer.str_array(columns["sale_names"])
+    for field in BREAKDOWN_INT_FIELDS:
+        writer.array("q", columns["sale_ints"][field])
+    for field in BREAKDOWN_FLOAT_FIELDS:
+        writer.array("d", columns["sale_floats"][field])
+
+    # Итоги пишутся целиком: отброшенные из истории отчёты в них уже учтены
+    writer.value(store.totals_state())
+
+
+def _read_reports(reader: _Reader, store: ReportStore) -> None:
+    """Дописывает отчёты в хранилище и восстанавливает итоги."""
+    columns = {
+        "ints": {field: reader.array("q") for field in REPORT_INT_FIELDS},
+        "strs": {field: reader.str_array() for field in REPORT_STR_FIELDS},
+        "success": reader.array("b"),
+        "goods_counts": reader.array("I"),
+        "goods_names": reader.str_array(),
+        "goods_qty": reader.array("q"),
+        "sale_counts": reader.array("I"),
+        "sale_names": reader.str_array(),
+        "sale_ints": {field: reader.array("q") for field in BREAKDOWN_INT_FIELDS},
+        "sale_floats": {field: reader.array("d") for field in BREAKDOWN_FLOAT_FIELDS}
+    }
+    store.extend(columns, count_totals=False)
+    store.restore_totals(reader.value())
+
+
+def _write_rng(writer: _Writer, state: tuple) -> None:
+    version, internal, gauss_next = state
+    writer.i64(version)
+    writer.array("I", internal)
+    writer.value(gauss_next)
+
+
+def _read_rng(reader: _Reader) -> tuple:
+    version = reader.i64()
+    internal = tuple(reader.array("I"))
+    return version, internal, reader.value()
+
+
+def _write_dynamic(writer: _Writer, game: Game) -> None:
+    """
+    Изменяемая часть состояния без отчётов: цикл, потоки ГСЧ, игрок, события городов,
+    насыщение рынков, прогрессия, караваны в пути.
+    """
+    writer.i64(game.current_cycle)
+    writer.value(game.rng.seed)
+    for name in STREAMS:
+        _write_rng(writer, game.rng.stream(name).getstate())
+
+    player = game.player
+    writer.i64(player.balance)
+    writer.value(player.inventory)
+    writer.value([[c.name, c.endurance, c.illness_resistance] for c in player.couriers])
+    writer.value([[w.name, w.capacity, w.durability] for w in player.wagons])
+
+    for city in game.cities:
+        writer.opt_str(city.current_event)
+    writer.array("d", game.market.getstate())
+
+    writer.u32(game.progression.reached)
+    writer.value([_unlock_state(event) for event in game.unlock_events])
+
+    writer.u32(len(game.active_caravans))
+    for caravan in game.active_caravans:
+        _write_caravan(writer, caravan, game)
+
+
+def _read_dynamic(reader: _Reader, game: Game) -> None:
+    """Применяет изменяемую часть состояния к игре."""
+    game.current_cycle = reader.i64()
+    rng = RngService(reader.value())
+    rng.setstate({name: _read_rng(reader) for name in STREAMS})
+    game.rng = rng
+
+    player = game.player
+    player.balance = reader.i64()
+    player.inventory = reader.value()
+    player.couriers = [
+        Courier(name=name, endurance=endurance, illness_resistance=illness_resistance)
+        for name, endurance, illness_resistance in reader.value()
+    ]
+    player.wagons = [
+        Wagon(name=name, capacity=capacity, durability=durability)
+        for name, capacity, durability in reader.value()
+    ]
+
+    registry = game.registry
+    for city in game.cities:
+        city.current_event = reader.opt_str()
+        city.current_event_id = -1 if city.current_event is None else registry.intern_event(city.current_event)
+    game.market.setstate(reader.array("d"))
+
+    game.progression.reached = reader.u32()
+    game.unlock_events = [_read_unlock(state) for state in reader.value()]
+
+    game.active_caravans = CaravanStore(registry)
+    game.active_caravans.extend(_read_caravan(reader, player, game) for _ in range(reader.u32()))
+    _rebuild(game)
+
+
+def _unlock_state(event: UnlockEvent) -> list:
+    return [event.threshold, event.name, event.kind, event.cycle, event.added]
+
+
+def _read_unlock(state: list) -> UnlockEvent:
+    threshold, name, kind, cycle, added = state
+    return UnlockEvent(threshold=threshold, name=name, kind=kind, cycle=cycle, added=added)
+
+
+def _rebuild(game: Game) -> None:
+    """Пересобирает производные структуры игры после загрузки состояния."""
+    game.routes.invalidate()
+    game.rebuild_schedules()
+    game.rebuild_fleet()
+    game.rebuild_caravan_index()
+    game.changes.reset(game.player.balance)
+
+
+def _check_header(data: bytes, magic: bytes) -> Tuple[int, memoryview]:
+    if len(data) < _HEADER.size:
+        raise SaveFormatError("Файл сохранения слишком короткий")
+    file_magic, version, checksum = _HEADER.unpack_from(data)
+    if file_magic != magic:
+        raise SaveFormatError("Это не файл сохранения Торгового Дома")
+    if version != FORMAT_VERSION:
+        raise SaveFormatError(f"Неподдерживаемая версия сохранения: {version}")
+    return checksum, memoryview(data)[_HEADER.size:]
+
+
+def dumps(game: Game) -> bytes:
+    """
+    Сериализует игру в байты (полный снимок).
+
+    Args:
+        game (Game): Игра.
+
+    Returns:
+        bytes: Содержимое файла сохранения.
+    """
+    writer = _Writer()
+
+    # Неизменяемая часть: параметры партии, конфигурация, города
+    writer.str(game.difficulty)
+    writer.i64(game.max_cycles)
+    writer.i64(game.victory_goal)
+    writer.value(game.preroll_events)
+    writer.value(game.config.raw)
+    writer.u32(len(game.cities))
+    for city in game.cities:
+        writer.value(_city_state(city))
+
+    _write_dynamic(writer, game)
+    _write_reports(writer, game.reports)
+
+    body = writer.getvalue()
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, zlib.crc32(body)) + body
+
+
+def loads(data: bytes, verbose: bool = True) -> Game:
+    """
+    Восстанавливает игру из байтов.
+
+    Args:
+        data (bytes): Содержимое файла сохранения.
+        verbose (bool): Печатать ли отчёты о караванах в консоль.
+
+    Returns:
+        Game: Восстановленная игра.
+    """
+    checksum, body = _check_header(data, MAGIC)
+    if zlib.crc32(body) != checksum:
+        raise SaveFormatError("Файл сохранения повреждён (не совпадает контрольная сумма)")
+
+    reader = _Reader(body)
+    difficulty = reader.str()
+    max_cycles = reader.i64()
+    victory_goal = reader.i64()
+    preroll_events = reader.value()
+    config = compile_config(reader.value(), difficulty)
+    cities = [_city_from_state(reader.value()) for _ in range(reader.u32())]
+
+    game = Game(
+        player=Player(balance=0),
+        cities=cities,
+        goods=load_goods(config),
+        config=config,
+        difficulty=difficulty,
+        verbose=verbose,
+        preroll_events=preroll_events
+    )
+    game.max_cycles = max_cycles
+    game.victory_goal = victory_goal
+
+    _read_dynamic(reader, game)
+    _read_reports(reader, game.reports)
+    return game
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def save_game(game: Game, path: str = DEFAULT_SAVE_PATH) -> None:
+    """
+    Сохраняет игру в файл. Запись атомарна: сначала во временный файл, затем замена.
+    Журнал предыдущего снимка, если он был, перестаёт действовать.
+
+    Args:
+        game (Game): Игра.
+        path (str): Путь к файлу сохранения.
+    """
+    _write_atomic(path, dumps(game))
+
+
+def load_game(path: str = DEFAULT_SAVE_PATH, verbose: bool = True) -> Game:
+    """
+    Загружает игру из файла и применяет записи его журнала, если он есть.
+
+    Args:
+        path (str): Путь к файлу сохранения.
+        verbose (bool): Печатать ли отчёты о караванах в консоль.
+
+    Returns:
+        Game: Восстановленная игра.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    game = loads(data, verbose=verbose)
+
+    snapshot_checksum = _HEADER.unpack_from(data)[2]
+    frames = _read_journal(path + JOURNAL_SUFFIX, snapshot_checksum)
+    if frames:
+        # Караваны в записях — по номеру: сначала караваны снимка по порядку, затем отправленные
+        caravans = list(game.active_caravans)
+        for frame in frames:
+            _apply_journal_record(frame, game, caravans)
+        _rebuild(game)
+    return game
+
+
+def has_save(path: str = DEFAULT_SAVE_PATH) -> bool:
+    """Проверяет, существует ли файл сохранения."""
+    return os.path.exists(path)
+
+
+def latest_save() -> Optional[str]:
+    """
+    Самое свежее из ручного сохранения и автосохранения (с учётом журнала).
+
+    Returns:
+        Optional[str]: Путь к файлу или None, если сохранений нет.
+    """
+    def modified(path: str) -> float:
+        times = [os.path.getmtime(p) for p in (path, path + JOURNAL_SUFFIX) if os.path.exists(p)]
+        return max(times)
+
+    paths = [path for path in (DEFAULT_SAVE_PATH, AUTOSAVE_PATH) if os.path.exists(path)]
+    return max(paths, key=modified) if paths else None
+
+
+# === Журнал автосохранения ===
+#
+# Рядом со снимком лежит файл <снимок>.journal: заголовок с CRC32 тела снимка,
+# к которому относится журнал, и записи вида [длина u32][CRC32 u32][данные].
+# Каждая запись — изменения с прошлой записи: новый цикл, сдвинувшиеся потоки
+# ГСЧ, баланс, изменённые позиции склада, новые события городов, счётчики
+# рынка городов с продажами, открытия, отправленные караваны целиком,
+# события в пути и номера вернувшихся караванов, новые отчёты. Караваны
+# нумеруются по порядку: караваны снимка, затем отправленные после него.
+# При чтении записи применяются по порядку до первой обрезанной или повреждённой,
+# поэтому сбой посреди дозаписи теряет только её. Журнал чужого снимка
+# (например, оставшийся после сбоя во время уплотнения) игнорируется.
+
+# Изменения, которые журнал собирает из ленты Game.changes
+_JOURNAL_EVENTS = (CaravanDeparted, CaravanReturned, TravelEventOccurred, CityEventsChanged, InventoryChanged, Unlocked)
+
+
+def _read_journal(path: str, snapshot_checksum: int) -> List[memoryview]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        checksum, body = _check_header(data, JOURNAL_MAGIC)
+    except SaveFormatError:
+        return []
+    if checksum != snapshot_checksum:
+        return []
+
+    frames = []
+    pos = 0
+    while pos + _FRAME.size <= len(body):
+        length, crc = _FRAME.unpack_from(body, pos)
+        payload = body[pos + _FRAME.size:pos + _FRAME.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        frames.append(payload)
+        pos += _FRAME.size + length
+    return frames
+
+
+def _apply_journal_record(payload: memoryview, game: Game, caravans: List[Caravan]) -> None:
+    """
+    Применяет запись журнала (см. SaveJournal._write_record).
+    Производные структуры игры пересобираются после всех записей (_rebuild).
+
+    Args:
+        payload (memoryview): Данные записи.
+        game (Game): Игра, восстановленная из снимка журнала.
+        caravans (List[Caravan]): Караваны по номеру в журнале; дополняется отправленными.
+    """
+    reader = _Reader(payload)
+    registry = game.registry
+    game.current_cycle = reader.i64()
+    for _ in range(reader.u32()):
+        game.market.advance()
+    game.rng.setstate({reader.str(): _read_rng(reader) for _ in range(reader.u32())})
+
+    player = game.player
+    player.balance = reader.i64()
+    for name, quantity in reader.value().items():
+        if quantity:
+            player.inventory[name] = quantity
+        else:
+            player.inventory.pop(name, None)
+    for index, event in reader.value():
+        city = game.cities[index]
+        city.current_event = event
+        city.current_event_id = -1 if event is None else registry.intern_event(event)
+    for _ in range(reader.u32()):
+        city_id = reader.u32()
+        game.market.set_city_state(city_id, reader.array("d"))
+
+    game.progression.reached = reader.u32()
+    game.unlock_events.extend(_read_unlock(state) for state in reader.value())
+    assets = reader.value()
+    if assets is not None:
+        # Новые курьеры и повозки дописываются: караваны в пути ссылаются на прежние объекты
+        replace, couriers, wagons = assets
+        if replace:
+            player.couriers, player.wagons = [], []
+        player.couriers.extend(Courier(name=n, endurance=e, illness_resistance=r) for n, e, r in couriers)
+        player.wagons.extend(Wagon(name=n, capacity=c, durability=d) for n, c, d in wagons)
+
+    store = game.active_caravans
+    for _ in range(reader.u32()):
+        caravan = _read_caravan(reader, player, game)
+        caravans.append(caravan)
+        store.append(caravan)
+    for number, event in reader.value():
+        caravan = caravans[number]
+        caravan.event_occurred = event
+        caravan.event_id = registry.intern_event(event)
+    for number in reader.array("q"):
+        caravan = caravans[number]
+        caravan.resolved = True
+        if caravan in store:
+            store.remove(caravan)
+
+    _read_reports(reader, game.reports)
+
+
+class SaveJournal:
+    """
+    Автосохранение с журналом: после каждого цикла дописываются только изменения,
+    а раз в несколько записей журнал уплотняется в новый снимок.
+
+    Изменения журнал узнаёт из ленты Game.changes (подписывается в start),
+    поэтому запись стоит O(изменений), а не O(состояния игры).
+
+    Атрибуты:
+        path (str): Путь к снимку; журнал лежит рядом с суффиксом JOURNAL_SUFFIX.
+        compact_every (int): Число записей журнала до уплотнения.
+        records (int): Записей в текущем журнале.
+    """
+
+    def __init__(self, path: str = AUTOSAVE_PATH, compact_every: int = COMPACT_EVERY):
+        """
+        Args:
+            path (str): Путь к файлу снимка.
+            compact_every (int): Число записей журнала до уплотнения.
+        """
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.records = 0
+        self._game: Optional[Game] = None
+        self._snapshot_size = 0
+        self._journal_size = 0
+        self._pending: List[object] = []
+
+    def start(self, game: Game) -> None:
+        """
+        Начинает журнал для игры: записывает снимок и пустой журнал.
+
+        Args:
+            game (Game): Игра.
+        """
+        if self._game is not None and self._game is not game:
+            self._game.changes.unsubscribe(self._collect)
+        self._game = game
+        game.changes.subscribe(self._collect, *_JOURNAL_EVENTS)
+        self.compact(game)
+
+    def _collect(self, events: List[object]) -> None:
+        self._pending.extend(events)
+
+    def compact(self, game: Game) -> None:
+        """
+        Уплотняет журнал: записывает полный снимок и начинает журнал заново.
+
+        Args:
+            game (Game): Игра.
+        """
+        # Накопленные изменения уже попадут в снимок
+        game.changes.flush()
+        self._pending = []
+
+        data = dumps(game)
+        _write_atomic(self.path, data)
+        # Новый журнал ссылается на CRC только что записанного снимка
+        header = _HEADER.pack(JOURNAL_MAGIC, FORMAT_VERSION, _HEADER.unpack_from(data)[2])
+        _write_atomic(self.journal_path, header)
+        self.records = 0
+        self._snapshot_size = len(data)
+        self._journal_size = len(header)
+
+        # Состояние, с которым сравнивается следующая запись
+        self._market_cycle = game.market.cycle
+        self._rng = game.rng.getstate()
+        self._reports_saved = game.reports.total
+        self._unlocks_saved = len(game.unlock_events)
+        self._assets = (len(game.player.couriers), len(game.player.wagons))
+        self._city_count = len(game.cities)
+        # Номера караванов в журнале: караваны снимка по порядку, затем отправленные
+        self._numbers = {id(caravan): number for number, caravan in enumerate(game.active_caravans)}
+        self._next_number = len(self._numbers)
+
+    def append(self, game: Game) -> None:
+        """
+        Дописывает изменения с прошлой записи. Стоимость пропорциональна
+        числу изменений, а не длине партии и не числу караванов в пути.
+
+        Args:
+            game (Game): Игра (если start для неё не вызывался, пишется снимок).
+        """
+        # Новые города меняют неизменяемую часть снимка: журнал к нему не применить
+        if (game is not self._game or self.records >= self.compact_every
+                or self._journal_size > self._snapshot_size or len(game.cities) != self._city_count):
+            if game is not self._game:
+                self.start(game)
+            else:
+                self.compact(game)
+            return
+
+        game.changes.flush()
+        writer = _Writer()
+        self._write_record(writer, game)
+        payload = writer.getvalue()
+
+        with open(self.journal_path, "ab") as f:
+            f.write(_FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self.records += 1
+        self._journal_size += _FRAME.size + len(payload)
+
+    def _write_record(self, writer: _Writer, game: Game) -> None:
+        """Записывает изменения из накопленных событий ленты и обновляет состояние сравнения."""
+        inventory = {}
+        cities = set()
+        sold = set()
+        departed = []
+        travel = {}
+        returned = []
+        unlocked = False
+        for event in self._pending:
+            if isinstance(event, InventoryChanged):
+                inventory.update(event.deltas)
+            elif isinstance(event, CityEventsChanged):
+                cities.update(event.city_ids)
+            elif isinstance(event, CaravanDeparted):
+                departed.append(event.caravan)
+            elif isinstance(event, TravelEventOccurred):
+                travel[id(event.caravan)] = event.caravan
+            elif isinstance(event, CaravanReturned):
+                returned.append(event.caravan)
+                if event.caravan.goods and not event.caravan.is_rome_expedition():
+                    sold.add(event.caravan.destination.city_id)
+            elif isinstance(event, Unlocked):
+                unlocked = True
+        self._pending = []
+
+        writer.i64(game.current_cycle)
+        writer.u32(game.market.cycle - self._market_cycle)
+        rng = game.rng.getstate()
+        changed = [name for name, state in rng.items() if state != self._rng.get(name)]
+        writer.u32(len(changed))
+        for name in changed:
+            writer.str(name)
+            _write_rng(writer, rng[name])
+
+        player = game.player
+        writer.i64(player.balance)
+        writer.value({name: player.inventory.get(name, 0) for name in inventory})
+        writer.value([[index, game.cities[index].current_event] for index in sorted(cities)])
+        writer.u32(len(sold))
+        for city_id in sorted(sold):
+            writer.u32(city_id)
+            writer.array("d", game.market.city_state(city_id))
+
+        writer.u32(game.progression.reached)
+        writer.value([_unlock_state(event) for event in game.unlock_events[self._unlocks_saved:]])
+        assets = (len(player.couriers), len(player.wagons))
+        if unlocked or assets != self._assets:
+            # Открытия только дописывают активы; списки короче прежних пишутся целиком
+            replace = assets[0] < self._assets[0] or assets[1] < self._assets[1]
+            couriers_from, wagons_from = (0, 0) if replace else self._assets
+            writer.value([
+                replace,
+                [[c.name, c.endurance, c.illness_resistance] for c in player.couriers[couriers_from:]],
+                [[w.name, w.capacity, w.durability] for w in player.wagons[wagons_from:]]
+            ])
+        else:
+            writer.value(None)
+
+        numbers = self._numbers
+        writer.u32(len(departed))
+        for caravan in departed:
+            numbers[id(caravan)] = self._next_number
+            self._next_number += 1
+            _write_caravan(writer, caravan, game)
+        writer.value([
+            [numbers[key], caravan.event_occurred]
+            for key, caravan in travel.items()
+            if key in numbers and caravan.event_occurred
+        ])
+        # Номер вернувшегося каравана больше не нужен (а его id может достаться новому объекту)
+        writer.array("q", [numbers.pop(id(caravan)) for caravan in returned if id(caravan) in numbers])
+        _write_reports(writer, game.reports, self._reports_saved)
+
+        self._market_cycle = game.market.cycle
+        self._rng = rng
+        self._reports_saved = game.reports.total
+        self._unlocks_saved = len(game.unlock_events)
+        self._assets = assets
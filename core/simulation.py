@@ -0,0 +1,361 @@
+"""
+Безголовая симуляция игры для тестирования баланса.
+
+Запуск:
+    python -m core.simulation --games 1000 --seed 42 --difficulty normal
+
+Производительность: жадная стратегия через Game на одном ядре проигрывает
+около 150–200 игр по 91 циклу в секунду: цикл стоит 60–70 мкс на десятки
+вызовов Python на объектах одной игры. Для тысяч игр в секунду есть
+пакетный движок core.batch_simulation — те же правила одними матрицами
+numpy для тысяч игр сразу:
+    python -m core.batch_simulation --games 100000 --difficulty normal
+"""
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from models.city import City
+from models.courier import Courier
+from models.goods_item import GoodsItem
+from models.player import Player
+from models.wagon import Wagon
+from core.config import RuntimeConfig
+from core.finance import calculate_trip_expenses, expected_unit_price
+from core.game import Game
+from core.goods import load_goods
+from core.pricing import np
+from core.rng import RngService
+from core.world import generate_world, load_balance_config
+
+# Ширина корзины гистограммы итогового баланса (в денариях)
+BALANCE_BUCKET = 500
+
+
+class Strategy:
+    """
+    Базовая стратегия: решает, что делать игроку в текущем цикле.
+    Наследники переопределяют play_cycle.
+    """
+
+    def play_cycle(self, game: Game) -> None:
+        """
+        Выполняет действия игрока перед переходом к следующему циклу.
+
+        Args:
+            game (Game): Текущая игра.
+        """
+        pass
+
+
+class IdleStrategy(Strategy):
+    """Стратегия, которая ничего не делает (эталон для сравнения)."""
+
+
+class GreedyStrategy(Strategy):
+    """
+    Жадная стратегия: когда караванов в пути нет, закупает один товар
+    с лучшей ожидаемой прибылью за цикл и отправляет его в лучший город.
+    """
+
+    def play_cycle(self, game: Game) -> None:
+        if game.active_caravans or not game.player.couriers or not game.player.wagons:
+            return
+
+        wagon = game.player.wagons[0]
+        if game.pricing is not None:
+            best = self._choose_vectorized(game, wagon)
+        else:
+            best = self._choose(game, wagon)
+        if best is None:
+            return
+
+        city, good, quantity = best
+        # Надёжность курьера и повозки влияет на события в пути: их подбирает диспетчер
+        courier, wagon = game.assign_fleet(quantity, city) or (game.player.couriers[0], wagon)
+        game.form_caravan(
+            courier=courier,
+            wagon=wagon,
+            goods_selection={good.name: quantity},
+            city=city
+        )
+        game.player.adjust_balance(-good.base_price * quantity)
+
+    @staticmethod
+    def _choose(game: Game, wagon: Wagon) -> Optional[Tuple[City, GoodsItem, int]]:
+        """Перебор всех пар (город, товар) без numpy."""
+        best = None
+        best_rate = 0.0
+        for city in game.cities:
+            if city.duration == 0:
+                continue
+            expenses = calculate_trip_expenses(city.duration * 2 + 1, game.config)
+            for good in game.goods:
+                quantity = min(wagon.capacity, game.player.balance // good.base_price)
+                if quantity <= 0:
+                    continue
+                saturation = game.market.modifier(city.city_id, good.name)
+                margin = expected_unit_price(good, city, game.config, saturation=saturation) - good.base_price
+                rate = (margin * quantity - expenses) / city.duration
+                if rate > best_rate:
+                    best_rate = rate
+                    best = (city, good, quantity)
+        return best
+
+    @staticmethod
+    def _choose_vectorized(game: Game, wagon: Wagon) -> Optional[Tuple[City, GoodsItem, int]]:
+        """Та же оценка одной матричной операцией через PricingKernel."""
+        kernel = game.pricing
+        base = kernel.base_prices_int
+        # Нехватка денег даёт нулевое количество и отрицательную оценку: такие товары не выбираются
+        quantity = np.minimum(wagon.capacity, game.player.balance // base)
+        np.maximum(quantity, 0, out=quantity)
+        if not quantity.any():
+            return None
+        margin = (kernel.price_matrix(game.market.factors) - base) * quantity
+        rate = (margin - kernel.trip_expenses[:, None]) / kernel.trip_rates
+        rate[kernel.rome_mask] = -np.inf
+
+        city_id, good_id = np.unravel_index(np.argmax(rate), rate.shape)
+        if not rate[city_id, good_id] > 0:
+            return None
+        good = game.goods_dict[game.registry.goods[good_id]]
+        return kernel.cities[city_id], good, int(quantity[good_id])
+
+
+@dataclass
+class GameResult:
+    """
+    Итог одной симулированной игры.
+
+    Атрибуты:
+        seed (int): Зерно генератора случайных чисел.
+        won (bool): Достигнута ли цель.
+        final_balance (int): Итоговый баланс.
+        cycles (int): Цикл, на котором игра завершилась.
+        caravans (int): Количество завершённых караванов.
+    """
+    seed: int
+    won: bool
+    final_balance: int
+    cycles: int
+    caravans: int
+
+
+@dataclass
+class BatchSummary:
+    """
+    Агрегированные результаты серии игр.
+
+    Атрибуты:
+        games (int): Количество сыгранных игр.
+        wins (int): Количество побед.
+        balance_histogram (Dict[int, int]): Нижняя граница корзины баланса → число игр.
+        cycles_to_win (Dict[int, int]): Цикл победы → число игр.
+        balance_sum (int): Сумма итоговых балансов.
+        min_balance (Optional[int]): Минимальный итоговый баланс.
+        max_balance (Optional[int]): Максимальный итоговый баланс.
+        elapsed (float): Время симуляции в секундах (при слиянии складывается).
+    """
+    games: int = 0
+    wins: int = 0
+    balance_histogram: Dict[int, int] = field(default_factory=dict)
+    cycles_to_win: Dict[int, int] = field(default_factory=dict)
+    balance_sum: int = 0
+    min_balance: Optional[int] = None
+    max_balance: Optional[int] = None
+    elapsed: float = 0.0
+
+    def add(self, result: GameResult) -> None:
+        """
+        Учитывает результат одной игры.
+
+        Args:
+            result (GameResult): Результат игры.
+        """
+        self.games += 1
+        self.balance_sum += result.final_balance
+        bucket = result.final_balance // BALANCE_BUCKET * BALANCE_BUCKET
+        self.balance_histogram[bucket] = self.balance_histogram.get(bucket, 0) + 1
+        if self.min_balance is None or result.final_balance < self.min_balance:
+            self.min_balance = result.final_balance
+        if self.max_balance is None or result.final_balance > self.max_balance:
+            self.max_balance = result.final_balance
+        if result.won:
+            self.wins += 1
+            self.cycles_to_win[result.cycles] = self.cycles_to_win.get(result.cycles, 0) + 1
+
+    def merge(self, other: "BatchSummary") -> None:
+        """
+        Объединяет с результатами другой серии (порядок слияния не важен).
+
+        Args:
+            other (BatchSummary): Результаты другой серии.
+        """
+        self.games += other.games
+        self.wins += other.wins
+        self.balance_sum += other.balance_sum
+        for bucket, count in other.balance_histogram.items():
+            self.balance_histogram[bucket] = self.balance_histogram.get(bucket, 0) + count
+        for cycle, count in other.cycles_to_win.items():
+            self.cycles_to_win[cycle] = self.cycles_to_win.get(cycle, 0) + count
+        if other.min_balance is not None and (self.min_balance is None or other.min_balance < self.min_balance):
+            self.min_balance = other.min_balance
+        if other.max_balance is not None and (self.max_balance is None or other.max_balance > self.max_balance):
+            self.max_balance = other.max_balance
+        self.elapsed += other.elapsed
+
+    @property
+    def win_rate(self) -> float:
+        """Доля побед."""
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean_balance(self) -> float:
+        """Средний итоговый баланс."""
+        return self.balance_sum / self.games if self.games else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        """Скорость симуляции."""
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def create_player(config: RuntimeConfig) -> Player:
+    """
+    Создаёт игрока так же, как main.create_player, но без зависимостей от UI.
+    Настройки сложности уже применены в скомпилированной конфигурации.
+    """
+    couriers = [
+        Courier(
+            name=courier_data["name"],
+            endurance=courier_data.get("endurance", 0),
+            illness_resistance=courier_data["illness_resistance"]
+        ) for courier_data in config.starting_couriers
+    ]
+    wagons = [
+        Wagon(
+            name=wagon_data["name"],
+            capacity=wagon_data["capacity"],
+            durability=wagon_data["durability"]
+        ) for wagon_data in config.starting_wagons
+    ]
+    return Player(balance=config.starting_balance, couriers=couriers, wagons=wagons)
+
+
+def run_game(
+        config: RuntimeConfig,
+        strategy: Strategy,
+        seed: int,
+        difficulty: str = "normal",
+        goods: Optional[List[GoodsItem]] = None,
+        preroll_events: bool = False
+) -> GameResult:
+    """
+    Проигрывает одну игру до конца без ввода и вывода.
+
+    Args:
+        config (RuntimeConfig): Конфигурация (уже с применённой сложностью).
+        strategy (Strategy): Стратегия игрока.
+        seed (int): Зерно партии (см. core.rng.RngService); одно зерно воспроизводит игру целиком.
+        difficulty (str): Уровень сложности.
+        goods (Optional[List[GoodsItem]]): Готовый список товаров (переиспользуется между играми).
+        preroll_events (bool): Разыгрывать события в пути при отправке каравана.
+
+    Returns:
+        GameResult: Итог игры.
+    """
+    rng = RngService(seed)
+    game = Game(
+        player=create_player(config),
+        cities=generate_world(config, rng=rng.world),
+        goods=goods if goods is not None else load_goods(config),
+        config=config,
+        difficulty=difficulty,
+        verbose=False,
+        preroll_events=preroll_events,
+        rng=rng
+    )
+
+    while not game.is_game_over():
+        strategy.play_cycle(game)
+        game.next_cycle()
+        game.update_caravans()
+
+    return GameResult(
+        seed=seed,
+        won=game.has_won(),
+        final_balance=game.player.balance,
+        cycles=game.current_cycle,
+        caravans=game.reports.total
+    )
+
+
+def run_batch(
+        config: RuntimeConfig,
+        strategy: Strategy,
+        games: int,
+        seed: int = 0,
+        difficulty: str = "normal",
+        preroll_events: bool = False
+) -> BatchSummary:
+    """
+    Проигрывает серию игр подряд с зёрнами seed, seed + 1, ...
+
+    Args:
+        config (RuntimeConfig): Конфигурация (уже с применённой сложностью).
+        strategy (Strategy): Стратегия игрока.
+        games (int): Количество игр.
+        seed (int): Начальное зерно.
+        difficulty (str): Уровень сложности.
+        preroll_events (bool): Разыгрывать события в пути при отправке каравана.
+
+    Returns:
+        BatchSummary: Агрегированные результаты.
+    """
+    summary = BatchSummary()
+    goods = load_goods(config)
+    started = time.perf_counter()
+    for i in range(games):
+        summary.add(run_game(config, strategy, seed + i, difficulty, goods, preroll_events))
+    summary.elapsed = time.perf_counter() - started
+    return summary
+
+
+STRATEGIES = {
+    "idle": IdleStrategy,
+    "greedy": GreedyStrategy,
+}
+
+
+def print_summary(summary: BatchSummary) -> None:
+    """Печатает сводку серии игр."""
+    print(f"Игр: {summary.games}, побед: {summary.wins} ({summary.win_rate:.1%})")
+    print(f"Баланс: средний {summary.mean_balance:.0f}, "
+          f"мин {summary.min_balance}, макс {summary.max_balance}")
+    if summary.cycles_to_win:
+        total = sum(summary.cycles_to_win.values())
+        mean_cycles = sum(c * n for c, n in summary.cycles_to_win.items()) / total
+        print(f"Средний цикл победы: {mean_cycles:.1f}")
+    print(f"Скорость: {summary.games_per_second:.0f} игр/с ({summary.elapsed:.2f} с)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Безголовая симуляция Торгового Дома")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", choices=["easy", "normal", "hard"], default="normal")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="greedy")
+    parser.add_argument("--config", default="data/balance_config.json")
+    parser.add_argument("--preroll", action="store_true", help="Разыгрывать события в пути при отправке")
+    args = parser.parse_args()
+
+    config = load_balance_config(path=args.config, difficulty=args.difficulty)
+    summary = run_batch(
+        config, STRATEGIES[args.strategy](), args.games, args.seed, args.difficulty, args.preroll
+    )
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Параллельный перебор вариантов баланса методом Монте-Карло.
+
+Запуск:
+    python -m core.sweep --games 10000 --workers 8 --difficulty easy normal hard \\
+        --set player.victory_goal=10000,15000 --set "travel_events.Набег разбойников=0.05,0.1"
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from core.config import RuntimeConfig, compile_config
+from core.simulation import STRATEGIES, BatchSummary, print_summary, run_batch
+from core.world import load_raw_config
+
+# Сколько шардов приходится на одного рабочего процесса (для балансировки нагрузки)
+SHARDS_PER_WORKER = 4
+
+
+@dataclass
+class Variant:
+    """
+    Один вариант конфигурации для перебора.
+
+    Атрибуты:
+        difficulty (str): Уровень сложности.
+        overrides (Dict[str, Any]): Переопределения вида "путь.к.ключу" → значение.
+    """
+    difficulty: str
+    overrides: Dict[str, Any]
+
+    def label(self) -> str:
+        """Краткое описание варианта для вывода."""
+        parts = [self.difficulty] + [f"{path}={value}" for path, value in self.overrides.items()]
+        return ", ".join(parts)
+
+
+def apply_override(config: dict, path: str, value: Any) -> None:
+    """
+    Записывает значение в конфигурацию по пути через точку.
+    Для списков событий сегмент пути — это имя события,
+    значение записывается в его поле probability.
+
+    Args:
+        config (dict): Исходная конфигурация до компиляции (изменяется на месте).
+        path (str): Путь, например "travel_costs.food_per_day" или "city_events.Война".
+        value (Any): Новое значение.
+    """
+    keys = path.split(".")
+    node = config
+    for key in keys[:-1]:
+        node = node[key]
+
+    last = keys[-1]
+    if isinstance(node, list):
+        for entry in node:
+            if entry.get("name") == last:
+                entry["probability"] = value
+                return
+        raise KeyError(f"Событие '{last}' не найдено в конфигурации")
+    if last not in node:
+        raise KeyError(f"Ключ '{path}' не найден в конфигурации")
+    node[last] = value
+
+
+def build_config(config_path: str, variant: Variant) -> RuntimeConfig:
+    """Загружает конфигурацию, применяет к ней вариант и компилирует."""
+    config = load_raw_config(config_path)
+    for path, value in variant.overrides.items():
+        apply_override(config, path, value)
+    return compile_config(config, variant.difficulty)
+
+
+def _run_shard(args: Tuple[str, Variant, str, int, int]) -> BatchSummary:
+    """
+    Проигрывает один шард зёрен в рабочем процессе.
+    Возвращает только компактную сводку, без объектов игры.
+    """
+    config_path, variant, strategy_name, seed_start, games = args
+    config = build_config(config_path, variant)
+    return run_batch(config, STRATEGIES[strategy_name](), games, seed_start, variant.difficulty)
+
+
+def split_seeds(master_seed: int, games: int, shards: int) -> List[Tuple[int, int]]:
+    """
+    Делит диапазон зёрен [master_seed, master_seed + games) на непрерывные шарды.
+    Игра i всегда получает зерно master_seed + i, поэтому результат
+    не зависит от числа шардов и рабочих процессов.
+
+    Returns:
+        List[Tuple[int, int]]: Пары (начальное зерно, количество игр).
+    """
+    shards = max(1, min(shards, games))
+    base, extra = divmod(games, shards)
+    result = []
+    start = master_seed
+    for i in range(shards):
+        count = base + (1 if i < extra else 0)
+        if count:
+            result.append((start, count))
+            start += count
+    return result
+
+
+def run_sweep(
+        variants: List[Variant],
+        games: int,
+        master_seed: int = 0,
+        strategy_name: str = "greedy",
+        workers: Optional[int] = None,
+        config_path: str = "data/balance_config.json"
+) -> List[Tuple[Variant, BatchSummary]]:
+    """
+    Прогоняет все варианты на пуле процессов.
+
+    Args:
+        variants (List[Variant]): Варианты конфигурации.
+        games (int): Количество игр на вариант.
+        master_seed (int): Главное зерно; одинаковое для всех вариантов,
+            чтобы варианты сравнивались на одних и тех же случайных мирах.
+        strategy_name (str): Имя стратегии из STRATEGIES.
+        workers (Optional[int]): Число процессов (по умолчанию — число ядер).
+        config_path (str): Путь к balance_config.json.
+
+    Returns:
+        List[Tuple[Variant, BatchSummary]]: Сводка по каждому варианту в исходном порядке;
+            elapsed — суммарное время шардов варианта в рабочих процессах.
+    """
+    workers = workers or os.cpu_count() or 1
+    seed_shards = split_seeds(master_seed, games, workers * SHARDS_PER_WORKER)
+    tasks = [
+        (config_path, variant, strategy_name, seed_start, count)
+        for variant in variants
+        for seed_start, count in seed_shards
+    ]
+
+    # Время варианта — сумма времени его шардов (скорость в пересчёте на один процесс)
+    summaries = [BatchSummary() for _ in variants]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for index, shard_summary in enumerate(pool.map(_run_shard, tasks, chunksize=1)):
+            summaries[index // len(seed_shards)].merge(shard_summary)
+    return list(zip(variants, summaries))
+
+
+def parse_value(text: str) -> Any:
+    """Разбирает значение из командной строки как JSON, иначе оставляет строкой."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def build_variants(difficulties: List[str], assignments: List[str]) -> List[Variant]:
+    """
+    Строит декартово произведение сложностей и переопределений.
+
+    Args:
+        difficulties (List[str]): Уровни сложности.
+        assignments (List[str]): Строки вида "путь=знач1,знач2".
+    """
+    axes = []
+    for assignment in assignments:
+        path, _, values = assignment.partition("=")
+        axes.append([(path, parse_value(v)) for v in values.split(",")])
+
+    variants = []
+    for difficulty in difficulties:
+        for combo in itertools.product(*axes):
+            variants.append(Variant(difficulty=difficulty, overrides=dict(combo)))
+    return variants
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Параллельный перебор вариантов баланса")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--difficulty", nargs="+", choices=["easy", "normal", "hard"], default=["normal"])
+    parser.add_argument("--set", action="append", default=[], dest="assignments",
+                        help="Переопределение: путь=знач1,знач2 (можно указать несколько раз)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="greedy")
+    parser.add_argument("--config", default="data/balance_config.json")
+    args = parser.parse_args()
+
+    variants = build_variants(args.difficulty, args.assignments)
+    started = time.perf_counter()
+    results = run_sweep(variants, args.games, args.seed, args.strategy, args.workers, args.config)
+    elapsed = time.perf_counter() - started
+    for variant, summary in results:
+        print(f"\n=== {variant.label()} ===")
+        print_summary(summary)
+
+    total = sum(summary.games for _, summary in results)
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"\nВсего: {total} игр за {elapsed:.2f} с ({rate:.0f} игр/с на всех процессах)")
+
+
+if __name__ == "__main__":
+    main()
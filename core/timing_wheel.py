@@ -0,0 +1,76 @@
+"""
+Очередь с корзинами по номеру цикла (timing wheel).
+
+Объекты раскладываются по циклу, в котором их нужно обработать,
+поэтому за цикл просматриваются только «созревшие» корзины.
+"""
+from typing import Dict, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class TimingWheel(Generic[T]):
+    """
+    Корзины «цикл → объекты».
+
+    Атрибуты:
+        buckets (Dict[int, List[T]]): Объекты по циклу обработки.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[int, List[T]] = {}
+        self._size = 0
+        # Наименьший цикл, в котором ещё могут быть объекты
+        self._cursor = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, cycle: int, item: T) -> None:
+        """
+        Ставит объект в корзину цикла.
+
+        Args:
+            cycle (int): Цикл обработки.
+            item (T): Объект.
+        """
+        self.buckets.setdefault(cycle, []).append(item)
+        self._size += 1
+        if self._cursor is None or cycle < self._cursor:
+            self._cursor = cycle
+
+    def pop_due(self, cycle: int) -> List[T]:
+        """
+        Забирает все объекты с циклом обработки не позже указанного.
+        Порядок: по циклу, внутри цикла — по порядку постановки.
+
+        Args:
+            cycle (int): Текущий цикл.
+
+        Returns:
+            List[T]: Созревшие объекты.
+        """
+        if self._cursor is None or self._cursor > cycle:
+            return []
+
+        due: List[T] = []
+        if cycle - self._cursor <= len(self.buckets):
+            # Обычный случай: курсор отстаёт на несколько циклов
+            for key in range(self._cursor, cycle + 1):
+                bucket = self.buckets.pop(key, None)
+                if bucket:
+                    due.extend(bucket)
+        else:
+            # Большой разрыв (например, после загрузки): обходим только непустые корзины
+            for key in sorted(k for k in self.buckets if k <= cycle):
+                due.extend(self.buckets.pop(key))
+
+        self._size -= len(due)
+        self._cursor = cycle + 1 if self.buckets else None
+        return due
+
+    def clear(self) -> None:
+        """Очищает все корзины."""
+        self.buckets.clear()
+        self._size = 0
+        self._cursor = None
@@ -1,90 +1,129 @@
 import random
 import json
 from typing import List
-from models.city import City
+from models.city import City, ROME_CITY_ID
+from core.config import RuntimeConfig, compile_config
 
 # Корни для генерации латинских названий городов
 LATIN_ROOTS = ["Brund", "Cap", "Nerv", "Flor", "Agr", "Tar", "Lug", "Vent", "Aqua", "Tric", "Claud", "Mar", "Luc"]
-
-
-def generate_city_name(existing_names: List[str]) -> str:
+# Городов в новом мире (вместе с Римом)
+DEFAULT_CITY_COUNT = 7
+# Длительности экспедиции в новые города (циклов)
+CITY_DURATIONS = (2, 4, 6)
+# Сколько товаров у города в повышенном и сколько в пониженном спросе
+DEMAND_SHIFTED_GOODS = 2
+# Модификаторы повышенного и пониженного спроса
+HIGH_DEMAND = 1.2
+LOW_DEMAND = 0.8
+
+
+def generate_city_name(existing_names: List[str], rng: random.Random = random) -> str:
     """Генерация уникального названия города."""
     while True:
-        root = random.choice(LATIN_ROOTS)
-        suffix = random.choice(["ium", "a", "um", "ona", "ensis"])
+        root = rng.choice(LATIN_ROOTS)
+        suffix = rng.choice(["ium", "a", "um", "ona", "ensis"])
         name = root + suffix
         if name not in existing_names:
             return name
 
 
-def generate_world(config: dict, city_count: int = 7) -> List[City]:
-    """Генерация мира: создаёт список городов."""
-    goods_names = [item["name"] for item in config["goods"]]
+def generate_cities(
+        config: RuntimeConfig,
+        count: int,
+        existing: List[City],
+        rng: random.Random = random
+) -> List[City]:
+    """
+    Генерация новых городов в дополнение к существующим (при создании мира
+    и при открытии городов по прогрессии).
+
+    Args:
+        count: Сколько городов создать
+        existing: Уже существующие города (для уникальности имён и нумерации)
+        rng: Генератор случайных чисел (поток мира из core.rng.RngService)
+    """
+    goods_names = config.good_names
+    used_names = {city.name for city in existing}
     cities = []
-    used_names = set()
 
-    # Добавляем Рим первым городом
-    rome_duration = 0
-    rome_demand_modifiers = {good: 1.0 for good in goods_names}
-    rome = City(
-        name="Рим",
-        duration=rome_duration,
-        demand_modifiers=rome_demand_modifiers,
-        current_event=None
-    )
-    cities.append(rome)
-    used_names.add("Рим")
-
-    # Генерируем остальные города
-    for _ in range(city_count - 1):
+    for _ in range(count):
         # Имя и длительность экспедиции
-        name = generate_city_name(list(used_names))
+        name = generate_city_name(list(used_names), rng)
         used_names.add(name)
-        duration = random.choice([2, 4, 6])  # Длительность от 1 до 3 дней
+        duration = rng.choice(CITY_DURATIONS)  # Длительность от 1 до 3 дней
 
         # Спрос: 2 повышенных, 2 пониженных
         demand_modifiers = {good: 1.0 for good in goods_names}
-        high_demand = random.sample(goods_names, 2)
-        low_demand = random.sample([g for g in goods_names if g not in high_demand], 2)
+        high_demand = rng.sample(goods_names, DEMAND_SHIFTED_GOODS)
+        low_demand = rng.sample([g for g in goods_names if g not in high_demand], DEMAND_SHIFTED_GOODS)
 
         for good in high_demand:
-            demand_modifiers[good] = 1.2
+            demand_modifiers[good] = HIGH_DEMAND
         for good in low_demand:
-            demand_modifiers[good] = 0.8
+            demand_modifiers[good] = LOW_DEMAND
 
         # Создание города
         city = City(
             name=name,
             duration=duration,
             demand_modifiers=demand_modifiers,
-            current_event=None
+            current_event=None,
+            city_id=len(existing) + len(cities)
         )
         cities.append(city)
 
     return cities
 
 
-def load_balance_config(
-        path: str = "data/balance_config.json",
-        difficulty: str = "normal"
-) -> dict:
-    with open(path, encoding="utf-8") as f:
-        config = json.load(f)
+def generate_world(config: RuntimeConfig, city_count: int = DEFAULT_CITY_COUNT, rng: random.Random = random) -> List[City]:
+    """
+    Генерация мира: создаёт список городов.
 
-    # Применяем настройки сложности, если они есть
-    if "difficulty_settings" in config and "player" in config:
-        settings = config["difficulty_settings"].get(difficulty, {})
+    Args:
+        rng: Генератор случайных чисел (поток мира из core.rng.RngService)
+    """
+    goods_names = config.good_names
+    cities = []
 
-        # Модифицируем стартовый баланс игрока
-        if "starting_balance_multiplier" in settings:
-            config["player"]["starting_balance"] = int(
-                config["player"]["starting_balance"] * settings["starting_balance_multiplier"]
-            )
+    # Добавляем Рим первым городом
+    rome_duration = 0
+    rome_demand_modifiers = {good: 1.0 for good in goods_names}
+    rome = City(
+        name="Рим",
+        duration=rome_duration,
+        demand_modifiers=rome_demand_modifiers,
+        current_event=None,
+        city_id=ROME_CITY_ID
+    )
+    cities.append(rome)
+
+    # Генерируем остальные города
+    cities.extend(generate_cities(config, city_count - 1, cities, rng))
+
+    return cities
 
-        # Модифицируем сопротивляемость болезням курьеров
-        if "illness_resistance_multiplier" in settings and "starting_couriers" in config["player"]:
-            for courier in config["player"]["starting_couriers"]:
-                if "illness_resistance" in courier:
-                    courier["illness_resistance"] *= settings["illness_resistance_multiplier"]
 
-    return config
+def load_raw_config(path: str = "data/balance_config.json") -> dict:
+    """
+    Читает balance_config.json без проверки и компиляции
+    (например, чтобы изменить значения перед compile_config).
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_balance_config(
+        path: str = "data/balance_config.json",
+        difficulty: str = "normal"
+) -> RuntimeConfig:
+    """
+    Загружает конфигурацию и компилирует её для уровня сложности.
+
+    Args:
+        path: Путь к balance_config.json
+        difficulty: Уровень сложности
+
+    Returns:
+        Проверенная неизменяемая конфигурация (см. core.config)
+    """
+    return compile_config(load_raw_config(path), difficulty)
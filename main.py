@@ -5,10 +5,14 @@
     python main.py          # GUI версия (по умолчанию)
     python main.py gui      # GUI версия
     python main.py cli      # CLI версия
+    python main.py gui --seed 42   # GUI версия с воспроизводимой партией
+    python main.py cli --seed 42   # CLI версия с воспроизводимой партией
 """
 
 import os
 import sys
+from typing import Optional
+from core.config import RuntimeConfig
 from core.world import load_balance_config, generate_world
 from core.goods import load_goods
 from models.player import Player
@@ -16,6 +20,7 @@ from models.courier import Courier
 from models.wagon import Wagon
 from models.audio import audio_manager
 from core.game import Game  # Исправлен импорт
+from core.rng import RngService
 from ui.cli import show_main_menu, select_difficulty
 
 
@@ -31,7 +36,7 @@ def get_resource_path(relative_path: str) -> str:
     return os.path.join(base_path, relative_path)
 
 
-def load_game_config(difficulty: str) -> dict:
+def load_game_config(difficulty: str) -> RuntimeConfig:
     """Загрузка и проверка конфигурации с учетом сложности"""
     config_path = get_resource_path("data/balance_config.json")
     if not os.path.exists(config_path):
@@ -50,39 +55,28 @@ def load_game_config(difficulty: str) -> dict:
         raise
 
 
-def create_player(config: dict, difficulty: str) -> Player:
-    """Создание игрока с учетом уровня сложности"""
-    # Настройки баланса
-    starting_balance = config["player"]["starting_balance"]
-    if "difficulty_settings" in config and difficulty in config["difficulty_settings"]:
-        settings = config["difficulty_settings"][difficulty]
-        starting_balance = int(starting_balance * settings.get("starting_balance_multiplier", 1.0))
-
+def create_player(config: RuntimeConfig) -> Player:
+    """Создание игрока (настройки сложности уже применены в конфигурации)"""
     # Создание курьеров
-    couriers = []
-    for courier_data in config["player"].get("starting_couriers", []):
-        illness_resistance = courier_data.get("illness_resistance", 1.0)
-        if "difficulty_settings" in config and difficulty in config["difficulty_settings"]:
-            settings = config["difficulty_settings"][difficulty]
-            illness_resistance *= settings.get("illness_resistance_multiplier", 1.0)
-
-        couriers.append(Courier(
+    couriers = [
+        Courier(
             name=courier_data["name"],
             endurance=courier_data.get("endurance", 0),
-            illness_resistance=illness_resistance
-        ))
+            illness_resistance=courier_data["illness_resistance"]
+        ) for courier_data in config.starting_couriers
+    ]
 
     # Создание повозок
     wagons = [
         Wagon(
             name=wagon_data["name"],
             capacity=wagon_data["capacity"],
-            durability=wagon_data.get("durability", 0.75)
-        ) for wagon_data in config["player"].get("starting_wagons", [])
+            durability=wagon_data["durability"]
+        ) for wagon_data in config.starting_wagons
     ]
 
     return Player(
-        balance=starting_balance,
+        balance=config.starting_balance,
         couriers=couriers,
         wagons=wagons
     )
@@ -101,12 +95,17 @@ def main():
             interface = "cli"
         elif sys.argv[1].lower() in ["gui", "window", "graphical"]:
             interface = "gui"
+
+    # Зерно партии: одно и то же зерно воспроизводит игру
+    seed = None
+    if "--seed" in sys.argv[1:-1]:
+        seed = int(sys.argv[sys.argv.index("--seed") + 1])
     
     if interface == "gui":
         # Запуск GUI версии
         try:
             from ui.gui import TradingHouseGUI
-            app = TradingHouseGUI()
+            app = TradingHouseGUI(seed=seed)
             app.run()
         except ImportError as e:
             print("Ошибка: Не удалось запустить GUI. Убедитесь, что установлен customtkinter.")
@@ -121,10 +120,10 @@ def main():
     
     if interface == "cli":
         # Запуск CLI версии
-        run_cli_game()
+        run_cli_game(seed)
 
 
-def run_cli_game():
+def run_cli_game(seed: Optional[int] = None):
     """Запуск CLI версии игры"""
     # Выбор сложности через CLI
     difficulty = select_difficulty()
@@ -136,12 +135,13 @@ def run_cli_game():
         return
 
     # Генерация мира и товаров
-    cities = generate_world(config)
+    rng = RngService(seed)
+    cities = generate_world(config, rng=rng.world)
     goods = load_goods(config)
 
     # Создание игрока
-    player = create_player(config, difficulty)    # Инициализация игры - исправлено количество аргументов
-    game = Game(player=player, cities=cities, goods=goods, config=config, difficulty=difficulty)
+    player = create_player(config)    # Инициализация игры - исправлено количество аргументов
+    game = Game(player=player, cities=cities, goods=goods, config=config, difficulty=difficulty, rng=rng)
 
     # Запуск CLI интерфейса
     show_main_menu(game)
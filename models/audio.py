@@ -43,6 +43,8 @@ class AudioManager:
         self.is_playing = False
         self.is_enabled = PYGAME_AVAILABLE
         self.shuffle_mode = True  # Всегда включено
+        # Свой генератор: перемешивание в потоке музыки не сдвигает игровые потоки ГСЧ
+        self.rng = random.Random()
         self._music_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         
@@ -83,7 +85,7 @@ class AudioManager:
     def _shuffle_playlist(self) -> None:
         """Перемешивание плейлиста"""
         if self.playlist:
-            random.shuffle(self.playlist)
+            self.rng.shuffle(self.playlist)
             self.current_track_index = 0
     
     def start_music(self) -> None:
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, Optional
 from models.courier import Courier
 from models.wagon import Wagon
-from models.city import City
+from models.city import City, ROME_CITY_ID
 
 
 @dataclass
@@ -21,6 +21,9 @@ class Caravan:
         return_cycle (int): Игровой цикл, когда он вернётся обратно.
         event_occurred (Optional[str]): Событие, произошедшее в пути (туда или обратно).
         resolved (bool): Флаг, указывающий, был ли караван уже обработан при возвращении.
+        event_id (Optional[int]): ID события в пути в реестре.
+        scheduled_event_id (Optional[int]): Заранее разыгранное событие в пути (ID в реестре).
+        scheduled_event_cycle (Optional[int]): Цикл, в котором наступит заранее разыгранное событие.
     """
     courier: Courier
     wagon: Wagon
@@ -32,6 +35,9 @@ class Caravan:
     return_cycle: int
     event_occurred: Optional[str] = None  # общее событие, можно расширить для "туда"/"обратно"
     resolved: bool = False  # флаг для предотвращения повторной обработки
+    event_id: Optional[int] = None
+    scheduled_event_id: Optional[int] = None
+    scheduled_event_cycle: Optional[int] = None
 
     @property
     def goods_carried(self) -> Dict[str, int]:
@@ -63,4 +69,7 @@ class Caravan:
 
     def is_rome_expedition(self) -> bool:
         """Проверяет, является ли экспедиция поездкой в Рим."""
+        city_id = self.destination.city_id
+        if city_id >= 0:
+            return city_id == ROME_CITY_ID
         return self.destination.name == "Рим"
\ No newline at end of file
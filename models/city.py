@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 from typing import Dict, Optional
 
+# ID Рима: столица всегда первая в списке городов мира
+ROME_CITY_ID = 0
+
 @dataclass
 class City:
     """
@@ -11,11 +14,15 @@ class City:
         duration (int): Длительность экспедиции туда и обратно (в днях).
         demand_modifiers (Dict[str, float]): Модификаторы спроса на товары.
         current_event (Optional[str]): Текущее событие в городе (устанавливается каждый игровой год).
+        city_id (int): Позиция города в списке мира (-1, если не назначена).
+        current_event_id (int): ID текущего события в реестре (-1, если события нет).
     """
     name: str
     duration: int
     demand_modifiers: Dict[str, float]
     current_event: Optional[str] = None
+    city_id: int = -1
+    current_event_id: int = -1
 
     def get_price_modifier(self, goods_name: str) -> float:
         """
@@ -1,9 +1,8 @@
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 from models.courier import Courier
 from models.wagon import Wagon
 from models.goods_item import GoodsItem
-from models.caravan import Caravan
 
 @dataclass
 class Player:
@@ -15,13 +14,17 @@ class Player:
         inventory (Dict[str, int]): Товары на складе (название → количество).
         couriers (List[Courier]): Курьеры, доступные игроку.
         wagons (List[Wagon]): Повозки, доступные игроку.
-        completed_caravans (List[Caravan]): История завершённых миссий.
+        on_balance_change (Optional[Callable[[int], None]]): Вызывается с новым балансом
+            после каждого adjust_balance (например, для проверки порогов прогрессии).
+        on_inventory_change (Optional[Callable[[str, int], None]]): Вызывается с названием
+            товара и изменением количества после add_goods и успешного remove_goods.
     """
     balance: int
     inventory: Dict[str, int] = field(default_factory=dict)
     couriers: List[Courier] = field(default_factory=list)
     wagons: List[Wagon] = field(default_factory=list)
-    completed_caravans: List[Caravan] = field(default_factory=list)
+    on_balance_change: Optional[Callable[[int], None]] = field(default=None, repr=False, compare=False)
+    on_inventory_change: Optional[Callable[[str, int], None]] = field(default=None, repr=False, compare=False)
 
     def add_goods(self, item: GoodsItem, quantity: int) -> None:
         """
@@ -32,6 +35,8 @@ class Player:
             quantity (int): Количество.
         """
         self.inventory[item.name] = self.inventory.get(item.name, 0) + quantity
+        if self.on_inventory_change is not None:
+            self.on_inventory_change(item.name, quantity)
 
     def remove_goods(self, item: GoodsItem, quantity: int) -> bool:
         """
@@ -48,6 +53,8 @@ class Player:
             self.inventory[item.name] -= quantity
             if self.inventory[item.name] == 0:
                 del self.inventory[item.name]
+            if self.on_inventory_change is not None:
+                self.on_inventory_change(item.name, -quantity)
             return True
         return False
 
@@ -72,3 +79,5 @@ class Player:
             amount (int): Сумма (может быть отрицательной).
         """
         self.balance += amount
+        if self.on_balance_change is not None:
+            self.on_balance_change(self.balance)
@@ -0,0 +1,89 @@
+"""
+Паритет пакетного движка с Game: в одном и том же состоянии партии
+BatchGreedyStrategy выбирает тот же рейс, что GreedyStrategy.
+"""
+import unittest
+from core.batch_simulation import BatchGreedyStrategy, BatchRules, GameBatch
+from core.game import Game
+from core.goods import load_goods
+from core.pricing import NUMPY_AVAILABLE, np
+from core.rng import RngService
+from core.simulation import GreedyStrategy, create_player
+from core.world import generate_world, load_balance_config
+
+CONFIG_PATH = "data/balance_config.json"
+GAMES = 20
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "нужен numpy")
+class BatchGreedyParityTest(unittest.TestCase):
+    def setUp(self):
+        self.config = load_balance_config(path=CONFIG_PATH, difficulty="normal")
+        self.registry = self.config.registry
+        self.goods = load_goods(self.config)
+        self.rules = BatchRules(self.config, "normal")
+
+    def _snapshot(self, game: Game) -> GameBatch:
+        """Пакет из одной игры в состоянии game (города, события, рынок, баланс, флот)."""
+        rules, registry = self.rules, self.registry
+        batch = GameBatch(rules, 1, np.random.default_rng(0))
+        batch.cycle = game.current_cycle
+        batch.update_market()
+        batch.city_count[0] = len(game.cities)
+        for slot, city in enumerate(game.cities):
+            batch.duration[0, slot] = city.duration
+            batch.trip_cost[0, slot] = rules.trip_expenses[city.duration * 2 + 1]
+            batch.trip_rate[0, slot] = max(city.duration, 1)
+            batch.sellable[0, slot] = city.duration > 0
+            batch.events[0, slot] = game.pricing.event_id(city.current_event)
+            for name, modifier in city.demand_modifiers.items():
+                batch.demand_factors[0, slot, registry.good_ids[name]] = 1.0 + (modifier - 1.0)
+            for name in registry.goods:
+                batch.sales[0, slot, registry.good_ids[name]] = game.market.count(slot, name) / batch.sales_scale
+        batch.balance[0] = game.player.balance
+        batch.couriers[0] = False
+        for courier in game.player.couriers:
+            batch.couriers[0, rules.courier_keys.index(courier.illness_resistance)] = True
+        batch.wagons[0] = False
+        for wagon in game.player.wagons:
+            batch.wagons[0, rules.wagon_types.index((wagon.capacity, wagon.durability))] = True
+        first = game.player.wagons[0]
+        batch.first_wagon[0] = rules.wagon_types.index((first.capacity, first.durability))
+        return batch
+
+    def test_greedy_choice_matches_game(self):
+        strategy, batch_strategy = GreedyStrategy(), BatchGreedyStrategy()
+        checked = 0
+        for seed in range(GAMES):
+            rng = RngService(seed)
+            game = Game(
+                player=create_player(self.config),
+                cities=generate_world(self.config, rng=rng.world),
+                goods=self.goods,
+                config=self.config,
+                difficulty="normal",
+                verbose=False,
+                rng=rng
+            )
+            while not game.is_game_over():
+                if not game.active_caravans:
+                    batch = self._snapshot(game)
+                    batch_strategy.play_cycle(batch)
+                    best = strategy._choose_vectorized(game, game.player.wagons[0])
+                    with self.subTest(seed=seed, cycle=game.current_cycle):
+                        self.assertEqual(bool(batch.travelling[0]), best is not None)
+                        if best is not None:
+                            city, good, quantity = best
+                            self.assertEqual(int(batch.trip_city[0]), city.city_id)
+                            self.assertEqual(int(batch.trip_good[0]), self.registry.good_ids[good.name])
+                            self.assertEqual(int(batch.trip_quantity[0]), quantity)
+                            self.assertEqual(int(batch.balance[0]), game.player.balance - good.base_price * quantity)
+                    checked += 1
+                strategy.play_cycle(game)
+                game.next_cycle()
+                game.update_caravans()
+        self.assertGreater(checked, GAMES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Паритет цены продажи: expected_unit_price, продажа по словарям,
+продажа через PricingKernel и матрицы ядра дают одну и ту же цену.
+"""
+import unittest
+from models.caravan import Caravan
+from models.city import City
+from models.courier import Courier
+from models.wagon import Wagon
+from core.finance import calculate_sale_profit, expected_unit_price
+from core.goods import load_goods
+from core.market import MarketSaturation
+from core.pricing import NUMPY_AVAILABLE, PricingKernel
+from core.world import load_balance_config
+
+CONFIG_PATH = "data/balance_config.json"
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "нужен numpy")
+class SalePriceParityTest(unittest.TestCase):
+    def setUp(self):
+        self.config = load_balance_config(path=CONFIG_PATH, difficulty="normal")
+        self.goods = load_goods(self.config)
+        self.goods_dict = {item.name: item for item in self.goods}
+        self.city = City(name="Тестовый город", duration=2, demand_modifiers={}, city_id=0)
+        self.kernel = PricingKernel(self.goods, [self.city], self.config, self.config.registry)
+        self.market = MarketSaturation(1, self.config.registry, self.config)
+
+    def _saturate(self, name: str, sales: int) -> None:
+        for _ in range(sales):
+            self.market.record_sale(self.city.city_id, {name: 1})
+
+    def _set_event(self, event_name: str) -> None:
+        self.city.current_event = event_name
+        self.city.current_event_id = self.config.registry.event_ids.get(event_name, -1)
+
+    def _sale_price(self, name: str, kernel) -> int:
+        caravan = Caravan(
+            courier=Courier(name="Курьер", endurance=0, illness_resistance=1.0),
+            wagon=Wagon(name="Повозка", capacity=100, durability=1.0),
+            goods={name: 1},
+            destination=self.city,
+            days_to_travel=2,
+            departure_cycle=0,
+            arrival_cycle=2,
+            return_cycle=4
+        )
+        profit, _ = calculate_sale_profit(caravan, self.goods_dict, self.config, self.market, kernel)
+        return profit
+
+    def _prices(self, name: str):
+        item = self.goods_dict[name]
+        saturation = self.market.modifier(self.city.city_id, name)
+        column = self.kernel.good_index[name]
+        return {
+            "expected": expected_unit_price(item, self.city, self.config, saturation=saturation),
+            "dict": self._sale_price(name, None),
+            "kernel": self._sale_price(name, self.kernel),
+            "matrix": int(self.kernel.price_matrix(self.market.factors)[0, column]),
+            "batch": int(self.kernel.unit_prices([0], [self.kernel.city_event_id(self.city)],
+                                                 self.market.factors)[0, column]),
+        }
+
+    def test_iron_at_war_with_saturated_market(self):
+        self._set_event("Война")
+        self._saturate("Железо", 7)
+        self.assertEqual(self.market.modifier(self.city.city_id, "Железо"), 0.7)
+        prices = self._prices("Железо")
+        self.assertEqual(prices["expected"], 21)
+        self.assertEqual(set(prices.values()), {21}, prices)
+
+    def test_all_goods_events_and_saturation_levels(self):
+        for event_name in self.config.event_modifiers:
+            for sales in (0, 3, 5, 7):
+                self.market = MarketSaturation(1, self.config.registry, self.config)
+                self._set_event(event_name)
+                for item in self.goods:
+                    self._saturate(item.name, sales)
+                for item in self.goods:
+                    with self.subTest(event=event_name, sales=sales, good=item.name):
+                        prices = self._prices(item.name)
+                        self.assertEqual(len(set(prices.values())), 1, prices)
+
+    def test_rome_price_is_fixed(self):
+        self.city.duration = 0
+        self.kernel.set_cities([self.city])
+        self._set_event("Война")
+        for item in self.goods:
+            self._saturate(item.name, 7)
+            prices = self._prices(item.name)
+            self.assertEqual(set(prices.values()), {int(item.base_price * 0.9)}, prices)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,8 @@
+from core.finance import expected_unit_price
+from core.progression import UNLOCK_CITIES
+from core.save_system import DEFAULT_SAVE_PATH, SaveFormatError, SaveJournal, latest_save, load_game, save_game
+
+
 def select_difficulty() -> str:
     """CLI выбор уровня сложности"""
     print("\n=== Выбор уровня сложности ===")
@@ -20,8 +25,13 @@ def select_difficulty() -> str:
 def show_main_menu(game) -> None:
     """
     Главное меню игрока. Работает в цикле до завершения игры.
+    После каждого цикла игра автоматически сохраняется в журнал.
     """
+    journal = SaveJournal()
+    autosave(journal, game, start=True)
+
     while not game.is_game_over():
+        show_unlocks(game)
         print("\n=== Торговый Дом ===")
         print(f"Цикл: {game.current_cycle} / {game.max_cycles}")
         print(f"Баланс: {game.player.balance} денариев")
@@ -31,7 +41,9 @@ def show_main_menu(game) -> None:
         print("4. Купить товары")
         print("5. Посмотреть склад")
         print("6. Перейти к следующему циклу")
-        print("7. Выйти")
+        print("7. Сохранить игру")
+        print("8. Загрузить игру")
+        print("9. Выйти")
 
         choice = input("Выберите действие: ").strip()
 
@@ -50,9 +62,17 @@ def show_main_menu(game) -> None:
         elif choice == "6":
             game.next_cycle()
             game.update_caravans()
+            autosave(journal, game)
             show_active_caravans_status(game)
             input("\nНажмите Enter для возврата в меню...")
         elif choice == "7":
+            save_current_game(game)
+        elif choice == "8":
+            loaded = load_saved_game(game)
+            if loaded is not game:
+                game = loaded
+                autosave(journal, game, start=True)
+        elif choice == "9":
             print("Выход из игры.")
             break
         else:
@@ -69,6 +89,86 @@ def show_main_menu(game) -> None:
         print("К сожалению, цель не достигнута.")
 
 
+def show_unlocks(game) -> None:
+    """
+    Сообщает об открытиях прогрессии, достигнутых с прошлого показа.
+    """
+    for event in game.pop_unlocks():
+        print(f"\n🔓 Баланс достиг {event.threshold} денариев: открыто «{event.name}»")
+        if event.kind == UNLOCK_CITIES:
+            print("   Новые города: " + ", ".join(event.added))
+
+
+def choose_asset(assets: list, title: str):
+    """
+    Выбор свободного курьера или повозки, если их несколько.
+
+    Returns:
+        Выбранный объект или None — назначить автоматически.
+    """
+    if len(assets) == 1:
+        return assets[0]
+    print(f"\n--- {title} (свободны) ---")
+    for i, asset in enumerate(assets, 1):
+        print(f"{i}. {describe_asset(asset)}")
+    while True:
+        choice = input("Выберите (номер, Enter — автоматически): ").strip()
+        if not choice:
+            return None
+        if choice.isdigit() and 1 <= int(choice) <= len(assets):
+            return assets[int(choice) - 1]
+        print("Неверный выбор.")
+
+
+def describe_asset(asset) -> str:
+    """Краткое описание курьера или повозки."""
+    if hasattr(asset, "capacity"):
+        return f"{asset.name} (вместимость {asset.capacity}, риск поломки ×{asset.durability:.2f})"
+    return f"{asset.name} (риск болезни ×{asset.illness_resistance:.2f})"
+
+
+def save_current_game(game, path: str = DEFAULT_SAVE_PATH) -> None:
+    """
+    Сохраняет игру в файл.
+    """
+    try:
+        save_game(game, path)
+        print(f"Игра сохранена в {path}.")
+    except OSError as e:
+        print(f"Не удалось сохранить игру: {e}")
+
+
+def autosave(journal: SaveJournal, game, start: bool = False) -> None:
+    """
+    Автосохранение: новый снимок при start, иначе запись изменений в журнал.
+    """
+    try:
+        if start:
+            journal.start(game)
+        else:
+            journal.append(game)
+    except OSError as e:
+        print(f"Автосохранение не удалось: {e}")
+
+
+def load_saved_game(game, path: str = None):
+    """
+    Загружает игру из файла (по умолчанию — самое свежее сохранение).
+    При ошибке возвращает текущую игру.
+    """
+    path = path or latest_save()
+    if path is None:
+        print("Сохранение не найдено.")
+        return game
+    try:
+        loaded = load_game(path)
+    except (OSError, SaveFormatError) as e:
+        print(f"Не удалось загрузить игру: {e}")
+        return game
+    print(f"Игра загружена: цикл {loaded.current_cycle}, баланс {loaded.player.balance} денариев.")
+    return loaded
+
+
 def show_cities(game) -> None:
     print("\n--- Города ---")
     for city in game.cities:
@@ -78,6 +178,13 @@ def show_cities(game) -> None:
             # Показываем общее время экспедиции
             print(f"{city.name}: длительность экспедиции {city.duration} дней (туда-обратно)")
 
+    print("\n--- Рекомендуемые маршруты ---")
+    for i, route in enumerate(game.recommend_routes()[:3], 1):
+        if route.per_cycle <= 0:
+            break
+        print(f"{i}. {route.city.name}: закупить «{route.best_good}», "
+              f"ожидаемая прибыль ≈ {route.expected_net:.0f} денариев ({route.per_cycle:.0f} за цикл)")
+
 
 def show_caravans(game) -> None:
     print("\n--- Активные караваны ---")
@@ -175,19 +282,19 @@ def send_caravan(game) -> None:
     city = game.cities[int(city_index) - 1]
 
     # Проверка доступности курьеров и повозок
-    couriers = game.player.couriers
-    if not couriers:
-        print("Нет доступных курьеров.")
+    fleet = game.fleet
+    if not fleet.couriers.idle_count:
+        print("Нет свободных курьеров: все в пути.")
         input("\nНажмите Enter для возврата в меню...")
         return
-    courier = couriers[0]
-
-    wagons = game.player.wagons
-    if not wagons:
-        print("Нет доступных повозок.")
+    if not fleet.wagons.idle_count:
+        print("Нет свободных повозок: все в пути.")
         input("\nНажмите Enter для возврата в меню...")
         return
-    wagon = wagons[0]
+    courier = choose_asset(fleet.couriers.idle(), "Курьеры")
+    wagon = choose_asset(fleet.wagons.idle(), "Повозки")
+    # Без выбранной повозки груз ограничен самой большой свободной
+    capacity = wagon.capacity if wagon is not None else fleet.largest_idle_capacity()
 
     # Подготовка данных о товарах
     goods_dict = {g.name: g for g in game.goods}
@@ -204,16 +311,10 @@ def send_caravan(game) -> None:
         good_obj = goods_dict[name]
 
         # Расчет цены с учетом особенностей Рима
+        expected_price = expected_unit_price(good_obj, city, game.config)
         if city.duration == 0:  # Рим
-            expected_price = int(good_obj.base_price * 0.9)
             print(f"{idx}. {name} — {qty} ед. — фиксированная цена: {expected_price} (90% от базовой)")
         else:
-            city_mod = city.demand_modifiers.get(name, 1.0) - 1.0
-            event = city.current_event or "Нет события"
-            event_mod = game.config["event_modifiers"].get(event, {}).get(name, 1.0) - 1.0
-            total_percent = city_mod + event_mod
-            final_modifier = 1.0 + total_percent
-            expected_price = int(good_obj.base_price * final_modifier)
             print(f"{idx}. {name} — {qty} ед. — ожидаемая цена: {expected_price}")
 
     # Выбор товаров
@@ -221,11 +322,23 @@ def send_caravan(game) -> None:
     used_capacity = 0
     goods_index = {i + 1: name for i, (name, _) in enumerate(available_goods)}
 
-    print("Введите номер товара и количество через пробел (пустая строка — завершить):")
+    print("Введите номер товара и количество через пробел (пустая строка — завершить, «авто» — автозагрузка):")
     while True:
         entry = input("> ").strip()
         if not entry:
             break
+        if entry.lower() in ("авто", "auto"):
+            plan = game.plan_cargo(wagon or fleet.pick_wagon(capacity, 1.0), city, courier)
+            if not plan.goods:
+                print("Нечего загрузить.")
+                continue
+            selection = dict(plan.goods)
+            used_capacity = plan.units
+            for name, qty in selection.items():
+                print(f"  {name}: {qty} ед.")
+            print(f"Загружено {used_capacity}/{capacity} ед. Выручка: {plan.revenue:.0f}, "
+                  f"ожидаемый чистый доход: {plan.expected_net:.0f} ± {plan.net_std:.0f}")
+            break
         try:
             num, qty = entry.split()
             num = int(num)
@@ -239,10 +352,10 @@ def send_caravan(game) -> None:
             if qty <= 0:
                 print("Количество должно быть положительным.")
                 continue
-            if qty > game.player.inventory[name]:
+            if selection.get(name, 0) + qty > game.player.inventory[name]:
                 print("Недостаточно на складе.")
                 continue
-            if used_capacity + qty > wagon.capacity:
+            if used_capacity + qty > capacity:
                 print("Недостаточно места в повозке.")
                 continue
 
@@ -256,17 +369,33 @@ def send_caravan(game) -> None:
         input("\nНажмите Enter для возврата в меню...")
         return
 
-    # Подтверждение и отправка
+    # Недостающих курьера и повозку подбирает диспетчер
+    risk = game.route_risk(city)
+    courier = courier or fleet.pick_courier(risk)
+    wagon = wagon or fleet.pick_wagon(used_capacity, risk)
+    if courier is None or wagon is None:
+        print("Нет свободных курьера или повозки для такого груза.")
+        input("\nНажмите Enter для возврата в меню...")
+        return
+
+    print(f"Курьер: {describe_asset(courier)}")
+    print(f"Повозка: {describe_asset(wagon)}")
+
+    # Подтверждение и отправка: склад трогаем только после того, как диспетчер принял караван
+    try:
+        caravan = game.form_caravan(
+            courier=courier,
+            wagon=wagon,
+            goods_selection=selection,
+            city=city
+        )
+    except ValueError as e:
+        print(f"Караван не отправлен: {e}")
+        input("\nНажмите Enter для возврата в меню...")
+        return
+
     for name, qty in selection.items():
-        good_obj = goods_dict[name]
-        game.player.remove_goods(good_obj, qty)
-
-    caravan = game.form_caravan(
-        courier=courier,
-        wagon=wagon,
-        goods_selection=selection,
-        city=city
-    )
+        game.player.remove_goods(goods_dict[name], qty)
 
     if city.duration == 0:
         print(f"Караван отправлен в Рим (вернется в этом цикле)")
@@ -7,11 +7,12 @@ import customtkinter as ctk
 import sys
 import os
 import json
-from typing import Optional
+from typing import Dict, Optional
 
 # Добавляем корневую папку в путь для импортов
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.config import RuntimeConfig
 from core.world import load_balance_config, generate_world
 from core.goods import load_goods
 from models.player import Player
@@ -19,6 +20,8 @@ from models.courier import Courier
 from models.wagon import Wagon
 from models.audio import audio_manager
 from core.game import Game
+from core.rng import RngService
+from core.save_system import SaveFormatError, SaveJournal, latest_save, load_game, save_game
 
 # Импорты экранов из подпапки screens
 from ui.screens.difficulty_screen import DifficultyScreen, RomanTheme
@@ -45,7 +48,12 @@ def get_resource_path(relative_path: str) -> str:
 
 class TradingHouseGUI:
     """Главный класс GUI приложения"""
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Args:
+            seed (Optional[int]): Зерно партии (None — случайное); одно зерно воспроизводит игру.
+        """
+        self.seed = seed
         # Настройка темы customtkinter
         ctk.set_appearance_mode("light")
         ctk.set_default_color_theme("blue")
@@ -64,7 +72,10 @@ class TradingHouseGUI:
         
         # Игровые объекты
         self.game: Optional[Game] = None
+        self.journal: Optional[SaveJournal] = None
         self.current_frame: Optional[ctk.CTkFrame] = None
+        # Экраны игры создаются при первом переходе и затем переиспользуются
+        self.screens: Dict[type, ctk.CTkFrame] = {}
           # Создание стартового экрана
         self.create_start_screen()
     
@@ -119,10 +130,48 @@ class TradingHouseGUI:
         self.root.geometry(f"{width}x{height}+{x}+{y}")
     
     def clear_screen(self):
-        """Очистка экрана от текущего фрейма"""
+        """Очистка экрана: экран из кэша скрывается, остальные фреймы уничтожаются"""
         if self.current_frame:
-            self.current_frame.destroy()
+            if self.screens.get(type(self.current_frame)) is self.current_frame:
+                self.current_frame.pack_forget()
+            else:
+                self.current_frame.destroy()
+            self.current_frame = None
+    
+    def reset_screens(self):
+        """Уничтожение кэша экранов (новая, загруженная или завершенная партия)"""
+        if self.current_frame is not None and self.screens.get(type(self.current_frame)) is self.current_frame:
             self.current_frame = None
+        for screen in self.screens.values():
+            screen.destroy()
+        self.screens.clear()
+    
+    def show_screen(self, screen_class: type, **kwargs) -> ctk.CTkFrame:
+        """
+        Показать экран игры. При первом переходе экран создается и кэшируется,
+        при повторных — обновляется на месте через update_screen(game),
+        без пересоздания виджетов.
+        
+        Args:
+            screen_class (type): Класс экрана.
+            **kwargs: Аргументы конструктора, кроме parent и game.
+            
+        Returns:
+            CTkFrame: Показанный экран.
+        """
+        self.clear_screen()
+        # Кэшированные экраны, подписанные на ленту изменений, обновляются до показа
+        self.game.changes.flush()
+        
+        screen = self.screens.get(screen_class)
+        if screen is None:
+            screen = screen_class(parent=self.root, game=self.game, **kwargs)
+            self.screens[screen_class] = screen
+        else:
+            screen.update_screen(self.game)
+        screen.pack(fill="both", expand=True)
+        self.current_frame = screen
+        return screen
     
     def create_start_screen(self):
         """Создание стартового экрана"""
@@ -242,6 +291,22 @@ Ave Caesar! Fortuna audaces iuvat!
             command=self.exit_game
         )
         exit_button.pack(side="left", padx=10)
+
+        # Кнопка загрузки сохранения
+        if latest_save():
+            load_button = ctk.CTkButton(
+                button_frame,
+                text="📂 Загрузить игру",
+                font=RomanTheme.FONT_TEXT,
+                fg_color=RomanTheme.BUTTON,
+                hover_color=RomanTheme.BUTTON_HOVER,
+                text_color=RomanTheme.BACKGROUND,
+                corner_radius=8,
+                width=180,
+                height=40,
+                command=self.load_game_action
+            )
+            load_button.pack(side="left", padx=10)
         
         # Панель управления аудио
         self.create_audio_controls(main_frame)
@@ -275,25 +340,30 @@ Ave Caesar! Fortuna audaces iuvat!
             config = self.load_game_config(difficulty)
             
             # Генерация мира и товаров
-            cities = generate_world(config)
+            rng = RngService(self.seed)
+            cities = generate_world(config, rng=rng.world)
             goods = load_goods(config)
             
             # Создание игрока
-            player = self.create_player(config, difficulty)            # Инициализация игры
+            player = self.create_player(config)            # Инициализация игры
             self.game = Game(
                 player=player,
                 cities=cities,
                 goods=goods,
                 config=config,
-                difficulty=difficulty
+                difficulty=difficulty,
+                rng=rng
             )
             
+            self.start_autosave()
+            self.reset_screens()
+
             # Переход к главному меню игры
             self.show_main_menu()
             
         except Exception as e:
             self.show_error(f"Ошибка при запуске игры: {str(e)}")
-    def load_game_config(self, difficulty: str) -> dict:
+    def load_game_config(self, difficulty: str) -> RuntimeConfig:
         """Загрузка конфигурации игры"""
         config_path = get_resource_path("data/balance_config.json")
         if not os.path.exists(config_path):
@@ -301,35 +371,26 @@ Ave Caesar! Fortuna audaces iuvat!
         
         return load_balance_config(path=config_path, difficulty=difficulty)
     
-    def create_player(self, config: dict, difficulty: str) -> Player:
-        """Создание игрока с учетом уровня сложности"""
-        # Настройки баланса
-        starting_balance = config["player"]["starting_balance"]
-        if "difficulty_settings" in config and difficulty in config["difficulty_settings"]:
-            settings = config["difficulty_settings"][difficulty]
-            starting_balance = int(starting_balance * settings.get("starting_balance_multiplier", 1.0))
-
+    def create_player(self, config: RuntimeConfig) -> Player:
+        """Создание игрока (настройки сложности уже применены в конфигурации)"""
         # Создание курьеров
-        couriers = []
-        for courier_data in config["player"].get("starting_couriers", []):
-            illness_resistance = courier_data.get("illness_resistance", 1.0)
-            if "difficulty_settings" in config and difficulty in config["difficulty_settings"]:
-                settings = config["difficulty_settings"][difficulty]
-                illness_resistance *= settings.get("illness_resistance_multiplier", 1.0)
-
-            couriers.append(Courier(
+        couriers = [
+            Courier(
                 name=courier_data["name"],
                 endurance=courier_data.get("endurance", 0),
-                illness_resistance=illness_resistance
-            ))        # Создание повозок
+                illness_resistance=courier_data["illness_resistance"]
+            ) for courier_data in config.starting_couriers
+        ]
+        # Создание повозок
         wagons = [
             Wagon(
                 name=wagon_data["name"],
                 capacity=wagon_data["capacity"],
-                durability=wagon_data.get("durability", 0.75)
-            ) for wagon_data in config["player"].get("starting_wagons", [])
-        ]        # Создаем игрока с начальными параметрами (баланс - позиционный аргумент)
-        player = Player(starting_balance)
+                durability=wagon_data["durability"]
+            ) for wagon_data in config.starting_wagons
+        ]
+        # Создаем игрока с начальными параметрами (баланс - позиционный аргумент)
+        player = Player(config.starting_balance)
         player.couriers = couriers
         player.wagons = wagons
         
@@ -341,7 +402,7 @@ Ave Caesar! Fortuna audaces iuvat!
             self.show_error("Ошибка: игра не инициализирована")
             return
             
-        self.clear_screen()        # Создаем callbacks для действий меню
+        # Создаем callbacks для действий меню
         menu_callbacks = {
             "show_cities": self.show_cities_overview,
             "show_caravans": self.show_caravans_status,
@@ -349,17 +410,13 @@ Ave Caesar! Fortuna audaces iuvat!
             "buy_goods": self.buy_goods_placeholder,
             # "show_inventory": self.show_inventory_placeholder,
             "next_cycle": self.next_cycle_action,
+            "save_game": self.save_game_action,
+            "load_game": self.load_game_action,
             "quit_game": self.quit_to_start_screen
         }
         
-        # Создаем экран главного меню
-        main_menu_screen = MainMenuScreen(
-            parent=self.root,
-            game=self.game,
-            callbacks=menu_callbacks
-        )
-        main_menu_screen.pack(fill="both", expand=True)
-        self.current_frame = main_menu_screen
+        # Показываем экран главного меню
+        self.show_screen(MainMenuScreen, callbacks=menu_callbacks)
       # Заглушки для действий меню (будут реализованы позже)
     def show_cities_overview(self):
         """Экран просмотра городов"""
@@ -367,32 +424,16 @@ Ave Caesar! Fortuna audaces iuvat!
             self.show_error("Ошибка: игра не инициализирована")
             return
             
-        self.clear_screen()
-        
-        # Создаем экран просмотра городов
-        cities_screen = CitiesOverviewScreen(
-            parent=self.root,
-            game=self.game,
-            on_back=self.show_main_menu
-        )
-        cities_screen.pack(fill="both", expand=True)
-        self.current_frame = cities_screen
+        # Показываем экран просмотра городов
+        self.show_screen(CitiesOverviewScreen, on_back=self.show_main_menu)
     def show_caravans_status(self):
         """Экран просмотра статуса караванов"""
         if not self.game:
             self.show_error("Ошибка: игра не инициализирована")
             return
             
-        self.clear_screen()
-        
-        # Создаем экран статуса караванов
-        caravans_screen = CaravansStatusScreen(
-            parent=self.root,
-            game=self.game,
-            on_back=self.show_main_menu
-        )
-        caravans_screen.pack(fill="both", expand=True)
-        self.current_frame = caravans_screen
+        # Показываем экран статуса караванов
+        self.show_screen(CaravansStatusScreen, on_back=self.show_main_menu)
     
     def send_caravan_screen(self):
         """Экран отправки каравана"""
@@ -400,16 +441,8 @@ Ave Caesar! Fortuna audaces iuvat!
             self.show_error("Ошибка: игра не инициализирована")
             return
             
-        self.clear_screen()
-        
-        # Создаем экран отправки каравана
-        send_caravan_screen = SendCaravanScreen(
-            parent=self.root,
-            game=self.game,
-            on_back=self.show_main_menu
-        )
-        send_caravan_screen.pack(fill="both", expand=True)
-        self.current_frame = send_caravan_screen
+        # Показываем экран отправки каравана
+        self.show_screen(SendCaravanScreen, on_back=self.show_main_menu)
     
     def buy_goods_placeholder(self):
         """Экран покупки товаров"""
@@ -425,15 +458,8 @@ Ave Caesar! Fortuna audaces iuvat!
             self.show_error("Ошибка: игра не инициализирована")
             return
             
-        self.clear_screen()        
-        # Создаем экран магазина и склада
-        shop_screen = ShopInventoryScreen(
-            parent=self.root,
-            game=self.game,
-            on_back=self.show_main_menu
-        )
-        shop_screen.pack(fill="both", expand=True)
-        self.current_frame = shop_screen
+        # Показываем экран магазина и склада
+        self.show_screen(ShopInventoryScreen, on_back=self.show_main_menu)
         
     def next_cycle_action(self):
         """Переход к следующему циклу"""
@@ -442,6 +468,8 @@ Ave Caesar! Fortuna audaces iuvat!
             
         self.game.next_cycle()
         self.game.update_caravans()
+        self.game.changes.flush()
+        self.autosave()
         
         # Проверяем достижение цели победы или истечения времени, используя метод is_game_over из Game
         if self.game.is_game_over():
@@ -453,9 +481,58 @@ Ave Caesar! Fortuna audaces iuvat!
         # Обновляем главное меню
         self.show_main_menu()
     
+    def save_game_action(self):
+        """Сохранение текущей игры"""
+        if not self.game:
+            return
+
+        try:
+            save_game(self.game)
+        except OSError as e:
+            self.show_error(f"Не удалось сохранить игру: {str(e)}")
+            return
+        self.show_main_menu()
+
+    def load_game_action(self):
+        """Загрузка сохранённой игры"""
+        path = latest_save()
+        if path is None:
+            self.show_error("Сохранение не найдено")
+            return
+
+        try:
+            self.game = load_game(path)
+        except (OSError, SaveFormatError) as e:
+            self.show_error(f"Не удалось загрузить игру: {str(e)}")
+            return
+        self.start_autosave()
+        self.reset_screens()
+        self.show_main_menu()
+
+    def start_autosave(self):
+        """Начало журнала автосохранения для текущей игры"""
+        self.journal = SaveJournal()
+        try:
+            self.journal.start(self.game)
+        except OSError as e:
+            print(f"Автосохранение не удалось: {e}")
+            self.journal = None
+
+    def autosave(self):
+        """Запись изменений за цикл в журнал автосохранения"""
+        if not self.journal:
+            return
+
+        try:
+            self.journal.append(self.game)
+        except OSError as e:
+            print(f"Автосохранение не удалось: {e}")
+
     def quit_to_start_screen(self):
         """Возврат к стартовому экрану"""
         self.game = None
+        self.journal = None
+        self.reset_screens()
         self.create_start_screen()
     
     def show_placeholder(self, title: str, description: str):
@@ -611,6 +688,23 @@ Ave Caesar! Fortuna audaces iuvat!
         )
         stats_label.pack(pady=10)
         
+        # Итоги торговли за всю игру из хранилища отчетов
+        reports = self.game.reports
+        summary = f"Караванов: {reports.total} · Чистый доход рейсов: {reports.total_net:,} денариев"
+        best_city = reports.best_city()
+        if best_city is not None:
+            summary += f"\nЛучший маршрут: {best_city} (окупаемость {reports.cities[best_city].roi:+.0%})"
+        top_goods = reports.top_goods(1)
+        if top_goods:
+            summary += f" · Самый доходный товар: {top_goods[0]} ({reports.goods[top_goods[0]].revenue:,} денариев)"
+        summary_label = ctk.CTkLabel(
+            stats_frame,
+            text=summary,
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.TEXT
+        )
+        summary_label.pack(pady=(0, 10))
+        
         # Кнопки
         button_frame = ctk.CTkFrame(
             main_frame,
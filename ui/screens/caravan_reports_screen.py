@@ -4,6 +4,12 @@
 
 import customtkinter as ctk
 from ui.screens.difficulty_screen import RomanTheme
+from ui.screens.virtual_list import VirtualList
+
+# Высота карточки отчета без товаров, блока товаров и строки одного товара (пиксели)
+REPORT_BASE_HEIGHT = 320
+GOODS_BLOCK_HEIGHT = 50
+GOODS_LINE_HEIGHT = 78
 
 
 class CaravanReportsScreen(ctk.CTkFrame):
@@ -37,18 +43,17 @@ class CaravanReportsScreen(ctk.CTkFrame):
         )
         subtitle_label.pack(pady=(0, 30))
         
-        # Основная область с отчетами
-        reports_frame = ctk.CTkScrollableFrame(
-            self,
-            fg_color=RomanTheme.BACKGROUND,
-            corner_radius=10,
-            border_width=2,
-            border_color=RomanTheme.FRAME_BORDER
-        )
-        reports_frame.pack(fill="both", expand=True, padx=40, pady=(0, 20))
-        
+        # Основная область с отчетами: виджеты создаются только для видимых отчетов
         if not self.reports:
             # Если нет отчетов
+            reports_frame = ctk.CTkFrame(
+                self,
+                fg_color=RomanTheme.BACKGROUND,
+                corner_radius=10,
+                border_width=2,
+                border_color=RomanTheme.FRAME_BORDER
+            )
+            reports_frame.pack(fill="both", expand=True, padx=40, pady=(0, 20))
             no_reports_label = ctk.CTkLabel(
                 reports_frame,
                 text="🏺 В этом цикле караваны не завершились 🏺",
@@ -57,9 +62,17 @@ class CaravanReportsScreen(ctk.CTkFrame):
             )
             no_reports_label.pack(pady=50)
         else:
-            # Отображаем отчеты
-            for i, report in enumerate(self.reports):
-                self.create_report_widget(reports_frame, report, i + 1)
+            self.reports_list = VirtualList(
+                self,
+                create_row=self.create_report_row,
+                bind_row=self.bind_report_row,
+                row_height=self.report_height,
+                corner_radius=10,
+                border_width=2,
+                border_color=RomanTheme.FRAME_BORDER
+            )
+            self.reports_list.pack(fill="both", expand=True, padx=40, pady=(0, 20))
+            self.reports_list.set_items(self.reports)
         
         # Кнопка продолжения
         continue_button = ctk.CTkButton(
@@ -76,22 +89,35 @@ class CaravanReportsScreen(ctk.CTkFrame):
         )
         continue_button.pack(pady=20)
     
-    def create_report_widget(self, parent, report: dict, caravan_num: int):
-        """Создает виджет для одного отчета о караване"""
+    @staticmethod
+    def report_height(report: dict) -> int:
+        """Высота карточки отчета (зависит от числа проданных товаров)"""
+        goods_count = len(report['sale_breakdown'])
+        if not goods_count:
+            return REPORT_BASE_HEIGHT
+        return REPORT_BASE_HEIGHT + GOODS_BLOCK_HEIGHT + GOODS_LINE_HEIGHT * goods_count
+    
+    def create_report_row(self, parent):
+        """
+        Создает пустую карточку отчета. Карточки переиспользуются списком
+        при прокрутке и заполняются в bind_report_row.
+        """
+        row = ctk.CTkFrame(parent, fg_color=RomanTheme.BACKGROUND, corner_radius=0)
+        
         # Фрейм для отчета
         report_frame = ctk.CTkFrame(
-            parent,
+            row,
             fg_color="#f8f5f0",
             corner_radius=10,
             border_width=1,
             border_color=RomanTheme.FRAME_BORDER
         )
-        report_frame.pack(fill="x", padx=10, pady=10)
+        report_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Заголовок каравана
         caravan_title = ctk.CTkLabel(
             report_frame,
-            text=f"🚛 КАРАВАН #{caravan_num} ЗАВЕРШЕН",
+            text="",
             font=("Georgia", 18, "bold"),
             text_color=RomanTheme.ACCENT
         )
@@ -107,7 +133,7 @@ class CaravanReportsScreen(ctk.CTkFrame):
         
         event_path_label = ctk.CTkLabel(
             events_frame,
-            text=f"🛤️ Событие в пути: {report['event_path']}",
+            text="",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
@@ -115,57 +141,26 @@ class CaravanReportsScreen(ctk.CTkFrame):
         
         event_city_label = ctk.CTkLabel(
             events_frame,
-            text=f"🏛️ Событие в городе: {report['event_city']}",
+            text="",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
         event_city_label.pack(pady=(0, 10), anchor="w", padx=15)
         
-        # Товары
-        if report['sale_breakdown']:
-            goods_frame = ctk.CTkFrame(
-                report_frame,
-                fg_color="#ebe8e1",
-                corner_radius=8
-            )
-            goods_frame.pack(fill="x", padx=15, pady=(0, 10))
-            
-            goods_title = ctk.CTkLabel(
-                goods_frame,
-                text="📦 ПРОДАННЫЕ ТОВАРЫ:",
-                font=("Georgia", 14, "bold"),
-                text_color=RomanTheme.TEXT
-            )
-            goods_title.pack(pady=(10, 5))
-            
-            for name, data in report['sale_breakdown'].items():
-                # Название товара и основная информация
-                goods_info = ctk.CTkLabel(
-                    goods_frame,
-                    text=f"• {name}: {data['qty']} ед. × {data['unit_price']} денариев (базовая цена: {data['base_price']})",
-                    font=RomanTheme.FONT_TEXT,
-                    text_color=RomanTheme.TEXT
-                )
-                goods_info.pack(anchor="w", padx=20, pady=2)
-                
-                # Модификаторы
-                modifiers_text = f"   Модификаторы: город {data['city_mod']:+.2f}, событие {data['event_mod']:+.2f}, дальность {data['dist_mod']:+.2f}"
-                modifiers_label = ctk.CTkLabel(
-                    goods_frame,
-                    text=modifiers_text,
-                    font=("Consolas", 12),
-                    text_color=RomanTheme.NEUTRAL
-                )
-                modifiers_label.pack(anchor="w", padx=20, pady=1)
-                
-                # Итоговый множитель
-                multiplier_label = ctk.CTkLabel(
-                    goods_frame,
-                    text=f"   Итоговый множитель: {data['final_mod']:.2f}",
-                    font=("Consolas", 12, "bold"),
-                    text_color=RomanTheme.TEXT
-                )
-                multiplier_label.pack(anchor="w", padx=20, pady=(1, 8))
+        # Товары (показываются, если что-то продано)
+        goods_frame = ctk.CTkFrame(
+            report_frame,
+            fg_color="#ebe8e1",
+            corner_radius=8
+        )
+        
+        goods_title = ctk.CTkLabel(
+            goods_frame,
+            text="📦 ПРОДАННЫЕ ТОВАРЫ:",
+            font=("Georgia", 14, "bold"),
+            text_color=RomanTheme.TEXT
+        )
+        goods_title.pack(pady=(10, 5))
         
         # Финансовая сводка
         finance_frame = ctk.CTkFrame(
@@ -183,12 +178,9 @@ class CaravanReportsScreen(ctk.CTkFrame):
         )
         finance_title.pack(pady=(10, 5))
         
-        # Определяем цвет для чистого дохода
-        net_color = "#228B22" if report['net'] > 0 else "#DC143C" if report['net'] < 0 else RomanTheme.TEXT
-        
         profit_label = ctk.CTkLabel(
             finance_frame,
-            text=f"📈 Прибыль: {report['profit']} денариев",
+            text="",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
@@ -196,7 +188,7 @@ class CaravanReportsScreen(ctk.CTkFrame):
         
         expenses_label = ctk.CTkLabel(
             finance_frame,
-            text=f"📉 Расходы: {report['expenses']} денариев",
+            text="",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
@@ -204,11 +196,98 @@ class CaravanReportsScreen(ctk.CTkFrame):
         
         net_label = ctk.CTkLabel(
             finance_frame,
-            text=f"💵 Чистый доход: {report['net']} денариев",
+            text="",
             font=("Georgia", 14, "bold"),
-            text_color=net_color
+            text_color=RomanTheme.TEXT
         )
         net_label.pack(anchor="w", padx=20, pady=(2, 10))
+        
+        setattr(row, 'caravan_title', caravan_title)
+        setattr(row, 'event_path_label', event_path_label)
+        setattr(row, 'event_city_label', event_city_label)
+        setattr(row, 'goods_frame', goods_frame)
+        setattr(row, 'goods_lines', [])  # Тройки надписей по товарам
+        setattr(row, 'goods_shown', 0)
+        setattr(row, 'finance_frame', finance_frame)
+        setattr(row, 'profit_label', profit_label)
+        setattr(row, 'expenses_label', expenses_label)
+        setattr(row, 'net_label', net_label)
+        return row
+    
+    def create_goods_lines(self, goods_frame):
+        """Создает надписи одного товара: основная информация, модификаторы, итоговый множитель"""
+        goods_info = ctk.CTkLabel(
+            goods_frame,
+            text="",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.TEXT
+        )
+        modifiers_label = ctk.CTkLabel(
+            goods_frame,
+            text="",
+            font=("Consolas", 12),
+            text_color=RomanTheme.NEUTRAL
+        )
+        multiplier_label = ctk.CTkLabel(
+            goods_frame,
+            text="",
+            font=("Consolas", 12, "bold"),
+            text_color=RomanTheme.TEXT
+        )
+        for label in (goods_info, modifiers_label, multiplier_label):
+            self.reports_list.add_wheel_tag(label)
+        return goods_info, modifiers_label, multiplier_label
+    
+    def bind_report_row(self, row, report: dict, position: int):
+        """
+        Заполняет карточку данными отчета.
+        
+        Args:
+            row: Карточка из create_report_row
+            report (dict): Отчет о караване
+            position (int): Номер отчета в списке с нуля
+        """
+        row.caravan_title.configure(text=f"🚛 КАРАВАН #{position + 1} ЗАВЕРШЕН")
+        row.event_path_label.configure(text=f"🛤️ Событие в пути: {report['event_path']}")
+        row.event_city_label.configure(text=f"🏛️ Событие в городе: {report['event_city']}")
+        
+        # Товары: недостающие надписи создаются, лишние скрываются
+        breakdown = list(report['sale_breakdown'].items())
+        if breakdown and not row.goods_shown:
+            row.goods_frame.pack(fill="x", padx=15, pady=(0, 10), before=row.finance_frame)
+        elif not breakdown and row.goods_shown:
+            row.goods_frame.pack_forget()
+        while len(row.goods_lines) < len(breakdown):
+            row.goods_lines.append(self.create_goods_lines(row.goods_frame))
+        for goods_info, modifiers_label, multiplier_label in row.goods_lines[len(breakdown):row.goods_shown]:
+            goods_info.pack_forget()
+            modifiers_label.pack_forget()
+            multiplier_label.pack_forget()
+        
+        for index, (name, data) in enumerate(breakdown):
+            goods_info, modifiers_label, multiplier_label = row.goods_lines[index]
+            # Название товара и основная информация
+            goods_info.configure(
+                text=f"• {name}: {data['qty']} ед. × {data['unit_price']} денариев (базовая цена: {data['base_price']})"
+            )
+            # Модификаторы
+            modifiers_label.configure(text=(
+                f"   Модификаторы: город {data['city_mod']:+.2f}, событие {data['event_mod']:+.2f}, "
+                f"дальность {data['dist_mod']:+.2f}, рынок {data.get('market_mod', 0):+.2f}"
+            ))
+            # Итоговый множитель
+            multiplier_label.configure(text=f"   Итоговый множитель: {data['final_mod']:.2f}")
+            if index >= row.goods_shown:
+                goods_info.pack(anchor="w", padx=20, pady=2)
+                modifiers_label.pack(anchor="w", padx=20, pady=1)
+                multiplier_label.pack(anchor="w", padx=20, pady=(1, 8))
+        row.goods_shown = len(breakdown)
+        
+        # Определяем цвет для чистого дохода
+        net_color = "#228B22" if report['net'] > 0 else "#DC143C" if report['net'] < 0 else RomanTheme.TEXT
+        row.profit_label.configure(text=f"📈 Прибыль: {report['profit']} денариев")
+        row.expenses_label.configure(text=f"📉 Расходы: {report['expenses']} денариев")
+        row.net_label.configure(text=f"💵 Чистый доход: {report['net']} денариев", text_color=net_color)
     
     def continue_game(self):
         """Продолжить игру"""
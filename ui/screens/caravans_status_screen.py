@@ -7,7 +7,16 @@ import customtkinter as ctk
 from typing import Optional, Dict, List, Callable
 
 from core.game import Game
+from core.changes import CaravanDeparted, CaravanReturned, CycleAdvanced, TravelEventOccurred
 from ui.screens.difficulty_screen import RomanTheme
+from ui.screens.virtual_list import VirtualList
+
+# Список отчетов о завершенных караванах: высота окна, карточки без товаров
+# и одной строки таблицы товаров (пиксели), ширины столбцов таблицы
+COMPLETED_LIST_HEIGHT = 520
+REPORT_CARD_HEIGHT = 255
+REPORT_GOODS_LINE_HEIGHT = 30
+REPORT_COLUMN_WIDTHS = [200, 60, 100, 100]
 
 
 class CaravansStatusScreen(ctk.CTkFrame):
@@ -26,6 +35,12 @@ class CaravansStatusScreen(ctk.CTkFrame):
         self.game = game
         self.on_back = on_back
         
+        # Карточки активных караванов по id каравана
+        self.active_cards: Dict[int, ctk.CTkFrame] = {}
+        self.subscribed = False
+        # report_id самого старого показанного отчета
+        self.reports_first_id = 0
+        
         self.create_widgets()
         
     def create_widgets(self):
@@ -56,43 +71,19 @@ class CaravansStatusScreen(ctk.CTkFrame):
             scrollbar_button_color=RomanTheme.BUTTON_HOVER,
             scrollbar_button_hover_color=RomanTheme.BUTTON_HOVER
         )
-        scrollable_container.pack(fill="both", expand=True, padx=10, pady=10)        # Разделение караванов на активные и завершенные
-        active_caravans = []
-        completed_reports = []
+        scrollable_container.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Блок активных караванов (секция или сообщение об их отсутствии)
+        active_holder = ctk.CTkFrame(scrollable_container, fg_color=RomanTheme.BACKGROUND)
+        active_holder.pack(fill="x")
+        self.active_section = self.create_caravans_section(active_holder, "💠 КАРАВАНЫ В ПУТИ")
+        self.no_active_label = ctk.CTkLabel(
+            active_holder,
+            text="У вас нет караванов в пути",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.TEXT
+        )
         
-        # Активные караваны - те, что еще не завершились
-        for caravan in self.game.active_caravans:
-            if self.game.current_cycle < caravan.return_cycle:
-                active_caravans.append(caravan)
-                
-        # Завершенные караваны - берем из отчетов
-        completed_reports = self.game.caravan_reports[-10:]  # Показываем последние 10 отчетов
-        
-        # Отладочная информация
-        print(f"DEBUG: Активных караванов: {len(active_caravans)}")
-        print(f"DEBUG: Всего караванов в игре: {len(self.game.active_caravans)}")
-        print(f"DEBUG: Отчетов о завершенных: {len(completed_reports)}")
-        print(f"DEBUG: Всего отчетов: {len(self.game.caravan_reports)}")
-        print(f"DEBUG: Текущий цикл: {self.game.current_cycle}")
-                
-        # Блок активных караванов
-        if active_caravans:
-            self.create_caravans_section(
-                scrollable_container,
-                "💠 КАРАВАНЫ В ПУТИ",
-                active_caravans,
-                is_active=True
-            )
-        else:
-            # Сообщение, если нет активных караванов
-            no_active_label = ctk.CTkLabel(
-                scrollable_container,
-                text="У вас нет караванов в пути",
-                font=RomanTheme.FONT_TEXT,
-                text_color=RomanTheme.TEXT
-            )
-            no_active_label.pack(pady=20)
-            
         # Разделитель
         separator = ctk.CTkFrame(
             scrollable_container,
@@ -100,22 +91,20 @@ class CaravansStatusScreen(ctk.CTkFrame):
             fg_color=RomanTheme.NEUTRAL
         )
         separator.pack(fill="x", padx=30, pady=20)
-              # Блок завершенных караванов
-        if completed_reports:
-            self.create_completed_reports_section(
-                scrollable_container,
-                "🏁 ЗАВЕРШЁННЫЕ КАРАВАНЫ",
-                completed_reports
-            )
-        else:
-            # Сообщение, если нет завершенных караванов
-            no_completed_label = ctk.CTkLabel(
-                scrollable_container,
-                text="У вас нет завершённых караванов",
-                font=RomanTheme.FONT_TEXT,
-                text_color=RomanTheme.TEXT
-            )
-            no_completed_label.pack(pady=20)
+        
+        # Блок завершенных караванов
+        completed_holder = ctk.CTkFrame(scrollable_container, fg_color=RomanTheme.BACKGROUND)
+        completed_holder.pack(fill="x")
+        self.completed_section = self.create_completed_reports_section(
+            completed_holder,
+            "🏁 ЗАВЕРШЁННЫЕ КАРАВАНЫ"
+        )
+        self.no_completed_label = ctk.CTkLabel(
+            completed_holder,
+            text="У вас нет завершённых караванов",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.TEXT
+        )
         
         # Информационный текст
         info_text = "Караваны возвращаются в Рим после продажи товаров. Прибыль зависит от событий в пути и на рынках городов."
@@ -141,16 +130,154 @@ class CaravansStatusScreen(ctk.CTkFrame):
             command=self.on_back
         )
         back_button.pack(pady=20)
+        
+        self.update_screen(self.game)
+    
+    def update_screen(self, game: Game):
+        """
+        Обновление кэшированного экрана перед повторным показом.
+        Изменения той же игры уже применены через ленту изменений.
+        
+        Args:
+            game (Game): Текущая игра.
+        """
+        if game is self.game and self.subscribed:
+            return
+        self.unsubscribe()
+        self.game = game
+        self.subscribe()
+        self.update_active_section()
+        self.update_completed_section()
+    
+    def subscribe(self):
+        """Подписка на ленту изменений игры (у заглушек игры ленты нет)"""
+        changes = getattr(self.game, "changes", None)
+        if changes is not None:
+            changes.subscribe(
+                self.on_changes,
+                CycleAdvanced, CaravanDeparted, CaravanReturned, TravelEventOccurred
+            )
+        self.subscribed = changes is not None
+    
+    def unsubscribe(self):
+        """Отписка от ленты изменений игры"""
+        changes = getattr(self.game, "changes", None)
+        if changes is not None:
+            changes.unsubscribe(self.on_changes)
+        self.subscribed = False
+    
+    def on_changes(self, events: list):
+        """
+        Обновление только затронутых секций и карточек.
+        
+        Args:
+            events (list): События одной раздачи ленты изменений.
+        """
+        kinds = {type(event) for event in events}
+        if kinds & {CycleAdvanced, CaravanDeparted, CaravanReturned}:
+            # Новый цикл может завершить рейс ещё до обработки возвращения
+            self.update_active_section()
+        if CaravanReturned in kinds:
+            self.update_completed_section()
+        for event in events:
+            if isinstance(event, TravelEventOccurred):
+                row = self.active_cards.get(id(event.caravan))
+                if row is not None:
+                    self.update_caravan_card(row.card, event.caravan)
+    
+    def update_active_section(self):
+        """
+        Синхронизация карточек активных караванов: создаются карточки только новых
+        караванов, уничтожаются карточки исчезнувших, остальные не пересоздаются.
+        """
+        # Активные караваны - те, что еще не завершились
+        active_caravans = self.game.active_caravans.travelling(self.game.current_cycle)
+        self.sync_cards(
+            self.active_section,
+            self.active_cards,
+            [(id(caravan), caravan) for caravan in active_caravans],
+            lambda parent, caravan: self.create_caravan_card(parent, caravan, is_active=True)
+        )
+        for caravan in active_caravans:
+            # Событие в пути может произойти после создания карточки
+            self.update_caravan_card(self.active_cards[id(caravan)].card, caravan)
+        self.toggle_section(self.active_section, self.no_active_label, bool(active_caravans))
+    
+    def update_completed_section(self):
+        """Обновление списка отчетов о завершенных караванах (сначала новые)"""
+        reports = self.game.reports
+        # Старые отчеты отбрасываются из истории: список сдвигает уже посчитанные высоты
+        dropped = reports.first_id - self.reports_first_id if reports is self.reports_list.items else 0
+        self.reports_first_id = reports.first_id
+        self.reports_list.set_items(reports, newest_first=True, dropped=dropped)
+        self.reports_totals_label.configure(text=self.format_report_totals(reports))
+        self.toggle_section(self.completed_section, self.no_completed_label, bool(reports))
+    
+    def destroy(self):
+        """Отписка от ленты изменений и уничтожение экрана"""
+        self.unsubscribe()
+        super().destroy()
+    
+    def toggle_section(self, section_frame, empty_label, has_items: bool):
+        """Показать секцию или сообщение о том, что она пуста"""
+        if has_items:
+            empty_label.pack_forget()
+            section_frame.pack(fill="x", padx=10, pady=10, ipady=10)
+        else:
+            section_frame.pack_forget()
+            empty_label.pack(pady=20)
     
-    def create_caravans_section(self, parent, title: str, caravans: list, is_active: bool):
+    def sync_cards(self, section_frame, cards: Dict[int, ctk.CTkFrame], items: list, create_card: Callable):
         """
-        Создаёт секцию с караванами (активными или завершёнными)
+        Приводит карточки секции к списку items без пересоздания существующих.
+        
+        Args:
+            section_frame: Фрейм секции
+            cards: Ключ → строка с карточкой (изменяется на месте)
+            items: Пары (ключ, объект) в порядке показа
+            create_card: Создание карточки create_card(parent, объект) -> фрейм карточки
+        """
+        wanted = {key for key, _ in items}
+        for key in [key for key in cards if key not in wanted]:
+            cards.pop(key).destroy()
+        
+        # Новые строки вставляются перед следующей по порядку существующей
+        next_row = None
+        for key, item in reversed(items):
+            row = cards.get(key)
+            if row is None:
+                row = ctk.CTkFrame(section_frame, fg_color=RomanTheme.BACKGROUND)
+                # Разделитель над карточкой (скрыт у первой)
+                separator = ctk.CTkFrame(row, height=1, fg_color=RomanTheme.NEUTRAL)
+                setattr(row, 'separator', separator)
+                setattr(row, 'card', create_card(row, item))
+                setattr(row, 'has_separator', False)
+                if next_row is None:
+                    row.pack(fill="x")
+                else:
+                    row.pack(fill="x", before=next_row)
+                cards[key] = row
+            next_row = row
+        
+        for index, (key, _) in enumerate(items):
+            row = cards[key]
+            if row.has_separator != (index > 0):
+                if index > 0:
+                    row.separator.pack(fill="x", padx=60, pady=10, before=row.card)
+                else:
+                    row.separator.pack_forget()
+                row.has_separator = index > 0
+    
+    def create_caravans_section(self, parent, title: str):
+        """
+        Создаёт секцию для карточек караванов (карточки добавляет sync_cards)
         
         Args:
             parent: Родительский виджет
             title: Заголовок секции
-            caravans: Список караванов
-            is_active: True для активных караванов, False для завершённых
+            
+        Returns:
+            CTkFrame: Фрейм секции (не размещён)
         """
         # Контейнер секции
         section_frame = ctk.CTkFrame(
@@ -160,7 +287,6 @@ class CaravansStatusScreen(ctk.CTkFrame):
             border_color=RomanTheme.FRAME_BORDER,
             corner_radius=10
         )
-        section_frame.pack(fill="x", padx=10, pady=10, ipady=10)
         
         # Заголовок секции
         section_label = ctk.CTkLabel(
@@ -171,17 +297,7 @@ class CaravansStatusScreen(ctk.CTkFrame):
         )
         section_label.pack(pady=(10, 15))
         
-        # Перебираем все караваны в секции
-        for idx, caravan in enumerate(caravans):
-            self.create_caravan_card(section_frame, caravan, is_active)
-              # Добавляем разделитель между карточками (кроме последней)
-            if idx < len(caravans) - 1:
-                separator = ctk.CTkFrame(
-                    section_frame,
-                    height=1,
-                    fg_color=RomanTheme.NEUTRAL
-                )
-                separator.pack(fill="x", padx=60, pady=10)
+        return section_frame
     
     def create_caravan_card(self, parent, caravan, is_active: bool):
         """
@@ -191,6 +307,9 @@ class CaravansStatusScreen(ctk.CTkFrame):
             parent: Родительский виджет
             caravan: Объект каравана
             is_active: True для активных караванов, False для завершённых
+            
+        Returns:
+            CTkFrame: Фрейм карточки
         """
         # Контейнер карточки
         card_frame = ctk.CTkFrame(
@@ -246,6 +365,7 @@ class CaravansStatusScreen(ctk.CTkFrame):
             text_color=RomanTheme.ACCENT
         )
         event_label.pack(side="right", padx=10)
+        setattr(card_frame, 'event_label', event_label)
         
         # Таблица товаров
         goods_frame = ctk.CTkFrame(
@@ -363,9 +483,21 @@ class CaravansStatusScreen(ctk.CTkFrame):
                     text_color=net_color
                 )
                 net_label.pack(side="right", padx=5)
+        
+        return card_frame
+    
+    def update_caravan_card(self, card_frame, caravan):
+        """Обновление изменяемых полей карточки каравана (событие в пути)"""
+        event_text = caravan.event_occurred if caravan.event_occurred else "Событий не было"
+        text = f"Событие: {event_text}"
+        if card_frame.event_label.cget("text") != text:
+            card_frame.event_label.configure(text=text)
+
     def find_caravan_report(self, caravan):
         """
-        Поиск финансового отчета для завершенного каравана
+        Поиск финансового отчета для завершенного каравана.
+        Если отчёт не найден (например, после загрузки сохранения),
+        возвращается точная оценка ожидаемого итога рейса.
         
         Args:
             caravan: Объект каравана
@@ -373,101 +505,97 @@ class CaravansStatusScreen(ctk.CTkFrame):
         Returns:
             Dict: Финансовый отчет или None
         """
-        # Получаем словарь товаров из игры для расчета стоимости
-        goods_dict = {g.name: g for g in self.game.goods}
-        
-        # Рассчитываем примерную закупочную стоимость товаров
-        total_purchase_cost = 0
-        for name, quantity in caravan.goods.items():
-            if name in goods_dict:
-                total_purchase_cost += goods_dict[name].base_price * quantity
-                
-        # Определяем влияние событий на прибыль
-        event_mod = 1.0
-        extra_expenses = 0
-        
-        if caravan.event_occurred:
-            if "разбойник" in caravan.event_occurred.lower():
-                event_mod = 0.6  # Потеряли 40% товаров
-            elif "поломка" in caravan.event_occurred.lower():
-                extra_expenses = 30
-            elif "болезнь" in caravan.event_occurred.lower():
-                extra_expenses = 15
-            elif "смерть" in caravan.event_occurred.lower():
-                event_mod = 0.0  # Полная потеря товаров
-
-        # Рассчитываем прибыль от продажи товаров с учетом расстояния
-        # и спроса в городе назначения
-        city_mod = 1.0 + (caravan.destination.duration * 0.02)
-        profit = int(total_purchase_cost * city_mod * event_mod)
-        
-        # Базовые расходы на путешествие
-        travel_days = caravan.days_to_travel * 2 + 1  # туда, обратно + день в городе
-        expenses = int(10 * travel_days) + extra_expenses  # базовые расходы + дополнительные
+        report = self.game.reports.find(caravan)
+        if report is not None:
+            return report
 
-        # Формируем отчет
+        estimate = self.game.estimate_caravan(caravan)
+        profit = int(round(estimate.mean_revenue))
+        expenses = int(round(estimate.mean_expenses))
         return {
             "profit": profit,
             "expenses": expenses,
             "net": profit - expenses,
             "event_path": caravan.event_occurred or "Нет событий",
             "event_city": caravan.destination.current_event or "Нет событий",
-            "sale_breakdown": {},  # Детализация будет добавлена в будущем
-            "success": profit > expenses
+            "sale_breakdown": {},
+            "success": estimate.mean > 0
         }
     
-    def create_completed_reports_section(self, parent, title: str, reports: list):
+    def create_completed_reports_section(self, parent, title: str):
         """
-        Создаёт секцию с завершёнными караванами из отчетов
+        Создаёт секцию отчетов о завершённых караванах. Отчеты показываются
+        виртуализированным списком: виджеты есть только у видимых карточек.
         
         Args:
             parent: Родительский виджет
             title: Заголовок секции
-            reports: Список отчетов о завершенных караванах
+            
+        Returns:
+            CTkFrame: Фрейм секции (не размещён)
         """
-        # Контейнер секции
-        section_frame = ctk.CTkFrame(
-            parent,
-            fg_color=RomanTheme.BACKGROUND,
-            border_width=2,
-            border_color=RomanTheme.FRAME_BORDER,
-            corner_radius=10
+        section_frame = self.create_caravans_section(parent, title)
+        # Итоги рейсов за всю игру (история отчетов ограничена, итоги — нет)
+        self.reports_totals_label = ctk.CTkLabel(
+            section_frame,
+            text="",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.TEXT
         )
-        section_frame.pack(fill="x", padx=10, pady=10, ipady=10)
-        
-        # Заголовок секции
-        section_label = ctk.CTkLabel(
+        self.reports_totals_label.pack(fill="x", padx=20, pady=(0, 5))
+        self.reports_list = VirtualList(
             section_frame,
-            text=title,
-            font=RomanTheme.FONT_HEADER,
-            text_color=RomanTheme.ACCENT
+            create_row=self.create_completed_report_row,
+            bind_row=self.bind_completed_report_row,
+            row_height=self.completed_report_height,
+            height=COMPLETED_LIST_HEIGHT
         )
-        section_label.pack(pady=(10, 15))
+        # Высота списка фиксирована: строки размещаются в нем вручную
+        self.reports_list.pack_propagate(False)
+        self.reports_list.pack(fill="x", padx=10, pady=(0, 10))
+        return section_frame
+    
+    @staticmethod
+    def format_report_totals(reports) -> str:
+        """
+        Строка итогов рейсов: число рейсов, чистый доход, лучший город и товар.
         
-        # Перебираем все отчеты в секции (в обратном порядке - сначала последние)
-        for idx, report in enumerate(reversed(reports)):
-            self.create_completed_report_card(section_frame, report)
+        Args:
+            reports: Хранилище отчетов (core.reports.ReportStore)
             
-            # Добавляем разделитель между карточками (кроме последней)
-            if idx < len(reports) - 1:
-                separator = ctk.CTkFrame(
-                    section_frame,
-                    height=1,
-                    fg_color=RomanTheme.NEUTRAL
-                )
-                separator.pack(fill="x", padx=60, pady=10)
-
-    def create_completed_report_card(self, parent, report):
+        Returns:
+            str: Текст итогов
+        """
+        parts = [f"Рейсов: {reports.total}", f"Чистый доход: {reports.total_net} 🪙"]
+        best_city = reports.best_city()
+        if best_city is not None:
+            parts.append(f"Лучший город: {best_city} ({reports.cities[best_city].roi:+.0%})")
+        top_goods = reports.top_goods(1)
+        if top_goods:
+            parts.append(f"Лучший товар: {top_goods[0]} ({reports.goods[top_goods[0]].revenue} 🪙)")
+        return " · ".join(parts)
+    
+    @staticmethod
+    def completed_report_height(report) -> int:
+        """Высота карточки отчета (зависит от числа товаров)"""
+        return REPORT_CARD_HEIGHT + REPORT_GOODS_LINE_HEIGHT * len(report.get("goods", {}))
+    
+    def create_completed_report_row(self, parent):
         """
-        Создаёт карточку для отображения отчета о завершенном караване
+        Создаёт пустую карточку отчета о завершенном караване. Карточки
+        переиспользуются списком при прокрутке и заполняются в bind_completed_report_row.
         
         Args:
             parent: Родительский виджет
-            report: Отчет о завершенном караване
+            
+        Returns:
+            CTkFrame: Фрейм строки с карточкой (не размещён)
         """
+        row = ctk.CTkFrame(parent, fg_color=RomanTheme.BACKGROUND, corner_radius=0)
+        
         # Контейнер карточки
         card_frame = ctk.CTkFrame(
-            parent,
+            row,
             fg_color=RomanTheme.BACKGROUND,
             corner_radius=5
         )
@@ -480,7 +608,7 @@ class CaravansStatusScreen(ctk.CTkFrame):
         # Название города
         city_name = ctk.CTkLabel(
             header_frame,
-            text=f"🏙️ {report['destination']}",
+            text="",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
@@ -499,10 +627,9 @@ class CaravansStatusScreen(ctk.CTkFrame):
         cycles_frame = ctk.CTkFrame(card_frame, fg_color=RomanTheme.BACKGROUND)
         cycles_frame.pack(fill="x", pady=5, padx=10)
         
-        cycles_text = f"Отправка: {report['departure_cycle']} ⟶ Возврат: {report['return_cycle']} ⟶ Завершён: {report['completion_cycle']}"
         cycles_label = ctk.CTkLabel(
             cycles_frame,
-            text=cycles_text,
+            text="",
             font=RomanTheme.FONT_SMALL,
             text_color=RomanTheme.TEXT
         )
@@ -512,12 +639,9 @@ class CaravansStatusScreen(ctk.CTkFrame):
         events_frame = ctk.CTkFrame(card_frame, fg_color=RomanTheme.BACKGROUND)
         events_frame.pack(fill="x", pady=5, padx=10)
         
-        event_path = report.get("event_path", "Нет событий")
-        event_city = report.get("event_city", "Нет событий")
-        
         path_label = ctk.CTkLabel(
             events_frame,
-            text=f"Событие в пути: {event_path}",
+            text="",
             font=RomanTheme.FONT_SMALL,
             text_color=RomanTheme.ACCENT
         )
@@ -525,7 +649,7 @@ class CaravansStatusScreen(ctk.CTkFrame):
         
         city_label = ctk.CTkLabel(
             events_frame,
-            text=f"Событие в городе: {event_city}",
+            text="",
             font=RomanTheme.FONT_SMALL,
             text_color=RomanTheme.ACCENT
         )
@@ -545,7 +669,6 @@ class CaravansStatusScreen(ctk.CTkFrame):
         headers_frame = ctk.CTkFrame(goods_frame, fg_color=RomanTheme.BACKGROUND)
         headers_frame.pack(fill="x", pady=(5, 0), padx=5)
         
-        col_widths = [200, 60, 100, 100]
         headers = ["Товар", "Кол-во", "Цена ед.", "Общая цена"]
         
         for i, header in enumerate(headers):
@@ -553,7 +676,7 @@ class CaravansStatusScreen(ctk.CTkFrame):
                 headers_frame,
                 text=header,
                 font=(RomanTheme.FONT_FAMILY, 12, "bold"),
-                width=col_widths[i] if i < len(col_widths) else 0,
+                width=REPORT_COLUMN_WIDTHS[i] if i < len(REPORT_COLUMN_WIDTHS) else 0,
                 text_color=RomanTheme.TEXT
             )
             header_label.pack(side="left", padx=5)
@@ -562,110 +685,118 @@ class CaravansStatusScreen(ctk.CTkFrame):
         separator = ctk.CTkFrame(goods_frame, height=1, fg_color=RomanTheme.NEUTRAL)
         separator.pack(fill="x", padx=5, pady=(2, 5))
         
-        # Строки таблицы с товарами
-        sale_breakdown = report.get("sale_breakdown", {})
-        goods_data = report.get("goods", {})
-        
-        for name, quantity in goods_data.items():
-            # Каждый товар - отдельная строка таблицы
-            item_frame = ctk.CTkFrame(goods_frame, fg_color=RomanTheme.BACKGROUND)
-            item_frame.pack(fill="x", pady=1, padx=5)
-            
-            # Название товара
-            name_label = ctk.CTkLabel(
-                item_frame,
-                text=name,
-                font=RomanTheme.FONT_SMALL,
-                width=col_widths[0],
-                anchor="w",
-                text_color=RomanTheme.TEXT
-            )
-            name_label.pack(side="left", padx=5)
-            
-            # Количество
-            qty_label = ctk.CTkLabel(
-                item_frame,
-                text=str(quantity),
-                font=RomanTheme.FONT_SMALL,
-                width=col_widths[1],
-                text_color=RomanTheme.TEXT
-            )
-            qty_label.pack(side="left", padx=5)
-            
-            # Цена за единицу и общая цена (если есть данные)
-            if name in sale_breakdown:
-                unit_price = sale_breakdown[name]["unit_price"]
-                total_price = unit_price * quantity
-                
-                unit_price_label = ctk.CTkLabel(
-                    item_frame,
-                    text=f"{unit_price} 🪙",
-                    font=RomanTheme.FONT_SMALL,
-                    width=col_widths[2],
-                    text_color=RomanTheme.TEXT
-                )
-                unit_price_label.pack(side="left", padx=5)
-                
-                total_price_label = ctk.CTkLabel(
-                    item_frame,
-                    text=f"{total_price} 🪙",
-                    font=RomanTheme.FONT_SMALL,
-                    width=col_widths[3],
-                    text_color=RomanTheme.TEXT
-                )
-                total_price_label.pack(side="left", padx=5)
-            else:
-                # Заглушки, если нет данных
-                unit_price_label = ctk.CTkLabel(
-                    item_frame,
-                    text="—",
-                    font=RomanTheme.FONT_SMALL,
-                    width=col_widths[2],
-                    text_color=RomanTheme.NEUTRAL
-                )
-                unit_price_label.pack(side="left", padx=5)
-                
-                total_price_label = ctk.CTkLabel(
-                    item_frame,
-                    text="—",
-                    font=RomanTheme.FONT_SMALL,
-                    width=col_widths[3],
-                    text_color=RomanTheme.NEUTRAL
-                )
-                total_price_label.pack(side="left", padx=5)
-        
         # Финансовая информация
         finance_frame = ctk.CTkFrame(card_frame, fg_color=RomanTheme.BACKGROUND)
         finance_frame.pack(fill="x", pady=5, padx=20)
         
         # Прибыль
-        profit_text = f"Прибыль: {report['profit']} 🪙"
         profit_label = ctk.CTkLabel(
             finance_frame,
-            text=profit_text,
+            text="",
             font=RomanTheme.FONT_TEXT,
             text_color="#6b8e23"  # Зеленоватый цвет для прибыли
         )
         profit_label.pack(side="left", padx=5)
         
         # Расходы
-        expenses_text = f"Расходы: {report['expenses']} 🪙"
         expenses_label = ctk.CTkLabel(
             finance_frame,
-            text=expenses_text,
+            text="",
             font=RomanTheme.FONT_TEXT,
             text_color="#cd853f"  # Коричневатый цвет для расходов
         )
         expenses_label.pack(side="left", padx=20)
         
         # Чистая прибыль
-        net_value = report.get('net', 0)
-        net_color = "#6b8e23" if net_value >= 0 else "#cd5c5c"  # Зеленый или красный
-        net_text = f"Чистая прибыль: {net_value} 🪙"
         net_label = ctk.CTkLabel(
             finance_frame,
-            text=net_text,
+            text="",
             font=(RomanTheme.FONT_FAMILY, 14, "bold"),
-            text_color=net_color
+            text_color="#6b8e23"
         )
-        net_label.pack(side="right", padx=5)
\ No newline at end of file
+        net_label.pack(side="right", padx=5)
+        
+        # Разделитель под карточкой
+        card_separator = ctk.CTkFrame(row, height=1, fg_color=RomanTheme.NEUTRAL)
+        card_separator.pack(fill="x", padx=60, pady=(0, 10))
+        
+        setattr(row, 'city_name', city_name)
+        setattr(row, 'cycles_label', cycles_label)
+        setattr(row, 'path_label', path_label)
+        setattr(row, 'city_label', city_label)
+        setattr(row, 'goods_frame', goods_frame)
+        setattr(row, 'goods_rows', [])  # Строки таблицы товаров: (фрейм, 4 надписи)
+        setattr(row, 'goods_shown', 0)
+        setattr(row, 'profit_label', profit_label)
+        setattr(row, 'expenses_label', expenses_label)
+        setattr(row, 'net_label', net_label)
+        return row
+    
+    def create_report_goods_row(self, goods_frame):
+        """Создаёт строку таблицы товаров: название, количество, цена за единицу, общая цена"""
+        item_frame = ctk.CTkFrame(goods_frame, fg_color=RomanTheme.BACKGROUND)
+        labels = []
+        for width in REPORT_COLUMN_WIDTHS:
+            label = ctk.CTkLabel(
+                item_frame,
+                text="",
+                font=RomanTheme.FONT_SMALL,
+                width=width,
+                text_color=RomanTheme.TEXT
+            )
+            label.pack(side="left", padx=5)
+            labels.append(label)
+        # Название товара выравнивается по левому краю
+        labels[0].configure(anchor="w")
+        self.reports_list.add_wheel_tag(item_frame)
+        return item_frame, labels
+    
+    def bind_completed_report_row(self, row, report, position: int):
+        """
+        Заполняет карточку данными отчета о завершенном караване.
+        
+        Args:
+            row: Строка из create_completed_report_row
+            report: Отчет о завершенном караване
+            position (int): Номер карточки в списке с нуля
+        """
+        row.city_name.configure(text=f"🏙️ {report['destination']}")
+        row.cycles_label.configure(
+            text=f"Отправка: {report['departure_cycle']} ⟶ Возврат: {report['return_cycle']} ⟶ Завершён: {report['completion_cycle']}"
+        )
+        row.path_label.configure(text=f"Событие в пути: {report.get('event_path', 'Нет событий')}")
+        row.city_label.configure(text=f"Событие в городе: {report.get('event_city', 'Нет событий')}")
+        
+        # Строки таблицы с товарами: недостающие создаются, лишние скрываются
+        sale_breakdown = report.get("sale_breakdown", {})
+        goods_data = list(report.get("goods", {}).items())
+        while len(row.goods_rows) < len(goods_data):
+            row.goods_rows.append(self.create_report_goods_row(row.goods_frame))
+        for item_frame, _ in row.goods_rows[len(goods_data):row.goods_shown]:
+            item_frame.pack_forget()
+        
+        for index, (name, quantity) in enumerate(goods_data):
+            item_frame, (name_label, qty_label, unit_price_label, total_price_label) = row.goods_rows[index]
+            name_label.configure(text=name)
+            qty_label.configure(text=str(quantity))
+            
+            # Цена за единицу и общая цена (если есть данные)
+            if name in sale_breakdown:
+                unit_price = sale_breakdown[name]["unit_price"]
+                total_price = unit_price * quantity
+                unit_price_label.configure(text=f"{unit_price} 🪙", text_color=RomanTheme.TEXT)
+                total_price_label.configure(text=f"{total_price} 🪙", text_color=RomanTheme.TEXT)
+            else:
+                # Заглушки, если нет данных
+                unit_price_label.configure(text="—", text_color=RomanTheme.NEUTRAL)
+                total_price_label.configure(text="—", text_color=RomanTheme.NEUTRAL)
+            if index >= row.goods_shown:
+                item_frame.pack(fill="x", pady=1, padx=5)
+        row.goods_shown = len(goods_data)
+        
+        # Финансовая информация
+        net_value = report.get('net', 0)
+        net_color = "#6b8e23" if net_value >= 0 else "#cd5c5c"  # Зеленый или красный
+        row.profit_label.configure(text=f"Прибыль: {report['profit']} 🪙")
+        row.expenses_label.configure(text=f"Расходы: {report['expenses']} 🪙")
+        row.net_label.configure(text=f"Чистая прибыль: {net_value} 🪙", text_color=net_color)
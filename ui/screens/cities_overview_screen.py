@@ -3,8 +3,9 @@
 """
 
 import customtkinter as ctk
-from typing import Callable
+from typing import Callable, Dict, List, Tuple
 from core.game import Game
+from core.caravan_index import PHASE_IN_CITY, PHASE_OUTBOUND
 from models.city import City
 
 
@@ -41,6 +42,11 @@ class CitiesOverviewScreen(ctk.CTkFrame):
         self.game = game
         self.on_back = on_back
         
+        # Изменяемые надписи строк по названию города и их текущее содержимое
+        self.city_rows: Dict[str, Tuple[ctk.CTkLabel, ctk.CTkLabel, ctk.CTkLabel]] = {}
+        self.row_state: Dict[str, tuple] = {}
+        self.route_labels: List[ctk.CTkLabel] = []
+        
         self.create_widgets()
     
     def create_widgets(self):
@@ -64,13 +70,12 @@ class CitiesOverviewScreen(ctk.CTkFrame):
         title_label.pack(pady=(20, 10))
         
         # Информация о текущем цикле
-        info_label = ctk.CTkLabel(
+        self.info_label = ctk.CTkLabel(
             header_frame,
-            text=f"📅 Цикл: {self.game.current_cycle}/{self.game.max_cycles} | 🏛️ Доступные города: {len(self.game.cities)}",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
-        info_label.pack(pady=(0, 10))
+        self.info_label.pack(pady=(0, 10))
         
         # Основная прокручиваемая область
         main_scrollable = ctk.CTkScrollableFrame(
@@ -81,12 +86,90 @@ class CitiesOverviewScreen(ctk.CTkFrame):
         )
         main_scrollable.pack(fill="both", expand=True, padx=20, pady=10)
         
+        # Рекомендуемые маршруты
+        self.create_recommendations_panel(main_scrollable)
+
         # Создаем таблицу городов
         self.create_cities_table(main_scrollable)
         
         # Нижняя панель
         self.create_bottom_panel()
+        
+        self.update_screen(self.game)
     
+    def update_screen(self, game: Game):
+        """
+        Обновление экрана на месте: меняются только надписи, текст которых
+        изменился, строки создаются лишь для новых городов.
+        
+        Args:
+            game (Game): Текущая игра.
+        """
+        self.game = game
+        self.info_label.configure(
+            text=f"📅 Цикл: {self.game.current_cycle}/{self.game.max_cycles} | 🏛️ Доступные города: {len(self.game.cities)}"
+        )
+        self.update_recommendations()
+        
+        for i, city in enumerate(self.game.cities):
+            if city.name in self.city_rows:
+                self.update_city_row(city)
+            else:
+                self.create_city_row(self.cities_rows_frame, city, i)
+    
+    def create_recommendations_panel(self, parent):
+        """Панель с лучшими маршрутами по ожидаемой прибыли за цикл"""
+        self.recommendations_frame = ctk.CTkFrame(
+            parent,
+            fg_color=RomanTheme.BACKGROUND,
+            border_color=RomanTheme.ACCENT,
+            border_width=2,
+            corner_radius=10
+        )
+
+        title_label = ctk.CTkLabel(
+            self.recommendations_frame,
+            text="🧭 РЕКОМЕНДУЕМЫЕ МАРШРУТЫ",
+            font=RomanTheme.FONT_BUTTON,
+            text_color=RomanTheme.ACCENT
+        )
+        title_label.pack(pady=(10, 5))
+
+        self.route_labels = [
+            ctk.CTkLabel(
+                self.recommendations_frame,
+                font=RomanTheme.FONT_TEXT,
+                text_color=RomanTheme.TEXT
+            )
+            for _ in range(3)
+        ]
+        self.route_labels_shown = 0
+
+        # Отступ снизу
+        self.route_padding = ctk.CTkLabel(self.recommendations_frame, text="", height=5)
+        self.route_padding.pack()
+
+    def update_recommendations(self):
+        """Обновление рекомендуемых маршрутов (панель скрыта, если прибыльных нет)"""
+        routes = [route for route in self.game.recommend_routes()[:3] if route.per_cycle > 0]
+        if not routes:
+            self.recommendations_frame.pack_forget()
+            return
+
+        for i, route in enumerate(routes):
+            self.route_labels[i].configure(
+                text=(f"{i + 1}. {route.city.name} — закупить «{route.best_good}», "
+                      f"≈ {route.expected_net:,.0f} денариев за рейс ({route.per_cycle:,.0f} за цикл)")
+            )
+        # Показываем нужное число надписей, лишние скрываем
+        for i in range(self.route_labels_shown, len(routes)):
+            self.route_labels[i].pack(pady=2, before=self.route_padding)
+        for i in range(len(routes), self.route_labels_shown):
+            self.route_labels[i].pack_forget()
+        self.route_labels_shown = len(routes)
+
+        self.recommendations_frame.pack(fill="x", pady=(20, 0), padx=20, before=self.table_header_frame)
+
     def create_cities_table(self, parent):
         """Создание таблицы городов"""
         
@@ -99,6 +182,7 @@ class CitiesOverviewScreen(ctk.CTkFrame):
         )
         table_header_frame.pack(fill="x", pady=(20, 15), padx=20)
         table_header_frame.pack_propagate(False)
+        self.table_header_frame = table_header_frame
         
         header_title_label = ctk.CTkLabel(
             table_header_frame,
@@ -146,15 +230,12 @@ class CitiesOverviewScreen(ctk.CTkFrame):
             label.grid(row=0, column=i, padx=10, pady=10, sticky="ew")
         
         # Строки с городами
-        cities_rows_frame = ctk.CTkFrame(
+        self.cities_rows_frame = ctk.CTkFrame(
             table_container,
             fg_color=RomanTheme.BACKGROUND
         )
-        cities_rows_frame.pack(fill="x", padx=15, pady=(0, 15))
-        
-        # Создаем строки для каждого города
-        for i, city in enumerate(self.game.cities):
-            self.create_city_row(cities_rows_frame, city, i)
+        self.cities_rows_frame.pack(fill="x", padx=15, pady=(0, 15))
+        # Строки городов создает update_screen
     
     def create_city_row(self, parent, city: City, row_index: int):
         """Создание строки с информацией о городе"""
@@ -196,20 +277,14 @@ class CitiesOverviewScreen(ctk.CTkFrame):
         )
         distance_label.grid(row=0, column=1, padx=10, pady=8, sticky="ew")
           # Текущее событие
-        event_text, event_color = self.get_event_display_info(city)
         event_label = ctk.CTkLabel(
             city_row_frame,
-            text=f"🎭 {event_text}",
-            font=RomanTheme.FONT_SMALL,
-            text_color=event_color
+            font=RomanTheme.FONT_SMALL
         )
         event_label.grid(row=0, column=2, padx=10, pady=8, sticky="ew")
           # Спрос на товары (показываем товары с измененным спросом)
-        high_demand_goods = self.get_high_demand_goods(city)
-        demand_text = ", ".join(high_demand_goods) if high_demand_goods else "Обычный спрос"
         demand_label = ctk.CTkLabel(
             city_row_frame,
-            text=demand_text,
             font=RomanTheme.FONT_SMALL,
             text_color=RomanTheme.TEXT,  # Нейтральный цвет, так как цветовая информация передается через эмодзи
             wraplength=200
@@ -217,15 +292,37 @@ class CitiesOverviewScreen(ctk.CTkFrame):
         demand_label.grid(row=0, column=3, padx=10, pady=8, sticky="ew")
         
         # Статус караванов
-        caravan_status = self.get_caravan_status_for_city(city)
-        caravan_color = RomanTheme.ACCENT if caravan_status != "Свободен" else RomanTheme.SUCCESS
         caravan_label = ctk.CTkLabel(
             city_row_frame,
-            text=caravan_status,
-            font=RomanTheme.FONT_SMALL,
-            text_color=caravan_color
+            font=RomanTheme.FONT_SMALL
         )
         caravan_label.grid(row=0, column=4, padx=10, pady=8, sticky="ew")
+        
+        self.city_rows[city.name] = (event_label, demand_label, caravan_label)
+        self.update_city_row(city)
+    
+    def update_city_row(self, city: City):
+        """Обновление изменяемых столбцов строки города (только если их текст изменился)"""
+        event_text, event_color = self.get_event_display_info(city)
+        high_demand_goods = self.get_high_demand_goods(city)
+        demand_text = ", ".join(high_demand_goods) if high_demand_goods else "Обычный спрос"
+        caravan_status = self.get_caravan_status_for_city(city)
+        
+        state = (event_text, demand_text, caravan_status)
+        previous = self.row_state.get(city.name, (None, None, None))
+        if state == previous:
+            return
+        self.row_state[city.name] = state
+        
+        event_label, demand_label, caravan_label = self.city_rows[city.name]
+        if event_text != previous[0]:
+            event_label.configure(text=f"🎭 {event_text}", text_color=event_color)
+        if demand_text != previous[1]:
+            demand_label.configure(text=demand_text)
+        if caravan_status != previous[2]:
+            caravan_color = RomanTheme.ACCENT if caravan_status != "Свободен" else RomanTheme.SUCCESS
+            caravan_label.configure(text=caravan_status, text_color=caravan_color)
+    
     def get_event_display_info(self, city: City) -> tuple[str, str]:
         """Получить информацию для отображения события"""
         if not city.current_event:
@@ -239,7 +336,7 @@ class CitiesOverviewScreen(ctk.CTkFrame):
             return "neutral"
         
         # Получаем модификаторы события из конфигурации
-        event_modifiers = self.game.config.get("event_modifiers", {}).get(city.current_event, {})
+        event_modifiers = self.game.config.event_modifiers.get(city.current_event, {})
         
         if not event_modifiers:
             return "neutral"
@@ -272,8 +369,8 @@ class CitiesOverviewScreen(ctk.CTkFrame):
                 demand_changes.append(f"⬇{good_name}")
         
         # Также проверяем влияние текущего события
-        if city.current_event and city.current_event in self.game.config.get("event_modifiers", {}):
-            event_modifiers = self.game.config["event_modifiers"][city.current_event]
+        if city.current_event and city.current_event in self.game.config.event_modifiers:
+            event_modifiers = self.game.config.event_modifiers[city.current_event]
             for good_name, modifier in event_modifiers.items():
                 # Проверяем, не добавляли ли мы уже этот товар из базовых модификаторов города
                 already_added = any(good_name in item for item in demand_changes)
@@ -286,45 +383,28 @@ class CitiesOverviewScreen(ctk.CTkFrame):
         return demand_changes[:5]  # Возвращаем максимум 5 товаров для компактности
     
     def get_caravan_status_for_city(self, city: City) -> str:
-        """Получить статус караванов для города"""
-        # Проверяем активные караваны
-        active_caravans_to_city = [
-            caravan for caravan in self.game.active_caravans 
-            if caravan.destination.name == city.name
-        ]
+        """Получить статус караванов для города (O(1) по индексам игры)"""
+        index = self.game.caravan_index
+        cycle = self.game.current_cycle
         
-        if not active_caravans_to_city:
+        # Проверяем активные караваны
+        if not index.has_city(city.city_id):
             return "Свободен"
         
         # Проверяем караваны отправленные в текущем цикле
-        current_cycle_caravans = [
-            caravan for caravan in active_caravans_to_city
-            if caravan.departure_cycle == self.game.current_cycle
-        ]
-        
-        if current_cycle_caravans:
+        if index.departed_to_city(city.city_id, cycle) is not None:
             return "Занят (цикл)"
         
         # Проверяем караваны в пути
-        traveling_caravans = [
-            caravan for caravan in active_caravans_to_city
-            if caravan.arrival_cycle > self.game.current_cycle
-        ]
-        
-        if traveling_caravans:
-            caravan = traveling_caravans[0]
-            days_left = caravan.arrival_cycle - self.game.current_cycle
+        caravan = index.first_to_city(city.city_id, PHASE_OUTBOUND)
+        if caravan is not None:
+            days_left = caravan.arrival_cycle - cycle
             return f"В пути ({days_left}д)"
         
         # Проверяем караваны в городе
-        in_city_caravans = [
-            caravan for caravan in active_caravans_to_city
-            if caravan.arrival_cycle <= self.game.current_cycle < caravan.return_cycle
-        ]
-        
-        if in_city_caravans:
-            caravan = in_city_caravans[0]
-            days_left = caravan.return_cycle - self.game.current_cycle
+        caravan = index.first_to_city(city.city_id, PHASE_IN_CITY)
+        if caravan is not None:
+            days_left = caravan.return_cycle - cycle
             return f"В городе ({days_left}д)"
         
         return "Возвращается"
@@ -364,6 +444,7 @@ if __name__ == "__main__":
     
     from core.world import load_balance_config, generate_world
     from core.goods import load_goods
+    from core.caravan_index import CaravanIndex
     from models.player import Player
     from models.courier import Courier
     from models.wagon import Wagon
@@ -392,6 +473,7 @@ if __name__ == "__main__":
             self.current_cycle = 1
             self.max_cycles = 20
             self.active_caravans = []
+            self.caravan_index = CaravanIndex()
     
     def test_back():
         print("Возврат в главное меню")
@@ -6,6 +6,14 @@
 import customtkinter as ctk
 from typing import Callable, Optional
 from core.game import Game
+from core.changes import (
+    BalanceChanged,
+    CaravanDeparted,
+    CaravanReturned,
+    CycleAdvanced,
+    InventoryChanged
+)
+from core.progression import UNLOCK_CITIES
 
 
 class RomanTheme:
@@ -45,8 +53,11 @@ class MainMenuScreen(ctk.CTkFrame):
         )
         self.game = game
         self.callbacks = callbacks
+        # Открытия прогрессии с прошлого показа меню
+        self.unlocks = game.pop_unlocks()
         
         self.create_widgets()
+        self.subscribe()
     
     def create_widgets(self):
         """Создание виджетов экрана"""
@@ -123,23 +134,19 @@ class MainMenuScreen(ctk.CTkFrame):
         main_info_frame.pack(fill="x", padx=15, pady=(15, 8))
         
         # Цикл
-        cycle_label = ctk.CTkLabel(
+        self.cycle_label = ctk.CTkLabel(
             main_info_frame,
-            text=f"⏳ Цикл: {self.game.current_cycle} / {self.game.max_cycles}",
             font=RomanTheme.FONT_INFO,
             text_color=RomanTheme.TEXT
         )
-        cycle_label.pack(side="left", padx=(0, 30))
+        self.cycle_label.pack(side="left", padx=(0, 30))
         
         # Баланс
-        balance_color = RomanTheme.SUCCESS if self.game.player.balance >= 5000 else RomanTheme.TEXT
-        balance_label = ctk.CTkLabel(
+        self.balance_label = ctk.CTkLabel(
             main_info_frame,
-            text=f"💰 Баланс: {self.game.player.balance:,} денариев",
-            font=RomanTheme.FONT_INFO,
-            text_color=balance_color
+            font=RomanTheme.FONT_INFO
         )
-        balance_label.pack(side="left", padx=(0, 30))
+        self.balance_label.pack(side="left", padx=(0, 30))
         
         # Уровень сложности
         difficulty_text = {
@@ -164,36 +171,65 @@ class MainMenuScreen(ctk.CTkFrame):
         additional_info_frame.pack(fill="x", padx=15, pady=(0, 15))
         
         # Активные караваны
-        active_caravans = len(self.game.active_caravans)
-        caravans_label = ctk.CTkLabel(
+        self.caravans_label = ctk.CTkLabel(
             additional_info_frame,
-            text=f"🚛 Активные караваны: {active_caravans}",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
-        caravans_label.pack(side="left", padx=(0, 30))
+        self.caravans_label.pack(side="left", padx=(0, 30))
         
         # Товары на складе
-        inventory_count = len([item for item, qty in self.game.player.inventory.items() if qty > 0])
-        inventory_label = ctk.CTkLabel(
+        self.inventory_label = ctk.CTkLabel(
             additional_info_frame,
-            text=f"📦 Товаров на складе: {inventory_count} видов",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
-        inventory_label.pack(side="left")
+        self.inventory_label.pack(side="left")
+        
+        # Цель игры
+        self.goal_label = ctk.CTkLabel(
+            additional_info_frame,
+            font=RomanTheme.FONT_TEXT
+        )
+        self.goal_label.pack(side="right")
+        
+        self.update_info_panel()
+    
+    def update_info_panel(self):
+        """Обновление текста информационной панели без пересоздания виджетов"""
+        self.update_cycle_label()
+        self.update_balance_labels()
+        self.update_caravans_label()
+        self.update_inventory_label()
+    
+    def update_cycle_label(self):
+        """Обновление номера цикла"""
+        self.cycle_label.configure(text=f"⏳ Цикл: {self.game.current_cycle} / {self.game.max_cycles}")
+    
+    def update_balance_labels(self):
+        """Обновление баланса и прогресса к цели"""
+        balance = self.game.player.balance
+        self.balance_label.configure(
+            text=f"💰 Баланс: {balance:,} денариев",
+            text_color=RomanTheme.SUCCESS if balance >= 5000 else RomanTheme.TEXT
+        )
         
         # Цель игры - используем значение из game.victory_goal вместо фиксированного 10000
         victory_goal = self.game.victory_goal
-        goal_progress = (self.game.player.balance / victory_goal) * 100
-        goal_color = RomanTheme.SUCCESS if goal_progress >= 100 else RomanTheme.WARNING
-        goal_label = ctk.CTkLabel(
-            additional_info_frame,
+        goal_progress = (balance / victory_goal) * 100
+        self.goal_label.configure(
             text=f"🎯 Цель: {goal_progress:.1f}% ({victory_goal:,} денариев)",
-            font=RomanTheme.FONT_TEXT,
-            text_color=goal_color
+            text_color=RomanTheme.SUCCESS if goal_progress >= 100 else RomanTheme.WARNING
         )
-        goal_label.pack(side="right")
+    
+    def update_caravans_label(self):
+        """Обновление числа активных караванов"""
+        self.caravans_label.configure(text=f"🚛 Активные караваны: {len(self.game.active_caravans)}")
+    
+    def update_inventory_label(self):
+        """Обновление числа видов товаров на складе"""
+        inventory_count = len([item for item, qty in self.game.player.inventory.items() if qty > 0])
+        self.inventory_label.configure(text=f"📦 Товаров на складе: {inventory_count} видов")
     
     def create_menu_buttons(self, parent):
         """Создание кнопок главного меню"""
@@ -245,6 +281,18 @@ class MainMenuScreen(ctk.CTkFrame):
                 "callback": "next_cycle",
                 "icon": "⏭️",
                 "style": "accent"
+            },
+            {
+                "text": "💾 Сохранить игру",
+                "description": "Запишите текущее состояние торгового дома",
+                "callback": "save_game",
+                "icon": "💾"
+            },
+            {
+                "text": "📂 Загрузить игру",
+                "description": "Вернитесь к последнему сохранению",
+                "callback": "load_game",
+                "icon": "📂"
             }
         ]
         
@@ -342,6 +390,23 @@ class MainMenuScreen(ctk.CTkFrame):
     
     def create_status_panel(self, parent):
         """Создание панели статуса игры"""
+        self.status_label = ctk.CTkLabel(
+            parent,
+            font=RomanTheme.FONT_TEXT
+        )
+        self.status_label.pack(pady=(10, 5))
+        
+        self.motivation_label = ctk.CTkLabel(
+            parent,
+            font=RomanTheme.FONT_SMALL,
+            justify="center"
+        )
+        self.motivation_label.pack(pady=(0, 10))
+        
+        self.update_status_panel()
+    
+    def update_status_panel(self):
+        """Обновление статуса игры и мотивирующей фразы"""
         
         # Проверка состояния игры
         if self.game.is_game_over():
@@ -360,13 +425,7 @@ class MainMenuScreen(ctk.CTkFrame):
                 status_text = f"📅 Осталось циклов: {cycles_left}"
                 status_color = RomanTheme.TEXT
         
-        status_label = ctk.CTkLabel(
-            parent,
-            text=status_text,
-            font=RomanTheme.FONT_TEXT,
-            text_color=status_color
-        )
-        status_label.pack(pady=(10, 5))
+        self.status_label.configure(text=status_text, text_color=status_color)
         
         # Мотивирующая фраза
         motivation_texts = [
@@ -378,15 +437,17 @@ class MainMenuScreen(ctk.CTkFrame):
         
         import random
         motivation_text = random.choice(motivation_texts)
-        
-        motivation_label = ctk.CTkLabel(
-            parent,
-            text=motivation_text,
-            font=RomanTheme.FONT_SMALL,
-            text_color=RomanTheme.NEUTRAL,
-            justify="center"
-        )
-        motivation_label.pack(pady=(0, 10))
+        motivation_color = RomanTheme.NEUTRAL
+
+        # Вместо девиза — сообщение об открытиях
+        if self.unlocks:
+            motivation_text = "🔓 Открыто: " + ", ".join(
+                event.name + (f" ({', '.join(event.added)})" if event.kind == UNLOCK_CITIES else "")
+                for event in self.unlocks
+            )
+            motivation_color = RomanTheme.SUCCESS
+        
+        self.motivation_label.configure(text=motivation_text, text_color=motivation_color)
     
     def handle_action(self, action: str):
         """Обработка действий пользователя"""
@@ -396,11 +457,67 @@ class MainMenuScreen(ctk.CTkFrame):
             print(f"Действие '{action}' еще не реализовано")
     
     def refresh_info(self):
-        """Обновление информации на экране"""
-        # Пересоздаем виджеты для обновления данных
-        for widget in self.winfo_children():
-            widget.destroy()
-        self.create_widgets()
+        """Обновление информации на экране (меняется только текст надписей)"""
+        self.update_info_panel()
+        self.update_status_panel()
+    
+    def subscribe(self):
+        """Подписка на ленту изменений игры (у заглушек игры ленты нет)"""
+        changes = getattr(self.game, "changes", None)
+        if changes is not None:
+            changes.subscribe(
+                self.on_changes,
+                CycleAdvanced, BalanceChanged, InventoryChanged, CaravanDeparted, CaravanReturned
+            )
+    
+    def unsubscribe(self):
+        """Отписка от ленты изменений игры"""
+        changes = getattr(self.game, "changes", None)
+        if changes is not None:
+            changes.unsubscribe(self.on_changes)
+    
+    def on_changes(self, events: list):
+        """
+        Обновление только тех надписей, которых касаются изменения.
+        
+        Args:
+            events (list): События одной раздачи ленты изменений.
+        """
+        kinds = {type(event) for event in events}
+        if CycleAdvanced in kinds:
+            self.update_cycle_label()
+        if BalanceChanged in kinds:
+            self.update_balance_labels()
+        if InventoryChanged in kinds:
+            self.update_inventory_label()
+        if CaravanDeparted in kinds or CaravanReturned in kinds:
+            self.update_caravans_label()
+        if CycleAdvanced in kinds or BalanceChanged in kinds:
+            self.update_status_panel()
+    
+    def update_screen(self, game: Game):
+        """
+        Обновление кэшированного экрана перед повторным показом.
+        Изменения той же игры уже применены через ленту изменений.
+        
+        Args:
+            game (Game): Текущая игра.
+        """
+        unlocks = game.pop_unlocks()
+        if game is not self.game:
+            self.unsubscribe()
+            self.game = game
+            self.subscribe()
+            self.unlocks = unlocks
+            self.refresh_info()
+        elif unlocks or self.unlocks:
+            self.unlocks = unlocks
+            self.update_status_panel()
+    
+    def destroy(self):
+        """Отписка от ленты изменений и уничтожение экрана"""
+        self.unsubscribe()
+        super().destroy()
 
 
 # Пример использования для тестирования
@@ -425,6 +542,9 @@ if __name__ == "__main__":
         
         def has_won(self):
             return self.player.balance >= 10000
+        
+        def pop_unlocks(self):
+            return []
     
     def test_callback():
         print("Кнопка нажата!")
@@ -7,6 +7,7 @@ from typing import Callable, Optional, Dict
 from core.game import Game
 from models.city import City
 from models.goods_item import GoodsItem
+from core.expectation import expected_unit_prices
 
 
 class RomanTheme:
@@ -45,9 +46,13 @@ class SendCaravanScreen(ctk.CTkFrame):
         self.selected_city: Optional[City] = None
         self.selected_goods: Dict[str, int] = {}
         self.current_capacity = 0
+        # Ожидаемые цены по городам (зависят только от города и конфигурации)
+        self._expected_prices: Dict[str, Dict[str, float]] = {}
         
         # Элементы интерфейса
-        self.city_buttons = {}
+        self.city_rows: Dict[str, tuple] = {}
+        self.goods_rows: Dict[str, ctk.CTkFrame] = {}
+        self.goods_layout: Optional[str] = None
         self.capacity_label: Optional[ctk.CTkLabel] = None
         self.send_button: Optional[ctk.CTkButton] = None
         
@@ -74,13 +79,12 @@ class SendCaravanScreen(ctk.CTkFrame):
         title_label.pack(pady=(20, 10))
         
         # Информация о доступных ресурсах
-        info_label = ctk.CTkLabel(
+        self.info_label = ctk.CTkLabel(
             header_frame,
-            text=f"💰 Баланс: {self.game.player.balance:,} денариев | 🚛 Курьеры: {len(self.game.player.couriers)} | 🛠️ Повозки: {len(self.game.player.wagons)}",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
-        info_label.pack(pady=(0, 10))
+        self.info_label.pack(pady=(0, 10))
         
         # Основная прокручиваемая область
         main_scrollable = ctk.CTkScrollableFrame(
@@ -91,26 +95,62 @@ class SendCaravanScreen(ctk.CTkFrame):
         )
         main_scrollable.pack(fill="both", expand=True, padx=20, pady=10)
         
-        # Проверка возможности отправки караванов
-        if not self.can_send_caravan():
-            self.create_no_caravan_message(main_scrollable)
-            self.create_bottom_panel()
-            return
+        # Сообщение о невозможности отправки и форма отправки: показывается одно из двух
+        self.create_no_caravan_message(main_scrollable)
+        self.send_form = ctk.CTkFrame(
+            main_scrollable,
+            fg_color=RomanTheme.BACKGROUND
+        )
         
         # Секция выбора города
-        self.create_city_selection(main_scrollable)
+        self.create_city_selection(self.send_form)
         
         # Секция выбора товаров
-        self.create_goods_selection(main_scrollable)
+        self.create_goods_selection(self.send_form)
         
         # Информация о вместимости
-        self.create_capacity_info(main_scrollable)
+        self.create_capacity_info(self.send_form)
         
         # Кнопка отправки
-        self.create_send_button(main_scrollable)
+        self.create_send_button(self.send_form)
         
         # Нижняя панель
         self.create_bottom_panel()
+        
+        self.update_screen(self.game)
+    
+    def update_screen(self, game: Game):
+        """
+        Обновление экрана на месте. Выбор сбрасывается, как при первом
+        открытии, но виджеты не пересоздаются: меняются только надписи
+        и строки, состояние которых изменилось.
+        
+        Args:
+            game (Game): Текущая игра.
+        """
+        self.game = game
+        self.selected_city = None
+        self.selected_goods = {}
+        self.current_capacity = 0
+        
+        self.info_label.configure(
+            text=f"💰 Баланс: {self.game.player.balance:,} денариев | 🚛 Курьеры: {self.game.fleet.couriers.idle_count}/{len(self.game.player.couriers)} | 🛠️ Повозки: {self.game.fleet.wagons.idle_count}/{len(self.game.player.wagons)} свободны"
+        )
+        
+        # Проверка возможности отправки караванов
+        if not self.can_send_caravan():
+            self.send_form.pack_forget()
+            self.update_no_caravan_message()
+            self.no_caravan_frame.pack(fill="x", pady=50, padx=50)
+            return
+        
+        self.no_caravan_frame.pack_forget()
+        self.send_form.pack(fill="x")
+        
+        self.update_city_selection()
+        self.update_goods_section()
+        self.update_capacity_info()
+        self.update_send_button()
     
     def can_send_caravan(self) -> bool:
         """Проверка возможности отправки каравана"""
@@ -127,41 +167,55 @@ class SendCaravanScreen(ctk.CTkFrame):
             return False
         
         # Проверяем наличие доступных городов (не все города заняты караванами в текущем цикле)
-        available_cities = self.get_available_cities()
-        if not available_cities:
+        departed = self.game.caravan_index.departed_in(self.game.current_cycle)
+        occupied = {caravan.destination.city_id for caravan in departed}
+        if len(occupied) >= len(self.game.cities):
             return False
         
         return True
     
     def get_available_cities(self) -> list[City]:
         """Получить список городов, в которые можно отправить караван"""
-        # Города, в которые уже отправлены караваны в текущем цикле
-        occupied_cities = set()
-        for caravan in self.game.active_caravans:
-            if caravan.departure_cycle == self.game.current_cycle:
-                occupied_cities.add(caravan.destination.name)
-          # Возвращаем доступные города
-        return [city for city in self.game.cities if city.name not in occupied_cities]
+        # Города, в которые уже отправлены караваны в текущем цикле, исключаются по индексу игры
+        index = self.game.caravan_index
+        cycle = self.game.current_cycle
+        return [city for city in self.game.cities if index.departed_to_city(city.city_id, cycle) is None]
     
     def get_caravan_info_for_city(self, city: City) -> str:
         """Получить информацию о караване, отправленном в данный город"""
-        for caravan in self.game.active_caravans:
-            if caravan.departure_cycle == self.game.current_cycle and caravan.destination.name == city.name:
-                return f"Цикл {caravan.return_cycle}"
+        caravan = self.game.caravan_index.departed_to_city(city.city_id, self.game.current_cycle)
+        if caravan is not None:
+            return f"Цикл {caravan.return_cycle}"
         return "Занят"
     
     def create_no_caravan_message(self, parent):
         """Создание сообщения о невозможности отправки каравана"""
-        message_frame = ctk.CTkFrame(
+        self.no_caravan_frame = ctk.CTkFrame(
             parent,
             fg_color=RomanTheme.WARNING,
             border_color=RomanTheme.FRAME_BORDER,
             border_width=2,
             corner_radius=10
         )
-        message_frame.pack(fill="x", pady=50, padx=50)
         
-        # Определяем причину невозможности отправки
+        warning_label = ctk.CTkLabel(
+            self.no_caravan_frame,
+            text="⚠️ НЕВОЗМОЖНО ОТПРАВИТЬ КАРАВАН ⚠️",
+            font=RomanTheme.FONT_HEADER,
+            text_color=RomanTheme.BACKGROUND
+        )
+        warning_label.pack(pady=(20, 10))
+        
+        self.reasons_label = ctk.CTkLabel(
+            self.no_caravan_frame,
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.BACKGROUND,
+            justify="center"
+        )
+        self.reasons_label.pack(pady=(0, 20))
+    
+    def update_no_caravan_message(self):
+        """Обновление причин невозможности отправки каравана"""
         reasons = []
         if not self.game.player.couriers:
             reasons.append("📝 Нет доступных курьеров")
@@ -174,23 +228,10 @@ class SendCaravanScreen(ctk.CTkFrame):
         if not available_cities:
             reasons.append("🏛️ Все города уже заняты караванами в этом цикле")
         
-        warning_label = ctk.CTkLabel(
-            message_frame,
-            text="⚠️ НЕВОЗМОЖНО ОТПРАВИТЬ КАРАВАН ⚠️",
-            font=RomanTheme.FONT_HEADER,
-            text_color=RomanTheme.BACKGROUND
-        )
-        warning_label.pack(pady=(20, 10))
-        
         reasons_text = "\n".join(reasons)
-        reasons_label = ctk.CTkLabel(
-            message_frame,
-            text=f"Причины:\n\n{reasons_text}\n\nВернитесь в главное меню для решения проблем.",
-            font=RomanTheme.FONT_TEXT,
-            text_color=RomanTheme.BACKGROUND,
-            justify="center"
+        self.reasons_label.configure(
+            text=f"Причины:\n\n{reasons_text}\n\nВернитесь в главное меню для решения проблем."
         )
-        reasons_label.pack(pady=(0, 20))
     
     def create_city_selection(self, parent):
         """Создание секции выбора города"""
@@ -220,55 +261,55 @@ class SendCaravanScreen(ctk.CTkFrame):
             corner_radius=10        )
         cities_container.pack(fill="x", pady=(0, 20), padx=20)
         
-        available_cities = self.get_available_cities()
+        self.no_cities_label = ctk.CTkLabel(
+            cities_container,
+            text="🚫 Все города заняты караванами в этом цикле\n\nПерейдите к следующему циклу для освобождения городов",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.NEUTRAL,
+            justify="center"
+        )
         
-        if not available_cities:
-            no_cities_label = ctk.CTkLabel(
-                cities_container,
-                text="🚫 Все города заняты караванами в этом цикле\n\nПерейдите к следующему циклу для освобождения городов",
-                font=RomanTheme.FONT_TEXT,
-                text_color=RomanTheme.NEUTRAL,
-                justify="center"
-            )
-            no_cities_label.pack(pady=40)
+        # Строки городов создает update_city_selection
+        self.city_rows_frame = ctk.CTkFrame(
+            cities_container,
+            fg_color=RomanTheme.BACKGROUND
+        )
+    
+    def update_city_selection(self):
+        """Обновление доступности городов; строки создаются только для новых городов"""
+        available_names = {city.name for city in self.get_available_cities()}
+        
+        if not available_names:
+            self.city_rows_frame.pack_forget()
+            self.no_cities_label.pack(pady=40)
             return
         
-        # Создаем кнопки для всех городов с разными состояниями
-        all_cities = self.game.cities
-        for i, city in enumerate(all_cities):
-            is_available = city in available_cities
-            self.create_city_button(cities_container, city, i, is_available)
-    
-    def create_city_button(self, parent, city: City, index: int, is_available: bool = True):
-        """Создание кнопки выбора города"""
-        # Определяем цвет фрейма в зависимости от доступности
-        frame_color = RomanTheme.BACKGROUND if is_available else "#e8ddc7"
-        border_color = RomanTheme.FRAME_BORDER if is_available else RomanTheme.NEUTRAL
+        self.no_cities_label.pack_forget()
+        self.city_rows_frame.pack(fill="x")
         
+        # Создаем строки для всех городов с разными состояниями
+        for i, city in enumerate(self.game.cities):
+            if city.name not in self.city_rows:
+                self.create_city_button(self.city_rows_frame, city, i)
+            self.update_city_row(city, city.name in available_names)
+    
+    def create_city_button(self, parent, city: City, index: int):
+        """Создание строки выбора города (оформление задает update_city_row)"""
         city_frame = ctk.CTkFrame(
             parent,
-            fg_color=frame_color,
-            border_color=border_color,
             border_width=1,
             corner_radius=8
         )
         city_frame.pack(fill="x", pady=5, padx=15)
         
         # Информация о городе
-        city_info_frame = ctk.CTkFrame(
-            city_frame,
-            fg_color=frame_color
-        )
+        city_info_frame = ctk.CTkFrame(city_frame)
         city_info_frame.pack(side="left", fill="both", expand=True, padx=10, pady=10)
         
         # Название города с индикатором доступности
-        city_prefix = "🏛️" if is_available else "🚫"
-        city_suffix = "" if is_available else " (ЗАНЯТ)"
         city_name_label = ctk.CTkLabel(
             city_info_frame,
-            text=f"{city_prefix} {city.name}{city_suffix}",
             font=RomanTheme.FONT_BUTTON,
-            text_color=RomanTheme.TEXT if is_available else RomanTheme.NEUTRAL,
             anchor="w"
         )
         city_name_label.pack(anchor="w")
@@ -281,10 +322,8 @@ class SendCaravanScreen(ctk.CTkFrame):
         )
         distance_label.pack(anchor="w")
         
-        event_text = f"🎭 Событие: {city.current_event or 'Нет события'}"
         event_label = ctk.CTkLabel(
             city_info_frame,
-            text=event_text,
             font=RomanTheme.FONT_SMALL,
             text_color=RomanTheme.NEUTRAL,
             anchor="w"
@@ -292,53 +331,78 @@ class SendCaravanScreen(ctk.CTkFrame):
         event_label.pack(anchor="w")
         
         # Кнопка выбора или информация о занятости
+        action_button = ctk.CTkButton(
+            city_frame,
+            hover_color=RomanTheme.BUTTON_HOVER,
+            text_color=RomanTheme.BACKGROUND,
+            corner_radius=8,
+            height=40,
+            command=lambda c=city: self.select_city(c)
+        )
+        action_button.pack(side="right", padx=10, pady=10)
+        
+        setattr(city_frame, 'row_state', None)
+        self.city_rows[city.name] = (city_frame, city_info_frame, city_name_label, event_label, action_button)
+    
+    def update_city_row(self, city: City, is_available: bool):
+        """Оформление строки города по доступности и выбору (только если оно изменилось)"""
+        is_selected = is_available and self.selected_city is not None and self.selected_city.name == city.name
+        occupied_info = None if is_available else self.get_caravan_info_for_city(city)
+        state = (is_available, is_selected, city.current_event, occupied_info)
+        
+        city_frame, city_info_frame, city_name_label, event_label, action_button = self.city_rows[city.name]
+        if city_frame.row_state == state:
+            return
+        city_frame.row_state = state
+        
+        # Определяем цвет фрейма в зависимости от доступности
+        frame_color = RomanTheme.BACKGROUND if is_available else "#e8ddc7"
+        if is_selected:
+            city_frame.configure(fg_color=frame_color, border_color=RomanTheme.ACCENT, border_width=3)
+        else:
+            border_color = RomanTheme.FRAME_BORDER if is_available else RomanTheme.NEUTRAL
+            city_frame.configure(fg_color=frame_color, border_color=border_color, border_width=1)
+        city_info_frame.configure(fg_color=frame_color)
+        
+        city_prefix = "🏛️" if is_available else "🚫"
+        city_suffix = "" if is_available else " (ЗАНЯТ)"
+        city_name_label.configure(
+            text=f"{city_prefix} {city.name}{city_suffix}",
+            text_color=RomanTheme.TEXT if is_available else RomanTheme.NEUTRAL
+        )
+        event_label.configure(text=f"🎭 Событие: {city.current_event or 'Нет события'}")
+        
         if is_available:
-            select_button = ctk.CTkButton(
-                city_frame,
-                text="⚡ Выбрать",
+            action_button.configure(
+                text="✅ Выбран" if is_selected else "⚡ Выбрать",
                 font=RomanTheme.FONT_BUTTON,
-                fg_color=RomanTheme.BUTTON,
-                hover_color=RomanTheme.BUTTON_HOVER,
-                text_color=RomanTheme.BACKGROUND,
-                corner_radius=8,
+                fg_color=RomanTheme.SUCCESS if is_selected else RomanTheme.BUTTON,
                 width=120,
-                height=40,
-                command=lambda c=city: self.select_city(c)
+                state="normal"
             )
-            select_button.pack(side="right", padx=10, pady=10)
-            
-            self.city_buttons[city.name] = (city_frame, select_button)
         else:
             # Показываем информацию о караване
-            occupied_info = self.get_caravan_info_for_city(city)
-            disabled_button = ctk.CTkButton(
-                city_frame,
+            action_button.configure(
                 text=f"🚛 {occupied_info}",
                 font=RomanTheme.FONT_SMALL,
                 fg_color=RomanTheme.NEUTRAL,
-                text_color=RomanTheme.BACKGROUND,
-                corner_radius=8,
                 width=140,
-                height=40,
                 state="disabled"
             )
-            disabled_button.pack(side="right", padx=10, pady=10)
     
     def select_city(self, city: City):
         """Выбор города для отправки каравана"""
+        previous = self.selected_city
         self.selected_city = city
         
-        # Обновляем визуальное состояние кнопок
-        for city_name, (frame, button) in self.city_buttons.items():
-            if city_name == city.name:
-                frame.configure(border_color=RomanTheme.ACCENT, border_width=3)
-                button.configure(text="✅ Выбран", fg_color=RomanTheme.SUCCESS)
-            else:
-                frame.configure(border_color=RomanTheme.FRAME_BORDER, border_width=1)
-                button.configure(text="⚡ Выбрать", fg_color=RomanTheme.BUTTON)
+        # Обновляем визуальное состояние только прежнего и нового выбранного города
+        if previous is not None and previous.name != city.name:
+            self.update_city_row(previous, True)
+        self.update_city_row(city, True)
         
-        # Обновляем секцию товаров
+        # Обновляем секцию товаров и оценку рейса
         self.update_goods_section()
+        self.update_capacity_info()
     
     def create_goods_selection(self, parent):
         """Создание секции выбора товаров"""
@@ -368,87 +432,155 @@ class SendCaravanScreen(ctk.CTkFrame):
         )
         self.goods_container.pack(fill="x", pady=(0, 20), padx=20)
         
-        # Контейнер для строк товаров
-        self.goods_rows_frame = ctk.CTkFrame(
-            self.goods_container,
-            fg_color=RomanTheme.BACKGROUND
-        )
-        self.goods_rows_frame.pack(fill="x", padx=15, pady=(0, 15))
-        
-        if not self.selected_city:
-            placeholder_label = ctk.CTkLabel(
-                self.goods_container,
-                text="👆 Сначала выберите город назначения",
-                font=RomanTheme.FONT_TEXT,
-                text_color=RomanTheme.NEUTRAL
-            )
-            placeholder_label.pack(pady=40)
-    
-    def update_goods_section(self):
-        """Обновление секции выбора товаров"""
-        # Очищаем контейнер
-        for widget in self.goods_container.winfo_children():
-            widget.destroy()
-        
-        if not self.selected_city:
-            return
-        
-        # Создаем заголовки таблицы
-        headers_frame = ctk.CTkFrame(
+        # Заголовки таблицы
+        self.goods_headers_frame = ctk.CTkFrame(
             self.goods_container,
             fg_color=RomanTheme.NEUTRAL,
             corner_radius=8,
             height=40
         )
-        headers_frame.pack(fill="x", pady=15, padx=15)
-        headers_frame.pack_propagate(False)
+        self.goods_headers_frame.pack_propagate(False)
         
         # Настройка сетки заголовков
-        headers_frame.grid_columnconfigure(0, weight=3)  # Название товара
-        headers_frame.grid_columnconfigure(1, weight=2)  # На складе
-        headers_frame.grid_columnconfigure(2, weight=2)  # Ожидаемая цена
-        headers_frame.grid_columnconfigure(3, weight=2)  # Количество
-        headers_frame.grid_columnconfigure(4, weight=1)  # Действие
+        self.goods_headers_frame.grid_columnconfigure(0, weight=3)  # Название товара
+        self.goods_headers_frame.grid_columnconfigure(1, weight=2)  # На складе
+        self.goods_headers_frame.grid_columnconfigure(2, weight=2)  # Ожидаемая цена
+        self.goods_headers_frame.grid_columnconfigure(3, weight=2)  # Количество
+        self.goods_headers_frame.grid_columnconfigure(4, weight=1)  # Действие
         
         headers = ["Товар", "На складе", "Ожидаемая цена", "Количество", ""]
         for i, header in enumerate(headers):
             label = ctk.CTkLabel(
-                headers_frame,
+                self.goods_headers_frame,
                 text=header,
                 font=RomanTheme.FONT_BUTTON,
                 text_color=RomanTheme.BACKGROUND
             )
             label.grid(row=0, column=i, padx=10, pady=8, sticky="ew")
         
-        # Создаем строки для товаров
-        goods_dict = {g.name: g for g in self.game.goods}
-        available_goods = [(name, qty) for name, qty in self.game.player.inventory.items() if qty > 0]
+        self.no_goods_label = ctk.CTkLabel(
+            self.goods_container,
+            text="📦 Нет товаров на складе\n\nПосетите торговую площадь для закупки товаров",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.NEUTRAL,
+            justify="center"
+        )
         
-        if not available_goods:
-            no_goods_label = ctk.CTkLabel(
-                self.goods_container,
-                text="📦 Нет товаров на складе\n\nПосетите торговую площадь для закупки товаров",
-                font=RomanTheme.FONT_TEXT,
-                text_color=RomanTheme.NEUTRAL,
-                justify="center"
-            )            
-            no_goods_label.pack(pady=40)
-            return
+        # Кнопка автозагрузки повозки
+        self.auto_load_button = ctk.CTkButton(
+            self.goods_container,
+            text="⚖️ Автозагрузка",
+            font=RomanTheme.FONT_BUTTON,
+            fg_color=RomanTheme.ACCENT,
+            hover_color="#5a5a1e",
+            text_color=RomanTheme.BACKGROUND,
+            corner_radius=8,
+            width=200,
+            height=36,
+            command=self.auto_load
+        )
         
-        # Пересоздаем контейнер для строк товаров
+        # Контейнер для строк товаров
         self.goods_rows_frame = ctk.CTkFrame(
             self.goods_container,
             fg_color=RomanTheme.BACKGROUND
         )
-        self.goods_rows_frame.pack(fill="x", padx=15, pady=(0, 15))
         
-        for i, (name, available_qty) in enumerate(available_goods):
+        self.goods_placeholder_label = ctk.CTkLabel(
+            self.goods_container,
+            text="👆 Сначала выберите город назначения",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.NEUTRAL
+        )
+    
+    def set_goods_layout(self, layout: str):
+        """
+        Показать нужные части секции товаров.
+        
+        Args:
+            layout (str): "placeholder" — город не выбран, "empty" — склад пуст, "rows" — строки товаров
+        """
+        if layout == self.goods_layout:
+            return
+        self.goods_layout = layout
+        
+        for widget in (self.goods_headers_frame, self.no_goods_label, self.auto_load_button,
+                       self.goods_rows_frame, self.goods_placeholder_label):
+            widget.pack_forget()
+        
+        if layout == "placeholder":
+            self.goods_placeholder_label.pack(pady=40)
+            return
+        
+        self.goods_headers_frame.pack(fill="x", pady=15, padx=15)
+        if layout == "empty":
+            self.no_goods_label.pack(pady=40)
+        else:
+            self.auto_load_button.pack(pady=(0, 10))
+            self.goods_rows_frame.pack(fill="x", padx=15, pady=(0, 15))
+    
+    def update_goods_section(self):
+        """Обновление секции выбора товаров: меняются только строки с изменившимися данными"""
+        if not self.selected_city:
+            self.set_goods_layout("placeholder")
+            return
+        
+        available_goods = [(name, qty) for name, qty in self.game.player.inventory.items() if qty > 0]
+        if not available_goods:
+            self.set_goods_layout("empty")
+            return
+        
+        self.set_goods_layout("rows")
+        
+        goods_dict = {g.name: g for g in self.game.goods}
+        shown = set()
+        for name, available_qty in available_goods:
             good_obj = goods_dict.get(name)
-            if good_obj:
-                self.create_goods_row(self.goods_rows_frame, good_obj, available_qty, i)
+            if not good_obj:
+                continue
+            shown.add(name)
+            row_container = self.goods_rows.get(name)
+            if row_container is None:
+                self.goods_rows[name] = self.create_goods_row(
+                    self.goods_rows_frame, good_obj, available_qty, len(self.goods_rows)
+                )
+                continue
+            row_container.available_qty = available_qty
+            if not row_container.winfo_manager():
+                row_container.pack(fill="x", pady=2)
+            self.update_goods_row(row_container)
+        
+        # Закончившиеся товары скрываются, строка остается для повторного показа
+        for name, row_container in self.goods_rows.items():
+            if name not in shown and row_container.winfo_manager():
+                self.hide_selection_form(row_container)
+                row_container.pack_forget()
     
+    def auto_load(self):
+        """Автозагрузка: груз с наибольшим ожидаемым доходом в выбранном городе"""
+        if not self.selected_city:
+            self.show_error("Сначала выберите город назначения")
+            return
+
+        wagon = self.planned_wagon(self.game.fleet.largest_idle_capacity())
+        if wagon is None:
+            self.show_error("Нет свободных повозок: все в пути")
+            return
+
+        courier = self.game.fleet.pick_courier(self.game.route_risk(self.selected_city))
+        plan = self.game.plan_cargo(wagon, self.selected_city, courier)
+        if not plan.goods:
+            self.show_error("Нечего загрузить")
+            return
+
+        self.selected_goods = dict(plan.goods)
+        self.update_goods_section()
+        self.update_capacity_info()
+        self.update_send_button()
+        self.show_success(f"Загружено {plan.units} ед.\nОжидаемый чистый доход: {plan.expected_net:.0f} денариев")
+
     def create_goods_row(self, parent, good: GoodsItem, available_qty: int, row_index: int):
-        """Создание строки с товаром с inline формой выбора"""
+        """Создание строки с товаром с inline формой выбора (данные заполняет update_goods_row)"""
         
         # Основной контейнер строки
         row_container = ctk.CTkFrame(
@@ -489,47 +621,35 @@ class SendCaravanScreen(ctk.CTkFrame):
         # Количество на складе
         stock_label = ctk.CTkLabel(
             main_row_frame,
-            text=f"{available_qty} ед.",
             font=RomanTheme.FONT_TEXT,
             text_color=RomanTheme.TEXT
         )
         stock_label.grid(row=0, column=1, padx=10, pady=8, sticky="ew")
         
-        # Расчет ожидаемой цены в выбранном городе
-        expected_price = self.calculate_expected_price(good, self.selected_city) if self.selected_city else good.base_price
+        # Ожидаемая цена в выбранном городе
         price_label = ctk.CTkLabel(
             main_row_frame,
-            text=f"{expected_price:,} ден./ед.",
-            font=RomanTheme.FONT_TEXT,
-            text_color=RomanTheme.SUCCESS if expected_price > good.base_price else RomanTheme.TEXT
+            font=RomanTheme.FONT_TEXT
         )
         price_label.grid(row=0, column=2, padx=10, pady=8, sticky="ew")
         
         # Отображение количества для отправки
-        selected_qty = self.selected_goods.get(good.name, 0)
-        quantity_text = f"{selected_qty} ед." if selected_qty > 0 else "-"
         quantity_label = ctk.CTkLabel(
             main_row_frame,
-            text=quantity_text,
-            font=RomanTheme.FONT_TEXT,
-            text_color=RomanTheme.ACCENT if selected_qty > 0 else RomanTheme.NEUTRAL
+            font=RomanTheme.FONT_TEXT
         )
         quantity_label.grid(row=0, column=3, padx=10, pady=8, sticky="ew")
         
-        # Кнопка выбора
-        button_text = "✓ Выбрано" if selected_qty > 0 else "⚡ Выбрать"
-        button_color = RomanTheme.SUCCESS if selected_qty > 0 else RomanTheme.BUTTON
+        # Кнопка выбора (доступное количество читается в момент нажатия)
         select_button = ctk.CTkButton(
             main_row_frame,
-            text=button_text,
             font=RomanTheme.FONT_BUTTON,
-            fg_color=button_color,
             hover_color=RomanTheme.BUTTON_HOVER,
             text_color=RomanTheme.BACKGROUND,
             corner_radius=5,
             width=100,
             height=30,
-            command=lambda g=good, container=row_container: self.toggle_selection_form(g, container, available_qty)
+            command=lambda g=good, container=row_container: self.toggle_selection_form(g, container, container.available_qty)
         )
         select_button.grid(row=0, column=4, padx=5, pady=8)
         
@@ -547,25 +667,64 @@ class SendCaravanScreen(ctk.CTkFrame):
         setattr(row_container, 'good', good)
         setattr(row_container, 'available_qty', available_qty)
         setattr(row_container, 'is_form_shown', False)
+        setattr(row_container, 'stock_label', stock_label)
+        setattr(row_container, 'price_label', price_label)
         setattr(row_container, 'quantity_label', quantity_label)
         setattr(row_container, 'select_button', select_button)
-    
-    def calculate_expected_price(self, good: GoodsItem, city: City) -> int:
-        """Расчет ожидаемой цены товара в городе"""
-        # Модификатор города
-        city_mod = city.demand_modifiers.get(good.name, 1.0) - 1.0
+        setattr(row_container, 'row_state', (None, None, None))
         
-        # Модификатор события
-        event = city.current_event or "Нет события"
-        event_mod = self.game.config["event_modifiers"].get(event, {}).get(good.name, 1.0) - 1.0
-          # Модификатор расстояния
-        distance_mod = city.duration * 0.02
+        self.update_goods_row(row_container)
+        return row_container
+    
+    def update_goods_row(self, row_container):
+        """Обновление столбцов строки товара, значения которых изменились"""
+        good = row_container.good
+        available_qty = row_container.available_qty
+        expected_price = self.calculate_expected_price(good, self.selected_city) if self.selected_city else good.base_price
+        selected_qty = self.selected_goods.get(good.name, 0)
         
-        # Итоговый модификатор
-        total_percent = city_mod + event_mod + distance_mod
-        final_modifier = 1.0 + total_percent
+        state = (available_qty, expected_price, selected_qty)
+        previous = row_container.row_state
+        if state == previous:
+            return
+        row_container.row_state = state
+        
+        if available_qty != previous[0]:
+            row_container.stock_label.configure(text=f"{available_qty} ед.")
+            # Открытая форма показывает прежнее доступное количество
+            if row_container.is_form_shown:
+                self.hide_selection_form(row_container)
+        
+        if expected_price != previous[1]:
+            row_container.price_label.configure(
+                text=f"{expected_price:,} ден./ед.",
+                text_color=RomanTheme.SUCCESS if expected_price > good.base_price else RomanTheme.TEXT
+            )
         
-        return int(good.base_price * final_modifier)
+        if selected_qty != previous[2]:
+            row_container.quantity_label.configure(
+                text=f"{selected_qty} ед." if selected_qty > 0 else "-",
+                text_color=RomanTheme.ACCENT if selected_qty > 0 else RomanTheme.NEUTRAL
+            )
+            row_container.select_button.configure(
+                text="✓ Выбрано" if selected_qty > 0 else "⚡ Выбрать",
+                fg_color=RomanTheme.SUCCESS if selected_qty > 0 else RomanTheme.BUTTON
+            )
+    
+    def planned_wagon(self, units: Optional[int] = None):
+        """Повозка, которую диспетчер назначит для груза (по умолчанию — выбранного)"""
+        if units is None:
+            units = sum(self.selected_goods.values())
+        risk = self.game.route_risk(self.selected_city) if self.selected_city else 1.0
+        return self.game.fleet.pick_wagon(units, risk)
+    
+    def calculate_expected_price(self, good: GoodsItem, city: City) -> int:
+        """Ожидаемая цена товара в городе с учётом распределения событий в цикле продажи"""
+        prices = self._expected_prices.get(city.name)
+        if prices is None:
+            prices = expected_unit_prices(city, self.game.goods, self.game.config, self.game.difficulty)
+            self._expected_prices[city.name] = prices
+        return int(prices.get(good.name, good.base_price))
     
     def create_capacity_info(self, parent):
         """Создание информации о вместимости"""
@@ -576,50 +735,71 @@ class SendCaravanScreen(ctk.CTkFrame):
         )
         self.capacity_frame.pack(fill="x", pady=(10, 20), padx=20)
         
-        self.update_capacity_info()
+        self.capacity_label = ctk.CTkLabel(
+            self.capacity_frame,
+            font=RomanTheme.FONT_HEADER
+        )
+        self.selected_label = ctk.CTkLabel(
+            self.capacity_frame,
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.BACKGROUND
+        )
+        self.estimate_label = ctk.CTkLabel(
+            self.capacity_frame,
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.BACKGROUND
+        )
     
     def update_capacity_info(self):
-        """Обновление информации о вместимости"""
-        # Очищаем фрейм
-        for widget in self.capacity_frame.winfo_children():
-            widget.destroy()
-        
+        """Обновление информации о вместимости (надписи меняются на месте)"""
         if not self.game.player.wagons:
+            for label in (self.capacity_label, self.selected_label, self.estimate_label):
+                label.pack_forget()
             return
         
-        wagon = self.game.player.wagons[0]
+        # Груз ограничен самой большой свободной повозкой; назначается самая маленькая подходящая
+        capacity = self.game.fleet.largest_idle_capacity()
         current_load = sum(self.selected_goods.values())
+        wagon = self.planned_wagon(current_load)
+        wagon_name = wagon.name if wagon else "нет свободной"
         
-        capacity_text = f"🛠️ Повозка: {wagon.name} | Загружено: {current_load}/{wagon.capacity} ед."
+        capacity_text = f"🛠️ Повозка: {wagon_name} | Загружено: {current_load}/{capacity} ед."
         
         # Определяем цвет в зависимости от загрузки
         if current_load == 0:
             color = RomanTheme.NEUTRAL
-        elif current_load <= wagon.capacity * 0.7:
+        elif current_load <= capacity * 0.7:
             color = RomanTheme.SUCCESS
-        elif current_load <= wagon.capacity:
+        elif current_load <= capacity:
             color = RomanTheme.WARNING
         else:
             color = RomanTheme.ERROR
         
-        self.capacity_label = ctk.CTkLabel(
-            self.capacity_frame,
-            text=capacity_text,
-            font=RomanTheme.FONT_HEADER,
-            text_color=color
-        )
+        self.capacity_label.configure(text=capacity_text, text_color=color)
         self.capacity_label.pack(pady=15)
         
         # Показываем выбранные товары
-        if self.selected_goods:
-            goods_text = " | ".join([f"{name}: {qty} ед." for name, qty in self.selected_goods.items()])
-            selected_label = ctk.CTkLabel(
-                self.capacity_frame,
-                text=f"📦 Выбрано: {goods_text}",
-                font=RomanTheme.FONT_TEXT,
-                text_color=RomanTheme.BACKGROUND
+        if not self.selected_goods:
+            self.selected_label.pack_forget()
+            self.estimate_label.pack_forget()
+            return
+        
+        goods_text = " | ".join([f"{name}: {qty} ед." for name, qty in self.selected_goods.items()])
+        self.selected_label.configure(text=f"📦 Выбрано: {goods_text}")
+        self.selected_label.pack(pady=(0, 15))
+        
+        # Ожидаемый итог рейса и его разброс
+        if self.selected_city:
+            risk = self.game.route_risk(self.selected_city)
+            estimate = self.game.estimate_outcome(
+                self.selected_goods, self.selected_city, self.game.fleet.pick_courier(risk), wagon
             )
-            selected_label.pack(pady=(0, 15))
+            self.estimate_label.configure(
+                text=f"📈 Ожидаемая прибыль: {estimate.mean:.0f} ± {estimate.std:.0f} 🪙"
+            )
+            self.estimate_label.pack(pady=(0, 15))
+        else:
+            self.estimate_label.pack_forget()
     
     def create_send_button(self, parent):
         """Создание кнопки отправки каравана"""
@@ -629,42 +809,40 @@ class SendCaravanScreen(ctk.CTkFrame):
         )
         self.send_button_frame.pack(fill="x", pady=20, padx=20)
         
-        self.update_send_button()
+        self.send_button = ctk.CTkButton(
+            self.send_button_frame,
+            font=RomanTheme.FONT_BUTTON,
+            fg_color=RomanTheme.SUCCESS,
+            hover_color="#5a7c1f",
+            text_color=RomanTheme.BACKGROUND,
+            corner_radius=10,
+            width=400,
+            height=60,
+            command=self.send_caravan
+        )
+        self.send_placeholder_label = ctk.CTkLabel(
+            self.send_button_frame,
+            text="👆 Выберите город и товары для отправки каравана",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.NEUTRAL
+        )
     def update_send_button(self):
         """Обновление кнопки отправки"""
-        # Очищаем фрейм
-        for widget in self.send_button_frame.winfo_children():
-            widget.destroy()
-        
         can_send = (
             self.selected_city is not None and 
             bool(self.selected_goods) and 
-            sum(self.selected_goods.values()) <= self.game.player.wagons[0].capacity
+            self.game.fleet.couriers.idle_count > 0 and
+            sum(self.selected_goods.values()) <= self.game.fleet.largest_idle_capacity()
         )
         
         if can_send:
             city_name = self.selected_city.name.upper() if self.selected_city else "ВЫБЕРИТЕ ГОРОД"
-            self.send_button = ctk.CTkButton(
-                self.send_button_frame,
-                text=f"🚀 ОТПРАВИТЬ КАРАВАН В {city_name}",
-                font=RomanTheme.FONT_BUTTON,
-                fg_color=RomanTheme.SUCCESS,
-                hover_color="#5a7c1f",
-                text_color=RomanTheme.BACKGROUND,
-                corner_radius=10,
-                width=400,
-                height=60,
-                command=self.send_caravan
-            )
+            self.send_button.configure(text=f"🚀 ОТПРАВИТЬ КАРАВАН В {city_name}")
+            self.send_placeholder_label.pack_forget()
             self.send_button.pack(pady=20)
         else:
-            placeholder_label = ctk.CTkLabel(
-                self.send_button_frame,
-                text="👆 Выберите город и товары для отправки каравана",
-                font=RomanTheme.FONT_TEXT,
-                text_color=RomanTheme.NEUTRAL
-            )
-            placeholder_label.pack(pady=20)
+            self.send_button.pack_forget()
+            self.send_placeholder_label.pack(pady=20)
     
     def send_caravan(self):
         """Отправка каравана"""
@@ -673,32 +851,34 @@ class SendCaravanScreen(ctk.CTkFrame):
             return
         
         try:
-            # Получаем курьера и повозку
-            courier = self.game.player.couriers[0]
-            wagon = self.game.player.wagons[0]
-            
-            # Проверяем еще раз вместимость
+            # Свободных курьера и повозку подбирает диспетчер
             total_goods = sum(self.selected_goods.values())
-            if total_goods > wagon.capacity:
-                self.show_error("Превышена вместимость повозки")
+            assignment = self.game.assign_fleet(total_goods, self.selected_city)
+            if assignment is None:
+                self.show_error("Нет свободных курьера или повозки для такого груза")
                 return
+            courier, wagon = assignment
             
-            # Убираем товары со склада
             goods_dict = {g.name: g for g in self.game.goods}
             for name, qty in self.selected_goods.items():
-                good_obj = goods_dict[name]
-                self.game.player.remove_goods(good_obj, qty)
+                if not self.game.player.has_goods(goods_dict[name], qty):
+                    self.show_error(f"Недостаточно товара «{name}» на складе")
+                    return
             
-            # Создаем караван
+            # Создаем караван: диспетчер может отказать, поэтому склад трогаем только после
             caravan = self.game.form_caravan(
                 courier=courier,
                 wagon=wagon,
                 goods_selection=self.selected_goods.copy(),
                 city=self.selected_city
             )
+            
+            # Убираем товары со склада
+            for name, qty in self.selected_goods.items():
+                self.game.player.remove_goods(goods_dict[name], qty)
               # Показываем успешное сообщение
             goods_list = ", ".join([f"{name} ({qty} ед.)" for name, qty in self.selected_goods.items()])
-            success_message = f"✅ Караван успешно отправлен!\n\nНазначение: {self.selected_city.name}\nТовары: {goods_list}\nПрибытие: цикл {caravan.arrival_cycle}\nВозврат: цикл {caravan.return_cycle}"
+            success_message = f"✅ Караван успешно отправлен!\n\nНазначение: {self.selected_city.name}\nТовары: {goods_list}\nКурьер: {courier.name}, повозка: {wagon.name}\nПрибытие: цикл {caravan.arrival_cycle}\nВозврат: цикл {caravan.return_cycle}"
             
             # Сбрасываем состояние экрана
             self.selected_city = None
@@ -934,13 +1114,13 @@ class SendCaravanScreen(ctk.CTkFrame):
                 self.show_error(f"Недостаточно товара на складе (доступно: {available_qty})")
                 return
             
-            # Проверяем вместимость повозки
-            wagon = self.game.player.wagons[0]
+            # Проверяем вместимость самой большой свободной повозки
+            capacity = self.game.fleet.largest_idle_capacity()
             current_load = sum(self.selected_goods.values())
             new_load = current_load - self.selected_goods.get(good.name, 0) + quantity
             
-            if new_load > wagon.capacity:
-                self.show_error(f"Превышена вместимость повозки!\nВместимость: {wagon.capacity}, попытка загрузить: {new_load}")
+            if new_load > capacity:
+                self.show_error(f"Превышена вместимость повозки!\nВместимость: {capacity}, попытка загрузить: {new_load}")
                 return
             
             # Обновляем выбранные товары
@@ -949,21 +1129,8 @@ class SendCaravanScreen(ctk.CTkFrame):
             else:
                 self.selected_goods.pop(good.name, None)
             
-            # Обновляем отображение количества в строке
-            selected_qty = self.selected_goods.get(good.name, 0)
-            quantity_text = f"{selected_qty} ед." if selected_qty > 0 else "-"
-            row_container.quantity_label.configure(
-                text=quantity_text,
-                text_color=RomanTheme.ACCENT if selected_qty > 0 else RomanTheme.NEUTRAL
-            )
-            
-            # Обновляем кнопку выбора
-            button_text = "✓ Выбрано" if selected_qty > 0 else "⚡ Выбрать"
-            button_color = RomanTheme.SUCCESS if selected_qty > 0 else RomanTheme.BUTTON
-            row_container.select_button.configure(
-                text=button_text,
-                fg_color=button_color
-            )
+            # Обновляем количество и кнопку выбора в строке
+            self.update_goods_row(row_container)
             
             # Скрываем форму
             self.hide_selection_form(row_container)
@@ -983,12 +1150,7 @@ class SendCaravanScreen(ctk.CTkFrame):
 
     def refresh_screen(self):
         """Обновление всего экрана после отправки каравана"""
-        # Сначала уничтожаем все виджеты
-        for widget in self.winfo_children():
-            widget.destroy()
-        
-        # Пересоздаем весь интерфейс
-        self.create_widgets()
+        self.update_screen(self.game)
 
 
 # Тестирование (если запускается напрямую)
@@ -1001,6 +1163,7 @@ if __name__ == "__main__":
     
     from core.world import load_balance_config, generate_world
     from core.goods import load_goods
+    from core.caravan_index import CaravanIndex
     from models.player import Player
     from models.courier import Courier
     from models.wagon import Wagon
@@ -1036,6 +1199,7 @@ if __name__ == "__main__":
             self.current_cycle = 1
             self.max_cycles = 20
             self.active_caravans = []
+            self.caravan_index = CaravanIndex()
         
         def form_caravan(self, courier, wagon, goods_selection, city):
             from models.caravan import Caravan
@@ -1049,6 +1213,7 @@ if __name__ == "__main__":
                 return_cycle=self.current_cycle + city.duration * 2 + 1
             )
             self.active_caravans.append(caravan)
+            self.caravan_index.add(caravan, self.current_cycle)
             return caravan
     
     def test_back():
@@ -4,8 +4,9 @@
 """
 
 import customtkinter as ctk
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional, Tuple
 from core.game import Game
+from core.changes import BalanceChanged, InventoryChanged
 from models.goods_item import GoodsItem
 
 
@@ -54,6 +55,11 @@ class ShopInventoryScreen(ctk.CTkFrame):
         self.quantity_entry: Optional[ctk.CTkEntry] = None
         self.purchase_frame: Optional[ctk.CTkFrame] = None
         
+        # Строки склада по названию товара и показанные в них количества
+        self.inventory_rows: Dict[str, Tuple[ctk.CTkFrame, ctk.CTkLabel]] = {}
+        self.shown_inventory: Dict[str, int] = {}
+        self.subscribed = False
+        
         self.create_widgets()
     
     def create_widgets(self):
@@ -78,13 +84,11 @@ class ShopInventoryScreen(ctk.CTkFrame):
         title_label.pack(pady=(20, 10))
         
         # Баланс игрока
-        balance_label = ctk.CTkLabel(
+        self.balance_label = ctk.CTkLabel(
             header_frame,
-            text=f"💰 Ваш баланс: {self.game.player.balance:,} денариев",
-            font=RomanTheme.FONT_HEADER,
-            text_color=RomanTheme.SUCCESS if self.game.player.balance >= 1000 else RomanTheme.TEXT
+            font=RomanTheme.FONT_HEADER
         )
-        balance_label.pack(pady=(0, 10))
+        self.balance_label.pack(pady=(0, 10))
         
         # Основная область с прокруткой
         main_scrollable = ctk.CTkScrollableFrame(
@@ -99,6 +103,8 @@ class ShopInventoryScreen(ctk.CTkFrame):
         self.create_shop_section(main_scrollable)
         self.create_inventory_section(main_scrollable)
         self.create_bottom_panel()
+        
+        self.update_screen(self.game)
     def create_shop_section(self, parent):
         """Создание секции покупки товаров"""
         
@@ -427,61 +433,92 @@ class ShopInventoryScreen(ctk.CTkFrame):
         inventory_title_label.pack(expand=True)
         
         # Фрейм для склада
-        warehouse_frame = ctk.CTkFrame(
+        self.warehouse_frame = ctk.CTkFrame(
             parent,
             fg_color=RomanTheme.BACKGROUND,
             border_color=RomanTheme.FRAME_BORDER,
             border_width=2,
             corner_radius=10
         )
-        warehouse_frame.pack(fill="x", pady=(0, 20), padx=20)
+        self.warehouse_frame.pack(fill="x", pady=(0, 20), padx=20)
         
-        # Проверяем, есть ли товары на складе
-        if not self.game.player.inventory or all(qty == 0 for qty in self.game.player.inventory.values()):
-            empty_label = ctk.CTkLabel(
-                warehouse_frame,
-                text="📦 Склад пуст\n\nПриобретите товары для начала торговли",
-                font=RomanTheme.FONT_TEXT,
-                text_color=RomanTheme.NEUTRAL,
-                justify="center"
-            )
-            empty_label.pack(pady=40)
-        else:
-            # Заголовки таблицы склада
-            warehouse_headers_frame = ctk.CTkFrame(
-                warehouse_frame,
-                fg_color=RomanTheme.NEUTRAL,
-                corner_radius=8
-            )
-            warehouse_headers_frame.pack(fill="x", pady=15, padx=15)
-            
-            # Заголовки для склада
-            name_header = ctk.CTkLabel(
-                warehouse_headers_frame,
-                text="Товар",
-                font=RomanTheme.FONT_BUTTON,
-                text_color=RomanTheme.BACKGROUND
-            )
-            name_header.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
-            
-            qty_header = ctk.CTkLabel(
-                warehouse_headers_frame,
-                text="Количество",
-                font=RomanTheme.FONT_BUTTON,
-                text_color=RomanTheme.BACKGROUND
-            )
-            qty_header.grid(row=0, column=1, padx=10, pady=10, sticky="ew")
-            
-            warehouse_headers_frame.grid_columnconfigure(0, weight=7)
-            warehouse_headers_frame.grid_columnconfigure(1, weight=3)
-            
-            # Строки со складскими товарами
-            for item_name, quantity in self.game.player.inventory.items():
-                if quantity > 0:  # Показываем только товары с количеством > 0
-                    self.create_inventory_row(warehouse_frame, item_name, quantity)
+        # Сообщение о пустом складе и заголовки таблицы: показывается одно из двух
+        self.empty_label = ctk.CTkLabel(
+            self.warehouse_frame,
+            text="📦 Склад пуст\n\nПриобретите товары для начала торговли",
+            font=RomanTheme.FONT_TEXT,
+            text_color=RomanTheme.NEUTRAL,
+            justify="center"
+        )
+        
+        self.warehouse_headers_frame = ctk.CTkFrame(
+            self.warehouse_frame,
+            fg_color=RomanTheme.NEUTRAL,
+            corner_radius=8
+        )
+        
+        # Заголовки для склада
+        name_header = ctk.CTkLabel(
+            self.warehouse_headers_frame,
+            text="Товар",
+            font=RomanTheme.FONT_BUTTON,
+            text_color=RomanTheme.BACKGROUND
+        )
+        name_header.grid(row=0, column=0, padx=10, pady=10, sticky="ew")
+        
+        qty_header = ctk.CTkLabel(
+            self.warehouse_headers_frame,
+            text="Количество",
+            font=RomanTheme.FONT_BUTTON,
+            text_color=RomanTheme.BACKGROUND
+        )
+        qty_header.grid(row=0, column=1, padx=10, pady=10, sticky="ew")
+        
+        self.warehouse_headers_frame.grid_columnconfigure(0, weight=7)
+        self.warehouse_headers_frame.grid_columnconfigure(1, weight=3)
+    
+    def update_inventory(self):
+        """
+        Обновление склада на месте: меняются только строки товаров,
+        количество которых изменилось с прошлого показа.
+        """
+        # Показываем только товары с количеством > 0
+        stocked = {name: qty for name, qty in self.game.player.inventory.items() if qty > 0}
+        
+        if stocked and not self.shown_inventory:
+            self.empty_label.pack_forget()
+            self.warehouse_headers_frame.pack(fill="x", pady=15, padx=15)
+        elif not stocked:
+            self.warehouse_headers_frame.pack_forget()
+            self.empty_label.pack(pady=40)
+        
+        for item_name, quantity in stocked.items():
+            shown = self.shown_inventory.get(item_name)
+            if shown == quantity:
+                continue
+            row = self.inventory_rows.get(item_name)
+            if row is None:
+                self.inventory_rows[item_name] = self.create_inventory_row(self.warehouse_frame, item_name, quantity)
+                continue
+            row_frame, quantity_label = row
+            quantity_label.configure(text=f"{quantity:,} ед.")
+            if shown is None:
+                row_frame.pack(fill="x", pady=3, padx=15)
+        
+        # Закончившиеся товары скрываются, строка остается для повторного показа
+        for item_name in self.shown_inventory:
+            if item_name not in stocked:
+                self.inventory_rows[item_name][0].pack_forget()
+        
+        self.shown_inventory = stocked
     
-    def create_inventory_row(self, parent, item_name: str, quantity: int):
-        """Создание строки склада"""
+    def create_inventory_row(self, parent, item_name: str, quantity: int) -> Tuple[ctk.CTkFrame, ctk.CTkLabel]:
+        """
+        Создание строки склада
+        
+        Returns:
+            Tuple[CTkFrame, CTkLabel]: Фрейм строки и надпись с количеством
+        """
         
         row_frame = ctk.CTkFrame(
             parent,
@@ -515,6 +552,8 @@ class ShopInventoryScreen(ctk.CTkFrame):
         # Настройка сетки
         row_frame.grid_columnconfigure(0, weight=7)
         row_frame.grid_columnconfigure(1, weight=3)
+        
+        return row_frame, quantity_label
     
     def create_bottom_panel(self):
         """Создание нижней панели с кнопкой возврата"""
@@ -582,11 +621,68 @@ class ShopInventoryScreen(ctk.CTkFrame):
         self.after(3000, lambda: message_frame.destroy())
     
     def refresh_screen(self):
-        """Обновление экрана после покупки"""
-        # Пересоздаем виджеты для обновления данных
-        for widget in self.winfo_children():
-            widget.destroy()
-        self.create_widgets()
+        """Обновление экрана после покупки: раздача накопленных изменений игры"""
+        changes = getattr(self.game, "changes", None)
+        if changes is not None and self.subscribed:
+            changes.flush()
+        else:
+            self.update_screen(self.game)
+    
+    def update_screen(self, game: Game):
+        """
+        Обновление баланса и склада без пересоздания виджетов.
+        Изменения той же игры уже применены через ленту изменений.
+        
+        Args:
+            game (Game): Текущая игра.
+        """
+        if game is self.game and self.subscribed:
+            return
+        self.unsubscribe()
+        self.game = game
+        self.subscribe()
+        self.update_balance_label()
+        self.update_inventory()
+    
+    def update_balance_label(self):
+        """Обновление баланса игрока"""
+        balance = self.game.player.balance
+        self.balance_label.configure(
+            text=f"💰 Ваш баланс: {balance:,} денариев",
+            text_color=RomanTheme.SUCCESS if balance >= 1000 else RomanTheme.TEXT
+        )
+    
+    def subscribe(self):
+        """Подписка на ленту изменений игры (у заглушек игры ленты нет)"""
+        changes = getattr(self.game, "changes", None)
+        if changes is not None:
+            changes.subscribe(self.on_changes, BalanceChanged, InventoryChanged)
+        self.subscribed = changes is not None
+    
+    def unsubscribe(self):
+        """Отписка от ленты изменений игры"""
+        changes = getattr(self.game, "changes", None)
+        if changes is not None:
+            changes.unsubscribe(self.on_changes)
+        self.subscribed = False
+    
+    def on_changes(self, events: list):
+        """
+        Обновление баланса и склада, если они изменились.
+        
+        Args:
+            events (list): События одной раздачи ленты изменений.
+        """
+        kinds = {type(event) for event in events}
+        if BalanceChanged in kinds:
+            self.update_balance_label()
+        if InventoryChanged in kinds:
+            self.update_inventory()
+    
+    def destroy(self):
+        """Отписка от ленты изменений и уничтожение экрана"""
+        self.unsubscribe()
+        super().destroy()
 
 
 # Пример использования для тестирования
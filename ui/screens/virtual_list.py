@@ -0,0 +1,234 @@
+"""
+Виртуализированный прокручиваемый список для длинных списков отчётов.
+
+Виджеты создаются только для строк, видимых в окне списка, и
+переиспользуются при прокрутке: строка, ушедшая за край, получает данные
+новой видимой строки через bind_row, а не пересоздаётся. Поэтому
+стоимость отрисовки зависит от высоты окна, а не от числа элементов —
+тысячи отчётов открываются так же быстро, как десяток.
+
+Высоты строк могут различаться (например, по числу товаров в отчёте);
+их смещения хранятся префиксными суммами и дописываются только для новых
+элементов, если список лишь растёт (как Game.reports; отброшенные из
+начала истории отчёты передаются в set_items через dropped). Поиск
+первой видимой строки — двоичный.
+"""
+from bisect import bisect_right
+from typing import Callable, Dict, List, Sequence
+
+import customtkinter as ctk
+from ui.screens.difficulty_screen import RomanTheme
+
+# Шаг прокрутки колесом мыши и стрелками полосы прокрутки, пикселей
+SCROLL_UNIT = 40
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Прокручиваемый список, отрисовывающий только видимые строки.
+
+    Атрибуты:
+        items (Sequence): Элементы списка.
+        newest_first (bool): Показывать ли элементы с конца (новые сверху).
+        offset (int): Прокрутка, пикселей от начала списка.
+    """
+
+    def __init__(
+            self,
+            parent,
+            create_row: Callable[[ctk.CTkFrame], ctk.CTkFrame],
+            bind_row: Callable[[ctk.CTkFrame, object, int], None],
+            row_height: Callable[[object], int],
+            **kwargs
+    ):
+        """
+        Args:
+            parent: Родительский виджет.
+            create_row (Callable): Создаёт пустую строку create_row(parent) -> фрейм
+                (не размещает её).
+            bind_row (Callable): Заполняет строку данными bind_row(row, item, position),
+                position — номер строки в списке с нуля.
+            row_height (Callable): Высота строки элемента, пикселей.
+            **kwargs: Параметры CTkFrame.
+        """
+        kwargs.setdefault("fg_color", RomanTheme.BACKGROUND)
+        super().__init__(parent, **kwargs)
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+
+        self.items: Sequence = ()
+        self.newest_first = False
+        self.offset = 0
+        # prefix[i] — сумма высот первых i элементов (в порядке items)
+        self._prefix: List[int] = [0]
+        # Видимые строки по позиции элемента и свободные строки для переиспользования
+        self._rows: Dict[int, ctk.CTkFrame] = {}
+        self._free: List[ctk.CTkFrame] = []
+        self._wheel_tag = f"VirtualList{id(self)}"
+
+        self.scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self.yview,
+            button_color=RomanTheme.BUTTON,
+            button_hover_color=RomanTheme.BUTTON_HOVER
+        )
+        self.scrollbar.pack(side="right", fill="y")
+        self.viewport = ctk.CTkFrame(self, fg_color=kwargs["fg_color"], corner_radius=0)
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", lambda event: self.render())
+
+        # Колесо мыши над списком прокручивает только его, а не внешний прокручиваемый фрейм
+        self.bind_class(self._wheel_tag, "<MouseWheel>", self._on_wheel)
+        self.bind_class(self._wheel_tag, "<Button-4>", self._on_wheel)
+        self.bind_class(self._wheel_tag, "<Button-5>", self._on_wheel)
+        self.add_wheel_tag(self.viewport)
+
+    def __len__(self) -> int:
+        return len(self._prefix) - 1
+
+    @property
+    def total_height(self) -> int:
+        """Высота всех строк списка, пикселей."""
+        return self._prefix[-1]
+
+    def set_items(self, items: Sequence, newest_first: bool = False, dropped: int = 0) -> None:
+        """
+        Задаёт элементы списка и перерисовывает видимые строки.
+        Если передан тот же растущий список, высоты считаются только для новых элементов.
+
+        Args:
+            items (Sequence): Элементы.
+            newest_first (bool): Показывать элементы с конца (новые сверху).
+            dropped (int): Сколько элементов того же списка удалено из его начала
+                с прошлого вызова.
+        """
+        grown = (items is self.items and newest_first == self.newest_first
+                 and 0 <= dropped <= len(self) and len(items) >= len(self) - dropped)
+        if not grown:
+            self._prefix = [0]
+        elif dropped:
+            # Первые элементы удалены: их высоты вычитаются из префиксных сумм
+            removed = self._prefix[dropped]
+            self._prefix = [height - removed for height in self._prefix[dropped:]]
+            if not newest_first:
+                self.offset = max(0, self.offset - removed)
+            self._release_rows()
+        start = len(self)
+        prefix = self._prefix
+        for index in range(start, len(items)):
+            prefix.append(prefix[-1] + self.row_height(items[index]))
+
+        if not grown:
+            self.offset = 0
+            self._release_rows()
+        elif newest_first and len(items) > start:
+            # Новые элементы появились сверху: позиции строк сместились, а прокрученное
+            # окно остаётся на прежних элементах
+            if self.offset > 0:
+                self.offset += prefix[-1] - prefix[start]
+            self._release_rows()
+
+        self.items = items
+        self.newest_first = newest_first
+        self.render()
+
+    def refresh(self) -> None:
+        """Перепривязывает видимые строки (данные элементов изменились на месте)."""
+        self._release_rows()
+        self.render()
+
+    def yview(self, *args) -> None:
+        """
+        Прокрутка в протоколе полосы прокрутки Tk:
+        ("moveto", доля) или ("scroll", число, "units" | "pages").
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self.total_height)
+        elif args[0] == "scroll":
+            step = self._view_height() if len(args) > 2 and args[2] == "pages" else SCROLL_UNIT
+            self.offset += int(float(args[1]) * step)
+        self.render()
+
+    def _on_wheel(self, event) -> str:
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.yview("scroll", -1 if up else 1, "units")
+        return "break"
+
+    def _view_height(self) -> int:
+        # Высоты строк заданы без масштабирования, как размеры виджетов customtkinter
+        return max(int(self._reverse_widget_scaling(self.viewport.winfo_height())), 1)
+
+    def _item_top(self, position: int) -> int:
+        """Верх строки по её позиции в показанном порядке."""
+        if self.newest_first:
+            return self.total_height - self._prefix[len(self) - position]
+        return self._prefix[position]
+
+    def _position_at(self, y: int) -> int:
+        """Позиция строки, в которую попадает координата y от начала списка."""
+        count = len(self)
+        if self.newest_first:
+            # Отсчёт от конца списка: строка хранится под индексом count - 1 - position
+            index = bisect_right(self._prefix, self.total_height - y - 1) - 1
+            return count - 1 - index
+        return bisect_right(self._prefix, y) - 1
+
+    def _item(self, position: int):
+        return self.items[len(self) - 1 - position if self.newest_first else position]
+
+    def render(self) -> None:
+        """Размещает строки, попадающие в окно списка; остальные возвращаются в запас."""
+        view = self._view_height()
+        total = self.total_height
+        self.offset = max(0, min(self.offset, total - view))
+
+        visible = range(0)
+        if total > 0:
+            first = self._position_at(self.offset)
+            last = self._position_at(min(self.offset + view, total) - 1)
+            visible = range(first, last + 1)
+
+        for position in [position for position in self._rows if position not in visible]:
+            row = self._rows.pop(position)
+            row.place_forget()
+            self._free.append(row)
+
+        for position in visible:
+            row = self._rows.get(position)
+            if row is None:
+                row = self._free.pop() if self._free else self._new_row()
+                self.bind_row(row, self._item(position), position)
+                self._rows[position] = row
+            top = self._item_top(position)
+            bottom = self._item_top(position + 1)
+            row.place(x=0, y=top - self.offset, relwidth=1.0, height=bottom - top)
+
+        if total <= view:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + view) / total)
+
+    def _new_row(self) -> ctk.CTkFrame:
+        row = self.create_row(self.viewport)
+        self.add_wheel_tag(row)
+        return row
+
+    def _release_rows(self) -> None:
+        for row in self._rows.values():
+            row.place_forget()
+            self._free.append(row)
+        self._rows.clear()
+
+    def add_wheel_tag(self, widget) -> None:
+        """
+        Колесо мыши над виджетом и любым его вложенным виджетом прокручивает список
+        (для виджетов, добавленных в строку после её создания).
+        """
+        tags = tuple(widget.bindtags())
+        if self._wheel_tag not in tags:
+            widget.bindtags((self._wheel_tag,) + tags)
+        for child in widget.winfo_children():
+            self.add_wheel_tag(child)